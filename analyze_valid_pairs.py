@@ -5,14 +5,13 @@ Analyze which specific pairs are valid and trace the greedy matching algorithm.
 import os
 import sys
 import django
-from decimal import Decimal
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'karate.settings')
 sys.path.insert(0, os.path.dirname(__file__))
 django.setup()
 
 from core.models import Trainee, Event, EventRegistration
-from core.services.matchmaking import MatchmakingService, are_belts_adjacent, get_belt_index
+from core.services.matchmaking import MatchmakingService
 
 def analyze_valid_pairs(event_id=None):
     """Show all valid pairs and trace the matching algorithm."""
@@ -35,37 +34,31 @@ def analyze_valid_pairs(event_id=None):
     registrations = EventRegistration.objects.filter(
         event=event,
         status='registered'
-    ).select_related('trainee__profile')
+    ).select_related('trainee__profile__user')
     
     trainees = [reg.trainee for reg in registrations]
     service = MatchmakingService()
     
-    # Find all valid pairs
+    # Find all valid pairs from the array-backed snapshot
+    snapshot = service.build_snapshot(trainees)
     valid_pairs = []
     
-    for i, t1 in enumerate(trainees):
-        for t2 in trainees[i+1:]:
-            if service._is_valid_pairing(t1, t2):
-                weight_diff = abs(t1.weight - t2.weight)
-                belt_diff = abs(get_belt_index(t1.belt_rank) - get_belt_index(t2.belt_rank))
-                age_diff = abs((t1.age or 0) - (t2.age or 0))
-                score = service._calculate_pairing_score(t1, t2)
-                
-                valid_pairs.append({
-                    'trainee1': t1,
-                    'trainee2': t2,
-                    'weight_diff': float(weight_diff),
-                    'belt_diff': belt_diff,
-                    'age_diff': age_diff,
-                    'score': score,
-                    'idx1': i,
-                    'idx2': trainees.index(t2)
-                })
+    for i, j in snapshot.valid_pairs():
+        valid_pairs.append({
+            'trainee1': trainees[i],
+            'trainee2': trainees[j],
+            'weight_diff': float(snapshot.weight_diff(i, j)),
+            'belt_diff': snapshot.belt_diff(i, j),
+            'age_diff': snapshot.age_diff(i, j),
+            'score': snapshot.scaled_score(i, j) / 100,
+            'idx1': i,
+            'idx2': j
+        })
     
     print(f"\nTotal VALID pairs: {len(valid_pairs)}\n")
     
-    # Sort by score
-    valid_pairs.sort(key=lambda x: x['score'])
+    # Sort by score, keeping trainee order for ties
+    valid_pairs.sort(key=lambda x: (x['score'], x['idx1'], x['idx2']))
     
     # Show all valid pairs
     print("VALID PAIRS (sorted by score - lower is better):")
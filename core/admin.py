@@ -11,13 +11,19 @@ from core.models import (
     Payment,
     BeltRankThreshold,
     TraineePoints,
+    PointsLedgerEntry,
     BeltRankProgress,
     Leaderboard,
     Notification,
+    BroadcastNotification,
+    BroadcastReadMarker,
     TraineeEvaluation,
     TrainingSession,
     Attendance,
+    Job,
+    ReportExport,
 )
+from core.services.notification_service import NotificationService
 
 
 @admin.register(UserProfile)
@@ -52,6 +58,14 @@ class EventAdmin(admin.ModelAdmin):
     )
     list_filter = ("status", "event_date")
     search_fields = ("name", "location")
+    readonly_fields = ("participant_count",)
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Only the edited fields; participant_count is kept by registrations
+            obj.save(update_fields=form.changed_data)
+        else:
+            obj.save()
 
 
 @admin.register(EventRegistration)
@@ -126,6 +140,14 @@ class TraineePointsAdmin(admin.ModelAdmin):
     readonly_fields = ("updated_at",)
 
 
+@admin.register(PointsLedgerEntry)
+class PointsLedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("trainee", "points", "reason", "created_at")
+    list_filter = ("reason", "created_at")
+    search_fields = ("trainee__profile__user__username",)
+    readonly_fields = ("trainee", "points", "reason", "created_at")
+
+
 @admin.register(BeltRankProgress)
 class BeltRankProgressAdmin(admin.ModelAdmin):
     list_display = (
@@ -169,19 +191,37 @@ class NotificationAdmin(admin.ModelAdmin):
         """Admin action to mark notifications as read."""
         from django.utils import timezone
 
+        recipient_ids = set(queryset.values_list("recipient_id", flat=True))
         updated = queryset.update(is_read=True, read_at=timezone.now())
+        NotificationService.invalidate_summaries(recipient_ids)
         self.message_user(request, f"{updated} notification(s) marked as read.")
 
     mark_as_read.short_description = "Mark selected notifications as read"
 
     def mark_as_unread(self, request, queryset):
         """Admin action to mark notifications as unread."""
+        recipient_ids = set(queryset.values_list("recipient_id", flat=True))
         updated = queryset.update(is_read=False, read_at=None)
+        NotificationService.invalidate_summaries(recipient_ids)
         self.message_user(request, f"{updated} notification(s) marked as unread.")
 
     mark_as_unread.short_description = "Mark selected notifications as unread"
 
 
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(admin.ModelAdmin):
+    list_display = ("title", "notification_type", "audience", "event", "created_at")
+    list_filter = ("notification_type", "audience", "created_at")
+    search_fields = ("title", "message")
+
+
+@admin.register(BroadcastReadMarker)
+class BroadcastReadMarkerAdmin(admin.ModelAdmin):
+    list_display = ("broadcast", "user", "read_at")
+    search_fields = ("broadcast__title", "user__username")
+    readonly_fields = ("read_at",)
+
+
 @admin.register(TraineeEvaluation)
 class TraineeEvaluationAdmin(admin.ModelAdmin):
     list_display = ("trainee", "overall_rating", "status", "evaluated_at", "evaluator")
@@ -264,3 +304,19 @@ class AttendanceAdmin(admin.ModelAdmin):
     )
     date_hierarchy = "date"
     raw_id_fields = ("trainee", "session", "event")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "attempts", "run_at", "started_at", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    readonly_fields = ("created_at", "started_at", "finished_at", "locked_by", "last_error")
+
+
+@admin.register(ReportExport)
+class ReportExportAdmin(admin.ModelAdmin):
+    list_display = ("filename", "kind", "status", "requested_by", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    search_fields = ("filename", "error")
+    readonly_fields = ("key", "created_at", "started_at", "finished_at", "error")
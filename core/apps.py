@@ -6,5 +6,6 @@ class CoreConfig(AppConfig):
     name = "core"
     
     def ready(self):
-        """Register signals when the app is ready."""
+        """Register signals and background tasks when the app is ready."""
         import core.signals
+        import core.tasks
@@ -0,0 +1,1015 @@
+"""
+Performance benchmarks for the BlackCobra Karate Club System.
+
+Run a scenario with the benchmark management command, e.g.:
+
+    python manage.py benchmark leaderboard --sizes 1000 5000
+
+Every scenario runs inside a transaction that is rolled back afterwards,
+so benchmarks never leave data behind in the database. Scenarios whose work
+runs in other processes, which cannot see that transaction, are registered
+with rollback=False and delete the data they commit themselves.
+
+Scenarios create the rows they measure on top of whatever the database
+already holds; to benchmark against a realistically sized club, fill it
+first with the generate_dataset command (see core.datasets).
+"""
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db.models import F
+
+from core.models import UserProfile, Trainee, TraineePoints
+
+
+SCENARIOS = {}
+
+
+def scenario(name, rollback=True):
+    """Register a benchmark scenario under the given name."""
+    def decorator(func):
+        func.rollback = rollback
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+def timed(func, *args, **kwargs):
+    """Run func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def create_trainees(count, seed=0, prefix='bench'):
+    """
+    Bulk-create users, profiles and trainees with random attributes.
+
+    Returns:
+        List of Trainee instances
+    """
+    rng = random.Random(seed)
+    belts = [belt for belt, _ in Trainee.BELT_CHOICES]
+    today = date.today()
+
+    users = User.objects.bulk_create([
+        User(
+            username=f'{prefix}_{seed}_{i}',
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            password='!',
+        )
+        for i in range(count)
+    ])
+    profiles = UserProfile.objects.bulk_create([
+        UserProfile(
+            user=user,
+            role='trainee',
+            date_of_birth=today - timedelta(days=rng.randint(10 * 365, 40 * 365)),
+        )
+        for user in users
+    ])
+
+    trainees = []
+    for profile in profiles:
+        trainee = Trainee(
+            profile=profile,
+            belt_rank=rng.choice(belts),
+            weight=Decimal(rng.randint(4000, 10000)) / 100,
+            emergency_contact='Benchmark Contact',
+            emergency_phone='0000000000',
+        )
+        trainee.weight_class = trainee.calculate_weight_class()
+        trainees.append(trainee)
+    return Trainee.objects.bulk_create(trainees)
+
+
+def create_trainee_points(trainees, seed=0):
+    """Bulk-create a TraineePoints record with random totals for each trainee."""
+    rng = random.Random(seed)
+    return TraineePoints.objects.bulk_create([
+        TraineePoints(
+            trainee=trainee,
+            total_points=rng.randint(0, 2000),
+            wins=rng.randint(0, 30),
+            losses=rng.randint(0, 30),
+        )
+        for trainee in trainees
+    ])
+
+
+@scenario('leaderboard')
+def leaderboard_benchmark(size, out):
+    """Compare a full leaderboard rebuild with an incremental re-rank after one match."""
+    from django.db import transaction
+    from core.models import Leaderboard
+    from core.services.leaderboard_service import LeaderboardService
+
+    trainees = create_trainees(size)
+    create_trainee_points(trainees)
+    LeaderboardService.update_all_leaderboards()
+
+    winner, loser = trainees[0], trainees[-1]
+
+    def close_match():
+        # Change the totals only; awarding points would re-rank them already
+        TraineePoints.objects.filter(trainee=winner).update(total_points=F('total_points') + TraineePoints.WIN_POINTS)
+        TraineePoints.objects.filter(trainee=loser).update(total_points=F('total_points') + TraineePoints.LOSS_POINTS)
+
+    def snapshot():
+        return list(
+            Leaderboard.objects.order_by('timeframe', 'rank').values_list('timeframe', 'rank', 'trainee_id', 'points')
+        )
+
+    close_match()
+
+    # Both start from the same stale boards and must produce identical rankings
+    savepoint = transaction.savepoint()
+    _, full = timed(LeaderboardService.update_all_leaderboards)
+    rebuilt_ranks = snapshot()
+    transaction.savepoint_rollback(savepoint)
+
+    _, incremental = timed(LeaderboardService.update_trainee_rankings, [winner, loser])
+    incremental_ranks = snapshot()
+
+    return {
+        'full_rebuild_s': full,
+        'incremental_s': incremental,
+        'speedup': full / incremental if incremental else None,
+        'consistent': incremental_ranks == rebuilt_ranks,
+    }
+
+
+def legacy_auto_match_pairs(service, trainees):
+    """
+    Reference all-pairs greedy matching, as auto_match worked before bucketing.
+    Scores use exact Decimal arithmetic so ties resolve the same way.
+    """
+    from core.services.matchmaking import get_belt_index
+
+    pairings = []
+    for i, t1 in enumerate(trainees):
+        for t2 in trainees[i + 1:]:
+            if service._is_valid_pairing(t1, t2):
+                score = (
+                    abs(t1.weight - t2.weight) * 2
+                    + abs(get_belt_index(t1.belt_rank) - get_belt_index(t2.belt_rank)) * 3
+                    + abs((t1.age or 0) - (t2.age or 0))
+                )
+                pairings.append((t1, t2, score))
+    pairings.sort(key=lambda x: x[2])
+
+    used, pairs = set(), []
+    for t1, t2, _ in pairings:
+        if t1.id not in used and t2.id not in used:
+            pairs.append((t1.id, t2.id))
+            used.update((t1.id, t2.id))
+    return pairs
+
+
+# All-pairs matching is quadratic; skip the baseline above this pool size
+LEGACY_MATCHING_LIMIT = 5000
+
+
+@scenario('matchmaking')
+def matchmaking_benchmark(size, out):
+    """Time auto_match over a global pool of trainees against the all-pairs baseline."""
+    from core.services.matchmaking import MatchmakingService
+
+    create_trainees(size)
+    event = create_event(size, status='draft')
+    service = MatchmakingService()
+    proposed, bucketed = timed(service.auto_match, event.id, use_global_pool=True)
+    results = {
+        'pool_size': size,
+        'matches': len(proposed),
+        'bucketed_s': bucketed,
+    }
+
+    if size <= LEGACY_MATCHING_LIMIT:
+        trainees = list(Trainee.objects.filter(
+            status='active', archived=False, profile__user__is_active=True
+        ).select_related('profile__user'))
+        pairs, legacy = timed(legacy_auto_match_pairs, service, trainees)
+        results['all_pairs_s'] = legacy
+        results['speedup'] = legacy / bucketed if bucketed else None
+        results['same_pairs'] = pairs == [(m.competitor1.id, m.competitor2.id) for m in proposed]
+    else:
+        results['all_pairs_s'] = 'skipped'
+    return results
+
+
+def create_event(participants=0, status='open', days_ahead=30):
+    """Create an event with registration open for the given number of days."""
+    from core.models import Event
+
+    return Event.objects.create(
+        name='Benchmark Open',
+        event_date=date.today() + timedelta(days=days_ahead),
+        location='Main Dojo',
+        registration_deadline=date.today() + timedelta(days=days_ahead - 10),
+        max_participants=max(participants, 1),
+        status=status,
+    )
+
+
+@scenario('matching_strategies')
+def matching_strategies_benchmark(size, out):
+    """Compare greedy and optimal auto-match pairings for a tournament of the given size."""
+    from core.models import Event, EventRegistration
+    from core.services.matchmaking import MatchmakingService
+
+    trainees = create_trainees(size)
+    event = create_event(size, status='draft')
+    EventRegistration.objects.bulk_create([
+        EventRegistration(event=event, trainee=trainee) for trainee in trainees
+    ])
+    event.reconcile_participant_counts(Event.objects.filter(pk=event.pk))
+
+    service = MatchmakingService()
+    greedy, greedy_s = timed(service.auto_match, event.id, strategy='greedy')
+    optimal, optimal_s = timed(service.auto_match, event.id, strategy='optimal')
+
+    return {
+        'greedy_paired': 2 * len(greedy),
+        'optimal_paired': 2 * len(optimal),
+        'extra_paired': 2 * (len(optimal) - len(greedy)),
+        'greedy_total_score': sum(m.score for m in greedy),
+        'optimal_total_score': sum(m.score for m in optimal),
+        'greedy_s': greedy_s,
+        'optimal_s': optimal_s,
+    }
+
+
+def brute_force_constraint_counts(snapshot):
+    """Reference pair diagnostics: check the constraints of every pair in turn."""
+    counts = {'weight': 0, 'belt': 0, 'age': 0, 'valid': 0}
+    failures = dict.fromkeys(snapshot.FAILURE_CATEGORIES, 0)
+    categories = {flags: name for name, flags in snapshot.FAILURE_CATEGORIES.items()}
+    for i in range(len(snapshot)):
+        for j in range(i + 1, len(snapshot)):
+            flags = snapshot.constraint_flags(i, j)
+            for name, ok in zip(('weight', 'belt', 'age'), flags):
+                counts[name] += ok
+            if all(flags):
+                counts['valid'] += 1
+            else:
+                failures[categories[flags]] += 1
+    counts['failures'] = failures
+    return counts
+
+
+# Brute-force diagnostics are quadratic; skip the cross-check above this size
+BRUTE_FORCE_DIAGNOSTICS_LIMIT = 2000
+
+
+@scenario('pair_diagnostics')
+def pair_diagnostics_benchmark(size, out):
+    """Time constraint diagnostics over a pool of trainees using the shared snapshot."""
+    from core.services.matchmaking import MatchmakingService
+
+    create_trainees(size)
+    trainees = list(Trainee.objects.select_related('profile__user'))
+    snapshot, snapshot_s = timed(MatchmakingService.build_snapshot, trainees)
+    counts, counts_s = timed(snapshot.constraint_counts)
+    _, samples_s = timed(snapshot.sample_failures, counts=counts)
+
+    results = {
+        'pool_size': len(snapshot),
+        'valid_pairs': counts['valid'],
+        'snapshot_s': snapshot_s,
+        'counts_s': counts_s,
+        'samples_s': samples_s,
+    }
+    if size <= BRUTE_FORCE_DIAGNOSTICS_LIMIT:
+        reference, brute_force = timed(brute_force_constraint_counts, snapshot)
+        counts.pop('total')
+        results['brute_force_s'] = brute_force
+        results['consistent'] = counts == reference
+    else:
+        results['brute_force_s'] = 'skipped'
+    return results
+
+
+def run_queued_jobs():
+    """Run every due background job, as the run_jobs worker would."""
+    from core.services.job_queue import JobQueue
+
+    while jobs := JobQueue.claim('benchmark', limit=100):
+        for job in jobs:
+            JobQueue.run(job)
+
+
+def legacy_event_notification_fan_out(event, notification_type='event_updated'):
+    """
+    Reference fan-out, as event saves worked before broadcast notifications:
+    one Notification row per active trainee.
+    """
+    from core.models import Notification
+
+    trainee_users = User.objects.filter(profile__role='trainee', profile__trainee__status='active')
+    return len(Notification.objects.bulk_create([
+        Notification(
+            notification_type=notification_type,
+            title=f'Event Updated: {event.name}',
+            message=event.name,
+            recipient=user,
+            event=event,
+        )
+        for user in trainee_users
+    ]))
+
+
+@scenario('event_save')
+def event_save_benchmark(size, out):
+    """Time an event edit with broadcast notifications against the per-trainee fan-out."""
+    from core.models import BroadcastNotification
+
+    create_trainees(size)
+    event = create_event(size)
+    run_queued_jobs()
+
+    def save_event():
+        event.location = 'Annex Dojo'
+        event.save(update_fields=['location'])
+
+    def legacy_save_event():
+        save_event()
+        run_queued_jobs()
+        return legacy_event_notification_fan_out(event)
+
+    broadcasts_before = BroadcastNotification.objects.count()
+    _, request_s = timed(save_event)
+    _, job_s = timed(run_queued_jobs)
+    rows_per_save = BroadcastNotification.objects.count() - broadcasts_before
+    fan_out_rows, legacy_s = timed(legacy_save_event)
+
+    return {
+        'legacy_rows_per_save': fan_out_rows,
+        'legacy_save_s': legacy_s,
+        'rows_per_save': rows_per_save,
+        'event_save_s': request_s + job_s,
+        'request_s': request_s,
+        'speedup': legacy_s / (request_s + job_s),
+    }
+
+
+def legacy_record_attendance(marks, session):
+    """Reference writer: one update_or_create per trainee, as the attendance views worked before."""
+    from core.models import Attendance
+
+    for trainee_id, values in marks.items():
+        Attendance.objects.update_or_create(
+            trainee_id=trainee_id,
+            session=session,
+            defaults={'date': session.date, **values},
+        )
+
+
+def counted(func, *args, **kwargs):
+    """Run func and return (elapsed seconds, number of queries)."""
+    from django.db import connection
+
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        _, elapsed = timed(func, *args, **kwargs)
+    return elapsed, queries
+
+
+@scenario('attendance_marking')
+def attendance_marking_benchmark(size, out):
+    """Mark, then re-mark, a session of the given size with the bulk writer and the per-trainee loop."""
+    from datetime import time as clock
+    from core.models import TrainingSession
+    from core.services.attendance_service import AttendanceService
+
+    trainees = create_trainees(size)
+    rng = random.Random(0)
+    sessions = [
+        TrainingSession.objects.create(
+            title=f'Benchmark Seminar {i}',
+            session_type='seminar',
+            date=date.today(),
+            start_time=clock(9, 0),
+            end_time=clock(12, 0),
+        )
+        for i in range(2)
+    ]
+
+    def marks():
+        return {
+            trainee.id: {'status': rng.choice(['present', 'present', 'late', 'absent']), 'notes': ''}
+            for trainee in trainees
+        }
+
+    first, second = marks(), marks()
+    results = {}
+    for label, session, writer in (
+        ('legacy', sessions[0], lambda m, s: legacy_record_attendance(m, s)),
+        ('bulk', sessions[1], lambda m, s: AttendanceService.record_attendance(m, session=s)),
+    ):
+        results[f'{label}_mark_s'], results[f'{label}_mark_queries'] = counted(writer, first, session)
+        results[f'{label}_remark_s'], results[f'{label}_remark_queries'] = counted(writer, second, session)
+
+    def snapshot(session):
+        return sorted(session.attendance_records.values_list('trainee_id', 'status', 'notes', 'date'))
+
+    results['speedup'] = (
+        (results['legacy_mark_s'] + results['legacy_remark_s'])
+        / (results['bulk_mark_s'] + results['bulk_remark_s'])
+    )
+    results['same_rows'] = snapshot(sessions[0]) == snapshot(sessions[1])
+    return results
+
+
+def create_attendance_history(rows, trainees_per_session=250, seed=0):
+    """
+    Bulk-create one session per day going back in time, each with every
+    trainee marked, until the given number of attendance rows exists.
+
+    Returns:
+        List of TrainingSession instances
+    """
+    from datetime import time as clock
+    from core.models import Attendance, TrainingSession
+
+    rng = random.Random(seed)
+    trainees = create_trainees(min(rows, trainees_per_session), seed=seed, prefix='history')
+    session_count = -(-rows // len(trainees))
+    sessions = TrainingSession.objects.bulk_create([
+        TrainingSession(
+            title=f'Benchmark Training {i}',
+            date=date.today() - timedelta(days=i),
+            start_time=clock(18, 0),
+            end_time=clock(19, 30),
+            status='completed',
+        )
+        for i in range(session_count)
+    ])
+    Attendance.objects.bulk_create(
+        (
+            Attendance(
+                trainee=trainee,
+                session=session,
+                date=session.date,
+                status=rng.choice(['present', 'present', 'late', 'absent', 'excused']),
+                notes=rng.choice(['', '', 'Arrived from school', 'Injured, watched']),
+            )
+            for session in sessions
+            for trainee in trainees
+        ),
+        batch_size=2000,
+    )
+    return sessions
+
+
+def measure_stream(export):
+    """
+    Call export() and consume the text chunks it returns.
+
+    Returns:
+        (seconds to first chunk, total seconds, total characters)
+    """
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in export():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def peak_memory(func, *args, **kwargs):
+    """Run func under tracemalloc and return its peak traced allocation in bytes."""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@scenario('csv_export')
+def csv_export_benchmark(size, out):
+    """Export a session attendance history of `size` rows as one string and as a stream."""
+    import hashlib
+    from core.services.reports import ReportService
+
+    session_ids = [session.id for session in create_attendance_history(size)]
+    service = ReportService()
+
+    def materialised():
+        report = service.session_attendance_report(session_ids=session_ids)
+        return [service.export_csv(report, 'session_attendance')]
+
+    def streamed():
+        report = service.session_attendance_report(session_ids=session_ids)
+        return service.stream_csv(report, 'session_attendance')
+
+    def digest(export):
+        sha = hashlib.sha256()
+        for chunk in export():
+            sha.update(chunk.encode())
+        return sha.hexdigest()
+
+    results = {}
+    for label, export in (('materialised', materialised), ('streamed', streamed)):
+        results[f'{label}_first_byte_s'], results[f'{label}_s'], results['csv_chars'] = (
+            measure_stream(export)
+        )
+        results[f'{label}_peak_mb'] = peak_memory(measure_stream, export) / 2**20
+    results['memory_ratio'] = results['materialised_peak_mb'] / results['streamed_peak_mb']
+    results['same_csv'] = digest(materialised) == digest(streamed)
+    return results
+
+
+@scenario('session_attendance_report')
+def session_attendance_report_benchmark(size, out):
+    """Queries and time to export a session attendance history of `size` rows."""
+    from core.services.reports import ReportService
+
+    session_ids = [session.id for session in create_attendance_history(size)]
+    service = ReportService()
+
+    def export(export_format):
+        report = service.session_attendance_report(session_ids=session_ids)
+        if export_format == 'pdf':
+            return service.export_pdf(report, 'session_attendance')
+        return service.export_csv(report, 'session_attendance')
+
+    results = {'sessions': len(session_ids)}
+    for export_format in ('csv', 'pdf'):
+        results[f'{export_format}_s'], results[f'{export_format}_queries'] = counted(
+            export, export_format
+        )
+    return results
+
+
+@scenario('report_cache')
+def report_cache_benchmark(size, out):
+    """Time to build the summary reports on a cache miss and on a hit, with `size` trainees."""
+    from core.services.report_cache import ReportCache
+    from core.services.reports import ReportService
+
+    create_trainees(size)
+    event = create_event()
+    service = ReportService()
+    today = date.today()
+    options = {
+        'membership': {'start_date': today - timedelta(days=365), 'end_date': today},
+        'financial': {'start_date': today - timedelta(days=365), 'end_date': today},
+        'event': {'event_id': event.id},
+    }
+
+    results = {}
+    for report_type, params in options.items():
+        ReportCache.invalidate_report(report_type)
+        _, results[f'{report_type}_miss_s'] = timed(service.build_report, report_type, **params)
+        _, results[f'{report_type}_hit_s'] = timed(service.build_report, report_type, **params)
+    return results
+
+
+PDF_EXPORT_REPEATS = 5
+
+
+def cpu_timed(func, *args, **kwargs):
+    """Run func and return (result, CPU seconds used by this process)."""
+    start = time.process_time()
+    result = func(*args, **kwargs)
+    return result, time.process_time() - start
+
+
+@scenario('pdf_export')
+def pdf_export_benchmark(size, out):
+    """CPU time per PDF export for the report types and the events export, with `size` trainees."""
+    import io
+    from core.models import Event
+    from core.services.reports import ReportService
+    from core.views.admin import export_events_pdf, render_match_monitor_pdf
+
+    create_trainees(size)
+    event = create_event()
+    service = ReportService()
+    today = date.today()
+
+    def rendered(render, *args, **kwargs):
+        output = io.BytesIO()
+        render(output, *args, **kwargs)
+        return output.getvalue()
+
+    exports = {
+        'membership': lambda: service.export_pdf(
+            service.membership_report(today - timedelta(days=365), today), 'membership'
+        ),
+        'financial': lambda: service.export_pdf(
+            service.financial_report(today - timedelta(days=365), today), 'financial'
+        ),
+        'event': lambda: service.export_pdf(service.event_report(event.id), 'event'),
+        'trainee_list': lambda: service.export_pdf(service.trainee_report(), 'trainee_list'),
+        'belt_promotion_history': lambda: service.export_pdf(
+            service.belt_promotion_history_report(), 'belt_promotion_history'
+        ),
+        'events_view': lambda: rendered(
+            export_events_pdf,
+            Event.objects.filter(pk=event.pk), ['name', 'date', 'status'], False, False, False,
+        ),
+        'match_monitor_view': lambda: rendered(render_match_monitor_pdf, event_filter=event.pk),
+    }
+
+    results = {}
+    for name, export in exports.items():
+        export()  # Warm up imports and caches shared by every export
+        cpu = 0.0
+        for _ in range(PDF_EXPORT_REPEATS):
+            pdf, elapsed = cpu_timed(export)
+            cpu += elapsed
+        results[f'{name}_ms'] = cpu / PDF_EXPORT_REPEATS * 1000
+        results[f'{name}_kb'] = len(pdf) / 1024
+    return results
+
+
+def export_like_rows(count):
+    """Yield `count` rows shaped like an export: text, numbers, dates and amounts."""
+    first = date(2020, 1, 1)
+    for number in range(count):
+        yield [
+            f'Trainee {number}',
+            f'trainee{number}@example.com',
+            number % 97,
+            first + timedelta(days=number % 1500),
+            Decimal(number % 5000) / 100,
+            'Present' if number % 3 else 'Absent',
+        ]
+
+
+@scenario('xlsx_export')
+def xlsx_export_benchmark(size, out):
+    """Time and peak memory to stream an Excel export of `size` rows, and its row count."""
+    import io
+    import zipfile
+    from xml.etree import ElementTree
+    from core.services.xlsx import stream_xlsx
+
+    def export():
+        return stream_xlsx(export_like_rows(size))
+
+    results = {}
+    results['first_chunk_s'], results['total_s'], xlsx_bytes = measure_stream(export)
+    results['rows_per_s'] = size / results['total_s']
+    results['xlsx_kb'] = xlsx_bytes / 1024
+    results['peak_mb'] = peak_memory(measure_stream, export) / 2**20
+
+    # Check the workbook parses back with every row
+    rows = 0
+    with zipfile.ZipFile(io.BytesIO(b''.join(export()))) as archive:
+        with archive.open('xl/worksheets/sheet1.xml') as sheet:
+            for _, element in ElementTree.iterparse(sheet):
+                if element.tag.endswith('}row'):
+                    rows += 1
+                    element.clear()
+    results['rows_read_back'] = rows
+    return results
+
+
+def create_progression_history(trainees, event, seed=0):
+    """
+    Bulk-create an evaluation, an achievement, a promotion and a won match
+    for each trainee, as read by the extended reports.
+    """
+    from django.utils import timezone
+    from core.models import BeltRankProgress, Match, TraineeAchievement, TraineeEvaluation
+
+    rng = random.Random(seed)
+    today = date.today()
+    TraineeEvaluation.objects.bulk_create([
+        TraineeEvaluation(trainee=trainee, status='completed', overall_rating=rng.randint(1, 5))
+        for trainee in trainees
+    ])
+    TraineeAchievement.objects.bulk_create([
+        TraineeAchievement(
+            trainee=trainee,
+            title='Kata Milestone',
+            achievement_type='skill',
+            date_earned=today - timedelta(days=rng.randint(0, 300)),
+        )
+        for trainee in trainees
+    ])
+    BeltRankProgress.objects.bulk_create([
+        BeltRankProgress(
+            trainee=trainee, old_belt_rank='white', new_belt_rank='yellow', points_earned=50
+        )
+        for trainee in trainees
+    ])
+    Match.objects.bulk_create([
+        Match(
+            event=event,
+            competitor1=trainee,
+            competitor2=opponent,
+            winner=trainee,
+            scheduled_time=timezone.now(),
+            status='completed',
+        )
+        for trainee, opponent in zip(trainees, trainees[1:])
+    ])
+
+
+@scenario('report_bundle', rollback=False)
+def report_bundle_benchmark(size, out):
+    """Wall-clock time to render the six-report bundle sequentially and in parallel, with `size` trainees."""
+    import io
+    import zipfile
+    from core.services import report_bundle
+
+    trainees = create_trainees(size, prefix='bundle')
+    event = create_event()
+    try:
+        create_progression_history(trainees, event)
+        today = date.today()
+        options = {
+            'start_date': (today - timedelta(days=365)).isoformat(),
+            'end_date': today.isoformat(),
+        }
+
+        def render(workers):
+            output = io.BytesIO()
+            report_bundle.render_report_bundle(
+                output, list(report_bundle.BUNDLE_REPORTS), options, workers=workers
+            )
+            return zipfile.ZipFile(output).namelist()
+
+        # Warm up imports and caches the sequential run would otherwise pay for
+        report_bundle.render_bundle_report('belt_promotion_history', options)
+
+        results = {'workers': min(report_bundle.MAX_WORKERS, len(report_bundle.BUNDLE_REPORTS))}
+        sequential, results['sequential_s'] = timed(render, 1)
+        parallel, results['parallel_s'] = timed(render, None)
+        results['speedup'] = results['sequential_s'] / results['parallel_s']
+        results['same_reports'] = sequential == parallel
+        return results
+    finally:
+        User.objects.filter(username__startswith='bundle_').delete()
+        event.delete()
+
+
+def legacy_listing_pdf(header, rows, col_widths, style):
+    """Lay a listing out as one Table, as the PDF exports did before PagedTable."""
+    import io
+    from reportlab.platypus import SimpleDocTemplate, Table
+
+    table = Table([header, *rows], colWidths=col_widths)
+    table.setStyle(style)
+    output = io.BytesIO()
+    SimpleDocTemplate(output).build([table])
+    return output.getvalue()
+
+
+def paged_listing_pdf(header, rows, col_widths, style):
+    """Lay a listing out with PagedTable."""
+    import io
+    from reportlab.platypus import SimpleDocTemplate
+    from core.services.pdf_tables import PagedTable
+
+    output = io.BytesIO()
+    SimpleDocTemplate(output).build([PagedTable(header, rows, col_widths, style)])
+    return output.getvalue()
+
+
+@scenario('pdf_listing')
+def pdf_listing_benchmark(size, out):
+    """Time to lay out a `size`-row listing as one Table and page by page, and to export `size` trainees."""
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+    from core.services.reports import ReportService
+
+    header = ['Name', 'Email', 'Belt Rank', 'Weight Class', 'Age', 'Status', 'Joined']
+    col_widths = [1.2 * inch, 1.3 * inch, 1 * inch, 1 * inch, 0.6 * inch, 0.9 * inch, 0.8 * inch]
+    style = TableStyle([
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ])
+
+    def rows():
+        return (
+            [f'First{i} Last{i}', f'trainee{i}@example.com', 'Black', 'Middleweight', '25', 'Active', '01/15/2024']
+            for i in range(size)
+        )
+
+    service = ReportService()
+    create_trainees(size)
+
+    def trainee_export():
+        report = service.trainee_report(export_format='by_user', stream=True)
+        return service.export_pdf(report, 'trainee_list')
+
+    results = {}
+    _, results['single_table_s'] = timed(legacy_listing_pdf, header, rows(), col_widths, style)
+    _, results['paged_table_s'] = timed(paged_listing_pdf, header, rows(), col_widths, style)
+    results['speedup'] = results['single_table_s'] / results['paged_table_s']
+    results['paged_ms_per_row'] = results['paged_table_s'] / size * 1000
+    _, results['trainee_export_s'] = timed(trainee_export)
+    results['trainee_export_peak_mb'] = peak_memory(trainee_export) / 2**20
+    return results
+
+
+def legacy_event_register(event_id, trainee_id):
+    """Reference check-then-insert registration, as event_register worked before seat reservation."""
+    from core.models import Event, EventRegistration
+
+    event = Event.objects.get(pk=event_id)
+    registered = event.registrations.filter(status='registered')
+    if event.status != 'open' or registered.count() >= event.max_participants:
+        return False
+    if registered.filter(trainee_id=trainee_id).exists():
+        return False
+    EventRegistration.objects.create(event=event, trainee_id=trainee_id, status='registered')
+    return True
+
+
+# Threads registering at once in the registration rush
+RUSH_THREADS = 8
+
+
+def registration_rush(register, trainee_ids, threads=RUSH_THREADS):
+    """
+    Call register(trainee_id) for every trainee from several threads at once.
+    trainee_ids can hold any requests register() accepts.
+
+    Returns:
+        (Counter of 'registered'/'refused'/'errors', elapsed seconds)
+    """
+    import queue
+    import threading
+    from collections import Counter
+    from django.db import DatabaseError, connection
+
+    pending = queue.SimpleQueue()
+    for trainee_id in trainee_ids:
+        pending.put(trainee_id)
+    outcomes = Counter()
+    lock = threading.Lock()
+    start = threading.Barrier(threads + 1)
+
+    def worker():
+        start.wait()
+        try:
+            while True:
+                try:
+                    trainee_id = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    outcome = 'registered' if register(trainee_id) else 'refused'
+                except DatabaseError:
+                    outcome = 'errors'
+                with lock:
+                    outcomes[outcome] += 1
+        finally:
+            connection.close()  # Each thread has its own connection
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return outcomes, time.perf_counter() - began
+
+
+@scenario('registration_rush', rollback=False)
+def registration_rush_benchmark(size, out):
+    """
+    `size` trainees rush for size/2 seats from several threads, with and
+    without seat reservation, then again while the holders of a quarter of
+    the seats withdraw twice each.
+    """
+    from core.models import Event, EventRegistration, Job
+    from core.services.event_registration import EventRegistrationService
+    from core.services.report_cache import ReportCache
+
+    seats = max(size // 2, 1)
+    trainee_ids = [trainee.pk for trainee in create_trainees(size, prefix='rush')]
+    events = []
+    results = {'threads': RUSH_THREADS, 'seats': seats}
+    try:
+        for name, register in (
+            ('legacy', lambda event: lambda trainee_id: legacy_event_register(event.pk, trainee_id)),
+            ('reserved', lambda event: lambda trainee_id: EventRegistrationService.register(
+                event, trainee_id
+            )[0] == EventRegistrationService.REGISTERED),
+        ):
+            event = create_event(seats)
+            events.append(event)
+            outcomes, elapsed = registration_rush(register(event), trainee_ids)
+            event.refresh_from_db()
+            rows = EventRegistration.objects.filter(event=event, status='registered').count()
+            results[f'{name}_per_s'] = size / elapsed
+            results[f'{name}_registered'] = rows
+            results[f'{name}_overbooked'] = max(rows - seats, 0)
+            results[f'{name}_errors'] = outcomes['errors']
+            results[f'{name}_count_matches'] = event.participant_count == rows
+        results['reserved_closed'] = event.status == 'closed'
+
+        # Withdrawals interleaved with registrations, each sent twice as a
+        # double-clicked or retried request would be
+        event = create_event(seats)
+        events.append(event)
+        holders, newcomers = trainee_ids[:seats // 2], trainee_ids[seats // 2:]
+        for trainee_id in holders:
+            EventRegistrationService.register(event, trainee_id)
+        requests = [('unregister', trainee_id) for trainee_id in holders for _ in range(2)]
+        requests += [('register', trainee_id) for trainee_id in newcomers]
+        random.Random(size).shuffle(requests)
+
+        def churn(request):
+            action, trainee_id = request
+            if action == 'unregister':
+                return EventRegistrationService.unregister(event.pk, trainee_id)
+            return EventRegistrationService.register(event, trainee_id)[0] == EventRegistrationService.REGISTERED
+
+        outcomes, elapsed = registration_rush(churn, requests)
+        event.refresh_from_db()
+        rows = EventRegistration.objects.filter(event=event, status='registered').count()
+        withdrawn = EventRegistration.objects.filter(event=event, status='withdrawn').count()
+        results['churn_per_s'] = len(requests) / elapsed
+        results['churn_registered'] = rows
+        results['churn_overbooked'] = max(rows - seats, 0)
+        results['churn_withdrawn_once'] = withdrawn == len(holders)
+        results['churn_errors'] = outcomes['errors']
+        results['churn_count_matches'] = event.participant_count == rows
+        return results
+    finally:
+        with ReportCache.deferred():
+            for event in events:
+                Job.objects.filter(payload__event_id=event.pk).delete()
+                event.delete()
+            User.objects.filter(username__startswith='rush_').delete()
+
+
+def legacy_close_expired_events():
+    """Reference closer: close_registration() and a notification per open event, as the command worked before."""
+    from core.models import Event
+    from core.services.notification_service import NotificationService
+
+    closed = 0
+    for event in Event.objects.filter(status='open'):
+        reason = event.close_registration()
+        if reason:
+            NotificationService.create_event_closed_notification(event, reason)
+            closed += 1
+    return closed
+
+
+@scenario('close_expired_events')
+def close_expired_events_benchmark(size, out):
+    """Close `size` open events (a third past their deadline, a third full) one by one and set-based."""
+    import io
+    from django.core.management import call_command
+    from django.db import transaction
+    from core.models import BroadcastNotification, Event
+
+    today = date.today()
+    Event.objects.bulk_create([
+        Event(
+            name=f'Benchmark Open {i}',
+            event_date=today + timedelta(days=30),
+            location='Main Dojo',
+            registration_deadline=today - timedelta(days=1) if i % 3 == 0 else today + timedelta(days=20),
+            max_participants=10,
+            participant_count=10 if i % 3 == 1 else 5,
+            status='open',
+        )
+        for i in range(size)
+    ])
+    closed_before = Event.objects.filter(status='closed').count()
+
+    savepoint = transaction.savepoint()
+    legacy_closed, legacy = timed(legacy_close_expired_events)
+    transaction.savepoint_rollback(savepoint)
+
+    broadcasts = BroadcastNotification.objects.count()
+    _, set_based = timed(call_command, 'close_expired_events', verbosity=0, stdout=io.StringIO())
+    set_based_closed = Event.objects.filter(status='closed').count() - closed_before
+
+    return {
+        'closed_events': set_based_closed,
+        'one_by_one_s': legacy,
+        'set_based_s': set_based,
+        'speedup': legacy / set_based if set_based else None,
+        'same_closed': legacy_closed == set_based_closed,
+        'notifications': BroadcastNotification.objects.count() - broadcasts,
+    }
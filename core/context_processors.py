@@ -1,26 +1,29 @@
 """
 Context processors for adding global context to templates.
 """
-from core.models import Notification
+from django.utils.functional import SimpleLazyObject
+
+from core.services.notification_service import NotificationService
 
 
 def notifications(request):
     """
     Context processor to add notifications to template context.
     Available as 'notifications' in all templates.
+    
+    The values are lazy: the user's cached notification summary is only
+    loaded when a template actually uses them.
     """
     if request.user.is_authenticated:
-        user_notifications = Notification.objects.filter(recipient=request.user).order_by('-created_at')
-        unread_count = user_notifications.filter(is_read=False).count()
+        user = request.user
+        summary = SimpleLazyObject(lambda: NotificationService.get_notification_summary(user))
         
         return {
-            'notifications': user_notifications[:10],  # Last 10 notifications
-            'unread_notifications_count': unread_count,
-            'all_notifications': user_notifications,
+            'notifications': SimpleLazyObject(lambda: summary['latest']),  # Last 10 notifications
+            'unread_notifications_count': SimpleLazyObject(lambda: summary['unread_count']),
         }
     
     return {
         'notifications': [],
         'unread_notifications_count': 0,
-        'all_notifications': [],
     }
@@ -0,0 +1,515 @@
+"""
+Synthetic datasets for the BlackCobra Karate Club System.
+
+DatasetGenerator fills the database with a club of a given size: users,
+profiles, trainees and judges, events with registrations, matches, judge
+assignments and results, points, payments, training sessions and
+attendance. Attributes follow realistic distributions (recent joiners
+outnumber veterans, belts follow tenure, most payments are completed) and
+are drawn from a seeded random generator, so the same size and seed always
+produce the same club.
+
+Everything is written with bulk_create in batches, which skips model
+save() methods and signals, so derived fields are filled in here and the
+report cache is invalidated at the end. Generate a dataset once with
+
+    python manage.py generate_dataset --trainees 50000
+
+and run benchmarks against it; their own data is rolled back afterwards.
+"""
+import random
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time as clock, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    Attendance, Event, EventRegistration, Judge, Match, MatchJudge, MatchResult,
+    Payment, PointsLedgerEntry, Trainee, TraineePoints, TrainingSession, UserProfile,
+)
+from core.services.report_cache import ReportCache
+
+
+# Written to the description of generated events and sessions, so they can be cleared
+DATASET_MARKER = 'Generated dataset'
+
+FIRST_NAMES = [
+    'Aiko', 'Ben', 'Carla', 'Daniel', 'Elena', 'Felix', 'Grace', 'Hiro', 'Isabel',
+    'Jonas', 'Kira', 'Liam', 'Maya', 'Noah', 'Olivia', 'Paolo', 'Quinn', 'Rosa',
+    'Sam', 'Tara', 'Umar', 'Vera', 'Wei', 'Ximena', 'Yuki', 'Zane',
+]
+LAST_NAMES = [
+    'Alvarez', 'Brooks', 'Cruz', 'Dumas', 'Evans', 'Fujita', 'Garcia', 'Hansen',
+    'Ito', 'Jensen', 'Kim', 'Lopez', 'Mendoza', 'Nakamura', 'Okafor', 'Perez',
+    'Reyes', 'Santos', 'Tanaka', 'Umali', 'Villanueva', 'Walker', 'Yamada', 'Zamora',
+]
+EVENT_NAMES = [
+    'Club Championship', 'Spring Open', 'Summer Invitational', 'Autumn Cup',
+    'Regional Tournament', 'Belt Promotion Day', 'Junior Open', 'Kumite Challenge',
+]
+SESSION_TITLES = {
+    'regular': 'Regular Training',
+    'special': 'Kumite Drills',
+    'exam': 'Belt Examination',
+    'seminar': 'Kata Seminar',
+    'workshop': 'Self-Defense Workshop',
+}
+
+# (value, weight) pairs
+TRAINEE_STATUSES = [('active', 88), ('inactive', 10), ('suspended', 2)]
+CERTIFICATION_LEVELS = [('regional', 60), ('national', 30), ('international', 10)]
+REGISTRATION_STATUSES = [('registered', 90), ('withdrawn', 7), ('cancelled', 3)]
+MATCH_TYPES = [('sparring', 60), ('penan', 15), ('judo', 15), ('breaking', 10)]
+SESSION_TYPES = [('regular', 80), ('special', 8), ('exam', 4), ('seminar', 4), ('workshop', 4)]
+ATTENDANCE_STATUSES = [('present', 75), ('late', 10), ('absent', 10), ('excused', 5)]
+PAYMENT_METHODS = [('cash', 40), ('bank_transfer', 30), ('card', 25), ('check', 3), ('other', 2)]
+# Membership fees that are due, by how they ended up
+SETTLED_STATUSES = [('completed', 92), ('overdue', 5), ('cancelled', 3)]
+
+MEMBERSHIP_FEE = Decimal('1500.00')
+EVENT_FEE = Decimal('500.00')
+JUDGES_PER_MATCH = 3
+
+# Dataset shape, relative to the number of trainees
+TRAINEES_PER_JUDGE = 200
+TRAINEES_PER_EVENT = 500
+TRAINEES_PER_SESSION = 50
+YEARS_OF_HISTORY = 6
+
+
+def _pick(rng, weighted):
+    """Pick a value from (value, weight) pairs."""
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+class DatasetGenerator:
+    """
+    Generates a club of a given number of trainees.
+
+    Usernames are "<prefix>_<n>" (judges "<prefix>_judge_<n>"), so several
+    datasets can live side by side and each can be cleared on its own.
+    """
+
+    def __init__(self, trainees, seed=0, prefix='data', batch_size=2000, today=None):
+        self.trainee_count = trainees
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.today = today or date.today()
+        self.counts = {}
+        self._moments = {}  # (day, hour, minute) -> aware datetime
+
+    def exists(self):
+        """Whether a dataset with this prefix is already in the database."""
+        return User.objects.filter(username__startswith=f'{self.prefix}_').exists()
+
+    def clear(self):
+        """Delete the dataset with this prefix, with everything that hangs off it."""
+        with ReportCache.deferred(), transaction.atomic():
+            Event.objects.filter(description=self._marker()).delete()
+            TrainingSession.objects.filter(description=self._marker()).delete()
+            User.objects.filter(username__startswith=f'{self.prefix}_').delete()
+
+    def generate(self, log=None):
+        """
+        Create the whole dataset in one transaction.
+
+        Args:
+            log: Optional callable given a progress line after each step
+
+        Returns:
+            Dict of model name -> rows created
+        """
+        steps = [
+            ('trainees', self.create_trainees),
+            ('judges', self.create_judges),
+            ('events', self.create_events),
+            ('matches', self.create_matches),
+            ('points', self.create_points),
+            ('payments', self.create_payments),
+            ('sessions', self.create_sessions),
+        ]
+        with transaction.atomic():
+            for name, step in steps:
+                start = time.perf_counter()
+                step()
+                if log:
+                    log(f'{name:10} {time.perf_counter() - start:7.2f}s')
+
+        for model in (User, Trainee, Event, EventRegistration, Match, Payment):
+            ReportCache.invalidate(model)
+        return self.counts
+
+    def _marker(self):
+        return f'{DATASET_MARKER} ({self.prefix})'
+
+    def _bulk_create(self, model, objects, keep=True):
+        """
+        Bulk-create objects from an iterable in batches and count them.
+
+        Returns:
+            The created objects, or only their primary keys if keep is false
+        """
+        created = []
+
+        def flush(batch):
+            batch = model.objects.bulk_create(batch)
+            created.extend(batch if keep else (obj.pk for obj in batch))
+
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _backdate(self, model, field, pks_by_value):
+        """
+        Set an auto_now_add field, which bulk_create always fills with the
+        current time, to the generated values: one update per value.
+        """
+        for value, pks in pks_by_value.items():
+            for start in range(0, len(pks), self.batch_size):
+                model.objects.filter(pk__in=pks[start:start + self.batch_size]).update(**{field: value})
+
+    def _moment(self, day, hour=10, minute=0):
+        """An aware datetime on the given day."""
+        key = (day, hour, minute)
+        if key not in self._moments:
+            self._moments[key] = timezone.make_aware(datetime.combine(day, clock(hour, minute)))
+        return self._moments[key]
+
+    def _users(self, count, username, role):
+        """Bulk-create users and their profiles; return the profiles."""
+        rng = self.rng
+        users = self._bulk_create(User, (
+            User(
+                username=username.format(i),
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                email=f'{username.format(i)}@example.com',
+                password='!',  # Unusable password
+            )
+            for i in range(count)
+        ))
+        return self._bulk_create(UserProfile, (
+            UserProfile(user=user, role=role, date_of_birth=self._date_of_birth(role))
+            for user in users
+        ))
+
+    def _date_of_birth(self, role):
+        if role == 'trainee' and self.rng.random() < 0.6:
+            age_days = self.rng.randint(6 * 365, 17 * 365)  # Juniors
+        else:
+            age_days = self.rng.randint(18 * 365, 55 * 365)
+        return self.today - timedelta(days=age_days)
+
+    def create_trainees(self):
+        """Trainees whose belt follows their tenure and whose weight follows their age."""
+        rng = self.rng
+        belts = [belt for belt, _ in Trainee.BELT_CHOICES]
+        profiles = self._users(self.trainee_count, f'{self.prefix}_{{}}', 'trainee')
+
+        trainees = []
+        joined_dates = []
+        for profile in profiles:
+            # Recent joiners outnumber veterans
+            tenure_days = int(rng.triangular(0, YEARS_OF_HISTORY * 365, 0))
+            belt = min(len(belts) - 1, int(tenure_days / 365 * rng.uniform(0.3, 0.9)))
+            if (self.today - profile.date_of_birth).days < 18 * 365:
+                weight = rng.gauss(45, 10)
+            else:
+                weight = rng.gauss(72, 12)
+            trainee = Trainee(
+                profile=profile,
+                belt_rank=belts[belt],
+                weight=Decimal(f'{min(max(weight, 25), 140):.2f}'),
+                emergency_contact=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                emergency_phone=f'09{rng.randint(0, 999999999):09d}',
+                status=_pick(rng, TRAINEE_STATUSES),
+                archived=rng.random() < 0.02,
+            )
+            trainee.weight_class = trainee.calculate_weight_class()
+            trainees.append(trainee)
+            joined_dates.append(self.today - timedelta(days=tenure_days))
+
+        self.trainees = self._bulk_create(Trainee, trainees)
+        joined = defaultdict(list)
+        for trainee, joined_date in zip(self.trainees, joined_dates):
+            trainee.joined_date = joined_date
+            joined[joined_date].append(trainee.pk)
+        self._backdate(Trainee, 'joined_date', joined)
+
+        # Trainees who can register and attend, by join date
+        members = sorted(
+            (t.joined_date, t.pk) for t in self.trainees if t.status == 'active' and not t.archived
+        )
+        self.member_joined = [joined_date for joined_date, _ in members]
+        self.member_pks = [pk for _, pk in members]
+
+    def _members_by(self, day, count):
+        """A random sample of up to count members who had joined by the given day."""
+        eligible = bisect_right(self.member_joined, day)
+        return [self.member_pks[i] for i in self.rng.sample(range(eligible), min(count, eligible))]
+
+    def create_judges(self):
+        rng = self.rng
+        count = max(JUDGES_PER_MATCH, self.trainee_count // TRAINEES_PER_JUDGE)
+        profiles = self._users(count, f'{self.prefix}_judge_{{}}', 'judge')
+        self.judges = self._bulk_create(Judge, (
+            Judge(
+                profile=profile,
+                certification_level=_pick(rng, CERTIFICATION_LEVELS),
+                certification_date=self.today - timedelta(days=rng.randint(30, 10 * 365)),
+                is_active=rng.random() < 0.9,
+            )
+            for profile in profiles
+        ))
+
+    def create_events(self):
+        """
+        Events spread over the last two years and the next three months,
+        with registrations from trainees who had joined by the deadline.
+        """
+        rng = self.rng
+        count = max(1, self.trainee_count // TRAINEES_PER_EVENT)
+        first_day = self.today - timedelta(days=730)
+        spacing = 820 / count
+
+        events = []
+        for i in range(count):
+            event_date = first_day + timedelta(days=int(i * spacing) + rng.randint(0, 6))
+            if event_date < self.today:
+                status = 'cancelled' if rng.random() < 0.05 else 'completed'
+            else:
+                status = 'draft' if rng.random() < 0.2 else 'open'
+            events.append(Event(
+                name=f'{rng.choice(EVENT_NAMES)} {event_date.year}',
+                event_date=event_date,
+                location=rng.choice(['Main Dojo', 'City Sports Center', 'University Gym']),
+                description=self._marker(),
+                registration_deadline=event_date - timedelta(days=14),
+                max_participants=128,
+                status=status,
+            ))
+        self.events = self._bulk_create(Event, events)
+
+        self.registrations = defaultdict(list)  # Event pk -> registered trainee pks
+        registrations = []
+        registered_at = defaultdict(list)
+        for event in self.events:
+            if event.status == 'draft':
+                continue
+            wanted = rng.randint(16, event.max_participants)
+            if event.status == 'open':
+                wanted //= 2  # Registration still running
+            for pk in self._members_by(event.registration_deadline, wanted):
+                status = _pick(rng, REGISTRATION_STATUSES)
+                registrations.append(EventRegistration(event=event, trainee_id=pk, status=status))
+                if status == 'registered':
+                    self.registrations[event.pk].append(pk)
+
+        for registration in self._bulk_create(EventRegistration, registrations):
+            day = registration.event.registration_deadline - timedelta(days=rng.randint(0, 30))
+            registered_at[self._moment(min(day, self.today))].append(registration.pk)
+        self._backdate(EventRegistration, 'registered_at', registered_at)
+        Event.reconcile_participant_counts(Event.objects.filter(pk__in=[event.pk for event in self.events]))
+
+    def create_matches(self):
+        """
+        Bouts between the registered trainees of completed events, each
+        scored by several judges, with a points ledger entry per competitor.
+        """
+        rng = self.rng
+        active_judges = [judge for judge in self.judges if judge.is_active] or self.judges
+
+        matches = []
+        for event in self.events:
+            if event.status != 'completed':
+                continue
+            competitors = list(self.registrations[event.pk])
+            rng.shuffle(competitors)
+            for bout, start in enumerate(range(0, len(competitors) - 1, 2)):
+                c1, c2 = competitors[start], competitors[start + 1]
+                matches.append(Match(
+                    event=event,
+                    competitor1_id=c1,
+                    competitor2_id=c2,
+                    winner_id=rng.choice((c1, c2)),
+                    scheduled_time=self._moment(event.event_date, 9 + bout // 6, bout % 6 * 10),
+                    status='completed',
+                    match_type=_pick(rng, MATCH_TYPES),
+                    is_promotion_match=rng.random() < 0.05,
+                ))
+        self.matches = self._bulk_create(Match, matches)
+
+        assignments, results, ledger = [], [], []
+        for match in self.matches:
+            loser = match.competitor2_id if match.winner_id == match.competitor1_id else match.competitor1_id
+            for judge in rng.sample(active_judges, min(JUDGES_PER_MATCH, len(active_judges))):
+                assignments.append(MatchJudge(match=match, judge=judge))
+                results.append(self._result(match, judge, loser))
+            when = match.scheduled_time
+            ledger.append(PointsLedgerEntry(trainee_id=match.winner_id, points=30, reason='win', created_at=when))
+            ledger.append(PointsLedgerEntry(trainee_id=loser, points=10, reason='loss', created_at=when))
+
+        self._bulk_create(MatchJudge, assignments)
+        self._bulk_create(MatchResult, results)
+        self._bulk_create(PointsLedgerEntry, ledger, keep=False)
+
+    def _result(self, match, judge, loser):
+        """One judge's score sheet; judges occasionally disagree with the decision."""
+        rng = self.rng
+        winner = match.winner_id if rng.random() < 0.9 else loser
+        high = rng.randint(5, 10)
+        low = rng.randint(0, high - 1)
+        c1_won = winner == match.competitor1_id
+        result = MatchResult(
+            match=match,
+            judge=judge,
+            winner_id=winner,
+            competitor1_score=high if c1_won else low,
+            competitor2_score=low if c1_won else high,
+        )
+        if match.is_promotion_match:
+            for side in ('c1', 'c2'):
+                for kind in ('sparring', 'penan', 'judo', 'breaking'):
+                    setattr(result, f'{side}_{kind}_score', rng.randint(0, 10))
+        return result
+
+    def create_points(self):
+        """Points totals that agree with the generated matches."""
+        wins, losses, events = defaultdict(int), defaultdict(int), defaultdict(int)
+        for match in self.matches:
+            loser = match.competitor2_id if match.winner_id == match.competitor1_id else match.competitor1_id
+            wins[match.winner_id] += 1
+            losses[loser] += 1
+        for event in self.events:
+            if event.status == 'completed':
+                for pk in self.registrations[event.pk]:
+                    events[pk] += 1
+
+        self._bulk_create(TraineePoints, (
+            TraineePoints(
+                trainee=trainee,
+                total_points=30 * wins[trainee.pk] + 10 * losses[trainee.pk],
+                wins=wins[trainee.pk],
+                losses=losses[trainee.pk],
+                events_participated=events[trainee.pk],
+            )
+            for trainee in self.trainees
+        ))
+
+    def create_payments(self):
+        """
+        Monthly membership fees for up to the last year of membership, event
+        fees for registrations and the odd equipment purchase.
+        """
+        rng = self.rng
+        this_month = self.today.replace(day=1)
+        months = []
+        month = this_month
+        for _ in range(12):
+            months.append(month)
+            month = (month - timedelta(days=1)).replace(day=1)
+
+        paid_on = []  # Payment date of each generated payment, in order
+
+        def payments():
+            for trainee in self.trainees:
+                for month in months:
+                    if month < trainee.joined_date.replace(day=1):
+                        break
+                    if month == this_month:
+                        status = 'completed' if rng.random() < 0.4 else 'pending'
+                    else:
+                        status = _pick(rng, SETTLED_STATUSES)
+                    yield self._payment(paid_on, trainee.pk, MEMBERSHIP_FEE, 'membership', status,
+                                        month + timedelta(days=rng.randint(0, 9)))
+                if rng.random() < 0.1:
+                    day = self.today - timedelta(days=rng.randint(0, 365))
+                    amount = Decimal(rng.randrange(50000, 500000, 2500)) / 100
+                    yield self._payment(paid_on, trainee.pk, amount, 'equipment', 'completed',
+                                        max(day, trainee.joined_date))
+            for event in self.events:
+                deadline = min(event.registration_deadline, self.today)
+                for pk in self.registrations[event.pk]:
+                    yield self._payment(paid_on, pk, EVENT_FEE, 'event', 'completed',
+                                        deadline - timedelta(days=rng.randint(0, 14)))
+
+        pks = self._bulk_create(Payment, payments(), keep=False)
+        paid = defaultdict(list)
+        for pk, payment_date in zip(pks, paid_on):
+            paid[payment_date].append(pk)
+        self._backdate(Payment, 'payment_date', paid)
+
+    def _payment(self, paid_on, trainee_pk, amount, payment_type, status, day):
+        """An unsaved payment; its payment date is appended to paid_on."""
+        paid_on.append(self._moment(day))
+        payment = Payment(
+            trainee_id=trainee_pk,
+            amount=amount,
+            payment_type=payment_type,
+            payment_method=_pick(self.rng, PAYMENT_METHODS),
+            status=status,
+        )
+        if status == 'completed':
+            payment.completed_at = self._moment(day, self.rng.randint(9, 19))
+        return payment
+
+    def create_sessions(self):
+        """Training sessions over the last year, each attended by a sample of active trainees."""
+        rng = self.rng
+        count = max(1, self.trainee_count // TRAINEES_PER_SESSION)
+        spacing = 365 / count
+
+        sessions = []
+        for i in range(count):
+            day = self.today - timedelta(days=365 - int(i * spacing))
+            session_type = _pick(rng, SESSION_TYPES)
+            start = clock(10) if day.weekday() >= 5 else clock(18)
+            sessions.append(TrainingSession(
+                title=SESSION_TITLES[session_type],
+                session_type=session_type,
+                date=day,
+                start_time=start,
+                end_time=clock(start.hour + 1, 30),
+                location='Main Dojo',
+                instructor=f'Sensei {rng.choice(LAST_NAMES)}',
+                description=self._marker(),
+                max_capacity=80,
+                status='completed' if day < self.today else 'scheduled',
+            ))
+        self.sessions = self._bulk_create(TrainingSession, sessions)
+
+        def attendance():
+            for session in self.sessions:
+                if session.status != 'completed':
+                    continue
+                wanted = rng.randint(20, session.max_capacity)
+                for pk in self._members_by(session.date, wanted):
+                    status = _pick(rng, ATTENDANCE_STATUSES)
+                    check_in = None
+                    if status == 'present':
+                        check_in = clock(session.start_time.hour - 1, rng.randint(40, 59))
+                    elif status == 'late':
+                        check_in = clock(session.start_time.hour, rng.randint(5, 40))
+                    yield Attendance(
+                        trainee_id=pk,
+                        session=session,
+                        date=session.date,
+                        status=status,
+                        check_in_time=check_in,
+                    )
+
+        self._bulk_create(Attendance, attendance(), keep=False)
@@ -0,0 +1,46 @@
+"""
+Management command to run performance benchmarks.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.benchmarks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = 'Run a performance benchmark scenario against throwaway data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenario',
+            choices=sorted(SCENARIOS),
+            help='Benchmark scenario to run',
+        )
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[1000],
+            help='Dataset sizes to run the scenario with',
+        )
+
+    def handle(self, *args, **options):
+        name = options['scenario']
+        benchmark = SCENARIOS[name]
+
+        self.stdout.write(self.style.WARNING(f'=== BENCHMARK: {name} ===\n'))
+        for size in options['sizes']:
+            if benchmark.rollback:
+                # Roll back everything the scenario created
+                with transaction.atomic():
+                    results = benchmark(size, self.stdout)
+                    transaction.set_rollback(True)
+            else:
+                results = benchmark(size, self.stdout)
+
+            self.stdout.write(self.style.SUCCESS(f'size={size}'))
+            for key, value in results.items():
+                if isinstance(value, float):
+                    value = f'{value:.4f}'
+                self.stdout.write(f'  {key:24}: {value}')
+        self.stdout.write('')
@@ -1,52 +1,80 @@
+import time
+import traceback
+
 from django.core.management.base import BaseCommand
-from datetime import date
 from core.models import Event
 from core.services.notification_service import NotificationService
+from core.services.report_cache import ReportCache
 
 
 class Command(BaseCommand):
     help = 'Close events with expired registration deadlines'
 
+    # Line printed for each event closed for a reason
+    CLOSED_MESSAGES = {
+        'registration_deadline_passed': 'Closed "{event.name}" - Registration deadline ({event.registration_deadline}) passed',
+        'max_participants_reached': 'Closed "{event.name}" - Maximum participants ({event.max_participants}) reached',
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, closing due events every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds between runs with --loop (default: 60)',
+        )
+
     def handle(self, *args, **options):
         """
-        Check all open events and close those that have:
+        Close all open events that have:
         1. Passed registration deadline
         2. Reached maximum participants
         """
-        today = date.today()
-        
-        # Get all open events
-        open_events = Event.objects.filter(status='open')
-        
+        if not options['loop']:
+            self.close_due_events(options['verbosity'])
+            return
+
+        self.stdout.write(f'Closing due events every {options["interval"]:g}s')
+        try:
+            while True:
+                try:
+                    self.close_due_events(options['verbosity'])
+                except Exception:
+                    # e.g. "database is locked"; the next pass retries the same events
+                    self.stderr.write(f'Closing due events failed:\n{traceback.format_exc()}')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
+
+    def close_due_events(self, verbosity=1):
+        """Close due events with set-based updates, then announce them per reason."""
+        start = time.perf_counter()
+        closed = Event.close_due_registrations()
+
         closed_count = 0
-        for event in open_events:
-            reason = event.close_registration()
-            
-            if reason == 'registration_deadline_passed':
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Closed "{event.name}" - Registration deadline ({event.registration_deadline}) passed'
-                    )
-                )
-                # Create notification about deadline closure
-                NotificationService.create_event_closed_notification(event, 'registration_deadline_passed')
-                closed_count += 1
-            
-            elif reason == 'max_participants_reached':
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Closed "{event.name}" - Maximum participants ({event.max_participants}) reached'
-                    )
-                )
-                # Create notification about max participants closure
-                NotificationService.create_event_closed_notification(event, 'max_participants_reached')
-                closed_count += 1
-        
+        for reason, event_ids in closed.items():
+            if not event_ids:
+                continue
+            events = list(Event.objects.filter(pk__in=event_ids))
+            NotificationService.create_event_closed_notifications(events, reason)
+            closed_count += len(events)
+            if verbosity >= 1:
+                for event in events:
+                    self.stdout.write(self.style.SUCCESS(self.CLOSED_MESSAGES[reason].format(event=event)))
+
+        elapsed = time.perf_counter() - start
         if closed_count == 0:
             self.stdout.write(
                 self.style.WARNING('No events needed to be closed')
             )
         else:
+            # Statuses changed with update(), which sends no signals
+            ReportCache.invalidate(Event)
             self.stdout.write(
-                self.style.SUCCESS(f'\nSuccessfully closed {closed_count} event(s)')
+                self.style.SUCCESS(f'\nSuccessfully closed {closed_count} event(s) in {elapsed:.2f}s')
             )
@@ -3,9 +3,8 @@ Management command to fix weight classes for all trainees and analyze matchmakin
 """
 from django.core.management.base import BaseCommand
 from django.db.models import Q
-from decimal import Decimal
 from core.models import Trainee, Event, EventRegistration, Match
-from core.services.matchmaking import MatchmakingService, are_belts_adjacent
+from core.services.matchmaking import MatchmakingService
 
 
 class Command(BaseCommand):
@@ -95,7 +94,7 @@ class Command(BaseCommand):
             registrations = EventRegistration.objects.filter(
                 event=event,
                 status='registered'
-            ).select_related('trainee__profile')
+            ).select_related('trainee__profile__user')
             
             trainees = [reg.trainee for reg in registrations]
             self.stdout.write(f'   Registered: {len(trainees)} trainees')
@@ -155,37 +154,13 @@ class Command(BaseCommand):
         """Analyze what pairings are valid based on constraints."""
         self.stdout.write('\n   🔍 Constraint Analysis:')
         
-        constraints = {
-            'weight_adjacent': [],
-            'belt_adjacent': [],
-            'age_valid': [],
-            'all_constraints': []
-        }
-
-        for i, t1 in enumerate(trainees):
-            for t2 in trainees[i+1:]:
-                weight_diff = abs(t1.weight - t2.weight)
-                belt_adj = are_belts_adjacent(t1.belt_rank, t2.belt_rank)
-                age1 = t1.age or 0
-                age2 = t2.age or 0
-                age_valid = abs(age1 - age2) <= 3
-
-                if weight_diff <= Decimal('5.0'):
-                    constraints['weight_adjacent'].append((t1, t2, weight_diff))
-                
-                if belt_adj:
-                    constraints['belt_adjacent'].append((t1, t2))
-                
-                if age_valid:
-                    constraints['age_valid'].append((t1, t2))
-                
-                if service._is_valid_pairing(t1, t2):
-                    constraints['all_constraints'].append((t1, t2))
-
-        self.stdout.write(f'      Weight within 5kg: {len(constraints["weight_adjacent"])}/{self._total_pairs(trainees)} pairs')
-        self.stdout.write(f'      Belt same/adjacent: {len(constraints["belt_adjacent"])}/{self._total_pairs(trainees)} pairs')
-        self.stdout.write(f'      Age within 3 years: {len(constraints["age_valid"])}/{self._total_pairs(trainees)} pairs')
-        self.stdout.write(f'      ALL constraints met: {len(constraints["all_constraints"])}/{self._total_pairs(trainees)} pairs ✓')
+        counts = service.build_snapshot(trainees).constraint_counts()
+        total = counts['total']
+
+        self.stdout.write(f'      Weight within 5kg: {counts["weight"]}/{total} pairs')
+        self.stdout.write(f'      Belt same/adjacent: {counts["belt"]}/{total} pairs')
+        self.stdout.write(f'      Age within 3 years: {counts["age"]}/{total} pairs')
+        self.stdout.write(f'      ALL constraints met: {counts["valid"]}/{total} pairs ✓')
 
     def generate_proposed_matches(self, event, service):
         """Generate proposed matches using the matchmaking service."""
@@ -208,8 +183,3 @@ class Command(BaseCommand):
                 )
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'      Error generating matches: {e}'))
-
-    def _total_pairs(self, trainees):
-        """Calculate total possible pairings."""
-        n = len(trainees)
-        return (n * (n - 1)) // 2
@@ -0,0 +1,69 @@
+"""
+Management command that fills the database with a synthetic club for benchmarks.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.datasets import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create a seeded synthetic dataset of trainees, judges, events, payments and sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trainees',
+            type=int,
+            default=1000,
+            help='Number of trainees; judges, events and sessions scale with it',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same size and seed give the same dataset',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='data',
+            help='Username prefix identifying the dataset',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per bulk insert',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete an existing dataset with the same prefix first',
+        )
+
+    def handle(self, *args, **options):
+        if options['trainees'] < 1:
+            raise CommandError('--trainees must be at least 1')
+
+        generator = DatasetGenerator(
+            options['trainees'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+        )
+        if generator.exists():
+            if not options['clear']:
+                raise CommandError(
+                    f'A dataset with prefix "{options["prefix"]}" already exists; '
+                    'use --clear to replace it or --prefix to add another'
+                )
+            self.stdout.write(f'Clearing dataset "{options["prefix"]}"...')
+            generator.clear()
+
+        start = time.perf_counter()
+        counts = generator.generate(log=self.stdout.write)
+        elapsed = time.perf_counter() - start
+
+        for model, count in counts.items():
+            self.stdout.write(f'  {model:20}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Dataset generated in {elapsed:.1f}s'))
@@ -0,0 +1,24 @@
+"""
+Management command that deletes old finished and failed PDF exports and their files.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.services.report_exports import ReportExportService
+
+
+class Command(BaseCommand):
+    help = 'Delete finished and failed exports, and their files under MEDIA_ROOT/exports, past their retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=ReportExportService.RETENTION.days,
+            help=f'Keep exports that finished within this many days (default: {ReportExportService.RETENTION.days})',
+        )
+
+    def handle(self, *args, **options):
+        deleted = ReportExportService.purge(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} export(s)'))
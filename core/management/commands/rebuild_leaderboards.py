@@ -0,0 +1,20 @@
+"""
+Management command that re-ranks every trainee on the current leaderboards.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.leaderboard_service import LeaderboardService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the all-time, yearly and monthly leaderboards from trainee points'
+
+    def handle(self, *args, **options):
+        # Points awards re-rank their trainees as they happen; a rebuild also
+        # adds active trainees who have no points record yet
+        start = time.perf_counter()
+        LeaderboardService.update_all_leaderboards()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'Leaderboards rebuilt in {elapsed:.2f}s'))
@@ -0,0 +1,32 @@
+"""
+Management command that recounts event participants and fixes stored counts that drifted.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import Event
+from core.services.report_cache import ReportCache
+
+
+class Command(BaseCommand):
+    help = 'Recount registered participants and correct stored event participant counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            type=int,
+            nargs='+',
+            dest='event_ids',
+            help='Only reconcile the events with these IDs',
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+
+        corrected = Event.reconcile_participant_counts(events)
+        if corrected:
+            ReportCache.invalidate(Event)
+            self.stdout.write(self.style.WARNING(f'Corrected {corrected} event participant count(s)'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All event participant counts are correct'))
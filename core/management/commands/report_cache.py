@@ -0,0 +1,37 @@
+"""
+Management command that shows or resets the report cache counters.
+"""
+from django.core.management.base import BaseCommand
+
+from core.services.report_cache import ReportCache
+
+
+class Command(BaseCommand):
+    help = 'Print report cache hit/miss counts, or reset or clear the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset-stats',
+            action='store_true',
+            help='Reset the hit and miss counters after printing them',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Drop every cached report',
+        )
+
+    def handle(self, *args, **options):
+        stats = ReportCache.stats()
+        self.stdout.write(f'Hits     : {stats["hits"]}')
+        self.stdout.write(f'Misses   : {stats["misses"]}')
+        self.stdout.write(f'Hit rate : {stats["hit_rate"]:.1%}')
+
+        if options['reset_stats']:
+            ReportCache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
+
+        if options['clear']:
+            for report_type in ReportCache.DEPENDENCIES:
+                ReportCache.invalidate_report(report_type)
+            self.stdout.write(self.style.SUCCESS('Cached reports dropped'))
@@ -0,0 +1,79 @@
+"""
+Management command that runs queued background jobs.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.job_queue import JobQueue
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (notifications, registration capacity checks)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due now, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Jobs to claim at a time (default: 10)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls when the queue is empty (default: 1)',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print job counts and the current queue lag, then exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.print_stats()
+            return
+
+        worker_id = JobQueue.worker_id()
+        self.stdout.write(f'Worker {worker_id} started')
+
+        try:
+            while True:
+                jobs = JobQueue.claim(worker_id, limit=options['batch_size'])
+                for job in jobs:
+                    self.run_job(job)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Worker stopped')
+
+    def run_job(self, job):
+        """Run one claimed job and report its outcome and lag."""
+        lag = job.lag.total_seconds()
+        if JobQueue.run(job):
+            self.stdout.write(self.style.SUCCESS(
+                f'{job.task} #{job.pk} succeeded (lag {lag:.2f}s)'
+            ))
+        elif job.attempts >= job.max_attempts:
+            self.stdout.write(self.style.ERROR(
+                f'{job.task} #{job.pk} failed after {job.attempts} attempts (lag {lag:.2f}s)'
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'{job.task} #{job.pk} failed, attempt {job.attempts}/{job.max_attempts}; will retry (lag {lag:.2f}s)'
+            ))
+
+    def print_stats(self):
+        """Print job counts by status and the current queue lag."""
+        stats = JobQueue.stats()
+        for status, count in stats['counts'].items():
+            self.stdout.write(f'{status:10}: {count}')
+        self.stdout.write(f'Queue lag : {stats["lag_s"]:.2f}s')
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_opening_balances(apps, schema_editor):
+    """
+    Seed the ledger with each trainee's current total as an opening balance,
+    so the ledger accounts for points earned before it existed.
+    """
+    TraineePoints = apps.get_model("core", "TraineePoints")
+    PointsLedgerEntry = apps.get_model("core", "PointsLedgerEntry")
+
+    PointsLedgerEntry.objects.bulk_create(
+        [
+            PointsLedgerEntry(
+                trainee_id=tp.trainee_id,
+                points=tp.total_points,
+                reason="opening_balance",
+                created_at=tp.updated_at,
+            )
+            for tp in TraineePoints.objects.exclude(total_points=0).iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_alter_matchresult_match_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField()),
+                ('reason', models.CharField(choices=[('win', 'Match Win'), ('loss', 'Match Loss'), ('achievement', 'Achievement'), ('evaluation', 'Evaluation'), ('adjustment', 'Adjustment'), ('belt_sync', 'Belt Rank Sync'), ('opening_balance', 'Opening Balance')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('trainee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_ledger', to='core.trainee')),
+            ],
+            options={
+                'verbose_name_plural': 'Points ledger entries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at', 'trainee'], name='core_points_created_ad900f_idx'), models.Index(fields=['trainee', '-created_at'], name='core_points_trainee_063c9d_idx')],
+            },
+        ),
+        migrations.RunPython(create_opening_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,193 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:26
+
+import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Event announcements were fanned out as one Notification per active trainee
+BROADCAST_TYPES = ["event_created", "event_updated"]
+
+# Rows of one fan-out were created within moments of each other
+FAN_OUT_WINDOW = datetime.timedelta(seconds=60)
+
+
+def _fan_outs(rows):
+    """
+    Group per-recipient rows, ordered by announcement and creation time, into
+    fan-outs: consecutive rows of the same announcement, created within
+    FAN_OUT_WINDOW of each other, each sent to a different recipient.
+    """
+    fan_out = []
+    recipients = set()  # Recipients of the current fan-out
+    for row in rows:
+        if fan_out:
+            last = fan_out[-1]
+            same_announcement = all(
+                row[field] == last[field]
+                for field in ("notification_type", "title", "message", "event_id")
+            )
+            if (
+                not same_announcement
+                or row["created_at"] - last["created_at"] > FAN_OUT_WINDOW
+                or row["recipient_id"] in recipients
+            ):
+                yield fan_out
+                fan_out = []
+                recipients = set()
+        fan_out.append(row)
+        recipients.add(row["recipient_id"])
+    if fan_out:
+        yield fan_out
+
+
+def collapse_event_notifications(apps, schema_editor):
+    """
+    Replace per-recipient event notifications with one broadcast per fan-out,
+    keeping read state as read markers.
+
+    A broadcast is shown to every active trainee who had joined when it was
+    sent, including trainees the original fan-out missed. Those trainees get
+    a read marker, so old announcements do not turn up as unread for them.
+    """
+    Notification = apps.get_model("core", "Notification")
+    BroadcastNotification = apps.get_model("core", "BroadcastNotification")
+    BroadcastReadMarker = apps.get_model("core", "BroadcastReadMarker")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    audience = list(
+        User.objects.filter(
+            profile__role="trainee", profile__trainee__status="active"
+        ).values_list("id", "date_joined")
+    )
+
+    rows = (
+        Notification.objects.filter(
+            notification_type__in=BROADCAST_TYPES,
+            event__isnull=False,
+            trainee__isnull=True,
+        )
+        .order_by("notification_type", "event_id", "title", "message", "created_at", "id")
+        .values(
+            "id", "notification_type", "title", "message", "event_id",
+            "recipient_id", "is_read", "read_at", "created_at",
+        )
+    )
+
+    for fan_out in _fan_outs(rows.iterator()):
+        first = fan_out[0]
+        broadcast = BroadcastNotification.objects.create(
+            notification_type=first["notification_type"],
+            title=first["title"],
+            message=first["message"],
+            audience="active_trainees",
+            event_id=first["event_id"],
+            created_at=first["created_at"],
+        )
+        recipients = {row["recipient_id"] for row in fan_out}
+        BroadcastReadMarker.objects.bulk_create(
+            [
+                BroadcastReadMarker(
+                    broadcast=broadcast,
+                    user_id=row["recipient_id"],
+                    read_at=row["read_at"] or row["created_at"],
+                )
+                for row in fan_out
+                if row["is_read"]
+            ]
+            + [
+                BroadcastReadMarker(broadcast=broadcast, user_id=user_id, read_at=broadcast.created_at)
+                for user_id, date_joined in audience
+                if user_id not in recipients and date_joined <= broadcast.created_at
+            ],
+            batch_size=500,
+        )
+        ids = [row["id"] for row in fan_out]
+        for start in range(0, len(ids), 500):
+            Notification.objects.filter(id__in=ids[start:start + 500]).delete()
+
+
+def expand_event_notifications(apps, schema_editor):
+    """Recreate one Notification per active trainee for each broadcast."""
+    BroadcastNotification = apps.get_model("core", "BroadcastNotification")
+    BroadcastReadMarker = apps.get_model("core", "BroadcastReadMarker")
+    Notification = apps.get_model("core", "Notification")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+    for broadcast in BroadcastNotification.objects.iterator():
+        read_at = dict(
+            BroadcastReadMarker.objects.filter(broadcast=broadcast).values_list("user_id", "read_at")
+        )
+        recipients = User.objects.filter(
+            profile__role="trainee",
+            profile__trainee__status="active",
+            date_joined__lte=broadcast.created_at,
+        ).values_list("id", flat=True)
+        created = Notification.objects.bulk_create(
+            [
+                Notification(
+                    notification_type=broadcast.notification_type,
+                    title=broadcast.title,
+                    message=broadcast.message,
+                    recipient_id=user_id,
+                    event_id=broadcast.event_id,
+                    is_read=user_id in read_at,
+                    read_at=read_at.get(user_id),
+                )
+                for user_id in recipients
+            ],
+            batch_size=500,
+        )
+        # created_at is auto_now_add, so restore the broadcast time afterwards
+        ids = [n.id for n in created]
+        for start in range(0, len(ids), 500):
+            Notification.objects.filter(id__in=ids[start:start + 500]).update(
+                created_at=broadcast.created_at
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_points_ledger_entry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(choices=[('event_created', 'Event Created'), ('event_updated', 'Event Updated'), ('belt_promotion', 'Belt Promotion'), ('match_scheduled', 'Match Scheduled'), ('match_result', 'Match Result'), ('event_reminder', 'Event Reminder'), ('general', 'General')], default='general', max_length=50)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('audience', models.CharField(choices=[('active_trainees', 'Active Trainees')], default='active_trainees', max_length=30)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcast_notifications', to='core.event')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BroadcastReadMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_markers', to='core.broadcastnotification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_read_markers', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='broadcastnotification',
+            index=models.Index(fields=['audience', '-created_at'], name='core_broadc_audienc_c13572_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='broadcastreadmarker',
+            unique_together={('user', 'broadcast')},
+        ),
+        migrations.RunPython(collapse_event_notifications, expand_event_notifications),
+    ]
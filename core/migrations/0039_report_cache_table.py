@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Create the table of the database-backed "reports" cache (see CACHES),
+    with the columns createcachetable would give it, so a migrated database
+    needs no separate createcachetable step. The table is not a model, so
+    only the database is changed.
+    """
+
+    dependencies = [
+        ('core', '0038_report_export'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.CreateModel(
+                    name='ReportCacheEntry',
+                    fields=[
+                        ('cache_key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                        ('value', models.TextField()),
+                        ('expires', models.DateTimeField(db_index=True)),
+                    ],
+                    options={'db_table': 'core_report_cache'},
+                ),
+            ],
+        ),
+    ]
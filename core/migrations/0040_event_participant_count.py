@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_participants(apps, schema_editor):
+    """Fill in the stored participant count of existing events."""
+    Event = apps.get_model('core', 'Event')
+    EventRegistration = apps.get_model('core', 'EventRegistration')
+    Event.objects.update(
+        participant_count=Coalesce(
+            Subquery(
+                EventRegistration.objects.filter(event=OuterRef('pk'), status='registered')
+                .values('event')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_report_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+    ]
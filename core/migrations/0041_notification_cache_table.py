@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Create the table of the database-backed "notifications" cache (see
+    CACHES), laid out like the reports cache table of migration 0039.
+    """
+
+    dependencies = [
+        ('core', '0040_event_participant_count'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.CreateModel(
+                    name='NotificationCacheEntry',
+                    fields=[
+                        ('cache_key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                        ('value', models.TextField()),
+                        ('expires', models.DateTimeField(db_index=True)),
+                    ],
+                    options={'db_table': 'core_notification_cache'},
+                ),
+            ],
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
 from decimal import Decimal
 
 
@@ -303,6 +306,17 @@ class Event(models.Model):
         ("cancelled", "Cancelled"),
     ]
 
+    # Fields edited by the admin event form, saved as update_fields
+    FORM_FIELDS = [
+        "name",
+        "event_date",
+        "location",
+        "description",
+        "registration_deadline",
+        "max_participants",
+        "status",
+    ]
+
     name = models.CharField(max_length=200)
     event_date = models.DateField()
     location = models.CharField(max_length=200)
@@ -311,6 +325,11 @@ class Event(models.Model):
     max_participants = models.IntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
     archived = models.BooleanField(default=False)
+    # Registrations with status "registered", kept up to date by the
+    # EventRegistration signals with F() updates (see core.signals). Saves of
+    # an existing event should pass update_fields, so a count loaded earlier
+    # is not written back over registrations counted since.
+    participant_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -322,10 +341,63 @@ class Event(models.Model):
     def __str__(self):
         return f"{self.name} - {self.event_date}"
 
-    @property
-    def participant_count(self):
-        """Returns the number of registered participants."""
-        return self.registrations.filter(status="registered").count()
+    @classmethod
+    def close_due_registrations(cls, today=None):
+        """
+        Close registration of every open event whose deadline has passed or
+        that is full, with one UPDATE per reason, like close_registration()
+        does for a single event. Sends no post_save signals.
+
+        Args:
+            today: Date deadlines are compared with (default: today)
+
+        Returns:
+            Dict of closure reason -> ids of the events closed for it
+        """
+        from datetime import date
+
+        today = today or date.today()
+        due = {
+            "registration_deadline_passed": Q(registration_deadline__lt=today),
+            "max_participants_reached": Q(participant_count__gte=F("max_participants")),
+        }
+        closed = {}
+        with transaction.atomic():
+            for reason, condition in due.items():
+                events = cls.objects.select_for_update().filter(condition, status="open")
+                closed[reason] = list(events.values_list("pk", flat=True))
+                cls.objects.filter(pk__in=closed[reason], status="open").update(status="closed")
+        return closed
+
+    @classmethod
+    def reconcile_participant_counts(cls, events=None):
+        """
+        Recount registered participants and fix stored counts that drifted,
+        e.g. after registrations were bulk-created or edited with update().
+
+        Args:
+            events: Events queryset to check (default: all events)
+
+        Returns:
+            Number of events whose count was corrected
+        """
+        if events is None:
+            events = cls.objects.all()
+        registered = Coalesce(
+            Subquery(
+                EventRegistration.objects.filter(event=OuterRef("pk"), status="registered")
+                .values("event")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        stale = events.annotate(registered=registered).exclude(
+            participant_count=F("registered")
+        )
+        return cls.objects.filter(pk__in=stale.values("pk")).update(
+            participant_count=registered
+        )
 
     @property
     def is_registration_open(self):
@@ -376,7 +448,7 @@ class Event(models.Model):
         should_close, reason = self.should_close()
         if should_close and self.status == "open":
             self.status = "closed"
-            self.save()
+            self.save(update_fields=["status"])
             return reason
         return None
 
@@ -644,50 +716,181 @@ class TraineePoints(models.Model):
     def __str__(self):
         return f"{self.trainee} - {self.total_points} points"
 
+    # Points for taking part in a match
+    WIN_POINTS = 30
+    LOSS_POINTS = 10
+
     def add_win(self):
         """Add points for a win (30 points)."""
-        self.total_points += 30
-        self.wins += 1
-        self.save()
-        self.check_belt_rank_promotion()
+        self._add(self.WIN_POINTS, "win")
 
     def add_loss(self):
         """Add points for a loss (10 points)."""
-        self.total_points += 10
-        self.losses += 1
-        self.save()
-        self.check_belt_rank_promotion()
+        self._add(self.LOSS_POINTS, "loss")
 
-    def add_points(self, points):
+    def add_points(self, points, reason="adjustment"):
         """Add generic points (e.g. from evaluation)."""
-        self.total_points += int(points)
-        self.save()
-        self.check_belt_rank_promotion()
+        self._add(int(points), reason)
+
+    def _add(self, points, reason):
+        """Award points to this record's trainee and mirror the change in memory."""
+        promoted = TraineePoints.award([(self.trainee_id, points, reason)])
+        self.total_points += points
+        self.wins += reason == "win"
+        self.losses += reason == "loss"
+        if self.trainee_id in promoted:
+            self.trainee.refresh_from_db(fields=["belt_rank", "updated_at"])
+
+    @classmethod
+    def award(cls, awards):
+        """
+        Add points to one or many trainees atomically.
+
+        Each total is changed with a single UPDATE ... SET total_points =
+        total_points + <delta> for all trainees at once, so concurrent awards
+        (e.g. judges closing matches at the same time) are never lost. Wins
+        and losses are counted from the "win" and "loss" reasons. Missing
+        TraineePoints records are created, each award is entered in the
+        points ledger, trainees who reach the next belt's threshold are
+        promoted, and the trainees are re-ranked on the current leaderboards.
+
+        Args:
+            awards: Iterable of (trainee id, points, ledger reason)
+
+        Returns:
+            Ids of the trainees who were promoted
+        """
+        deltas = {}  # Trainee id -> [points, wins, losses]
+        entries = []
+        for trainee_id, points, reason in awards:
+            delta = deltas.setdefault(trainee_id, [0, 0, 0])
+            delta[0] += points
+            delta[1] += reason == "win"
+            delta[2] += reason == "loss"
+            if points:
+                entries.append(PointsLedgerEntry(trainee_id=trainee_id, points=points, reason=reason))
+        if not deltas:
+            return []
+
+        def change(field, index):
+            values = [
+                When(trainee_id=trainee_id, then=Value(delta[index]))
+                for trainee_id, delta in deltas.items()
+                if delta[index]
+            ]
+            if not values:
+                return F(field)
+            if len(deltas) == 1:
+                return F(field) + values[0].result
+            return F(field) + Case(*values, default=Value(0))
+
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(trainee_id=trainee_id) for trainee_id in deltas], ignore_conflicts=True
+            )
+            cls.objects.filter(trainee_id__in=deltas).update(
+                total_points=change("total_points", 0),
+                wins=change("wins", 1),
+                losses=change("losses", 2),
+                updated_at=timezone.now(),
+            )
+            PointsLedgerEntry.objects.bulk_create(entries)
+            promoted = cls.promote_due(deltas)
+
+            from core.services.leaderboard_service import LeaderboardService
+
+            LeaderboardService.update_trainee_rankings(deltas)
+            return promoted
+
+    @classmethod
+    def promote_due(cls, trainee_ids):
+        """
+        Promote trainees whose points reach the threshold of the next belt,
+        one belt at a time, as check_belt_rank_promotion does for one record.
+
+        Returns:
+            Ids of the promoted trainees
+        """
+        from core.services.belt_thresholds import BeltThresholds
+
+        thresholds = BeltThresholds.points_by_belt()
+        belts = [belt for belt, _ in Trainee.BELT_CHOICES]
+        next_belts = dict(zip(belts, belts[1:]))
+        promoted = []
+        for trainee_id, belt_rank, total_points in cls.objects.filter(
+            trainee_id__in=trainee_ids
+        ).values_list("trainee_id", "trainee__belt_rank", "total_points"):
+            next_belt = next_belts.get(belt_rank)
+            if next_belt not in thresholds or total_points < thresholds[next_belt]:
+                continue
+            # Conditional, so concurrent awards promote a trainee only once
+            if Trainee.objects.filter(pk=trainee_id, belt_rank=belt_rank).update(
+                belt_rank=next_belt, updated_at=timezone.now()
+            ):
+                BeltRankProgress.objects.create(
+                    trainee_id=trainee_id,
+                    old_belt_rank=belt_rank,
+                    new_belt_rank=next_belt,
+                    points_earned=total_points,
+                )
+                promoted.append(trainee_id)
+
+        if promoted:
+            from core.services.report_cache import ReportCache
+
+            ReportCache.invalidate(Trainee)  # Belts changed with update()
+        return promoted
+
+    def record_ledger_entry(self, points, reason):
+        """Append a points change to the trainee's points ledger."""
+        if points:
+            PointsLedgerEntry.objects.create(
+                trainee_id=self.trainee_id, points=points, reason=reason
+            )
 
     def check_belt_rank_promotion(self):
         """Check if trainee qualifies for belt rank promotion."""
-        # Get next belt rank threshold
-        current_belt_index = [belt[0] for belt in Trainee.BELT_CHOICES].index(
-            self.trainee.belt_rank
-        )
+        if TraineePoints.promote_due([self.trainee_id]):
+            self.trainee.refresh_from_db(fields=["belt_rank", "updated_at"])
+
+
+class PointsLedgerEntry(models.Model):
+    """
+    PointsLedgerEntry model recording every change to a trainee's points.
+    The ledger is append-only; yearly and monthly leaderboards are
+    aggregated from it by time range.
+    """
+
+    REASON_CHOICES = [
+        ("win", "Match Win"),
+        ("loss", "Match Loss"),
+        ("achievement", "Achievement"),
+        ("evaluation", "Evaluation"),
+        ("adjustment", "Adjustment"),
+        ("belt_sync", "Belt Rank Sync"),
+        ("opening_balance", "Opening Balance"),
+    ]
+
+    # Bookkeeping entries that do not count as points earned in a period
+    NON_EARNED_REASONS = ["belt_sync", "opening_balance"]
+
+    trainee = models.ForeignKey(
+        Trainee, on_delete=models.CASCADE, related_name="points_ledger"
+    )
+    points = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Points ledger entries"
+        indexes = [
+            models.Index(fields=["created_at", "trainee"]),
+            models.Index(fields=["trainee", "-created_at"]),
+        ]
 
-        if current_belt_index < len(Trainee.BELT_CHOICES) - 1:
-            next_belt = Trainee.BELT_CHOICES[current_belt_index + 1][0]
-            try:
-                threshold = BeltRankThreshold.objects.get(belt_rank=next_belt)
-                if self.total_points >= threshold.points_required:
-                    # Auto-promote trainee
-                    self.trainee.belt_rank = next_belt
-                    self.trainee.save()
-                    # Create rank progress entry
-                    BeltRankProgress.objects.create(
-                        trainee=self.trainee,
-                        old_belt_rank=Trainee.BELT_CHOICES[current_belt_index][0],
-                        new_belt_rank=next_belt,
-                        points_earned=self.total_points,
-                    )
-            except BeltRankThreshold.DoesNotExist:
-                pass
+    def __str__(self):
+        return f"{self.trainee} {self.points:+d} ({self.get_reason_display()})"
 
 
 class BeltRankProgress(models.Model):
@@ -823,6 +1026,88 @@ class Notification(models.Model):
             self.save()
 
 
+class BroadcastNotification(models.Model):
+    """
+    Announcement shown to every user in an audience, stored as a single row.
+    Read state is tracked per user with BroadcastReadMarker rows.
+    """
+
+    AUDIENCE_CHOICES = [
+        ("active_trainees", "Active Trainees"),
+    ]
+
+    # User queryset filters defining each audience
+    AUDIENCE_FILTERS = {
+        "active_trainees": {
+            "profile__role": "trainee",
+            "profile__trainee__status": "active",
+        },
+    }
+
+    notification_type = models.CharField(
+        max_length=50, choices=Notification.NOTIFICATION_TYPES, default="general"
+    )
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    audience = models.CharField(
+        max_length=30, choices=AUDIENCE_CHOICES, default="active_trainees"
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="broadcast_notifications",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["audience", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.get_audience_display()})"
+
+    @classmethod
+    def audiences_for(cls, user):
+        """Return the audiences the given user belongs to."""
+        return [
+            audience
+            for audience, filters in cls.AUDIENCE_FILTERS.items()
+            if User.objects.filter(pk=user.pk, **filters).exists()
+        ]
+
+    @classmethod
+    def visible_to(cls, user):
+        """
+        Broadcasts shown to a user: those sent to one of the user's audiences
+        since the user joined.
+        """
+        return cls.objects.filter(
+            audience__in=cls.audiences_for(user), created_at__gte=user.date_joined
+        )
+
+
+class BroadcastReadMarker(models.Model):
+    """Records that a user has read a broadcast notification."""
+
+    broadcast = models.ForeignKey(
+        BroadcastNotification, on_delete=models.CASCADE, related_name="read_markers"
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="broadcast_read_markers"
+    )
+    read_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ["user", "broadcast"]
+
+    def __str__(self):
+        return f"{self.user.username} read {self.broadcast.title}"
+
+
 class Registration(models.Model):
     """
     Registration model for new member sign-ups requiring admin approval.
@@ -951,10 +1236,7 @@ class TraineeAchievement(models.Model):
     def _apply_points(self):
         """Apply achievement points to trainee's total points."""
         try:
-            trainee_points, _ = TraineePoints.objects.get_or_create(
-                trainee=self.trainee
-            )
-            trainee_points.add_points(self.points_awarded)
+            TraineePoints.award([(self.trainee_id, self.points_awarded, "achievement")])
             TraineeAchievement.objects.filter(pk=self.pk).update(is_points_applied=True)
         except Exception as e:
             print(f"Error applying achievement points: {e}")
@@ -1105,13 +1387,125 @@ class TraineeEvaluation(models.Model):
         super().save(*args, **kwargs)
 
         if self.status == "completed" and not self.is_points_applied:
-            try:
-                trainee_points = self.trainee.points
-                trainee_points.add_points(self.total_belt_points)
-                self.is_points_applied = True
-                # convert to update to avoid recursion loop if save calls signals, though save() here calls super save again
-                TraineeEvaluation.objects.filter(pk=self.pk).update(
-                    is_points_applied=True
-                )
-            except TraineePoints.DoesNotExist:
-                pass  # Should exist but handle gracefully
+            TraineeEvaluation.apply_points([self])
+
+    @classmethod
+    def apply_points(cls, evaluations):
+        """
+        Award the belt points of completed evaluations whose points were not
+        applied yet, to all their trainees in one points update.
+        """
+        evaluations = [
+            evaluation
+            for evaluation in evaluations
+            if evaluation.status == "completed" and not evaluation.is_points_applied
+        ]
+        if not evaluations:
+            return
+        with transaction.atomic():
+            TraineePoints.award(
+                (evaluation.trainee_id, evaluation.total_belt_points, "evaluation")
+                for evaluation in evaluations
+            )
+            # update() rather than save(), which would apply the points again
+            cls.objects.filter(pk__in=[evaluation.pk for evaluation in evaluations]).update(
+                is_points_applied=True
+            )
+        for evaluation in evaluations:
+            evaluation.is_points_applied = True
+
+
+class Job(models.Model):
+    """
+    A unit of background work in the database-backed job queue.
+    Jobs are enqueued with core.services.job_queue.JobQueue and run by the
+    `run_jobs` management command.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)  # Earliest time the job may run
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)  # Worker running the job
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    @property
+    def lag(self):
+        """Time the job waited between becoming due and being started."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.run_at
+
+
+class ReportExport(models.Model):
+    """
+    A PDF export rendered in the background by the job queue.
+    Requested through core.services.report_exports.ReportExportService;
+    the finished file is stored under MEDIA_ROOT/exports/.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    # Statuses of an export that identical requests should share
+    IN_FLIGHT = ("pending", "running")
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    key = models.CharField(max_length=64)  # Hash of kind and params
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    filename = models.CharField(max_length=200)  # Name offered on download
+    file = models.FileField(upload_to="exports/", blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="report_exports",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_in_flight_report_export",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.IN_FLIGHT
@@ -0,0 +1,78 @@
+"""
+Attendance Service for the BlackCobra Karate Club System.
+Handles recording session and event attendance in bulk.
+"""
+from typing import Dict, Optional
+
+from django.db import transaction
+
+from core.models import Attendance, Event, TrainingSession
+
+
+class AttendanceService:
+    """Service for recording attendance for many trainees at once."""
+
+    # Fields written for every recorded row
+    RECORD_FIELDS = ('date', 'status', 'notes', 'check_in_time')
+
+    @staticmethod
+    def record_attendance(
+        marks: Dict[int, dict],
+        session: Optional[TrainingSession] = None,
+        event: Optional[Event] = None,
+    ) -> int:
+        """
+        Record attendance for a session or an event.
+
+        Existing rows for the session/event are loaded once and compared with
+        the marks; only new or changed rows are written, with a single bulk
+        upsert inside one transaction. Fields missing from a mark keep their
+        current value (or the model default for new rows), like the defaults
+        of update_or_create.
+
+        Args:
+            marks: Dict of trainee id -> Attendance field values (status, and
+                optionally notes and check_in_time)
+            session: TrainingSession to record attendance for, or
+            event: Event to record attendance for
+
+        Returns:
+            Number of attendance rows created or updated
+        """
+        if (session is None) == (event is None):
+            raise ValueError("Pass exactly one of session or event")
+
+        target_field = 'session' if session is not None else 'event'
+        target = session if session is not None else event
+        attendance_date = session.date if session is not None else event.event_date
+
+        with transaction.atomic():
+            existing = {
+                row['trainee_id']: row
+                for row in Attendance.objects.filter(**{target_field: target}).values(
+                    'trainee_id', *AttendanceService.RECORD_FIELDS
+                )
+            }
+
+            records = []
+            for trainee_id, values in marks.items():
+                values = {'date': attendance_date, **values}
+                current = existing.get(trainee_id)
+                if current is not None:
+                    if all(current[field] == value for field, value in values.items()):
+                        continue
+                    values = {
+                        **{field: current[field] for field in AttendanceService.RECORD_FIELDS},
+                        **values,
+                    }
+                records.append(Attendance(trainee_id=trainee_id, **{target_field: target}, **values))
+
+            if records:
+                Attendance.objects.bulk_create(
+                    records,
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=['trainee', target_field],
+                    update_fields=list(AttendanceService.RECORD_FIELDS),
+                )
+        return len(records)
@@ -0,0 +1,103 @@
+"""
+Belt Thresholds for the BlackCobra Karate Club System.
+
+The belt rank threshold table has a row per belt at most and changes only
+when an admin edits it, yet points pages and every points award read it.
+Each process keeps the table in memory and reloads it when it changes.
+
+Saving or deleting a threshold (see core.signals) moves the table's version
+in the shared "reports" cache, which the web and job queue worker processes
+all read. A process compares its copy against that version at most once
+every CHECK_INTERVAL seconds, so an edit reaches the other processes within
+that time and reaches the process that made it at once. Code that changes
+thresholds with queryset update() or bulk_create(), which send no signals,
+must call BeltThresholds.invalidate itself.
+"""
+import time
+
+from django.core.cache import caches
+
+from core.models import BeltRankThreshold, Trainee
+
+
+class BeltThresholds:
+    """Process-wide cache of the belt rank threshold table."""
+
+    CACHE_ALIAS = "reports"
+    VERSION_KEY = "belt_threshold_version"
+
+    # Seconds between checks of the shared version
+    CHECK_INTERVAL = 5.0
+
+    # (version, checked at, belt rank -> threshold), replaced as a whole
+    _table = (None, 0.0, None)
+
+    @staticmethod
+    def all():
+        """
+        Thresholds ordered by points required.
+
+        The instances are shared by every caller in the process and must not
+        be changed.
+        """
+        return sorted(BeltThresholds._thresholds().values(), key=lambda threshold: threshold.points_required)
+
+    @staticmethod
+    def get(belt_rank):
+        """Threshold of a belt rank, or None if it has none."""
+        return BeltThresholds._thresholds().get(belt_rank)
+
+    @staticmethod
+    def next_after(belt_rank):
+        """
+        Threshold of the belt rank after belt_rank.
+
+        Returns:
+            BeltRankThreshold instance, or None for the last belt, an unknown
+            belt or a next belt without a threshold
+        """
+        belts = [belt for belt, _ in Trainee.BELT_CHOICES]
+        if belt_rank not in belts[:-1]:
+            return None
+        return BeltThresholds.get(belts[belts.index(belt_rank) + 1])
+
+    @staticmethod
+    def points_by_belt():
+        """Points required for each belt rank that has a threshold."""
+        return {
+            belt_rank: threshold.points_required
+            for belt_rank, threshold in BeltThresholds._thresholds().items()
+        }
+
+    @staticmethod
+    def invalidate():
+        """
+        Make every process reload the table: this one on its next read, the
+        others once they next check the shared version.
+
+        Returns:
+            The new version
+        """
+        version = time.time_ns()
+        caches[BeltThresholds.CACHE_ALIAS].set(BeltThresholds.VERSION_KEY, version, None)
+        BeltThresholds._table = (None, 0.0, None)
+        return version
+
+    @staticmethod
+    def _thresholds():
+        """The table of this process, reloaded if another version was saved."""
+        version, checked_at, thresholds = BeltThresholds._table
+        now = time.monotonic()
+        if thresholds is not None and now - checked_at < BeltThresholds.CHECK_INTERVAL:
+            return thresholds
+
+        shared_version = caches[BeltThresholds.CACHE_ALIAS].get(BeltThresholds.VERSION_KEY)
+        if shared_version is None:
+            shared_version = BeltThresholds.invalidate()
+        if thresholds is None or shared_version != version:
+            thresholds = {
+                threshold.belt_rank: threshold
+                for threshold in BeltRankThreshold.objects.all()
+            }
+        BeltThresholds._table = (shared_version, now, thresholds)
+        return thresholds
@@ -0,0 +1,135 @@
+"""
+Event Registration Service for the BlackCobra Karate Club System.
+Registers trainees for events without overbooking under concurrent requests.
+"""
+from datetime import date
+from typing import Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import Event, EventRegistration
+from core.services.job_queue import JobQueue
+from core.services.report_cache import ReportCache
+
+
+class _AlreadyRegistered(Exception):
+    """Raised inside the registration transaction to give the seat back."""
+
+
+class EventRegistrationService:
+    """Service for registering trainees for events."""
+
+    # Outcomes of register()
+    REGISTERED = 'registered'
+    ALREADY_REGISTERED = 'already_registered'
+    DEADLINE_PASSED = 'registration_deadline_passed'
+    FULL = 'max_participants_reached'
+    NOT_OPEN = 'not_open'
+
+    @staticmethod
+    def register(event: Event, trainee_id: int) -> Tuple[str, bool]:
+        """
+        Register a trainee for an event if a seat is free.
+
+        The seat is reserved with a conditional UPDATE of the event's
+        participant count, which the database applies to one request at a
+        time, so concurrent registrations never take more seats than
+        max_participants. The registration is created in the same
+        transaction, which gives the seat back if the trainee turns out to
+        be registered already. The request that takes the last seat closes
+        registration in the same UPDATE.
+
+        Args:
+            event: Event to register for; beyond its id, the fields as
+                loaded are only used to explain a refusal
+            trainee_id: Trainee to register
+
+        Returns:
+            Tuple of (outcome, closed): one of the outcome constants, and
+            whether this registration filled the event and closed it
+        """
+        open_events = Event.objects.filter(
+            pk=event.pk, status='open', registration_deadline__gte=date.today()
+        )
+        try:
+            with transaction.atomic():
+                closed = bool(
+                    open_events.filter(participant_count=F('max_participants') - 1).update(
+                        participant_count=F('participant_count') + 1, status='closed'
+                    )
+                )
+                if not closed and not open_events.filter(
+                    participant_count__lt=F('max_participants') - 1
+                ).update(participant_count=F('participant_count') + 1):
+                    return EventRegistrationService._refusal(event), False
+                EventRegistrationService._save_registration(event.pk, trainee_id)
+        except _AlreadyRegistered:
+            return EventRegistrationService.ALREADY_REGISTERED, False
+
+        if closed:
+            # Status changed with update(), which sends no signals
+            ReportCache.invalidate(Event)
+            JobQueue.enqueue(
+                'notifications.event_closed',
+                event_id=event.pk,
+                reason=EventRegistrationService.FULL,
+            )
+        return EventRegistrationService.REGISTERED, closed
+
+    @staticmethod
+    def unregister(event_id: int, trainee_id: int) -> bool:
+        """
+        Withdraw a trainee's registration and give its seat back.
+
+        The registration is withdrawn with a conditional UPDATE, and the seat
+        is only given back if that UPDATE changed the row, so concurrent or
+        repeated requests give it back once.
+
+        Returns:
+            True if the trainee was registered and is now withdrawn
+        """
+        with transaction.atomic():
+            withdrawn = EventRegistration.objects.filter(
+                event_id=event_id, trainee_id=trainee_id, status='registered'
+            ).update(status='withdrawn')
+            if withdrawn:
+                Event.objects.filter(pk=event_id).update(participant_count=F('participant_count') - 1)
+        if withdrawn:
+            # Withdrawn with update(), which sends no signals
+            ReportCache.invalidate(EventRegistration)
+        return bool(withdrawn)
+
+    @staticmethod
+    def _save_registration(event_id, trainee_id):
+        """
+        Create the registration for a reserved seat, or re-activate a
+        withdrawn or cancelled one.
+        """
+        registration = EventRegistration(event_id=event_id, trainee_id=trainee_id)
+        # Already counted by the seat reservation (see core.signals)
+        registration.seat_reserved = True
+        try:
+            with transaction.atomic():
+                registration.save()
+            return
+        except IntegrityError:
+            pass
+
+        registration = EventRegistration.objects.select_for_update().get(
+            event_id=event_id, trainee_id=trainee_id
+        )
+        if registration.status == 'registered':
+            raise _AlreadyRegistered
+        registration.status = 'registered'
+        registration.seat_reserved = True
+        registration.save()
+
+    @staticmethod
+    def _refusal(event):
+        """Why no seat could be reserved, judged from the event as loaded."""
+        if event.registration_deadline < date.today():
+            return EventRegistrationService.DEADLINE_PASSED
+        if event.status == 'open' or event.is_full:
+            return EventRegistrationService.FULL
+        return EventRegistrationService.NOT_OPEN
@@ -0,0 +1,247 @@
+"""
+Database-backed job queue for the BlackCobra Karate Club System.
+
+Work that does not need to finish inside a request (notification fan-out,
+registration capacity checks) is enqueued as a Job row and run later by the
+worker command:
+
+    python manage.py run_jobs
+
+Jobs are enqueued in the caller's transaction, so they only become visible
+once the triggering change commits. Delivery is at-least-once: a job is
+marked succeeded only after its task has committed, failed jobs are retried
+with exponential backoff, and jobs left running by a stopped worker are
+reclaimed after LOCK_TIMEOUT. Tasks should therefore be safe to run twice.
+A task that runs past TIME_LIMIT is stopped before its job could be
+reclaimed while it is still running. Tasks can register a handler that runs
+once their job has failed for good, to release what the job was holding.
+Tasks that commit progress others should see while they run (like a
+render's "running" status) can run outside the job's transaction and
+manage their own.
+"""
+import os
+import signal
+import socket
+import threading
+import traceback
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Min, Q, Count
+from django.utils import timezone
+
+from core.models import Job
+
+
+TASKS = {}
+
+# Task name -> handler called with the payload of a job that failed for good
+FAILURE_HANDLERS = {}
+
+# Names of tasks run outside a transaction of the job queue's own
+NON_ATOMIC_TASKS = set()
+
+
+def task(name, on_failure=None, atomic=True):
+    """
+    Register a function as a job queue task under the given name.
+
+    on_failure, if given, is called with the job's payload once the job has
+    failed for good (out of attempts, or reclaimed with none left). Tasks
+    registered with atomic=False are not wrapped in a transaction, so what
+    they write is visible as they go; they must keep their own writes
+    consistent.
+    """
+    def decorator(func):
+        TASKS[name] = func
+        if on_failure is not None:
+            FAILURE_HANDLERS[name] = on_failure
+        if not atomic:
+            NON_ATOMIC_TASKS.add(name)
+        return func
+    return decorator
+
+
+class JobTimeout(Exception):
+    """Raised inside a task that runs past JobQueue.TIME_LIMIT."""
+
+
+class JobQueue:
+    """Service for enqueuing, claiming and running background jobs."""
+    
+    RETRY_BASE_DELAY = timedelta(seconds=30)  # Doubled after every failed attempt
+    LOCK_TIMEOUT = timedelta(minutes=10)  # Running jobs older than this are reclaimed
+    TIME_LIMIT = timedelta(minutes=9)  # Tasks are stopped after this, before LOCK_TIMEOUT
+    
+    @staticmethod
+    def enqueue(task_name, delay=None, max_attempts=5, **payload):
+        """
+        Enqueue a job to run a registered task.
+        
+        Args:
+            task_name: Name the task was registered under
+            delay: Optional timedelta to wait before the job may run
+            max_attempts: Attempts before the job is marked failed
+            **payload: JSON-serialisable keyword arguments for the task
+        
+        Returns:
+            The created Job
+        """
+        if task_name not in TASKS:
+            raise ValueError(f"Unknown task: {task_name}")
+        
+        return Job.objects.create(
+            task=task_name,
+            payload=payload,
+            max_attempts=max_attempts,
+            run_at=timezone.now() + (delay or timedelta()),
+        )
+    
+    @staticmethod
+    def worker_id():
+        """Identify this worker process in Job.locked_by."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+    
+    @staticmethod
+    def claim(worker_id, limit=10):
+        """
+        Claim up to `limit` due jobs for a worker, oldest first.
+        
+        Each job is claimed with a conditional update, so concurrent workers
+        never claim the same job. Jobs left running past LOCK_TIMEOUT are
+        reclaimed, or marked failed if they have no attempts left.
+        
+        Returns:
+            List of claimed Jobs
+        """
+        now = timezone.now()
+        stale = Q(status='running', started_at__lt=now - JobQueue.LOCK_TIMEOUT)
+        
+        dead = list(Job.objects.filter(stale, attempts__gte=F('max_attempts')).values_list(
+            'pk', 'task', 'payload'
+        ))
+        for pk, task_name, payload in dead:
+            if Job.objects.filter(stale, pk=pk).update(
+                status='failed',
+                finished_at=now,
+                last_error='Worker stopped while running the job',
+            ):
+                JobQueue._handle_failure(task_name, payload)
+        
+        candidates = Job.objects.filter(
+            Q(status='pending', run_at__lte=now) | stale
+        ).order_by('run_at', 'id').values_list('pk', 'status', 'started_at')[:limit]
+        
+        claimed = []
+        for pk, status, started_at in candidates:
+            updated = Job.objects.filter(pk=pk, status=status, started_at=started_at).update(
+                status='running',
+                started_at=now,
+                locked_by=worker_id,
+                attempts=F('attempts') + 1,
+            )
+            if updated:
+                claimed.append(pk)
+        return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+    
+    @staticmethod
+    def run(job):
+        """
+        Run a claimed job's task in its own transaction, unless it was
+        registered with atomic=False, and record the outcome.
+        
+        Returns:
+            True if the task succeeded
+        """
+        atomic = nullcontext() if job.task in NON_ATOMIC_TASKS else transaction.atomic()
+        try:
+            with JobQueue._time_limit(JobQueue.TIME_LIMIT), atomic:
+                TASKS[job.task](**job.payload)
+        except Exception:
+            JobQueue._record_failure(job, traceback.format_exc())
+            return False
+        
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            status='succeeded',
+            finished_at=timezone.now(),
+            last_error='',
+        )
+        return True
+    
+    @staticmethod
+    def _record_failure(job, error):
+        """Schedule a retry with exponential backoff, or fail the job for good."""
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            changes = {'status': 'failed', 'finished_at': now}
+        else:
+            changes = {
+                'status': 'pending',
+                'run_at': now + JobQueue.RETRY_BASE_DELAY * 2 ** (job.attempts - 1),
+                'started_at': None,
+                'locked_by': '',
+            }
+        updated = Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            last_error=error, **changes
+        )
+        if updated and changes['status'] == 'failed':
+            JobQueue._handle_failure(job.task, job.payload)
+    
+    @staticmethod
+    def _handle_failure(task_name, payload):
+        """Run the failure handler of a job that failed for good, if its task has one."""
+        handler = FAILURE_HANDLERS.get(task_name)
+        if handler is None:
+            return
+        try:
+            with transaction.atomic():
+                handler(**payload)
+        except Exception:
+            # The job is already marked failed; a broken handler must not stop the worker
+            traceback.print_exc()
+    
+    @staticmethod
+    @contextmanager
+    def _time_limit(limit):
+        """
+        Raise JobTimeout in the block once it has run for `limit`.
+        
+        Uses SIGALRM, so the limit only applies in the main thread on
+        platforms that have it, which is where run_jobs runs tasks.
+        """
+        if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        
+        def expire(signum, frame):
+            raise JobTimeout(f"Task ran for more than {limit}")
+        
+        previous = signal.signal(signal.SIGALRM, expire)
+        signal.setitimer(signal.ITIMER_REAL, limit.total_seconds())
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    
+    @staticmethod
+    def lag(now=None):
+        """
+        Current queue lag: how long the oldest due pending job has waited,
+        in seconds (0 when nothing is waiting).
+        """
+        now = now or timezone.now()
+        oldest = Job.objects.filter(status='pending', run_at__lte=now).aggregate(
+            oldest=Min('run_at')
+        )['oldest']
+        return (now - oldest).total_seconds() if oldest else 0.0
+    
+    @staticmethod
+    def stats():
+        """Job counts by status and the current queue lag."""
+        counts = dict(Job.objects.values_list('status').annotate(count=Count('id')).order_by())
+        return {
+            'counts': {status: counts.get(status, 0) for status, _ in Job.STATUS_CHOICES},
+            'lag_s': JobQueue.lag(),
+        }
@@ -3,19 +3,290 @@ Leaderboard and Points Service
 Handles all leaderboard ranking and point calculation logic.
 """
 from datetime import datetime
-from django.db.models import Sum, Case, When, IntegerField
+from django.db import transaction
+from django.db.models import Sum, Max, Case, When, IntegerField, F, Q, Value
+from django.utils import timezone
 from core.models import (
     TraineePoints,
+    PointsLedgerEntry,
     Leaderboard,
-    BeltRankThreshold,
     Trainee,
     MatchResult,
 )
+from core.services.belt_thresholds import BeltThresholds
+
+
+def belt_order_expression(field='trainee__belt_rank'):
+    """
+    Build a Case expression mapping a belt rank field to its numeric order.
+    master_degree is highest, white is lowest.
+    """
+    return Case(
+        *[When(**{field: belt}, then=Value(order)) for belt, order in Trainee.BELT_ORDER.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
 
 
 class LeaderboardService:
     """Service for managing leaderboards and rankings."""
     
+    # Changed trainees beyond which a board is renumbered in one pass
+    # rather than moving each trainee on its own
+    RERANK_LIMIT = 50
+    
+    @staticmethod
+    def get_timeframe_scopes(year=None, month=None):
+        """
+        Return the (timeframe, year, month) lookups for the current leaderboards.
+        """
+        if year is None:
+            year = datetime.now().year
+        if month is None:
+            month = datetime.now().month
+        return [
+            {'timeframe': 'all_time', 'year': None, 'month': None},
+            {'timeframe': 'yearly', 'year': year, 'month': None},
+            {'timeframe': 'monthly', 'year': year, 'month': month},
+        ]
+    
+    @staticmethod
+    def update_trainee_rankings(trainees):
+        """
+        Incrementally re-rank the given trainees on all current leaderboards.
+        
+        Instead of rebuilding every row, each changed trainee is moved from
+        its old rank to its new one and only the entries in between are
+        shifted (see _rerank). Large batches renumber the board in one pass
+        instead. Entries are ordered by belt rank, then points, then
+        trainee id (the same order used by update_leaderboard), so the
+        result matches a full rebuild.
+        
+        Args:
+            trainees: Iterable of Trainee instances or trainee IDs
+        """
+        trainee_ids = [getattr(t, 'pk', t) for t in trainees]
+        current = list(TraineePoints.objects.filter(
+            trainee_id__in=trainee_ids
+        ).values_list('trainee_id', 'total_points', 'trainee__belt_rank'))
+        
+        with transaction.atomic():
+            for scope in LeaderboardService.get_timeframe_scopes():
+                if scope['timeframe'] == 'all_time':
+                    changes = {
+                        trainee_id: (points, belt_rank)
+                        for trainee_id, points, belt_rank in current
+                    }
+                elif not Leaderboard.objects.filter(**scope).exists():
+                    # Rank a period nobody has viewed yet in full
+                    LeaderboardService.update_period_leaderboard(
+                        scope['timeframe'], scope['year'], scope['month']
+                    )
+                    continue
+                else:
+                    # Yearly/monthly points come from the ledger, not the running total
+                    changes = {
+                        row['trainee_id']: (row['points'], row['belt_rank'])
+                        for row in LeaderboardService.period_totals(
+                            scope['timeframe'], scope['year'], scope['month']
+                        ).filter(trainee_id__in=trainee_ids)
+                    }
+                if len(changes) > LeaderboardService.RERANK_LIMIT:
+                    LeaderboardService._renumber(scope, changes)
+                else:
+                    LeaderboardService._rerank(scope, changes)
+    
+    @staticmethod
+    def get_period_bounds(timeframe, year, month=None):
+        """
+        Return the [start, end) datetimes covered by a yearly or monthly leaderboard.
+        """
+        year = int(year)
+        if timeframe == 'yearly':
+            start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        else:
+            month = int(month)
+            start = datetime(year, month, 1)
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+        return timezone.make_aware(start), timezone.make_aware(end)
+    
+    @staticmethod
+    def period_totals(timeframe, year, month=None):
+        """
+        Aggregate points earned per trainee within a yearly or monthly period.
+        
+        Returns:
+            QuerySet of dicts with trainee_id, belt_rank and points
+        """
+        start, end = LeaderboardService.get_period_bounds(timeframe, year, month)
+        return PointsLedgerEntry.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end,
+        ).exclude(
+            reason__in=PointsLedgerEntry.NON_EARNED_REASONS
+        ).values(
+            'trainee_id', belt_rank=F('trainee__belt_rank')
+        ).annotate(
+            points=Sum('points')
+        ).order_by()
+    
+    @staticmethod
+    def is_period_frozen(timeframe, year, month=None):
+        """
+        Check whether a yearly or monthly period has ended and already been ranked.
+        Frozen periods are never recomputed.
+        """
+        _, end = LeaderboardService.get_period_bounds(timeframe, year, month)
+        if end > timezone.now():
+            return False
+        return Leaderboard.objects.filter(
+            timeframe=timeframe,
+            year=year,
+            month=month if timeframe == 'monthly' else None,
+        ).exists()
+    
+    @staticmethod
+    def refresh_period_leaderboard(timeframe, year, month=None):
+        """
+        Rank a yearly or monthly period on first view, and re-rank a period
+        that has not ended whenever the points ledger has entries newer than
+        its leaderboard. Ended periods stay frozen once ranked.
+        
+        Returns:
+            Number of leaderboard entries written, or None if none were
+        """
+        month = month if timeframe == 'monthly' else None
+        ranked_at = Leaderboard.objects.filter(
+            timeframe=timeframe, year=year, month=month
+        ).aggregate(ranked_at=Max('updated_at'))['ranked_at']
+        if ranked_at is not None:
+            start, end = LeaderboardService.get_period_bounds(timeframe, year, month)
+            if end <= timezone.now():
+                return None
+            changed_at = PointsLedgerEntry.objects.filter(
+                created_at__gte=start, created_at__lt=end
+            ).aggregate(changed_at=Max('created_at'))['changed_at']
+            if changed_at is None or changed_at <= ranked_at:
+                return None
+        return LeaderboardService.update_period_leaderboard(timeframe, year, month)
+    
+    @staticmethod
+    def _rerank(scope, changes):
+        """
+        Move trainees whose points or belt changed to their new place on a
+        leaderboard.
+        
+        Trainees are moved one at a time. A trainee's new rank is one more
+        than the number of other entries ordered ahead of it, and only the
+        entries between its old and new rank are written, shifted by one
+        with a single ranged UPDATE. Nothing else on the board is read or
+        written.
+        
+        Args:
+            scope: Leaderboard lookups (timeframe, year, month)
+            changes: Dict of trainee id -> (points, belt rank)
+        
+        Returns:
+            Number of entries written
+        """
+        board = Leaderboard.objects.filter(**scope)
+        entries = {
+            trainee_id: (pk, rank, points, belt_rank)
+            for pk, trainee_id, rank, points, belt_rank in board.filter(
+                trainee_id__in=changes
+            ).values_list('pk', 'trainee_id', 'rank', 'points', 'belt_rank')
+        }
+        
+        now = timezone.now()
+        written = 0
+        for trainee_id, (points, belt_rank) in sorted(changes.items()):
+            entry = entries.get(trainee_id)
+            if entry is not None and entry[2:] == (points, belt_rank):
+                continue
+            belt_order = Trainee.get_belt_order(belt_rank)
+            rank = 1 + board.exclude(trainee_id=trainee_id).alias(
+                belt_order=belt_order_expression('belt_rank')
+            ).filter(
+                Q(belt_order__gt=belt_order)
+                | Q(belt_order=belt_order, points__gt=points)
+                | Q(belt_order=belt_order, points=points, trainee_id__lt=trainee_id)
+            ).count()
+            
+            if entry is None:
+                written += board.filter(rank__gte=rank).update(rank=F('rank') + 1, updated_at=now)
+                Leaderboard.objects.create(
+                    trainee_id=trainee_id, rank=rank, points=points, belt_rank=belt_rank, **scope
+                )
+            else:
+                pk, old_rank = entry[:2]
+                if rank < old_rank:
+                    written += board.filter(rank__gte=rank, rank__lt=old_rank).update(
+                        rank=F('rank') + 1, updated_at=now
+                    )
+                elif rank > old_rank:
+                    written += board.filter(rank__gt=old_rank, rank__lte=rank).update(
+                        rank=F('rank') - 1, updated_at=now
+                    )
+                Leaderboard.objects.filter(pk=pk).update(
+                    rank=rank, points=points, belt_rank=belt_rank, updated_at=now
+                )
+            written += 1
+        return written
+    
+    @staticmethod
+    def _renumber(scope, changes):
+        """
+        Apply new points to a leaderboard's entries and renumber it.
+        
+        The board's entries are read once and sorted in memory; new entries
+        are inserted and entries whose rank, points or belt changed are
+        written with a single bulk update.
+        
+        Args:
+            scope: Leaderboard lookups (timeframe, year, month)
+            changes: Dict of trainee id -> (points, belt rank)
+        
+        Returns:
+            Number of entries written
+        """
+        entries = {
+            trainee_id: (pk, rank, points, belt_rank)
+            for pk, trainee_id, rank, points, belt_rank in Leaderboard.objects.filter(
+                **scope
+            ).values_list('pk', 'trainee_id', 'rank', 'points', 'belt_rank')
+        }
+        standings = {
+            trainee_id: (points, belt_rank)
+            for trainee_id, (_, _, points, belt_rank) in entries.items()
+        }
+        standings.update(changes)
+        order = sorted(standings, key=lambda trainee_id: (
+            -Trainee.get_belt_order(standings[trainee_id][1]),
+            -standings[trainee_id][0],
+            trainee_id,
+        ))
+        
+        now = timezone.now()
+        created, updated = [], []
+        for rank, trainee_id in enumerate(order, 1):
+            points, belt_rank = standings[trainee_id]
+            if trainee_id not in entries:
+                created.append(Leaderboard(
+                    trainee_id=trainee_id, rank=rank, points=points, belt_rank=belt_rank, **scope
+                ))
+            elif entries[trainee_id][1:] != (rank, points, belt_rank):
+                updated.append(Leaderboard(
+                    pk=entries[trainee_id][0],
+                    rank=rank,
+                    points=points,
+                    belt_rank=belt_rank,
+                    updated_at=now,
+                ))
+        
+        Leaderboard.objects.bulk_create(created)
+        Leaderboard.objects.bulk_update(updated, ['rank', 'points', 'belt_rank', 'updated_at'])
+        return len(created) + len(updated)
+    
     @staticmethod
     def update_all_leaderboards():
         """Update all leaderboard rankings (all-time, yearly, monthly)."""
@@ -38,48 +309,76 @@ class LeaderboardService:
         if month is None:
             month = datetime.now().month
         
-        # Ensure all active trainees have a TraineePoints record
-        # This ensures new trainees appear on the leaderboard
-        active_trainees = Trainee.objects.filter(status='active', archived=False)
-        for trainee in active_trainees:
-            points_record, created = TraineePoints.objects.get_or_create(trainee=trainee)
+        if timeframe in ['yearly', 'monthly']:
+            LeaderboardService.update_period_leaderboard(timeframe, year, month)
+            return
+        
+        thresholds = BeltThresholds.points_by_belt()
+        with transaction.atomic():
+            # Give active trainees without a TraineePoints record one, starting
+            # at their belt's threshold, so new trainees appear on the leaderboard
+            records = TraineePoints.objects.bulk_create([
+                TraineePoints(trainee_id=trainee_id, total_points=thresholds.get(belt_rank, 0))
+                for trainee_id, belt_rank in Trainee.objects.filter(
+                    status='active', archived=False, points__isnull=True
+                ).values_list('pk', 'belt_rank')
+            ])
+            PointsLedgerEntry.objects.bulk_create([
+                PointsLedgerEntry(trainee_id=record.trainee_id, points=record.total_points, reason='belt_sync')
+                for record in records
+                if record.total_points
+            ])
             
-            # If this is a new trainee with 0 points, set initial points to belt rank threshold
-            if created and points_record.total_points == 0:
-                PointsService.sync_points_with_belt(trainee)
-        
-        # Get all trainees sorted by belt rank first, then points
-        # master_degree is highest, white is lowest
-        trainees_points = TraineePoints.objects.all().annotate(
-            belt_order=Case(
-                When(trainee__belt_rank='master_degree', then=4),
-                When(trainee__belt_rank='black', then=3),
-                When(trainee__belt_rank='brown', then=2),
-                When(trainee__belt_rank='green', then=1),
-                When(trainee__belt_rank='white', then=0),
-                default=0,
-                output_field=IntegerField(),
+            # Rank all trainees by belt rank first, then points
+            # master_degree is highest, white is lowest
+            # Ties are broken by trainee id so incremental updates stay consistent
+            LeaderboardService._renumber(
+                {'timeframe': timeframe, 'year': None, 'month': None},
+                {
+                    trainee_id: (points, belt_rank)
+                    for trainee_id, points, belt_rank in TraineePoints.objects.values_list(
+                        'trainee_id', 'total_points', 'trainee__belt_rank'
+                    )
+                },
             )
-        ).order_by('-belt_order', '-total_points')
-        
-        for rank, tp in enumerate(trainees_points, 1):
-            try:
-                # Refresh trainee to get latest belt_rank from database
-                tp.trainee.refresh_from_db()
-                
-                Leaderboard.objects.update_or_create(
-                    trainee=tp.trainee,
-                    timeframe=timeframe,
-                    year=year if timeframe in ['yearly', 'monthly'] else None,
-                    month=month if timeframe == 'monthly' else None,
-                    defaults={
-                        'rank': rank,
-                        'points': tp.total_points,
-                        'belt_rank': tp.trainee.belt_rank,
-                    }
-                )
-            except Exception as e:
-                print(f"Error updating leaderboard for {tp.trainee}: {e}")
+    
+    @staticmethod
+    def update_period_leaderboard(timeframe, year, month=None, force=False):
+        """
+        Rank trainees by the points they earned within a yearly or monthly period.
+        
+        Points are aggregated from the points ledger over the period's time
+        range. Periods that have ended are frozen once ranked and are only
+        recomputed when force is True.
+        
+        Returns:
+            Number of leaderboard entries written, or None if the period is frozen
+        """
+        month = month if timeframe == 'monthly' else None
+        if not force and LeaderboardService.is_period_frozen(timeframe, year, month):
+            return None
+        
+        totals = LeaderboardService.period_totals(timeframe, year, month).annotate(
+            belt_order=belt_order_expression()
+        ).order_by('-belt_order', '-points', 'trainee_id')
+        
+        entries = [
+            Leaderboard(
+                trainee_id=row['trainee_id'],
+                rank=rank,
+                points=row['points'],
+                belt_rank=row['belt_rank'],
+                timeframe=timeframe,
+                year=year,
+                month=month,
+            )
+            for rank, row in enumerate(totals, 1)
+        ]
+        
+        with transaction.atomic():
+            Leaderboard.objects.filter(timeframe=timeframe, year=year, month=month).delete()
+            Leaderboard.objects.bulk_create(entries)
+        return len(entries)
     
     @staticmethod
     def get_leaderboard(timeframe='all_time', year=None, month=None, belt_rank=None):
@@ -143,16 +442,11 @@ class PointsService:
                     if match_result.match.competitor2 == winner 
                     else match_result.match.competitor2)
             
-            # Get or create points records
-            winner_points, _ = TraineePoints.objects.get_or_create(trainee=winner)
-            loser_points, _ = TraineePoints.objects.get_or_create(trainee=loser)
-            
-            # Award points
-            winner_points.add_win()  # +30 points
-            loser_points.add_loss()  # +10 points
-            
-            # Update leaderboards
-            LeaderboardService.update_all_leaderboards()
+            # Award points to both in one atomic update
+            TraineePoints.award([
+                (winner.id, TraineePoints.WIN_POINTS, 'win'),
+                (loser.id, TraineePoints.LOSS_POINTS, 'loss'),
+            ])  # Also re-ranks the two competitors
         except Exception as e:
             print(f"Error adding match result points: {e}")
     
@@ -192,18 +486,7 @@ class PointsService:
         Returns:
             BeltRankThreshold instance or None
         """
-        try:
-            current_belt_index = [belt[0] for belt in Trainee.BELT_CHOICES].index(
-                trainee.belt_rank
-            )
-            
-            if current_belt_index < len(Trainee.BELT_CHOICES) - 1:
-                next_belt = Trainee.BELT_CHOICES[current_belt_index + 1][0]
-                return BeltRankThreshold.objects.get(belt_rank=next_belt)
-        except (ValueError, BeltRankThreshold.DoesNotExist):
-            pass
-        
-        return None
+        return BeltThresholds.next_after(trainee.belt_rank)
     
     @staticmethod
     def get_progress_percentage(trainee):
@@ -231,18 +514,28 @@ class PointsService:
         Ensure trainee points match the minimum threshold for their current belt rank.
         Used when admin manually changes the belt rank.
         If force is True, points will be reset to the threshold even if currently higher.
+        
+        The total is set with a conditional UPDATE on the total it was read
+        with, and the ledger entry is only written when that UPDATE changed
+        the row, so a concurrent award is never overwritten or entered twice.
         """
-        try:
-            threshold = BeltRankThreshold.objects.get(belt_rank=trainee.belt_rank)
-            points_record, _ = TraineePoints.objects.get_or_create(trainee=trainee)
-
-            # Update points if forced or if they are currently lower than the threshold
-            if force or points_record.total_points < threshold.points_required:
-                points_record.total_points = threshold.points_required
-                points_record.save()
-
-                # Update leaderboards
-                LeaderboardService.update_all_leaderboards()
-        except BeltRankThreshold.DoesNotExist:
-            pass
+        threshold = BeltThresholds.get(trainee.belt_rank)
+        if threshold is None:
+            return
+        required = threshold.points_required
+        TraineePoints.objects.bulk_create([TraineePoints(trainee=trainee)], ignore_conflicts=True)
+        record = TraineePoints.objects.filter(trainee=trainee)
+        
+        # Update points if forced or if they are currently lower than the threshold
+        while True:
+            total = record.values_list('total_points', flat=True).get()
+            if total == required or (total > required and not force):
+                return
+            if record.filter(total_points=total).update(total_points=required, updated_at=timezone.now()):
+                break
+            # Changed since it was read: judge the new total
+        
+        PointsLedgerEntry.objects.create(trainee=trainee, points=required - total, reason='belt_sync')
+        # Re-rank only this trainee
+        LeaderboardService.update_trainee_rankings([trainee])
 
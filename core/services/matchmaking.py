@@ -3,12 +3,16 @@ Matchmaking Service for the BlackCobra Karate Club System.
 Handles auto-matchmaking algorithm and match creation.
 Requirements: 5.3, 5.4, 5.5, 5.6
 """
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 
 from core.models import Event, Trainee, Judge, Match, MatchJudge, EventRegistration
+from core.services.weighted_matching import max_weight_matching
 
 
 @dataclass
@@ -46,6 +50,247 @@ def are_belts_adjacent(belt1: str, belt2: str) -> bool:
     return abs(idx1 - idx2) <= 1
 
 
+class TraineeSnapshot:
+    """
+    Array-backed snapshot of the trainee attributes used for pairing.
+
+    Weight (in hundredths of a kg), belt index and age are computed once per
+    trainee and stored in compact typed arrays; trainees are then referred to
+    by their index in the snapshot. Pairs are enumerated and counted per group
+    of belt/age values, with weight windows found by binary search, so neither
+    matchmaking nor the pair diagnostics compare every trainee with every other.
+    """
+
+    UNKNOWN_AGE = -1
+
+    # Failure categories, keyed by which constraints a pair meets:
+    # (weight ok, belt ok, age ok)
+    FAILURE_CATEGORIES = {
+        'all_three': (False, False, False),
+        'weight_belt': (False, False, True),
+        'weight_age': (False, True, False),
+        'belt_age': (True, False, False),
+        'weight': (False, True, True),
+        'belt': (True, False, True),
+        'age': (True, True, False),
+    }
+
+    def __init__(self, trainees, max_weight_diff=Decimal('5.0'), max_age_diff=3):
+        self.trainees = list(trainees)
+        self.weights = array('q')
+        self.belts = array('b')
+        self.ages = array('h')
+        for trainee in self.trainees:
+            age = trainee.age
+            self.weights.append(int(trainee.weight * 100))
+            self.belts.append(get_belt_index(trainee.belt_rank))
+            self.ages.append(self.UNKNOWN_AGE if age is None else age)
+
+        self.max_weight_diff = int(max_weight_diff * 100)
+        self.max_age_diff = max_age_diff
+        self._groups = {}
+
+    def __len__(self):
+        return len(self.trainees)
+
+    def age(self, i: int) -> Optional[int]:
+        age = self.ages[i]
+        return None if age == self.UNKNOWN_AGE else age
+
+    def weight_diff(self, i: int, j: int) -> Decimal:
+        return Decimal(abs(self.weights[i] - self.weights[j])).scaleb(-2)
+
+    def belt_diff(self, i: int, j: int) -> int:
+        return abs(self.belts[i] - self.belts[j])
+
+    def age_diff(self, i: int, j: int) -> int:
+        return abs((self.age(i) or 0) - (self.age(j) or 0))
+
+    def scaled_score(self, i: int, j: int) -> int:
+        """
+        Score a pairing as an exact integer: MatchmakingService.pairing_score
+        in hundredths of a point. Lower is better.
+        """
+        ages = self.ages
+        # Unknown ages (-1) score as 0, like pairing_score's `age or 0`
+        return (
+            abs(self.weights[i] - self.weights[j]) * 2
+            + abs(self.belts[i] - self.belts[j]) * 300
+            + abs(max(ages[i], 0) - max(ages[j], 0)) * 100
+        )
+
+    def _belts_compatible(self, belt1: int, belt2: int) -> bool:
+        return belt1 != -1 and belt2 != -1 and abs(belt1 - belt2) <= 1
+
+    def _ages_compatible(self, age1: int, age2: int) -> bool:
+        return (
+            age1 == self.UNKNOWN_AGE
+            or age2 == self.UNKNOWN_AGE
+            or abs(age1 - age2) <= self.max_age_diff
+        )
+
+    def constraint_flags(self, i: int, j: int) -> Tuple[bool, bool, bool]:
+        """Return whether a pair meets the (weight, belt, age) constraints."""
+        return (
+            abs(self.weights[i] - self.weights[j]) <= self.max_weight_diff,
+            self._belts_compatible(self.belts[i], self.belts[j]),
+            self._ages_compatible(self.ages[i], self.ages[j]),
+        )
+
+    def is_valid(self, i: int, j: int) -> bool:
+        return all(self.constraint_flags(i, j))
+
+    def _weight_sorted_groups(self, by_belt: bool, by_age: bool):
+        """
+        Group trainee indices by belt and/or age, each group sorted by weight.
+        Trainees with an unknown belt can never meet the belt constraint, so
+        they are left out when grouping by belt.
+
+        Returns:
+            Dict of (belt, age) group key -> (indices, weights)
+        """
+        cache_key = (by_belt, by_age)
+        if cache_key not in self._groups:
+            members = defaultdict(list)
+            for i in range(len(self)):
+                belt = self.belts[i]
+                if by_belt and belt == -1:
+                    continue
+                members[(belt if by_belt else 0, self.ages[i] if by_age else 0)].append(i)
+
+            groups = {}
+            for key, indices in members.items():
+                indices.sort(key=self.weights.__getitem__)
+                groups[key] = (indices, [self.weights[i] for i in indices])
+            self._groups[cache_key] = groups
+        return self._groups[cache_key]
+
+    def _partner_groups(self, groups, by_belt: bool, by_age: bool):
+        """
+        Yield (group key, compatible later group keys), such that every pair of
+        distinct compatible groups is visited exactly once. Trainees within a
+        single group are always compatible with each other.
+        """
+        keys = sorted(groups)
+        for position, key in enumerate(keys):
+            yield key, [
+                other for other in keys[position + 1:]
+                if (not by_belt or self._belts_compatible(key[0], other[0]))
+                and (not by_age or self._ages_compatible(key[1], other[1]))
+            ]
+
+    def valid_pairs(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield every pair (i, j), i < j, that meets all pairing constraints.
+        """
+        window = self.max_weight_diff
+        groups = self._weight_sorted_groups(True, True)
+        for key, partners in self._partner_groups(groups, True, True):
+            indices, weights = groups[key]
+            for position, i in enumerate(indices):
+                weight = weights[position]
+
+                # Same group: only heavier (or equal) trainees after this one
+                others = indices[position + 1:bisect_right(weights, weight + window)]
+                for partner in partners:
+                    partner_indices, partner_weights = groups[partner]
+                    others += partner_indices[
+                        bisect_left(partner_weights, weight - window):
+                        bisect_right(partner_weights, weight + window)
+                    ]
+
+                for j in others:
+                    yield (i, j) if i < j else (j, i)
+
+    def count_pairs(self, weight: bool = True, belt: bool = True, age: bool = True) -> int:
+        """
+        Count the pairs that meet the selected constraints without
+        enumerating them.
+        """
+        window = self.max_weight_diff
+        groups = self._weight_sorted_groups(belt, age)
+        total = 0
+        for key, partners in self._partner_groups(groups, belt, age):
+            indices, weights = groups[key]
+            if not weight:
+                size = len(indices)
+                total += size * (size - 1) // 2
+                total += size * sum(len(groups[partner][0]) for partner in partners)
+                continue
+
+            for position, trainee_weight in enumerate(weights):
+                total += bisect_right(weights, trainee_weight + window) - position - 1
+                for partner in partners:
+                    partner_weights = groups[partner][1]
+                    total += (
+                        bisect_right(partner_weights, trainee_weight + window)
+                        - bisect_left(partner_weights, trainee_weight - window)
+                    )
+        return total
+
+    def constraint_counts(self) -> dict:
+        """
+        Count the pairs meeting each constraint, all constraints, and each
+        combination of failed constraints (by inclusion-exclusion).
+
+        Returns:
+            Dict with 'total', 'weight', 'belt', 'age' and 'valid' pair counts,
+            and 'failures' mapping each FAILURE_CATEGORIES key to a count
+        """
+        size = len(self)
+        total = size * (size - 1) // 2
+        w = self.count_pairs(weight=True, belt=False, age=False)
+        b = self.count_pairs(weight=False, belt=True, age=False)
+        a = self.count_pairs(weight=False, belt=False, age=True)
+        wb = self.count_pairs(weight=True, belt=True, age=False)
+        wa = self.count_pairs(weight=True, belt=False, age=True)
+        ba = self.count_pairs(weight=False, belt=True, age=True)
+        wba = self.count_pairs()
+
+        return {
+            'total': total,
+            'weight': w,
+            'belt': b,
+            'age': a,
+            'valid': wba,
+            'failures': {
+                'all_three': total - (w + b + a - wb - wa - ba + wba),
+                'weight_belt': a - wa - ba + wba,
+                'weight_age': b - wb - ba + wba,
+                'belt_age': w - wb - wa + wba,
+                'weight': ba - wba,
+                'belt': wa - wba,
+                'age': wb - wba,
+            },
+        }
+
+    def sample_failures(self, limit: int = 5, counts: Optional[dict] = None, max_scanned: int = 1_000_000):
+        """
+        Collect up to `limit` example pairs for each failure category, scanning
+        pairs in list order. The scan stops once every category has its
+        examples, or after `max_scanned` pairs on very large pools.
+
+        Returns:
+            Dict of failure category -> list of (i, j) pairs
+        """
+        failures = (counts or self.constraint_counts())['failures']
+        categories = {flags: name for name, flags in self.FAILURE_CATEGORIES.items()}
+        samples = {name: [] for name in self.FAILURE_CATEGORIES}
+        remaining = sum(min(limit, count) for count in failures.values())
+
+        scanned = 0
+        for i in range(len(self)):
+            if not remaining or scanned >= max_scanned:
+                break
+            for j in range(i + 1, len(self)):
+                name = categories.get(self.constraint_flags(i, j))
+                if name and len(samples[name]) < limit:
+                    samples[name].append((i, j))
+                    remaining -= 1
+                scanned += 1
+        return samples
+
+
 class MatchmakingService:
     """
     Service for creating matches and auto-matchmaking.
@@ -57,6 +302,9 @@ class MatchmakingService:
     MAX_AGE_DIFF = 3  # years
     MIN_JUDGES_REQUIRED = 3  # Minimum judges per match
     
+    # Pairing strategies for auto-matchmaking
+    STRATEGIES = ("greedy", "optimal")
+    
     def auto_match(
         self, 
         event_id: int, 
@@ -64,7 +312,8 @@ class MatchmakingService:
         include_title_matches: bool = True,
         use_global_pool: bool = False,
         match_type: str = "sparring",
-        is_promotion_match: bool = False
+        is_promotion_match: bool = False,
+        strategy: str = "greedy"
     ) -> List[ProposedMatch]:
         """
         Generate automatic match pairings for an event or globally.
@@ -81,9 +330,14 @@ class MatchmakingService:
             use_global_pool: If True, match from all active trainees in system (not just event participants)
             match_type: The match type for all generated matches (sparring, penan, judo, breaking)
             is_promotion_match: If True, judges will score all match types
+            strategy: "greedy" (fast, best pairs first) or "optimal" (pairs as
+                many trainees as possible at the lowest total score)
         
         Returns list of proposed matches for admin review.
         """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown matchmaking strategy: {strategy}")
+        
         event = Event.objects.get(id=event_id)
         
         # Get trainees - either globally or from event registration
@@ -100,7 +354,7 @@ class MatchmakingService:
             registrations = EventRegistration.objects.filter(
                 event=event,
                 status='registered'
-            ).select_related('trainee__profile')
+            ).select_related('trainee__profile__user')
             all_trainees = [reg.trainee for reg in registrations]
         
         # Get trainees with completed matches (candidates for title matches)
@@ -132,52 +386,153 @@ class MatchmakingService:
             regular_match_candidates = [t for t in all_trainees if t.id not in ongoing_trainee_ids]
             title_match_candidates = []
         
-        # Generate all valid pairings
+        regular_snapshot = self.build_snapshot(regular_match_candidates)
+        title_snapshot = self.build_snapshot(
+            title_match_candidates if include_title_matches else []
+        )
+        
+        if strategy == "optimal":
+            pairings = self._optimal_pairings(regular_snapshot, title_snapshot)
+        else:
+            pairings = self._greedy_pairings(regular_snapshot, title_snapshot)
+        
         proposed_matches = []
-        used_trainees = set()
+        for scaled_score, is_title_match, snapshot, i, j in pairings:
+            proposed_matches.append(ProposedMatch(
+                competitor1=snapshot.trainees[i],
+                competitor2=snapshot.trainees[j],
+                weight_diff=snapshot.weight_diff(i, j),
+                belt_diff=snapshot.belt_diff(i, j),
+                age_diff=snapshot.age_diff(i, j),
+                score=scaled_score / 1000,
+                is_title_match=is_title_match,
+                match_type=match_type,
+                is_promotion_match=is_promotion_match
+            ))
+        
+        return proposed_matches
+    
+    @classmethod
+    def build_snapshot(cls, trainees: List[Trainee]) -> TraineeSnapshot:
+        """Snapshot the pairing attributes of trainees under this service's constraints."""
+        return TraineeSnapshot(trainees, cls.MAX_WEIGHT_DIFF, cls.MAX_AGE_DIFF)
+    
+    def _greedy_pairings(self, regular_snapshot, title_snapshot):
+        """
+        Select pairings greedily: best score first, skipping trainees already paired.
+        
+        Returns:
+            List of (scaled score, is title match, snapshot, index 1, index 2)
+        """
+        # Each pairing is encoded as one integer ordered by (score, title flag,
+        # index 1, index 2), so large pools sort quickly and pairs with equal
+        # scores keep trainee-list order, regular before title.
+        size = max(len(regular_snapshot), len(title_snapshot), 1)
+        pairing_keys = [
+            ((regular_snapshot.scaled_score(i, j) * 10 * 2) * size + i) * size + j
+            for i, j in regular_snapshot.valid_pairs()
+        ]
         
-        # Score all possible regular pairings
-        all_pairings = []
-        for i, t1 in enumerate(regular_match_candidates):
-            for t2 in regular_match_candidates[i+1:]:
-                if self._is_valid_pairing(t1, t2):
-                    score = self._calculate_pairing_score(t1, t2)
-                    all_pairings.append((t1, t2, score, False))  # False = not a title match
-        
-        # Add title match pairings if enabled
-        if include_title_matches and title_match_candidates:
-            for i, t1 in enumerate(title_match_candidates):
-                for t2 in title_match_candidates[i+1:]:
-                    if t1.id != t2.id and self._is_valid_pairing(t1, t2):
-                        # Title matches get a bonus score (slightly better priority)
-                        score = self._calculate_pairing_score(t1, t2) * 0.9  # 10% bonus
-                        all_pairings.append((t1, t2, score, True))  # True = is a title match
+        # Title matches get a bonus score (slightly better priority)
+        pairing_keys += [
+            ((title_snapshot.scaled_score(i, j) * 9 * 2 + 1) * size + i) * size + j  # 10% bonus
+            for i, j in title_snapshot.valid_pairs()
+        ]
         
         # Sort by score (lower is better) and greedily select matches
-        all_pairings.sort(key=lambda x: x[2])
-        
-        for t1, t2, score, is_title_match in all_pairings:
-            if t1.id not in used_trainees and t2.id not in used_trainees:
-                weight_diff = abs(t1.weight - t2.weight)
-                belt_diff = abs(get_belt_index(t1.belt_rank) - get_belt_index(t2.belt_rank))
-                age_diff = abs((t1.age or 0) - (t2.age or 0))
-                
-                proposed_matches.append(ProposedMatch(
-                    competitor1=t1,
-                    competitor2=t2,
-                    weight_diff=weight_diff,
-                    belt_diff=belt_diff,
-                    age_diff=age_diff,
-                    score=score,
-                    is_title_match=is_title_match,
-                    match_type=match_type,
-                    is_promotion_match=is_promotion_match
-                ))
-                
-                used_trainees.add(t1.id)
-                used_trainees.add(t2.id)
+        pairing_keys.sort()
         
-        return proposed_matches
+        pairings = []
+        used_trainees = set()
+        for key in pairing_keys:
+            rest, j = divmod(key, size)
+            rest, i = divmod(rest, size)
+            scaled_score, is_title_match = divmod(rest, 2)
+            
+            snapshot = title_snapshot if is_title_match else regular_snapshot
+            id1, id2 = snapshot.trainees[i].id, snapshot.trainees[j].id
+            if id1 not in used_trainees and id2 not in used_trainees:
+                pairings.append((scaled_score, bool(is_title_match), snapshot, i, j))
+                used_trainees.add(id1)
+                used_trainees.add(id2)
+        return pairings
+    
+    def _optimal_pairings(self, regular_snapshot, title_snapshot):
+        """
+        Select a minimum-cost maximum matching: pair as many trainees as
+        possible, and among those pairings minimise the total score.
+        
+        The constraint graph splits into connected components (trainees
+        that can never meet through any chain of valid pairings), and each
+        component is solved independently with the blossom algorithm.
+        
+        Returns:
+            List of (scaled score, is title match, snapshot, index 1, index 2)
+        """
+        # Best edge per pair of trainees; title pairings carry the 10% bonus
+        edges = {}
+        for snapshot, factor, is_title in (
+            (regular_snapshot, 10, False),
+            (title_snapshot, 9, True),
+        ):
+            trainees = snapshot.trainees
+            for i, j in snapshot.valid_pairs():
+                key = (trainees[i].id, trainees[j].id)
+                cost = snapshot.scaled_score(i, j) * factor
+                if key not in edges or cost < edges[key][0]:
+                    edges[key] = (cost, is_title, snapshot, i, j)
+        
+        # Union-find over trainee ids to split the graph into components
+        parent = {}
+        
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        
+        for id1, id2 in edges:
+            parent[find(id1)] = find(id2)
+        
+        components = defaultdict(list)
+        for key, edge in edges.items():
+            components[find(key[0])].append((key, edge))
+        
+        pairings = []
+        for component_edges in components.values():
+            if len(component_edges) == 1:
+                pairings.append(component_edges[0][1])
+                continue
+            
+            vertex_ids = {}
+            for (id1, id2), _ in component_edges:
+                vertex_ids.setdefault(id1, len(vertex_ids))
+                vertex_ids.setdefault(id2, len(vertex_ids))
+            
+            # Maximise (ceiling - cost) over maximum-cardinality matchings,
+            # which minimises total cost among the largest matchings
+            ceiling = max(edge[0] for _, edge in component_edges) + 1
+            graph = [
+                (vertex_ids[id1], vertex_ids[id2], ceiling - edge[0])
+                for (id1, id2), edge in component_edges
+            ]
+            mate = max_weight_matching(graph, max_cardinality=True)
+            
+            for (_, edge), (v, w, _) in zip(component_edges, graph):
+                if mate[v] == w:
+                    pairings.append(edge)
+        
+        pairings.sort(key=lambda edge: (edge[0], edge[3], edge[4]))
+        return pairings
+    
+    @staticmethod
+    def pairing_score(weight_diff, belt_diff: int, age_diff: int) -> float:
+        """
+        Weighted pairing score: weight is most important, then belt, then age.
+        Lower is better.
+        """
+        return (float(weight_diff) * 2) + (belt_diff * 3) + age_diff
     
     def _is_valid_pairing(self, t1: Trainee, t2: Trainee) -> bool:
         """Check if two trainees can be paired based on constraints."""
@@ -211,8 +566,7 @@ class MatchmakingService:
         age2 = t2.age or 0
         age_diff = abs(age1 - age2)
         
-        # Weighted score: weight is most important, then belt, then age
-        return (weight_diff * 2) + (belt_diff * 3) + age_diff
+        return self.pairing_score(weight_diff, belt_diff, age_diff)
     
     def create_match(
         self,
@@ -1,50 +1,75 @@
 """
 Notification service for managing in-app notifications.
+
+Notification summaries are cached in the database-backed "notifications"
+cache, because notifications are created and summaries invalidated by the
+job queue workers and the close_expired_events command as well as by the web
+processes. Each process also keeps the summaries it read and checks them
+against the shared cache at most once every SUMMARY_CHECK_INTERVAL seconds,
+so most pages read the summary without a query. A change reaches the
+process that made it at once and the other processes within that time.
 """
+import heapq
+import time
+from itertools import islice
+from operator import itemgetter
+
 from django.contrib.auth.models import User
-from core.models import Notification, Event, Trainee, BeltRankProgress
+from django.core.cache import caches
+from django.db.models import Exists, OuterRef, Value
+from core.models import (
+    Notification, BroadcastNotification, BroadcastReadMarker,
+    Event, Trainee, BeltRankProgress,
+)
 
 
 class NotificationService:
     """Service for creating and managing notifications."""
     
+    # Per-user notification summary shown in the header bell
+    CACHE_ALIAS = 'notifications'
+    SUMMARY_CACHE_KEY = 'notification_summary:{user_id}'
+    SUMMARY_SIZE = 10  # Latest notifications kept in the summary
+    SUMMARY_TIMEOUT = 300  # seconds
+    
+    # Seconds a process serves a summary from memory before checking it
+    # against the shared cache, and the most summaries it keeps
+    SUMMARY_CHECK_INTERVAL = 5.0
+    PROCESS_SUMMARIES = 1000
+    
+    # user id -> (checked at, summary), this process's copies
+    _summaries = {}
+    
+    # Changes whenever a broadcast is sent, invalidating every user's summary
+    BROADCAST_VERSION_KEY = 'notification_broadcast_version'
+    
+    ITEM_FIELDS = ('id', 'notification_type', 'title', 'message', 'is_read', 'created_at')
+    
     @staticmethod
     def create_event_notification(event, notification_type='event_created'):
         """
-        Create notifications for all trainees when an event is created/updated.
+        Announce an event to all active trainees when it is created/updated.
         
         Args:
             event: Event instance
             notification_type: Type of notification (event_created, event_updated)
-        """
-        # Get all trainee users
-        trainee_users = User.objects.filter(
-            profile__role='trainee',
-            profile__trainee__status='active'
-        )
         
+        Returns:
+            The BroadcastNotification shown to active trainees
+        """
         title = f"New Event: {event.name}"
         if notification_type == 'event_updated':
             title = f"Event Updated: {event.name}"
         
         message = f"{event.description or event.name}\n\nDate: {event.event_date}\nLocation: {event.location}"
         
-        notifications = []
-        for user in trainee_users:
-            notif = Notification(
-                notification_type=notification_type,
-                title=title,
-                message=message,
-                recipient=user,
-                event=event
-            )
-            notifications.append(notif)
-        
-        # Bulk create notifications
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-        
-        return len(notifications)
+        return BroadcastNotification.objects.create(
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            audience='active_trainees',
+            event=event
+        )
     
     @staticmethod
     def create_belt_promotion_notification(belt_rank_progress):
@@ -102,7 +127,7 @@ class NotificationService:
             notifications.append(notif)
         
         if notifications:
-            Notification.objects.bulk_create(notifications)
+            NotificationService.bulk_create(notifications)
         
         return len(notifications)
     
@@ -147,7 +172,7 @@ class NotificationService:
         ))
         
         if notifications:
-            Notification.objects.bulk_create(notifications)
+            NotificationService.bulk_create(notifications)
         
         return len(notifications)
     
@@ -181,25 +206,49 @@ class NotificationService:
             notifications.append(notif)
         
         if notifications:
-            Notification.objects.bulk_create(notifications)
+            NotificationService.bulk_create(notifications)
         
         return len(notifications)
     
     @staticmethod
     def create_event_closed_notification(event, reason):
         """
-        Create notifications for all trainees when an event registration closes.
+        Announce to all active trainees that an event's registration closed.
         
         Args:
             event: Event instance
             reason: Reason for closure ('registration_deadline_passed' or 'max_participants_reached')
+        
+        Returns:
+            The BroadcastNotification shown to active trainees
         """
-        # Get all trainee users
-        trainee_users = User.objects.filter(
-            profile__role='trainee',
-            profile__trainee__status='active'
-        )
+        broadcast = NotificationService._event_closed_broadcast(event, reason)
+        broadcast.save()
+        return broadcast
+    
+    @staticmethod
+    def create_event_closed_notifications(events, reason):
+        """
+        Announce the closed registration of many events at once, with one
+        insert and a single summary invalidation.
         
+        Args:
+            events: Event instances closed for the same reason
+            reason: Reason for closure, as for create_event_closed_notification
+        
+        Returns:
+            The created BroadcastNotifications
+        """
+        broadcasts = BroadcastNotification.objects.bulk_create([
+            NotificationService._event_closed_broadcast(event, reason) for event in events
+        ])
+        if broadcasts:
+            NotificationService.invalidate_broadcast_summaries()
+        return broadcasts
+    
+    @staticmethod
+    def _event_closed_broadcast(event, reason):
+        """Build the unsaved broadcast announcing an event's closed registration."""
         if reason == 'registration_deadline_passed':
             title = f"Event Registration Closed: {event.name}"
             message = f"Registration for '{event.name}' has closed.\n\nReason: Registration deadline ({event.registration_deadline}) has passed.\n\nEvent Date: {event.event_date}"
@@ -210,22 +259,122 @@ class NotificationService:
             title = f"Event Registration Closed: {event.name}"
             message = f"Registration for '{event.name}' has closed.\n\nEvent Date: {event.event_date}"
         
-        notifications = []
-        for user in trainee_users:
-            notif = Notification(
-                notification_type='event_updated',
-                title=title,
-                message=message,
-                recipient=user,
-                event=event
-            )
-            notifications.append(notif)
+        return BroadcastNotification(
+            notification_type='event_updated',
+            title=title,
+            message=message,
+            audience='active_trainees',
+            event=event
+        )
+    
+    @staticmethod
+    def bulk_create(notifications):
+        """Bulk create notifications and invalidate their recipients' summaries."""
+        created = Notification.objects.bulk_create(notifications)
+        NotificationService.invalidate_summaries({n.recipient_id for n in notifications})
+        return created
+    
+    @staticmethod
+    def get_notification_items(user, limit=None):
+        """
+        Get a user's personal and broadcast notifications, newest first, as
+        dicts. Broadcast items have is_broadcast set and their own id space.
         
-        # Bulk create notifications
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        Args:
+            user: User instance
+            limit: Maximum number of items to return (None for all)
+        """
+        read = BroadcastReadMarker.objects.filter(user=user, broadcast=OuterRef('pk'))
+        personal = Notification.objects.filter(recipient=user).order_by('-created_at').values(
+            *NotificationService.ITEM_FIELDS
+        ).annotate(is_broadcast=Value(False))
+        shared = BroadcastNotification.visible_to(user).order_by('-created_at').values(
+            'id', 'notification_type', 'title', 'message', 'created_at'
+        ).annotate(is_read=Exists(read), is_broadcast=Value(True))
+        if limit is not None:
+            personal, shared = personal[:limit], shared[:limit]
+        
+        items = heapq.merge(personal, shared, key=itemgetter('created_at'), reverse=True)
+        return list(islice(items, limit))
+    
+    @staticmethod
+    def get_unread_count(user):
+        """Count a user's unread personal and broadcast notifications."""
+        return (
+            Notification.objects.filter(recipient=user, is_read=False).count()
+            + BroadcastNotification.visible_to(user).exclude(read_markers__user=user).count()
+        )
+    
+    @staticmethod
+    def get_notification_summary(user):
+        """
+        Get the unread count and latest notifications for a user, cached
+        until one of the user's notifications is created or marked read, or
+        a broadcast is sent.
         
-        return len(notifications)
+        Returns:
+            Dict with 'unread_count' and 'latest' (list of notification dicts),
+            shared by every caller in the process and not to be changed
+        """
+        now = time.monotonic()
+        local = NotificationService._summaries.get(user.pk)
+        if local is not None and now - local[0] < NotificationService.SUMMARY_CHECK_INTERVAL:
+            return local[1]
+        
+        cache = caches[NotificationService.CACHE_ALIAS]
+        key = NotificationService.SUMMARY_CACHE_KEY.format(user_id=user.pk)
+        cached = cache.get_many([key, NotificationService.BROADCAST_VERSION_KEY])
+        broadcast_version = cached.get(NotificationService.BROADCAST_VERSION_KEY)
+        if broadcast_version is None:
+            broadcast_version = NotificationService.invalidate_broadcast_summaries()
+        
+        summary = cached.get(key)
+        if summary is None or summary['broadcast_version'] != broadcast_version:
+            summary = {
+                'unread_count': NotificationService.get_unread_count(user),
+                'latest': NotificationService.get_notification_items(
+                    user, limit=NotificationService.SUMMARY_SIZE
+                ),
+                'broadcast_version': broadcast_version,
+            }
+            cache.set(key, summary, NotificationService.SUMMARY_TIMEOUT)
+        
+        if len(NotificationService._summaries) >= NotificationService.PROCESS_SUMMARIES:
+            NotificationService._summaries = {}
+        NotificationService._summaries[user.pk] = (now, summary)
+        return summary
+    
+    @staticmethod
+    def invalidate_summaries(user_ids):
+        """Drop the cached notification summaries of the given users."""
+        user_ids = list(user_ids)
+        for user_id in user_ids:
+            NotificationService._summaries.pop(user_id, None)
+        caches[NotificationService.CACHE_ALIAS].delete_many([
+            NotificationService.SUMMARY_CACHE_KEY.format(user_id=user_id)
+            for user_id in user_ids
+        ])
+    
+    @staticmethod
+    def forget_process_summaries():
+        """Drop this process's copies of the summaries, leaving the shared cache."""
+        NotificationService._summaries = {}
+    
+    @staticmethod
+    def invalidate_broadcast_summaries():
+        """
+        Invalidate every user's cached summary after a broadcast changes, by
+        moving to a new broadcast version instead of deleting each user's key.
+        
+        Returns:
+            The new broadcast version
+        """
+        version = time.time_ns()
+        caches[NotificationService.CACHE_ALIAS].set(
+            NotificationService.BROADCAST_VERSION_KEY, version, None
+        )
+        NotificationService.forget_process_summaries()
+        return version
     
     @staticmethod
     def get_unread_notifications(user):
@@ -247,12 +396,35 @@ class NotificationService:
         except Notification.DoesNotExist:
             return False
     
+    @staticmethod
+    def mark_broadcast_as_read(user, broadcast_id):
+        """Mark a broadcast notification as read for a user."""
+        if not BroadcastNotification.visible_to(user).filter(pk=broadcast_id).exists():
+            return False
+        BroadcastReadMarker.objects.get_or_create(user=user, broadcast_id=broadcast_id)
+        NotificationService.invalidate_summaries([user.pk])
+        return True
+    
     @staticmethod
     def mark_all_as_read(user):
-        """Mark all notifications for a user as read."""
+        """Mark all notifications for a user as read, including broadcasts."""
         from django.utils import timezone
+        now = timezone.now()
         count = Notification.objects.filter(
             recipient=user, 
             is_read=False
-        ).update(is_read=True, read_at=timezone.now())
-        return count
+        ).update(is_read=True, read_at=now)
+        
+        unread_broadcast_ids = BroadcastNotification.visible_to(user).exclude(
+            read_markers__user=user
+        ).values_list('pk', flat=True)
+        markers = BroadcastReadMarker.objects.bulk_create(
+            [
+                BroadcastReadMarker(user=user, broadcast_id=broadcast_id, read_at=now)
+                for broadcast_id in unread_broadcast_ids
+            ],
+            ignore_conflicts=True,
+        )
+        
+        NotificationService.invalidate_summaries([user.pk])
+        return count + len(markers)
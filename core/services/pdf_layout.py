@@ -0,0 +1,227 @@
+"""
+PDF Layout for the BlackCobra Karate Club System.
+Shared branding for every PDF export: logos, paragraph styles, the
+letterhead and the signature block.
+"""
+
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from PIL import Image as PILImage
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, Spacer, Table, TableStyle
+
+
+class PdfLayout:
+    """
+    Process-wide PDF branding.
+
+    Logos are decoded and downscaled to their printed size once, and the
+    styles are built once; every export then only creates the flowables
+    it places in its own document. Styles are shared between exports and
+    must not be modified by callers.
+    """
+
+    IMAGES_DIR = os.path.join(settings.BASE_DIR, "core", "static", "images")
+    CLUB_LOGO = os.path.join(IMAGES_DIR, "black_cobra_logo.jpg")
+    ASSOCIATION_LOGO = os.path.join(IMAGES_DIR, "judo_logo.png")
+
+    ASSOCIATION_NAME = (
+        "BLACK COBRA JUDO<br/>KARATE AIKIDO<br/>ASSOCIATION OF THE<br/>PHILIPPINES"
+    )
+
+    # Resolution logos are downscaled to for their printed size
+    LOGO_DPI = 300
+
+    def __init__(self):
+        self._logos = {}
+        self._lock = threading.Lock()
+        self._binary_builds = 0
+        self._binary_lock = threading.Lock()
+
+        self.styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            "CustomTitle",
+            parent=self.styles["Heading1"],
+            fontSize=24,
+            textColor=colors.HexColor("#1a1a1a"),
+            spaceAfter=12,
+            fontName="Helvetica-Bold",
+        )
+        self.org_header_style = ParagraphStyle(
+            "OrgHeader",
+            parent=self.styles["Heading2"],
+            fontSize=13,
+            textColor=colors.black,
+            alignment=1,  # Center alignment
+            leading=16,
+        )
+
+        # Letterhead with everything centred in its column
+        self.centered_header_style = TableStyle(
+            [
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (0, -1), 0),
+                ("RIGHTPADDING", (-1, 0), (-1, -1), 0),
+            ]
+        )
+        # Letterhead with the logos pushed to the page edges
+        self.spread_header_style = TableStyle(
+            [
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("ALIGN", (0, 0), (0, 0), "LEFT"),
+                ("ALIGN", (1, 0), (1, 0), "CENTER"),
+                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
+            ]
+        )
+
+    def build(self, doc, flowables: list):
+        """
+        Build a document with binary image and page streams.
+
+        ASCII85 only matters for 7-bit transports, and without reportlab's C
+        accelerator it is encoded in pure Python, which cost more than the
+        rest of a branded export together.
+        """
+        with self._binary_streams():
+            doc.build(flowables)
+
+    @contextmanager
+    def _binary_streams(self):
+        """
+        Turn reportlab's ASCII85 stream encoding off while builds run.
+
+        Reportlab only reads the setting from its process-wide rl_config, so
+        it is switched off by the first of any concurrent builds and restored
+        by the last one to finish, leaving it alone between exports.
+        """
+        with self._binary_lock:
+            if not self._binary_builds:
+                self._saved_use_a85 = rl_config.useA85
+                rl_config.useA85 = 0
+            self._binary_builds += 1
+        try:
+            yield
+        finally:
+            with self._binary_lock:
+                self._binary_builds -= 1
+                if not self._binary_builds:
+                    rl_config.useA85 = self._saved_use_a85
+
+    def logo(self, path: str, size: float):
+        """
+        Build an Image flowable for a square logo.
+
+        Args:
+            path: Image file path
+            size: Printed width and height in points
+
+        Returns:
+            Image flowable, or None if the file is missing or unreadable
+        """
+        key = (path, size)
+        if key not in self._logos:
+            with self._lock:
+                if key not in self._logos:
+                    self._logos[key] = self._downscale(path, size)
+        data = self._logos[key]
+        if data is None:
+            return None
+        return Image(io.BytesIO(data), width=size, height=size)
+
+    def _downscale(self, path: str, size: float):
+        """Decode a logo and re-encode it as a JPEG sized for printing."""
+        pixels = max(1, round(size / inch * self.LOGO_DPI))
+        try:
+            with PILImage.open(path) as image:
+                if image.mode in ("RGBA", "LA", "P"):
+                    image = image.convert("RGBA")
+                    background = PILImage.new("RGB", image.size, "white")
+                    background.paste(image, mask=image.getchannel("A"))
+                    image = background
+                else:
+                    image = image.convert("RGB")
+                image = image.resize((pixels, pixels), PILImage.LANCZOS)
+        except OSError:
+            return None
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        return buffer.getvalue()
+
+    def letterhead(
+        self, center, col_widths: list, logo_size: float = inch, spread: bool = False
+    ) -> Table:
+        """
+        Build the club letterhead: club logo, center content, association logo.
+
+        Args:
+            center: Flowable placed between the logos
+            col_widths: Widths of the three columns
+            logo_size: Printed size of each logo
+            spread: Push the logos to the page edges instead of centring them
+
+        Returns:
+            Table flowable
+        """
+        header_table = Table(
+            [
+                [
+                    self.logo(self.CLUB_LOGO, logo_size) or "",
+                    center,
+                    self.logo(self.ASSOCIATION_LOGO, logo_size) or "",
+                ]
+            ],
+            colWidths=col_widths,
+        )
+        header_table.setStyle(
+            self.spread_header_style if spread else self.centered_header_style
+        )
+        return header_table
+
+    def association_header(self) -> Table:
+        """Letterhead with the association name, used by the club reports."""
+        return self.letterhead(
+            Paragraph(self.ASSOCIATION_NAME, self.org_header_style),
+            col_widths=[1.2 * inch, 3.6 * inch, 1.2 * inch],
+        )
+
+    def signature_block(
+        self,
+        label: str = "Authorized By:",
+        signer: str = "Admin Signature",
+        space_before: int = 30,
+        rule: bool = True,
+    ) -> list:
+        """
+        Build the signatory section closing a report.
+
+        Args:
+            label: Text above the signature line
+            signer: Text below the signature line
+            space_before: Space above the section in points
+            rule: Whether to draw a full-width rule above the label
+
+        Returns:
+            List of flowables
+        """
+        normal = self.styles["Normal"]
+        elements = [Spacer(1, space_before)]
+        if rule:
+            elements.append(Paragraph("_" * 80, normal))
+        elements.append(Paragraph(label, normal))
+        elements.append(Spacer(1, 20))
+        elements.append(Paragraph("_" * 40, normal))
+        elements.append(Paragraph(signer, normal))
+        return elements
+
+
+pdf_layout = PdfLayout()
@@ -0,0 +1,112 @@
+"""
+PDF Tables for the BlackCobra Karate Club System.
+
+Large listings in PDF exports (thousands of trainees, attendance records or
+participants) are laid out with PagedTable instead of a single ReportLab
+Table. A single Table measures every row up front and, when it is split
+across pages, copies the remaining rows and styles for every page, so its
+render time and memory grow faster than its row count.
+"""
+from reportlab.platypus import Flowable, Table
+
+
+class PagedTable(Flowable):
+    """
+    A listing laid out one page-sized Table at a time.
+
+    Rows are pulled from an iterable (a list, or a generator over a
+    queryset iterator) only as pages are laid out. Each page gets its own
+    Table of the rows that fit, headed by the header row. Column widths are
+    fixed and every row has the height of the first one, so the rows that
+    fit a page are counted rather than measured, and render time stays
+    linear in the number of rows.
+
+    Cells should be single-line strings; taller content is clipped to the
+    row height.
+    """
+
+    def __init__(self, header: list, rows, col_widths: list, style):
+        """
+        Args:
+            header: Header row, repeated at the top of every page
+            rows: Iterable of data rows, consumed once
+            col_widths: Width of each column in points
+            style: TableStyle (or list of commands) applied to each page table,
+                with row 0 as the header
+        """
+        super().__init__()
+        self.hAlign = "CENTER"  # Placed like a Table
+        self.header = header
+        self.rows = iter(rows)
+        self.col_widths = col_widths
+        self.style = style
+        self.header_height = None
+        self.row_height = None
+        self._pending = []  # Rows pulled from self.rows but not laid out yet
+        self._table = None
+
+    def _pull(self, count: int):
+        """Pull rows until count are pending or the rows run out."""
+        while len(self._pending) < count:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            self._pending.append(row)
+
+    def _measure(self):
+        """Measure the header and row heights once, from the first row."""
+        self._pull(1)
+        sample = self._pending[:1] or [[""] * len(self.header)]
+        table = Table([self.header, *sample], colWidths=self.col_widths)
+        table.setStyle(self.style)
+        table.wrap(sum(self.col_widths), 1 << 30)
+        self.header_height, self.row_height = table._rowHeights[:2]
+
+    def _rows_fitting(self, height: float) -> int:
+        return max(0, int((height - self.header_height) // self.row_height))
+
+    def _page_table(self, rows: list) -> Table:
+        table = Table(
+            [self.header, *rows],
+            colWidths=self.col_widths,
+            rowHeights=[self.header_height] + [self.row_height] * len(rows),
+        )
+        table.setStyle(self.style)
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        if self.row_height is None:
+            self._measure()
+        fitting = self._rows_fitting(availHeight)
+        self._pull(fitting + 1)
+
+        self.width = sum(self.col_widths)
+        if len(self._pending) > fitting:
+            # More rows than fit: report a height the frame must split
+            self._table = None
+            self.height = availHeight + self.row_height
+        else:
+            self._table = self._page_table(self._pending)
+            self.height = self.header_height + len(self._pending) * self.row_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        if self.row_height is None:
+            self._measure()
+        fitting = self._rows_fitting(availHeight)
+        if not fitting:
+            return []  # Not even one row fits: move on to the next page
+        self._pull(fitting + 1)
+        if len(self._pending) <= fitting:
+            return [self._page_table(self._pending)]
+
+        # The rest continues in a new flowable: platypus keeps layout state
+        # on flowables it has tried to place
+        rest = PagedTable(self.header, self.rows, self.col_widths, self.style)
+        rest.header_height, rest.row_height = self.header_height, self.row_height
+        rest._pending = self._pending[fitting:]
+        return [self._page_table(self._pending[:fitting]), rest]
+
+    def draw(self):
+        self._table.wrapOn(self.canv, self.width, self.height)
+        self._table.drawOn(self.canv, 0, 0)
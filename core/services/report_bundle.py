@@ -0,0 +1,100 @@
+"""
+Report Bundles for the BlackCobra Karate Club System.
+
+A bundle is a zip of several ReportService report PDFs for one period,
+such as the year-end set of progression reports. It is rendered as a
+background export (kind "bundle", see core.services.report_exports).
+
+The reports are rendered in parallel by a pool of worker processes.
+Workers are spawned rather than forked, so none of them inherits the
+parent's database connection: each one sets Django up and opens its own.
+Spawned workers import this module before Django is set up, so models
+and services are imported inside the functions that use them.
+"""
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Report type -> title, in bundle order
+BUNDLE_REPORTS = {
+    "belt_promotion_history": "Belt Promotion History",
+    "trainee_skill_progression": "Skill Progression",
+    "tournament_participation": "Tournament Participation",
+    "performance_evaluation": "Performance Evaluation",
+    "competition_results": "Competition Results",
+    "trainee_milestones": "Trainee Milestones",
+}
+
+# Upper bound on worker processes per bundle
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def render_report_bundle(output, report_types, options, workers=None):
+    """
+    Render reports into a zip of PDFs.
+
+    Args:
+        output: Binary file the zip is written to
+        report_types: Report types from BUNDLE_REPORTS
+        options: Report options shared by every report; date options are
+            ISO strings
+        workers: Worker processes to use (default: one per report, at
+            most MAX_WORKERS); 1 renders in this process
+    """
+    report_types = [name for name in BUNDLE_REPORTS if name in report_types]
+    if not report_types:
+        raise ValueError("No reports selected for the bundle")
+
+    workers = min(workers or MAX_WORKERS, len(report_types))
+    if workers > 1 and not _database_is_shared():
+        workers = 1
+
+    if workers == 1:
+        pdfs = map(render_bundle_report, report_types, repeat(options))
+        _write_bundle(output, report_types, pdfs)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_setup_worker,
+    ) as pool:
+        pdfs = pool.map(render_bundle_report, report_types, repeat(options))
+        _write_bundle(output, report_types, pdfs)
+
+
+def render_bundle_report(report_type, options):
+    """Render one report of a bundle and return the PDF."""
+    import io
+
+    from core.services.report_exports import render_report_pdf
+
+    output = io.BytesIO()
+    render_report_pdf(output, report_type, options)
+    return output.getvalue()
+
+
+def _write_bundle(output, report_types, pdfs):
+    """Write the rendered PDFs to the zip in bundle order."""
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for report_type, pdf in zip(report_types, pdfs):
+            bundle.writestr(f"{report_type}.pdf", pdf)
+
+
+def _setup_worker():
+    """Set Django up in a freshly spawned worker process."""
+    import django
+
+    django.setup()
+
+
+def _database_is_shared():
+    """
+    Whether worker processes can open the database this process uses.
+    An in-memory SQLite database, as used by the tests, is private.
+    """
+    from django.db import connection
+
+    return not (connection.vendor == "sqlite" and connection.is_in_memory_db())
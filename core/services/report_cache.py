@@ -0,0 +1,156 @@
+"""
+Report Cache for the BlackCobra Karate Club System.
+
+Caches report data by report type and parameters in the "reports" cache,
+which is shared by the web and job queue worker processes, so a report
+previewed on the reports page and then exported is computed once.
+
+Each cached report type has a version that moves on whenever a model the
+report reads from is saved or deleted (see core.signals); entries cached
+under an older version are never read again and expire on their own.
+Code that changes these models with queryset update() or bulk_create(),
+which send no signals, must call ReportCache.invalidate itself. Code that
+deletes many rows at once can defer invalidation, so each report type is
+invalidated once instead of once per deleted row.
+"""
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+from core.models import Event, EventRegistration, Match, Payment, Trainee
+
+
+class ReportCache:
+    """Cache of report data keyed by report type and parameters."""
+
+    CACHE_ALIAS = "reports"
+    VERSION_KEY = "report_version:{report_type}"
+    DATA_KEY = "report:{report_type}:{version}:{params}"
+    HITS_KEY = "report_cache_hits"
+    MISSES_KEY = "report_cache_misses"
+
+    # Report type -> models whose rows the report reads
+    DEPENDENCIES = {
+        "membership": (Trainee, User),
+        "financial": (Payment, Trainee, User),
+        "event": (Event, EventRegistration, Match, Trainee, User),
+    }
+
+    # Report types invalidated while deferred() is active in this thread
+    _deferred = threading.local()
+
+    @staticmethod
+    def get_or_build(report_type, params, build):
+        """
+        Get a report's data from the cache, building and caching it on a miss.
+
+        Args:
+            report_type: Report type; types without DEPENDENCIES are not cached
+            params: Report parameters (JSON-serialisable, dates allowed)
+            build: Callable returning the report data
+
+        Returns:
+            Report data dictionary
+        """
+        if report_type not in ReportCache.DEPENDENCIES:
+            return build()
+
+        cache = caches[ReportCache.CACHE_ALIAS]
+        version = cache.get(ReportCache.VERSION_KEY.format(report_type=report_type))
+        if version is None:
+            version = ReportCache.invalidate_report(report_type)
+
+        key = ReportCache.DATA_KEY.format(
+            report_type=report_type,
+            version=version,
+            params=hashlib.sha256(
+                json.dumps(params, sort_keys=True, default=str).encode()
+            ).hexdigest(),
+        )
+        data = cache.get(key)
+        if data is not None:
+            ReportCache._count(ReportCache.HITS_KEY)
+            return data
+
+        ReportCache._count(ReportCache.MISSES_KEY)
+        data = build()
+        cache.set(key, data)
+        return data
+
+    @staticmethod
+    def invalidate_report(report_type):
+        """
+        Drop every cached entry of a report type by moving to a new version.
+
+        Returns:
+            The new version
+        """
+        version = time.time_ns()
+        caches[ReportCache.CACHE_ALIAS].set(
+            ReportCache.VERSION_KEY.format(report_type=report_type), version, None
+        )
+        return version
+
+    @staticmethod
+    def invalidate(model):
+        """Drop the cached entries of every report that reads from model."""
+        pending = getattr(ReportCache._deferred, "report_types", None)
+        for report_type, models in ReportCache.DEPENDENCIES.items():
+            if model in models:
+                if pending is None:
+                    ReportCache.invalidate_report(report_type)
+                else:
+                    pending.add(report_type)
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        """
+        Collect invalidations made in this thread inside the block and apply
+        them once on exit, e.g. around a delete() that cascades to thousands
+        of rows and sends a signal for each.
+        """
+        if getattr(ReportCache._deferred, "report_types", None) is not None:
+            yield  # Already deferred by an outer block
+            return
+        ReportCache._deferred.report_types = set()
+        try:
+            yield
+        finally:
+            report_types = ReportCache._deferred.report_types
+            ReportCache._deferred.report_types = None
+            for report_type in report_types:
+                ReportCache.invalidate_report(report_type)
+
+    @staticmethod
+    def _count(key):
+        """Increment a hit/miss counter (approximate under concurrent updates)."""
+        cache = caches[ReportCache.CACHE_ALIAS]
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+    @staticmethod
+    def stats():
+        """Hit and miss counts since the counters were last reset, and the hit rate."""
+        counts = caches[ReportCache.CACHE_ALIAS].get_many(
+            [ReportCache.HITS_KEY, ReportCache.MISSES_KEY]
+        )
+        hits = counts.get(ReportCache.HITS_KEY, 0)
+        misses = counts.get(ReportCache.MISSES_KEY, 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    @staticmethod
+    def reset_stats():
+        """Reset the hit and miss counters."""
+        caches[ReportCache.CACHE_ALIAS].delete_many(
+            [ReportCache.HITS_KEY, ReportCache.MISSES_KEY]
+        )
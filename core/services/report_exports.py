@@ -0,0 +1,172 @@
+"""
+Background PDF exports for the BlackCobra Karate Club System.
+
+Export views request a ReportExport instead of rendering the PDF inside the
+request. The render runs in a job queue worker process (python manage.py
+run_jobs), the file is saved under MEDIA_ROOT/exports/, and the browser
+polls the export's status page until the file can be downloaded. Exports
+are kept for RETENTION once finished; python manage.py purge_exports
+deletes older ones and their files.
+
+Requests identical to an export that is still pending or running share it
+instead of queueing a second render. Report bundles (a zip of several
+report PDFs, see core.services.report_bundle) are exported the same way.
+"""
+import hashlib
+import io
+import json
+import os
+import secrets
+from datetime import date, timedelta
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import ReportExport
+from core.services.job_queue import JobQueue
+
+
+# Export kind -> dotted path of render(output, **params), writing the file to output
+RENDERERS = {
+    "report": "core.services.report_exports.render_report_pdf",
+    "match_monitor": "core.views.admin.render_match_monitor_pdf",
+    "match_result": "core.views.admin.render_match_result_pdf",
+    "events": "core.views.admin.render_events_pdf",
+    "bundle": "core.services.report_bundle.render_report_bundle",
+}
+
+
+def render_report_pdf(output, report_type, options):
+    """Render one of the ReportService reports; date options are ISO strings."""
+    from core.services.reports import ReportService
+
+    options = {
+        name: date.fromisoformat(value) if name in ("start_date", "end_date") and value else value
+        for name, value in options.items()
+    }
+    report_service = ReportService()
+    report_data = report_service.build_report(report_type, **options)
+    output.write(report_service.export_pdf(report_data, report_type))
+
+
+class ReportExportService:
+    """Service for requesting, rendering and tracking background PDF exports."""
+
+    # How long finished and failed exports are kept (see purge_exports)
+    RETENTION = timedelta(days=7)
+
+    @staticmethod
+    def export_key(kind, params):
+        """Identify an export request by its kind and parameters."""
+        canonical = json.dumps([kind, params], sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def request_export(kind, params, filename, user=None):
+        """
+        Queue a PDF export, or join an identical one already in flight.
+
+        Args:
+            kind: Renderer name from RENDERERS
+            params: JSON-serialisable keyword arguments for the renderer
+            filename: Name offered when the file is downloaded
+            user: User requesting the export
+
+        Returns:
+            The ReportExport to poll
+        """
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown export kind: {kind}")
+
+        key = ReportExportService.export_key(kind, params)
+        existing = ReportExport.objects.filter(
+            key=key, status__in=ReportExport.IN_FLIGHT
+        ).first()
+        if existing:
+            return existing
+
+        try:
+            with transaction.atomic():
+                export = ReportExport.objects.create(
+                    kind=kind,
+                    params=params,
+                    key=key,
+                    filename=filename,
+                    requested_by=user,
+                )
+                JobQueue.enqueue("exports.render", export_id=export.id)
+        except IntegrityError:
+            # An identical request was queued concurrently
+            return ReportExport.objects.get(key=key, status__in=ReportExport.IN_FLIGHT)
+        return export
+
+    @staticmethod
+    def render(export):
+        """
+        Render a requested export and store the file.
+
+        Does nothing if the export already finished, so a job run twice does
+        not render twice. Render and storage errors are recorded on the
+        export rather than retried: they come from the report data or the
+        file storage, not the worker. A render that runs past the job
+        queue's TIME_LIMIT is stopped and recorded the same way, so its job
+        is never reclaimed while it is still rendering. A render cut short
+        by a stopped worker is rerun when the job queue reclaims its job.
+        
+        The job runs outside a transaction (see core.tasks), so the claim
+        below commits at once and status pages show the export running.
+        """
+        claimed = ReportExport.objects.filter(
+            pk=export.pk, status__in=ReportExport.IN_FLIGHT
+        ).update(status="running", started_at=timezone.now())
+        if not claimed:
+            return
+
+        output = io.BytesIO()
+        try:
+            with transaction.atomic():
+                import_string(RENDERERS[export.kind])(output, **export.params)
+
+            extension = os.path.splitext(export.filename)[1] or ".pdf"
+            export.file.save(
+                f"{export.pk}-{secrets.token_hex(8)}{extension}",
+                ContentFile(output.getvalue()),
+                save=False,
+            )
+            ReportExport.objects.filter(pk=export.pk).update(
+                file=export.file.name, status="done", finished_at=timezone.now()
+            )
+        except Exception as exc:
+            ReportExportService.fail(export.pk, f"{type(exc).__name__}: {exc}")
+            if export.file:
+                export.file.delete(save=False)  # Stored before the status update failed
+
+    @staticmethod
+    def purge(older_than=None):
+        """
+        Delete finished and failed exports, and their files, that finished
+        more than `older_than` ago.
+        
+        Args:
+            older_than: timedelta, RETENTION by default
+        
+        Returns:
+            Number of exports deleted
+        """
+        cutoff = timezone.now() - (older_than or ReportExportService.RETENTION)
+        expired = ReportExport.objects.filter(status__in=("done", "failed"), finished_at__lt=cutoff)
+        for export in expired.exclude(file=""):
+            export.file.delete(save=False)
+        return expired.delete()[0]
+
+    @staticmethod
+    def fail(export_id, error):
+        """
+        Mark an export that is still in flight as failed, so identical
+        requests queue a fresh export instead of waiting on it.
+        """
+        ReportExport.objects.filter(pk=export_id, status__in=ReportExport.IN_FLIGHT).update(
+            status="failed", error=error, finished_at=timezone.now()
+        )
@@ -8,14 +8,14 @@ import csv
 import io
 from datetime import date
 from decimal import Decimal
-from typing import Any, Dict
+from itertools import groupby
+from typing import Any, Dict, Iterator
 
-from django.db.models import Sum, Count, Q
+from django.db.models import Case, Count, IntegerField, Prefetch, Q, Sum, Value, When
 from django.db.models.functions import TruncMonth
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate,
@@ -23,10 +23,33 @@ from reportlab.platypus import (
     TableStyle,
     Paragraph,
     Spacer,
-    Image,
 )
-import os
-from django.conf import settings
+
+from core.services.pdf_layout import pdf_layout
+from core.services.pdf_tables import PagedTable
+from core.services.report_cache import ReportCache
+from core.services.xlsx import stream_xlsx
+
+
+class _Echo:
+    """File-like object whose write() hands the CSV line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+class _Rows:
+    """
+    Report rows that are read from the database again on every iteration,
+    so report data can be read more than once without holding the rows in
+    memory.
+    """
+
+    def __init__(self, generate):
+        self._generate = generate
+
+    def __iter__(self):
+        return self._generate()
 
 
 class ReportService:
@@ -35,6 +58,12 @@ class ReportService:
     Requirements: 7.1, 7.2, 7.3, 7.4
     """
 
+    # Rows per chunk yielded by stream_csv
+    CSV_CHUNK_ROWS = 500
+
+    # Rows fetched per database round trip when a report is streamed
+    STREAM_CHUNK_SIZE = 2000
+
     def membership_report(self, start_date: date, end_date: date) -> Dict[str, Any]:
         """
         Generate membership statistics report.
@@ -303,6 +332,40 @@ class ReportService:
             "all_participants": all_participants,
         }
 
+    def build_report(self, report_type: str, **options) -> Dict[str, Any]:
+        """
+        Generate a report by its type name.
+
+        Reports with cache dependencies (see ReportCache.DEPENDENCIES) are
+        served from the report cache, so previewing a report and exporting
+        it with the same options computes it once.
+
+        Args:
+            report_type: Type of report, as accepted by export_pdf and export_csv
+            **options: Keyword arguments for the report's method
+
+        Returns:
+            dict containing the report data
+        """
+        builders = {
+            "membership": self.membership_report,
+            "financial": self.financial_report,
+            "event": self.event_report,
+            "trainee_list": self.trainee_report,
+            "session_attendance": self.session_attendance_report,
+            "belt_promotion_history": self.belt_promotion_history_report,
+            "trainee_skill_progression": self.trainee_skill_progression_report,
+            "tournament_participation": self.tournament_participation_report,
+            "performance_evaluation": self.performance_evaluation_report,
+            "competition_results": self.competition_results_report,
+            "trainee_milestones": self.trainee_milestones_report,
+        }
+        if report_type not in builders:
+            raise ValueError(f"Unknown report type: {report_type}")
+        return ReportCache.get_or_build(
+            report_type, options, lambda: builders[report_type](**options)
+        )
+
     def export_pdf(
         self, report_data: Dict[str, Any], report_type: str, sections: list = None
     ) -> bytes:
@@ -324,19 +387,10 @@ class ReportService:
         doc = SimpleDocTemplate(
             buffer, pagesize=letter, topMargin=0.5 * inch, bottomMargin=0.5 * inch
         )
-        styles = getSampleStyleSheet()
+        styles = pdf_layout.styles
+        title_style = pdf_layout.title_style
         elements = []
 
-        # Title style
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Heading1"],
-            fontSize=24,
-            textColor=colors.HexColor("#1a1a1a"),
-            spaceAfter=12,
-            fontName="Helvetica-Bold",
-        )
-
         if report_type == "membership":
             elements = self._build_membership_pdf(report_data, styles, title_style)
         elif report_type == "financial":
@@ -374,7 +428,7 @@ class ReportService:
                 report_data, styles, title_style
             )
 
-        doc.build(elements)
+        pdf_layout.build(doc, elements)
         buffer.seek(0)
         return buffer.getvalue()
 
@@ -383,58 +437,7 @@ class ReportService:
         elements = []
 
         # Add header with logos and organization name
-        logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "black_cobra_logo.jpg"
-        )
-        judo_logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "judo_logo.png"
-        )
-
-        # Create header table with left logo, center text, right logo
-        header_data = [[None, None, None]]
-
-        # Left logo
-        if os.path.exists(logo_path):
-            left_logo = Image(logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][0] = left_logo
-
-        # Center text
-        header_style = ParagraphStyle(
-            "OrgHeader",
-            parent=styles["Heading2"],
-            fontSize=13,
-            textColor=colors.black,
-            alignment=1,  # Center alignment
-            leading=16,
-        )
-        center_text = Paragraph(
-            "BLACK COBRA JUDO<br/>KARATE AIKIDO<br/>ASSOCIATION OF THE<br/>PHILIPPINES",
-            header_style,
-        )
-        header_data[0][1] = center_text
-
-        # Right logo
-        if os.path.exists(judo_logo_path):
-            right_logo = Image(judo_logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][2] = right_logo
-        else:
-            # Placeholder if judo logo doesn't exist
-            header_data[0][2] = Paragraph("Judo<br/>Logo", styles["Normal"])
-
-        header_table = Table(
-            header_data, colWidths=[1.2 * inch, 3.6 * inch, 1.2 * inch]
-        )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0),
-                    ("RIGHTPADDING", (-1, 0), (-1, -1), 0),
-                ]
-            )
-        )
-        elements.append(header_table)
+        elements.append(pdf_layout.association_header())
         elements.append(Spacer(1, 15))
 
         # Title
@@ -528,11 +531,11 @@ class ReportService:
                 elements.append(Spacer(1, 10))
 
         # Add signatory section at the end
-        elements.append(Spacer(1, 40))
-        elements.append(Paragraph("Prepared By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("INSTRUCTOR", styles["Normal"]))
+        elements.extend(
+            pdf_layout.signature_block(
+                "Prepared By:", "INSTRUCTOR", space_before=40, rule=False
+            )
+        )
 
         return elements
 
@@ -541,58 +544,7 @@ class ReportService:
         elements = []
 
         # Add header with logos and organization name
-        logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "black_cobra_logo.jpg"
-        )
-        judo_logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "judo_logo.png"
-        )
-
-        # Create header table with left logo, center text, right logo
-        header_data = [[None, None, None]]
-
-        # Left logo
-        if os.path.exists(logo_path):
-            left_logo = Image(logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][0] = left_logo
-
-        # Center text
-        header_style = ParagraphStyle(
-            "OrgHeader",
-            parent=styles["Heading2"],
-            fontSize=13,
-            textColor=colors.black,
-            alignment=1,  # Center alignment
-            leading=16,
-        )
-        center_text = Paragraph(
-            "BLACK COBRA JUDO<br/>KARATE AIKIDO<br/>ASSOCIATION OF THE<br/>PHILIPPINES",
-            header_style,
-        )
-        header_data[0][1] = center_text
-
-        # Right logo
-        if os.path.exists(judo_logo_path):
-            right_logo = Image(judo_logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][2] = right_logo
-        else:
-            # Placeholder if judo logo doesn't exist
-            header_data[0][2] = Paragraph("Judo<br/>Logo", styles["Normal"])
-
-        header_table = Table(
-            header_data, colWidths=[1.2 * inch, 3.6 * inch, 1.2 * inch]
-        )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0),
-                    ("RIGHTPADDING", (-1, 0), (-1, -1), 0),
-                ]
-            )
-        )
-        elements.append(header_table)
+        elements.append(pdf_layout.association_header())
         elements.append(Spacer(1, 15))
 
         # Title
@@ -681,11 +633,11 @@ class ReportService:
             elements.append(balance_table)
 
         # Add signatory section at the end
-        elements.append(Spacer(1, 40))
-        elements.append(Paragraph("Prepared By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("INSTRUCTOR", styles["Normal"]))
+        elements.extend(
+            pdf_layout.signature_block(
+                "Prepared By:", "INSTRUCTOR", space_before=40, rule=False
+            )
+        )
 
         return elements
 
@@ -694,58 +646,7 @@ class ReportService:
         elements = []
 
         # Add header with logos and organization name
-        logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "black_cobra_logo.jpg"
-        )
-        judo_logo_path = os.path.join(
-            settings.BASE_DIR, "core", "static", "images", "judo_logo.png"
-        )
-
-        # Create header table with left logo, center text, right logo
-        header_data = [[None, None, None]]
-
-        # Left logo
-        if os.path.exists(logo_path):
-            left_logo = Image(logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][0] = left_logo
-
-        # Center text
-        header_style = ParagraphStyle(
-            "OrgHeader",
-            parent=styles["Heading2"],
-            fontSize=13,
-            textColor=colors.black,
-            alignment=1,  # Center alignment
-            leading=16,
-        )
-        center_text = Paragraph(
-            "BLACK COBRA JUDO<br/>KARATE AIKIDO<br/>ASSOCIATION OF THE<br/>PHILIPPINES",
-            header_style,
-        )
-        header_data[0][1] = center_text
-
-        # Right logo
-        if os.path.exists(judo_logo_path):
-            right_logo = Image(judo_logo_path, width=1 * inch, height=1 * inch)
-            header_data[0][2] = right_logo
-        else:
-            # Placeholder if judo logo doesn't exist
-            header_data[0][2] = Paragraph("Judo<br/>Logo", styles["Normal"])
-
-        header_table = Table(
-            header_data, colWidths=[1.2 * inch, 3.6 * inch, 1.2 * inch]
-        )
-        header_table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("LEFTPADDING", (0, 0), (0, -1), 0),
-                    ("RIGHTPADDING", (-1, 0), (-1, -1), 0),
-                ]
-            )
-        )
-        elements.append(header_table)
+        elements.append(pdf_layout.association_header())
         elements.append(Spacer(1, 15))
 
         event = data["event"]
@@ -857,11 +758,11 @@ class ReportService:
             elements.append(weight_table)
 
         # Add signatory section at the end
-        elements.append(Spacer(1, 40))
-        elements.append(Paragraph("Prepared By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("INSTRUCTOR", styles["Normal"]))
+        elements.extend(
+            pdf_layout.signature_block(
+                "Prepared By:", "INSTRUCTOR", space_before=40, rule=False
+            )
+        )
 
         return elements
 
@@ -878,142 +779,195 @@ class ReportService:
         Returns:
             CSV content as string
         """
-        output = io.StringIO()
+        return "".join(self.stream_csv(report_data, report_type))
+
+    def stream_csv(
+        self, report_data: Dict[str, Any], report_type: str
+    ) -> Iterator[str]:
+        """
+        Export report as CSV, one chunk of rows at a time.
+
+        Rows are encoded as they are produced, so streamed report rows are
+        never held in memory as a whole. Suitable as the content of a
+        StreamingHttpResponse.
+
+        Args:
+            report_data: The report data dictionary
+            report_type: Type of report (same values as export_csv)
+
+        Returns:
+            Iterator of CSV text chunks
+        """
+        return self.csv_chunks(self._csv_rows(report_data, report_type))
+
+    def stream_xlsx(
+        self, report_data: Dict[str, Any], report_type: str
+    ) -> Iterator[bytes]:
+        """
+        Export report as an Excel workbook, one chunk at a time.
 
+        The sheet holds the same rows as the CSV export and is written with
+        the streaming writer in core.services.xlsx, so like stream_csv it
+        never holds a report built with stream=True in memory.
+
+        Args:
+            report_data: The report data dictionary
+            report_type: Type of report (same values as export_csv)
+
+        Returns:
+            Iterator of XLSX file chunks
+        """
+        return stream_xlsx(
+            self._csv_rows(report_data, report_type),
+            sheet_name=report_type.replace("_", " ").title(),
+        )
+
+    def csv_chunks(self, rows) -> Iterator[str]:
+        """
+        Encode an iterable of CSV rows lazily.
+
+        Args:
+            rows: Iterable of row lists, consumed once
+
+        Yields:
+            CSV text chunks of up to CSV_CHUNK_ROWS rows
+        """
+        writer = csv.writer(_Echo())
+        chunk = []
+        for row in rows:
+            chunk.append(writer.writerow(row))
+            if len(chunk) >= self.CSV_CHUNK_ROWS:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+    def _csv_rows(self, report_data: Dict[str, Any], report_type: str) -> Iterator[list]:
+        """Yield the CSV rows for a report type."""
         if report_type == "membership":
-            self._build_membership_csv(output, report_data)
+            return self._membership_csv_rows(report_data)
         elif report_type == "financial":
-            self._build_financial_csv(output, report_data)
+            return self._financial_csv_rows(report_data)
         elif report_type == "event":
-            self._build_event_csv(output, report_data)
+            return self._event_csv_rows(report_data)
         elif report_type == "trainee_list":
-            self._build_trainee_list_csv(output, report_data)
+            return self._trainee_list_csv_rows(report_data)
         elif report_type == "session_attendance":
-            self._build_session_attendance_csv(output, report_data)
+            return self._session_attendance_csv_rows(report_data)
         elif report_type == "belt_promotion_history":
-            self._build_belt_promotion_csv(output, report_data)
+            return self._belt_promotion_csv_rows(report_data)
         elif report_type == "trainee_skill_progression":
-            self._build_skill_progression_csv(output, report_data)
+            return self._skill_progression_csv_rows(report_data)
         elif report_type == "tournament_participation":
-            self._build_tournament_participation_csv(output, report_data)
+            return self._tournament_participation_csv_rows(report_data)
         elif report_type == "performance_evaluation":
-            self._build_performance_evaluation_csv(output, report_data)
+            return self._performance_evaluation_csv_rows(report_data)
         elif report_type == "competition_results":
-            self._build_competition_results_csv(output, report_data)
+            return self._competition_results_csv_rows(report_data)
         elif report_type == "trainee_milestones":
-            self._build_trainee_milestones_csv(output, report_data)
-
-        return output.getvalue()
-
-    def _build_membership_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for membership report."""
-        writer = csv.writer(output)
+            return self._trainee_milestones_csv_rows(report_data)
+        return iter(())
 
+    def _membership_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for membership report."""
         # Header
-        writer.writerow(["Membership Report"])
-        writer.writerow([f"Period: {data['start_date']} to {data['end_date']}"])
-        writer.writerow([])
+        yield ["Membership Report"]
+        yield [f"Period: {data['start_date']} to {data['end_date']}"]
+        yield []
 
         # Summary
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Count"])
-        writer.writerow(["Total Members", data["total_members"]])
-        writer.writerow(["Active Members", data["active_members"]])
-        writer.writerow(["Inactive Members", data["inactive_members"]])
-        writer.writerow(["Suspended Members", data["suspended_members"]])
-        writer.writerow(["New Members (Period)", data["new_members"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Count"]
+        yield ["Total Members", data["total_members"]]
+        yield ["Active Members", data["active_members"]]
+        yield ["Inactive Members", data["inactive_members"]]
+        yield ["Suspended Members", data["suspended_members"]]
+        yield ["New Members (Period)", data["new_members"]]
+        yield []
 
         # Belt breakdown with trainee names
-        writer.writerow(["Members by Belt Rank - Detailed"])
-        writer.writerow([])
+        yield ["Members by Belt Rank - Detailed"]
+        yield []
 
         if data.get("belt_rank_details"):
             for belt_rank in sorted(data["belt_rank_details"].keys()):
                 members = data["belt_rank_details"][belt_rank]
-                writer.writerow([f"{belt_rank.title()} ({len(members)})"])
-                writer.writerow(["Name", "Status", "Weight Class"])
+                yield [f"{belt_rank.title()} ({len(members)})"]
+                yield ["Name", "Status", "Weight Class"]
                 for member in members:
-                    writer.writerow(
-                        [
-                            member["name"],
-                            member["status"].title(),
-                            member["weight_class"],
-                        ]
-                    )
-                writer.writerow([])
+                    yield [
+                        member["name"],
+                        member["status"].title(),
+                        member["weight_class"],
+                    ]
+                yield []
         else:
             # Fallback to summary if detailed list not available
-            writer.writerow(["Belt Rank", "Count"])
+            yield ["Belt Rank", "Count"]
             for item in data["members_by_belt"]:
-                writer.writerow([item["belt_rank"].title(), item["count"]])
-            writer.writerow([])
+                yield [item["belt_rank"].title(), item["count"]]
+            yield []
 
         # Weight class breakdown
-        writer.writerow(["Members by Weight Class"])
-        writer.writerow(["Weight Class", "Count"])
+        yield ["Members by Weight Class"]
+        yield ["Weight Class", "Count"]
         for item in data["members_by_weight_class"]:
-            writer.writerow([item["weight_class"], item["count"]])
-
-    def _build_financial_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for financial report."""
-        writer = csv.writer(output)
+            yield [item["weight_class"], item["count"]]
 
+    def _financial_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for financial report."""
         # Header
-        writer.writerow(["Financial Report"])
-        writer.writerow([f"Period: {data['start_date']} to {data['end_date']}"])
-        writer.writerow([])
+        yield ["Financial Report"]
+        yield [f"Period: {data['start_date']} to {data['end_date']}"]
+        yield []
 
         # Summary
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Amount"])
-        writer.writerow(["Total Revenue", f"${data['total_revenue']:.2f}"])
-        writer.writerow(["Pending Payments", f"${data['pending_amount']:.2f}"])
-        writer.writerow(["Overdue Payments", f"${data['overdue_amount']:.2f}"])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Amount"]
+        yield ["Total Revenue", f"${data['total_revenue']:.2f}"]
+        yield ["Pending Payments", f"${data['pending_amount']:.2f}"]
+        yield ["Overdue Payments", f"${data['overdue_amount']:.2f}"]
+        yield []
 
         # Payments by type
-        writer.writerow(["Revenue by Payment Type"])
-        writer.writerow(["Payment Type", "Count", "Total"])
+        yield ["Revenue by Payment Type"]
+        yield ["Payment Type", "Count", "Total"]
         for item in data["payments_by_type"]:
-            writer.writerow(
-                [item["payment_type"].title(), item["count"], f"${item['total']:.2f}"]
-            )
-        writer.writerow([])
+            yield [item["payment_type"].title(), item["count"], f"${item['total']:.2f}"]
+        yield []
 
         # Outstanding balances
-        writer.writerow(["Outstanding Balances"])
-        writer.writerow(["Trainee", "Outstanding Amount"])
+        yield ["Outstanding Balances"]
+        yield ["Trainee", "Outstanding Amount"]
         for item in data["outstanding_balances"]:
             name = f"{item['trainee__profile__user__first_name']} {item['trainee__profile__user__last_name']}"
-            writer.writerow([name, f"${item['total_outstanding']:.2f}"])
+            yield [name, f"${item['total_outstanding']:.2f}"]
 
-    def _build_event_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for event report."""
-        writer = csv.writer(output)
+    def _event_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for event report."""
         event = data["event"]
 
         # Header
-        writer.writerow(["Event Report"])
-        writer.writerow([f"Event: {event['name']}"])
-        writer.writerow([f"Date: {event['event_date']}"])
-        writer.writerow([f"Location: {event['location']}"])
-        writer.writerow([])
+        yield ["Event Report"]
+        yield [f"Event: {event['name']}"]
+        yield [f"Date: {event['event_date']}"]
+        yield [f"Location: {event['location']}"]
+        yield []
 
         # Summary
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Status", event["status"].title()])
-        writer.writerow(["Max Participants", event["max_participants"]])
-        writer.writerow(["Total Registrations", data["total_registrations"]])
-        writer.writerow(["Total Matches", data["matches_summary"]["total"]])
-        writer.writerow(["Completed Matches", data["matches_summary"]["completed"]])
-        writer.writerow(["Scheduled Matches", data["matches_summary"]["scheduled"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Status", event["status"].title()]
+        yield ["Max Participants", event["max_participants"]]
+        yield ["Total Registrations", data["total_registrations"]]
+        yield ["Total Matches", data["matches_summary"]["total"]]
+        yield ["Completed Matches", data["matches_summary"]["completed"]]
+        yield ["Scheduled Matches", data["matches_summary"]["scheduled"]]
+        yield []
 
         # Participants by belt
-        writer.writerow(["Participants by Belt Rank"])
-        writer.writerow(["Belt Rank", "Count", "Trainees"])
+        yield ["Participants by Belt Rank"]
+        yield ["Belt Rank", "Count", "Trainees"]
         for item in data["participants_by_belt"]:
             belt = (
                 item.get("belt_rank", "Unknown").title()
@@ -1021,32 +975,30 @@ class ReportService:
                 else "Unknown"
             )
             names = item.get("names", "")
-            writer.writerow([belt, item["count"], names])
-        writer.writerow([])
+            yield [belt, item["count"], names]
+        yield []
 
         # Participants by weight class
-        writer.writerow(["Participants by Weight Class"])
-        writer.writerow(["Weight Class", "Count", "Trainees"])
+        yield ["Participants by Weight Class"]
+        yield ["Weight Class", "Count", "Trainees"]
         for item in data["participants_by_weight_class"]:
             weight = item.get("weight_class", "Unknown")
             names = item.get("names", "")
-            writer.writerow([weight, item["count"], names])
-        writer.writerow([])
+            yield [weight, item["count"], names]
+        yield []
 
         # All participants detailed list
         if data.get("all_participants"):
-            writer.writerow(["All Participants - Detailed List"])
-            writer.writerow(["Name", "Belt Rank", "Weight Class"])
+            yield ["All Participants - Detailed List"]
+            yield ["Name", "Belt Rank", "Weight Class"]
             for participant in sorted(
                 data["all_participants"], key=lambda x: x["name"]
             ):
-                writer.writerow(
-                    [
-                        participant["name"],
-                        participant["belt_rank"] or "Unknown",
-                        participant["weight_class"] or "Unknown",
-                    ]
-                )
+                yield [
+                    participant["name"],
+                    participant["belt_rank"] or "Unknown",
+                    participant["weight_class"] or "Unknown",
+                ]
 
     def trainee_report(
         self,
@@ -1054,6 +1006,7 @@ class ReportService:
         belt_filter: str = None,
         trainee_ids: list = None,
         export_format: str = "by_user",
+        stream: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate trainee listing report with optional filters.
@@ -1063,6 +1016,11 @@ class ReportService:
             belt_filter: Filter by belt rank
             trainee_ids: List of specific trainee IDs to export
             export_format: 'by_user' (list format) or 'by_belt' (grouped by belt)
+            stream: Return the trainees as a single-pass generator over the
+                database cursor instead of lists (for stream_csv, stream_xlsx
+                and the by-user PDF). Trainees
+                are then ordered by belt for 'by_belt', and the group sizes
+                are given in 'belt_counts' instead of 'trainees_by_belt'.
 
         Returns:
             dict containing trainee listing data
@@ -1083,59 +1041,78 @@ class ReportService:
         if belt_filter:
             trainees = trainees.filter(belt_rank=belt_filter)
 
-        # Order by name
-        trainees = trainees.order_by(
-            "profile__user__first_name", "profile__user__last_name"
+        # Summary statistics
+        summary = trainees.aggregate(
+            total_trainees=Count("id"),
+            active_trainees=Count("id", filter=Q(status="active")),
+            inactive_trainees=Count("id", filter=Q(status="inactive")),
+            suspended_trainees=Count("id", filter=Q(status="suspended")),
         )
 
-        # Build trainee list with details
-        trainee_list = []
-        for trainee in trainees:
-            user = trainee.profile.user
-            trainee_list.append(
-                {
-                    "id": trainee.id,
-                    "name": f"{user.first_name} {user.last_name}".strip()
-                    or user.username,
-                    "email": user.email,
-                    "belt_rank": trainee.belt_rank or "Not Set",
-                    "weight_class": trainee.weight_class or "Not Set",
-                    "age": trainee.age
-                    if hasattr(trainee, "age") and trainee.age is not None
-                    else "N/A",
-                    "status": trainee.status.title(),
-                    "join_date": trainee.joined_date,
-                }
-            )
+        # Order by name
+        name_order = ("profile__user__first_name", "profile__user__last_name")
 
-        # Group by belt rank if requested
         trainees_by_belt = {}
-        if export_format == "by_belt":
-            for trainee in trainee_list:
-                belt = trainee["belt_rank"]
-                if belt not in trainees_by_belt:
-                    trainees_by_belt[belt] = []
-                trainees_by_belt[belt].append(trainee)
+        belt_counts = {}
+        if stream:
+            if export_format == "by_belt":
+                belt_position = Case(
+                    *[
+                        When(belt_rank=belt, then=Value(position))
+                        for belt, position in Trainee.BELT_ORDER.items()
+                    ],
+                    default=Value(len(Trainee.BELT_ORDER)),
+                    output_field=IntegerField(),
+                )
+                trainees = trainees.order_by(belt_position, "belt_rank", *name_order)
+                for row in trainees.values("belt_rank").annotate(count=Count("id")):
+                    belt = row["belt_rank"] or "Not Set"
+                    belt_counts[belt] = belt_counts.get(belt, 0) + row["count"]
+            else:
+                trainees = trainees.order_by(*name_order)
+            trainee_list = (
+                self._trainee_row(trainee)
+                for trainee in trainees.iterator(chunk_size=self.STREAM_CHUNK_SIZE)
+            )
+        else:
+            trainee_list = [
+                self._trainee_row(trainee) for trainee in trainees.order_by(*name_order)
+            ]
+
+            # Group by belt rank if requested
+            if export_format == "by_belt":
+                for trainee in trainee_list:
+                    belt = trainee["belt_rank"]
+                    if belt not in trainees_by_belt:
+                        trainees_by_belt[belt] = []
+                    trainees_by_belt[belt].append(trainee)
 
-        # Summary statistics
         return {
             "report_type": "trainee_list",
             "export_format": export_format,
             "generated_date": date.today(),
-            "total_trainees": len(trainee_list),
-            "active_trainees": sum(
-                1 for t in trainee_list if "active" in t["status"].lower()
-            ),
-            "inactive_trainees": sum(
-                1 for t in trainee_list if "inactive" in t["status"].lower()
-            ),
-            "suspended_trainees": sum(
-                1 for t in trainee_list if "suspended" in t["status"].lower()
-            ),
+            **summary,
             "status_filter": status_filter or "All",
             "belt_filter": belt_filter or "All",
             "trainees": trainee_list,
             "trainees_by_belt": trainees_by_belt,
+            "belt_counts": belt_counts,
+        }
+
+    def _trainee_row(self, trainee) -> Dict[str, Any]:
+        """Flatten a trainee into the fields listed by the trainee report."""
+        user = trainee.profile.user
+        return {
+            "id": trainee.id,
+            "name": f"{user.first_name} {user.last_name}".strip() or user.username,
+            "email": user.email,
+            "belt_rank": trainee.belt_rank or "Not Set",
+            "weight_class": trainee.weight_class or "Not Set",
+            "age": trainee.age
+            if hasattr(trainee, "age") and trainee.age is not None
+            else "N/A",
+            "status": trainee.status.title(),
+            "join_date": trainee.joined_date,
         }
 
     def _build_trainee_list_pdf(
@@ -1207,46 +1184,42 @@ class ReportService:
 
         # Trainee details section
         if "details" in sections:
-            if data["trainees"]:
+            if data["total_trainees"]:
                 elements.append(
                     Paragraph("Trainee Details (By User)", styles["Heading3"])
                 )
                 elements.append(Spacer(1, 10))
 
-                table_data = [
-                    [
-                        "Name",
-                        "Email",
-                        "Belt Rank",
-                        "Weight Class",
-                        "Age",
-                        "Status",
-                        "Joined",
-                    ]
+                header = [
+                    "Name",
+                    "Email",
+                    "Belt Rank",
+                    "Weight Class",
+                    "Age",
+                    "Status",
+                    "Joined",
                 ]
 
-                for trainee in data["trainees"]:
-                    join_date = (
+                rows = (
+                    [
+                        trainee["name"],
+                        trainee["email"],
+                        trainee["belt_rank"],
+                        trainee["weight_class"],
+                        str(trainee["age"]),
+                        trainee["status"],
                         trainee["join_date"].strftime("%m/%d/%Y")
                         if trainee["join_date"]
-                        else "N/A"
-                    )
-                    table_data.append(
-                        [
-                            trainee["name"],
-                            trainee["email"],
-                            trainee["belt_rank"],
-                            trainee["weight_class"],
-                            str(trainee["age"]),
-                            trainee["status"],
-                            join_date,
-                        ]
-                    )
+                        else "N/A",
+                    ]
+                    for trainee in data["trainees"]
+                )
 
-                # Adjust column widths for 7 columns
-                trainee_table = Table(
-                    table_data,
-                    colWidths=[
+                # Laid out a page at a time, so trainees may be a stream
+                trainee_table = PagedTable(
+                    header,
+                    rows,
+                    col_widths=[
                         1.2 * inch,
                         1.3 * inch,
                         1 * inch,
@@ -1255,9 +1228,7 @@ class ReportService:
                         0.9 * inch,
                         0.8 * inch,
                     ],
-                )
-                trainee_table.setStyle(
-                    TableStyle(
+                    style=TableStyle(
                         [
                             ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f2937")),
                             ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
@@ -1278,7 +1249,7 @@ class ReportService:
                             ("LEFTPADDING", (0, 0), (-1, -1), 5),
                             ("RIGHTPADDING", (0, 0), (-1, -1), 5),
                         ]
-                    )
+                    ),
                 )
                 elements.append(trainee_table)
             else:
@@ -1291,12 +1262,7 @@ class ReportService:
 
         # Signature/Footer section
         if "signature" in sections:
-            elements.append(Spacer(1, 40))
-            elements.append(Paragraph("_" * 80, styles["Normal"]))
-            elements.append(Paragraph("Authorized By:", styles["Normal"]))
-            elements.append(Spacer(1, 20))
-            elements.append(Paragraph("_" * 40, styles["Normal"]))
-            elements.append(Paragraph("Admin Signature", styles["Normal"]))
+            elements.extend(pdf_layout.signature_block(space_before=40))
 
         return elements
 
@@ -1471,94 +1437,75 @@ class ReportService:
 
         # Signature/Footer section
         if "signature" in sections:
-            elements.append(Spacer(1, 20))
-            elements.append(Paragraph("_" * 80, styles["Normal"]))
-            elements.append(Paragraph("Authorized By:", styles["Normal"]))
-            elements.append(Spacer(1, 20))
-            elements.append(Paragraph("_" * 40, styles["Normal"]))
-            elements.append(Paragraph("Admin Signature", styles["Normal"]))
+            elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
-    def _build_trainee_list_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for trainee list report."""
+    def _trainee_list_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for trainee list report."""
         export_format = data.get("export_format", "by_user")
 
         if export_format == "by_belt":
-            self._build_trainee_by_belt_csv(output, data)
+            yield from self._trainee_by_belt_csv_rows(data)
         else:
-            self._build_trainee_by_user_csv(output, data)
-
-    def _build_trainee_by_user_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for trainee list organized by user."""
-        writer = csv.writer(output)
+            yield from self._trainee_by_user_csv_rows(data)
 
+    def _trainee_by_user_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for trainee list organized by user."""
         # Header
-        writer.writerow(["BlackCobra Karate Club - Trainee Management Report"])
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow(
-            [
-                f"Status Filter: {data['status_filter']} | Belt Filter: {data['belt_filter']}"
-            ]
-        )
-        writer.writerow([])
+        yield ["BlackCobra Karate Club - Trainee Management Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield [
+            f"Status Filter: {data['status_filter']} | Belt Filter: {data['belt_filter']}"
+        ]
+        yield []
 
         # Summary
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Count"])
-        writer.writerow(["Total Trainees", data["total_trainees"]])
-        writer.writerow(["Active", data["active_trainees"]])
-        writer.writerow(["Inactive", data["inactive_trainees"]])
-        writer.writerow(["Suspended", data["suspended_trainees"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Count"]
+        yield ["Total Trainees", data["total_trainees"]]
+        yield ["Active", data["active_trainees"]]
+        yield ["Inactive", data["inactive_trainees"]]
+        yield ["Suspended", data["suspended_trainees"]]
+        yield []
 
         # Detailed list
-        writer.writerow(["Trainee Details (By User)"])
-        writer.writerow(
-            ["Name", "Email", "Belt Rank", "Weight Class", "Age", "Status", "Joined"]
-        )
+        yield ["Trainee Details (By User)"]
+        yield ["Name", "Email", "Belt Rank", "Weight Class", "Age", "Status", "Joined"]
         for trainee in data["trainees"]:
             join_date = (
                 trainee["join_date"].strftime("%m/%d/%Y")
                 if trainee["join_date"]
                 else "N/A"
             )
-            writer.writerow(
-                [
-                    trainee["name"],
-                    trainee["email"],
-                    trainee["belt_rank"],
-                    trainee["weight_class"],
-                    str(trainee["age"]),
-                    trainee["status"],
-                    join_date,
-                ]
-            )
-
-    def _build_trainee_by_belt_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for trainee list organized by belt rank."""
-        writer = csv.writer(output)
+            yield [
+                trainee["name"],
+                trainee["email"],
+                trainee["belt_rank"],
+                trainee["weight_class"],
+                str(trainee["age"]),
+                trainee["status"],
+                join_date,
+            ]
 
+    def _trainee_by_belt_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for trainee list organized by belt rank."""
         # Header
-        writer.writerow(
-            ["BlackCobra Karate Club - Trainee Management Report (By Belt Rank)"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow(
-            [
-                f"Status Filter: {data['status_filter']} | Belt Filter: {data['belt_filter']}"
-            ]
-        )
-        writer.writerow([])
+        yield ["BlackCobra Karate Club - Trainee Management Report (By Belt Rank)"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield [
+            f"Status Filter: {data['status_filter']} | Belt Filter: {data['belt_filter']}"
+        ]
+        yield []
 
         # Summary
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Count"])
-        writer.writerow(["Total Trainees", data["total_trainees"]])
-        writer.writerow(["Active", data["active_trainees"]])
-        writer.writerow(["Inactive", data["inactive_trainees"]])
-        writer.writerow(["Suspended", data["suspended_trainees"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Count"]
+        yield ["Total Trainees", data["total_trainees"]]
+        yield ["Active", data["active_trainees"]]
+        yield ["Inactive", data["inactive_trainees"]]
+        yield ["Suspended", data["suspended_trainees"]]
+        yield []
 
         # Belt rank order for proper sorting
         belt_order = [
@@ -1572,46 +1519,58 @@ class ReportService:
             "master_degree",
         ]
         trainees_by_belt = data.get("trainees_by_belt", {})
+        belt_counts = data.get("belt_counts")
 
-        # Sort belts by defined order
-        sorted_belts = sorted(
-            trainees_by_belt.keys(),
-            key=lambda x: belt_order.index(x.lower().replace(" ", "_"))
-            if x.lower().replace(" ", "_") in belt_order
-            else len(belt_order),
-        )
+        if belt_counts:
+            # Streamed report: trainees already arrive grouped in belt order
+            groups = (
+                (belt_rank, belt_counts[belt_rank], belt_trainees)
+                for belt_rank, belt_trainees in groupby(
+                    data["trainees"], key=lambda x: x["belt_rank"]
+                )
+            )
+        else:
+            # Sort belts by defined order
+            sorted_belts = sorted(
+                trainees_by_belt.keys(),
+                key=lambda x: belt_order.index(x.lower().replace(" ", "_"))
+                if x.lower().replace(" ", "_") in belt_order
+                else len(belt_order),
+            )
+            groups = (
+                (
+                    belt_rank,
+                    len(trainees_by_belt[belt_rank]),
+                    sorted(trainees_by_belt[belt_rank], key=lambda x: x["name"]),
+                )
+                for belt_rank in sorted_belts
+            )
 
         # Group by belt rank
-        for belt_rank in sorted_belts:
-            belt_trainees = trainees_by_belt[belt_rank]
-
+        for belt_rank, belt_count, belt_trainees in groups:
             # Belt rank heading
             belt_label = (
                 belt_rank.title() if belt_rank != "master_degree" else "Master Degree"
             )
-            writer.writerow([f"{belt_label} Belt ({len(belt_trainees)} trainees)"])
-            writer.writerow(
-                ["Name", "Email", "Weight Class", "Age", "Status", "Joined"]
-            )
+            yield [f"{belt_label} Belt ({belt_count} trainees)"]
+            yield ["Name", "Email", "Weight Class", "Age", "Status", "Joined"]
 
-            for trainee in sorted(belt_trainees, key=lambda x: x["name"]):
+            for trainee in belt_trainees:
                 join_date = (
                     trainee["join_date"].strftime("%m/%d/%Y")
                     if trainee["join_date"]
                     else "N/A"
                 )
-                writer.writerow(
-                    [
-                        trainee["name"],
-                        trainee["email"],
-                        trainee["weight_class"],
-                        str(trainee["age"]),
-                        trainee["status"],
-                        join_date,
-                    ]
-                )
+                yield [
+                    trainee["name"],
+                    trainee["email"],
+                    trainee["weight_class"],
+                    str(trainee["age"]),
+                    trainee["status"],
+                    join_date,
+                ]
 
-            writer.writerow([])  # Empty row between belt groups
+            yield []  # Empty row between belt groups
 
     def session_attendance_report(
         self,
@@ -1623,6 +1582,13 @@ class ReportService:
         """
         Generate session attendance report.
 
+        Session statistics come from one aggregate query grouped by session.
+        Individual records are given in 'attendance_records' as an iterable
+        that streams them from the database cursor each time it is iterated,
+        ordered like the sessions and by trainee last name within a session;
+        export_pdf and stream_csv both read it without holding all records
+        in memory.
+
         Args:
             session_ids: List of specific session IDs to include
             date_from: Start date filter
@@ -1634,7 +1600,7 @@ class ReportService:
         """
         from core.models import TrainingSession, Attendance, Trainee
 
-        sessions = TrainingSession.objects.all().order_by("-date", "-start_time")
+        sessions = TrainingSession.objects.all().order_by("-date", "-start_time", "-id")
 
         # Apply filters
         if session_ids:
@@ -1645,66 +1611,102 @@ class ReportService:
             sessions = sessions.filter(date__lte=date_to)
 
         # Build session data
+        annotated = sessions.annotate(
+            present=Count(
+                "attendance_records", filter=Q(attendance_records__status="present")
+            ),
+            absent=Count(
+                "attendance_records", filter=Q(attendance_records__status="absent")
+            ),
+            excused=Count(
+                "attendance_records", filter=Q(attendance_records__status="excused")
+            ),
+            late=Count("attendance_records", filter=Q(attendance_records__status="late")),
+            marked=Count("attendance_records"),
+        )
+
         sessions_data = []
         total_present = 0
         total_absent = 0
         total_excused = 0
         total_late = 0
 
-        for session in sessions:
-            attendance_records = session.attendance_records.select_related(
-                "trainee__profile__user"
-            ).all()
-
-            present = attendance_records.filter(status="present").count()
-            absent = attendance_records.filter(status="absent").count()
-            excused = attendance_records.filter(status="excused").count()
-            late = attendance_records.filter(status="late").count()
-            total = attendance_records.count()
-
-            total_present += present + late
-            total_absent += absent
-            total_excused += excused
-            total_late += late
-
-            session_data = {
-                "id": session.id,
-                "title": session.title,
-                "session_type": session.get_session_type_display(),
-                "date": session.date,
-                "start_time": session.start_time,
-                "end_time": session.end_time,
-                "location": session.location,
-                "instructor": session.instructor,
-                "status": session.get_status_display(),
-                "present_count": present + late,
-                "absent_count": absent,
-                "excused_count": excused,
-                "late_count": late,
-                "total_marked": total,
-                "attendance_rate": int((present + late) / total * 100)
-                if total > 0
-                else 0,
-                "attendance_records": [],
-            }
+        for session in annotated:
+            present = session.present + session.late
 
-            if include_attendance_details:
-                for record in attendance_records.order_by(
-                    "trainee__profile__user__last_name"
-                ):
-                    user = record.trainee.profile.user
-                    session_data["attendance_records"].append(
-                        {
-                            "trainee_name": f"{user.first_name} {user.last_name}".strip()
-                            or user.username,
-                            "belt_rank": record.trainee.get_belt_rank_display(),
-                            "status": record.get_status_display(),
-                            "check_in_time": record.check_in_time,
-                            "notes": record.notes,
-                        }
-                    )
+            total_present += present
+            total_absent += session.absent
+            total_excused += session.excused
+            total_late += session.late
 
-            sessions_data.append(session_data)
+            sessions_data.append(
+                {
+                    "id": session.id,
+                    "title": session.title,
+                    "session_type": session.get_session_type_display(),
+                    "date": session.date,
+                    "start_time": session.start_time,
+                    "end_time": session.end_time,
+                    "location": session.location,
+                    "instructor": session.instructor,
+                    "status": session.get_status_display(),
+                    "present_count": present,
+                    "absent_count": session.absent,
+                    "excused_count": session.excused,
+                    "late_count": session.late,
+                    "total_marked": session.marked,
+                    "attendance_rate": int(present / session.marked * 100)
+                    if session.marked > 0
+                    else 0,
+                }
+            )
+
+        def attendance_rows():
+            # Plain value tuples: building five model instances per record
+            # would dominate the cost of a long export
+            belt_labels = dict(Trainee.BELT_CHOICES)
+            status_labels = dict(Attendance.STATUS_CHOICES)
+            ordered = Attendance.objects.filter(
+                session__in=sessions.values("id")
+            ).order_by(
+                "-session__date",
+                "-session__start_time",
+                "-session_id",
+                "trainee__profile__user__last_name",
+            ).values_list(
+                "session_id",
+                "session__title",
+                "session__date",
+                "trainee__profile__user__first_name",
+                "trainee__profile__user__last_name",
+                "trainee__profile__user__username",
+                "trainee__belt_rank",
+                "status",
+                "check_in_time",
+                "notes",
+            )
+            for (
+                session_id,
+                title,
+                session_date,
+                first_name,
+                last_name,
+                username,
+                belt_rank,
+                status,
+                check_in_time,
+                notes,
+            ) in ordered.iterator(chunk_size=self.STREAM_CHUNK_SIZE):
+                yield {
+                    "session_id": session_id,
+                    "session_title": title,
+                    "session_date": session_date,
+                    "trainee_name": f"{first_name} {last_name}".strip() or username,
+                    "belt_rank": belt_labels.get(belt_rank, belt_rank),
+                    "status": status_labels.get(status, status),
+                    "check_in_time": check_in_time,
+                    "notes": notes,
+                }
 
         # Calculate overall stats
         total_records = total_present + total_absent + total_excused
@@ -1724,6 +1726,9 @@ class ReportService:
             "total_late": total_late,
             "overall_attendance_rate": overall_rate,
             "sessions": sessions_data,
+            "attendance_records": _Rows(attendance_rows)
+            if include_attendance_details
+            else (),
         }
 
     def _build_session_attendance_pdf(
@@ -1796,27 +1801,24 @@ class ReportService:
             elements.append(Paragraph("Sessions Overview", styles["Heading3"]))
             elements.append(Spacer(1, 10))
 
-            session_table_data = [
-                ["Date", "Session", "Type", "Time", "Present", "Absent", "Rate"]
-            ]
-
-            for session in data["sessions"]:
-                session_table_data.append(
-                    [
-                        session["date"].strftime("%m/%d/%Y"),
-                        session["title"][:25]
-                        + ("..." if len(session["title"]) > 25 else ""),
-                        session["session_type"],
-                        session["start_time"].strftime("%H:%M"),
-                        str(session["present_count"]),
-                        str(session["absent_count"]),
-                        f"{session['attendance_rate']}%",
-                    ]
-                )
+            session_rows = (
+                [
+                    session["date"].strftime("%m/%d/%Y"),
+                    session["title"][:25]
+                    + ("..." if len(session["title"]) > 25 else ""),
+                    session["session_type"],
+                    session["start_time"].strftime("%H:%M"),
+                    str(session["present_count"]),
+                    str(session["absent_count"]),
+                    f"{session['attendance_rate']}%",
+                ]
+                for session in data["sessions"]
+            )
 
-            session_table = Table(
-                session_table_data,
-                colWidths=[
+            session_table = PagedTable(
+                ["Date", "Session", "Type", "Time", "Present", "Absent", "Rate"],
+                session_rows,
+                col_widths=[
                     0.9 * inch,
                     1.5 * inch,
                     1.1 * inch,
@@ -1825,9 +1827,7 @@ class ReportService:
                     0.7 * inch,
                     0.6 * inch,
                 ],
-            )
-            session_table.setStyle(
-                TableStyle(
+                style=TableStyle(
                     [
                         ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#374151")),
                         ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
@@ -1846,106 +1846,167 @@ class ReportService:
                         ),
                         ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
                     ]
-                )
+                ),
             )
             elements.append(session_table)
             elements.append(Spacer(1, 20))
 
         # Detailed attendance section
         if "details" in sections:
-            for session in data["sessions"]:
-                if session["attendance_records"]:
-                    elements.append(
-                        Paragraph(
-                            f"{session['title']} - {session['date'].strftime('%B %d, %Y')}",
-                            styles["Heading4"],
-                        )
+            sessions_by_id = {session["id"]: session for session in data["sessions"]}
+            for session_id, records in groupby(
+                data["attendance_records"], key=lambda record: record["session_id"]
+            ):
+                session = sessions_by_id[session_id]
+                elements.append(
+                    Paragraph(
+                        f"{session['title']} - {session['date'].strftime('%B %d, %Y')}",
+                        styles["Heading4"],
                     )
-                    elements.append(
-                        Paragraph(
-                            f"Time: {session['start_time'].strftime('%H:%M')} - {session['end_time'].strftime('%H:%M')} | "
-                            f"Location: {session['location']} | "
-                            f"Attendance: {session['attendance_rate']}%",
-                            styles["Normal"],
-                        )
+                )
+                elements.append(
+                    Paragraph(
+                        f"Time: {session['start_time'].strftime('%H:%M')} - {session['end_time'].strftime('%H:%M')} | "
+                        f"Location: {session['location']} | "
+                        f"Attendance: {session['attendance_rate']}%",
+                        styles["Normal"],
                     )
-                    elements.append(Spacer(1, 8))
+                )
+                elements.append(Spacer(1, 8))
 
-                    detail_data = [["Trainee", "Belt", "Status", "Check-in", "Notes"]]
+                # Rows are listed now: groupby moves past this session's
+                # records before the document lays the table out
+                detail_rows = [
+                    [
+                        record["trainee_name"],
+                        record["belt_rank"],
+                        record["status"],
+                        record["check_in_time"].strftime("%H:%M")
+                        if record["check_in_time"]
+                        else "-",
+                        record["notes"][:20]
+                        + ("..." if len(record["notes"]) > 20 else "")
+                        if record["notes"]
+                        else "-",
+                    ]
+                    for record in records
+                ]
 
-                    for record in session["attendance_records"]:
-                        check_in = (
-                            record["check_in_time"].strftime("%H:%M")
-                            if record["check_in_time"]
-                            else "-"
-                        )
-                        detail_data.append(
-                            [
-                                record["trainee_name"],
-                                record["belt_rank"],
-                                record["status"],
-                                check_in,
-                                record["notes"][:20]
-                                + ("..." if len(record["notes"]) > 20 else "")
-                                if record["notes"]
-                                else "-",
-                            ]
-                        )
+                detail_table = PagedTable(
+                    ["Trainee", "Belt", "Status", "Check-in", "Notes"],
+                    detail_rows,
+                    col_widths=[
+                        1.5 * inch,
+                        0.9 * inch,
+                        0.8 * inch,
+                        0.7 * inch,
+                        1.8 * inch,
+                    ],
+                    style=TableStyle(
+                        [
+                            (
+                                "BACKGROUND",
+                                (0, 0),
+                                (-1, 0),
+                                colors.HexColor("#4b5563"),
+                            ),
+                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                            ("ALIGN", (0, 0), (0, -1), "LEFT"),
+                            ("ALIGN", (4, 0), (4, -1), "LEFT"),
+                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                            ("FONTSIZE", (0, 0), (-1, 0), 8),
+                            ("FONTSIZE", (0, 1), (-1, -1), 7),
+                            ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                            (
+                                "ROWBACKGROUNDS",
+                                (0, 1),
+                                (-1, -1),
+                                [colors.white, colors.HexColor("#f9fafb")],
+                            ),
+                        ]
+                    ),
+                )
+                elements.append(detail_table)
+                elements.append(Spacer(1, 15))
 
-                    detail_table = Table(
-                        detail_data,
-                        colWidths=[
-                            1.5 * inch,
-                            0.9 * inch,
-                            0.8 * inch,
-                            0.7 * inch,
-                            1.8 * inch,
-                        ],
-                    )
-                    detail_table.setStyle(
-                        TableStyle(
-                            [
-                                (
-                                    "BACKGROUND",
-                                    (0, 0),
-                                    (-1, 0),
-                                    colors.HexColor("#4b5563"),
-                                ),
-                                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                                ("ALIGN", (0, 0), (0, -1), "LEFT"),
-                                ("ALIGN", (4, 0), (4, -1), "LEFT"),
-                                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                                ("FONTSIZE", (0, 0), (-1, 0), 8),
-                                ("FONTSIZE", (0, 1), (-1, -1), 7),
-                                ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
-                                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                                (
-                                    "ROWBACKGROUNDS",
-                                    (0, 1),
-                                    (-1, -1),
-                                    [colors.white, colors.HexColor("#f9fafb")],
-                                ),
-                            ]
-                        )
-                    )
-                    elements.append(detail_table)
-                    elements.append(Spacer(1, 15))
+        # Signature section
+        if "signature" in sections:
+            elements.extend(pdf_layout.signature_block())
+
+        return elements
+
+    def _session_attendance_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for session attendance report."""
+        # Header
+        yield ["BlackCobra Karate Club - Session Attendance Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
+
+        # Summary
+        yield ["Summary Statistics"]
+        yield ["Metric", "Value"]
+        yield ["Total Sessions", data["total_sessions"]]
+        yield ["Total Present", data["total_present"]]
+        yield ["Total Absent", data["total_absent"]]
+        yield ["Total Excused", data["total_excused"]]
+        yield ["Total Late", data["total_late"]]
+        yield ["Overall Attendance Rate", f"{data['overall_attendance_rate']}%"]
+        yield []
 
-        # Signature section
-        if "signature" in sections:
-            elements.append(Spacer(1, 30))
-            elements.append(Paragraph("_" * 80, styles["Normal"]))
-            elements.append(Paragraph("Authorized By:", styles["Normal"]))
-            elements.append(Spacer(1, 20))
-            elements.append(Paragraph("_" * 40, styles["Normal"]))
-            elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        # Sessions overview
+        yield ["Sessions Overview"]
+        yield [
+            "Date",
+            "Session",
+            "Type",
+            "Start Time",
+            "End Time",
+            "Location",
+            "Present",
+            "Absent",
+            "Excused",
+            "Late",
+            "Rate",
+        ]
 
-        return elements
+        for session in data["sessions"]:
+            yield [
+                session["date"].strftime("%Y-%m-%d"),
+                session["title"],
+                session["session_type"],
+                session["start_time"].strftime("%H:%M"),
+                session["end_time"].strftime("%H:%M"),
+                session["location"],
+                session["present_count"],
+                session["absent_count"],
+                session["excused_count"],
+                session["late_count"],
+                f"{session['attendance_rate']}%",
+            ]
+
+        yield []
 
-    def _build_session_attendance_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for session attendance report."""
-        writer = csv.writer(output)
+        # Detailed attendance
+        yield ["Detailed Attendance Records"]
+        yield ["Session", "Date", "Trainee", "Belt", "Status", "Check-in Time", "Notes"]
+
+        for record in data["attendance_records"]:
+            check_in = (
+                record["check_in_time"].strftime("%H:%M")
+                if record["check_in_time"]
+                else ""
+            )
+            yield [
+                record["session_title"],
+                record["session_date"].strftime("%Y-%m-%d"),
+                record["trainee_name"],
+                record["belt_rank"],
+                record["status"],
+                check_in,
+                record["notes"],
+            ]
 
     def _build_belt_promotion_pdf(self, data: dict, styles, title_style) -> list:
         """Build PDF elements for belt promotion history report."""
@@ -2048,12 +2109,7 @@ class ReportService:
             )
             elements.append(promo_table)
 
-        elements.append(Spacer(1, 30))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block())
 
         return elements
 
@@ -2233,12 +2289,7 @@ class ReportService:
                 elements.append(bp_table)
                 elements.append(Spacer(1, 15))
 
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
@@ -2348,12 +2399,7 @@ class ReportService:
 
             elements.append(Spacer(1, 15))
 
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
@@ -2461,12 +2507,7 @@ class ReportService:
             )
             elements.append(eval_table)
 
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
@@ -2562,12 +2603,7 @@ class ReportService:
             )
             elements.append(match_table)
 
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
@@ -2676,421 +2712,286 @@ class ReportService:
                 elements.append(milestone_table)
                 elements.append(Spacer(1, 15))
 
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 80, styles["Normal"]))
-        elements.append(Paragraph("Authorized By:", styles["Normal"]))
-        elements.append(Spacer(1, 20))
-        elements.append(Paragraph("_" * 40, styles["Normal"]))
-        elements.append(Paragraph("Admin Signature", styles["Normal"]))
+        elements.extend(pdf_layout.signature_block(space_before=20))
 
         return elements
 
-        # Header
-        writer.writerow(["BlackCobra Karate Club - Session Attendance Report"])
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
-
-        # Summary
-        writer.writerow(["Summary Statistics"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Sessions", data["total_sessions"]])
-        writer.writerow(["Total Present", data["total_present"]])
-        writer.writerow(["Total Absent", data["total_absent"]])
-        writer.writerow(["Total Excused", data["total_excused"]])
-        writer.writerow(["Total Late", data["total_late"]])
-        writer.writerow(
-            ["Overall Attendance Rate", f"{data['overall_attendance_rate']}%"]
-        )
-        writer.writerow([])
-
-        # Sessions overview
-        writer.writerow(["Sessions Overview"])
-        writer.writerow(
-            [
-                "Date",
-                "Session",
-                "Type",
-                "Start Time",
-                "End Time",
-                "Location",
-                "Present",
-                "Absent",
-                "Excused",
-                "Late",
-                "Rate",
-            ]
-        )
-
-        for session in data["sessions"]:
-            writer.writerow(
-                [
-                    session["date"].strftime("%Y-%m-%d"),
-                    session["title"],
-                    session["session_type"],
-                    session["start_time"].strftime("%H:%M"),
-                    session["end_time"].strftime("%H:%M"),
-                    session["location"],
-                    session["present_count"],
-                    session["absent_count"],
-                    session["excused_count"],
-                    session["late_count"],
-                    f"{session['attendance_rate']}%",
-                ]
-            )
-
-        writer.writerow([])
-
-        # Detailed attendance
-        writer.writerow(["Detailed Attendance Records"])
-        writer.writerow(
-            ["Session", "Date", "Trainee", "Belt", "Status", "Check-in Time", "Notes"]
-        )
-
-        for session in data["sessions"]:
-            for record in session["attendance_records"]:
-                check_in = (
-                    record["check_in_time"].strftime("%H:%M")
-                    if record["check_in_time"]
-                    else ""
-                )
-                writer.writerow(
-                    [
-                        session["title"],
-                        session["date"].strftime("%Y-%m-%d"),
-                        record["trainee_name"],
-                        record["belt_rank"],
-                        record["status"],
-                        check_in,
-                        record["notes"],
-                    ]
-                )
-
-    def _build_belt_promotion_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for belt promotion history report."""
-        writer = csv.writer(output)
-
-        writer.writerow(["BlackCobra Karate Club - Belt Promotion History Report"])
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _belt_promotion_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for belt promotion history report."""
+        yield ["BlackCobra Karate Club - Belt Promotion History Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Promotions", summary["total_promotions"]])
-        writer.writerow(["Automatic Promotions", summary["automatic_promotions"]])
-        writer.writerow(["Manual Promotions", summary["manual_promotions"]])
-        writer.writerow([])
-
-        writer.writerow(["Promotion Details"])
-        writer.writerow(
-            [
-                "Date",
-                "Trainee Name",
-                "Email",
-                "Old Belt Rank",
-                "New Belt Rank",
-                "Points Earned",
-                "Promotion Type",
-                "Promoted By",
-                "Admin Notes",
-            ]
-        )
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Promotions", summary["total_promotions"]]
+        yield ["Automatic Promotions", summary["automatic_promotions"]]
+        yield ["Manual Promotions", summary["manual_promotions"]]
+        yield []
+
+        yield ["Promotion Details"]
+        yield [
+            "Date",
+            "Trainee Name",
+            "Email",
+            "Old Belt Rank",
+            "New Belt Rank",
+            "Points Earned",
+            "Promotion Type",
+            "Promoted By",
+            "Admin Notes",
+        ]
 
         for promo in data["promotions"]:
-            writer.writerow(
-                [
-                    promo["promoted_at"].strftime("%Y-%m-%d %H:%M"),
-                    promo["trainee_name"],
-                    promo["trainee_email"],
-                    promo["old_belt_rank"],
-                    promo["new_belt_rank"],
-                    promo["points_earned"],
-                    promo["promotion_type"],
-                    promo["promoted_by"],
-                    promo["admin_notes"],
-                ]
-            )
-
-    def _build_skill_progression_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for trainee skill progression report."""
-        writer = csv.writer(output)
+            yield [
+                promo["promoted_at"].strftime("%Y-%m-%d %H:%M"),
+                promo["trainee_name"],
+                promo["trainee_email"],
+                promo["old_belt_rank"],
+                promo["new_belt_rank"],
+                promo["points_earned"],
+                promo["promotion_type"],
+                promo["promoted_by"],
+                promo["admin_notes"],
+            ]
 
-        writer.writerow(
-            ["BlackCobra Karate Club - Trainee Skill Progression Report"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _skill_progression_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for trainee skill progression report."""
+        yield ["BlackCobra Karate Club - Trainee Skill Progression Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Trainees", summary["total_trainees"]])
-        writer.writerow(["Total Evaluations", summary["total_evaluations"]])
-        writer.writerow(["Total Achievements", summary["total_achievements"]])
-        writer.writerow(["Total Belt Promotions", summary["total_belt_promotions"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Trainees", summary["total_trainees"]]
+        yield ["Total Evaluations", summary["total_evaluations"]]
+        yield ["Total Achievements", summary["total_achievements"]]
+        yield ["Total Belt Promotions", summary["total_belt_promotions"]]
+        yield []
 
         for trainee in data["trainees"]:
-            writer.writerow([f"Trainee: {trainee['name']}"])
-            writer.writerow(
-                [
-                    "Current Belt Rank",
-                    "Weight Class",
-                    "Status",
-                    "Current Points",
-                    "Wins",
-                    "Losses",
-                    "Events Participated",
-                ]
-            )
-            writer.writerow(
-                [
-                    trainee["current_belt_rank"],
-                    trainee["weight_class"],
-                    trainee["status"],
-                    trainee["current_points"],
-                    trainee["wins"],
-                    trainee["losses"],
-                    trainee["events_participated"],
-                ]
-            )
-            writer.writerow([])
+            yield [f"Trainee: {trainee['name']}"]
+            yield [
+                "Current Belt Rank",
+                "Weight Class",
+                "Status",
+                "Current Points",
+                "Wins",
+                "Losses",
+                "Events Participated",
+            ]
+            yield [
+                trainee["current_belt_rank"],
+                trainee["weight_class"],
+                trainee["status"],
+                trainee["current_points"],
+                trainee["wins"],
+                trainee["losses"],
+                trainee["events_participated"],
+            ]
+            yield []
 
             if trainee["evaluations"]:
-                writer.writerow(["Evaluations"])
-                writer.writerow(
-                    [
-                        "Date",
-                        "Overall Rating",
-                        "Average Rating",
-                        "Technique",
-                        "Speed",
-                        "Strength",
-                        "Flexibility",
-                        "Discipline",
-                        "Spirit",
-                        "Attendance Score",
-                        "Sparring Score",
-                        "Achievement Score",
-                        "Performance Score",
-                        "Total Belt Points",
-                        "Comments",
-                        "Strengths",
-                        "Areas for Improvement",
-                    ]
-                )
+                yield ["Evaluations"]
+                yield [
+                    "Date",
+                    "Overall Rating",
+                    "Average Rating",
+                    "Technique",
+                    "Speed",
+                    "Strength",
+                    "Flexibility",
+                    "Discipline",
+                    "Spirit",
+                    "Attendance Score",
+                    "Sparring Score",
+                    "Achievement Score",
+                    "Performance Score",
+                    "Total Belt Points",
+                    "Comments",
+                    "Strengths",
+                    "Areas for Improvement",
+                ]
                 for eval_obj in trainee["evaluations"]:
-                    writer.writerow(
-                        [
-                            eval_obj["date"].strftime("%Y-%m-%d %H:%M"),
-                            eval_obj["overall_rating"],
-                            f"{eval_obj['average_rating']:.2f}",
-                            eval_obj["technique"],
-                            eval_obj["speed"],
-                            eval_obj["strength"],
-                            eval_obj["flexibility"],
-                            eval_obj["discipline"],
-                            eval_obj["spirit"],
-                            eval_obj["attendance_score"],
-                            eval_obj["sparring_score"],
-                            eval_obj["achievement_score"],
-                            eval_obj["performance_score"],
-                            eval_obj["total_belt_points"],
-                            eval_obj["comments"],
-                            eval_obj["strengths"],
-                            eval_obj["areas_for_improvement"],
-                        ]
-                    )
-                writer.writerow([])
+                    yield [
+                        eval_obj["date"].strftime("%Y-%m-%d %H:%M"),
+                        eval_obj["overall_rating"],
+                        f"{eval_obj['average_rating']:.2f}",
+                        eval_obj["technique"],
+                        eval_obj["speed"],
+                        eval_obj["strength"],
+                        eval_obj["flexibility"],
+                        eval_obj["discipline"],
+                        eval_obj["spirit"],
+                        eval_obj["attendance_score"],
+                        eval_obj["sparring_score"],
+                        eval_obj["achievement_score"],
+                        eval_obj["performance_score"],
+                        eval_obj["total_belt_points"],
+                        eval_obj["comments"],
+                        eval_obj["strengths"],
+                        eval_obj["areas_for_improvement"],
+                    ]
+                yield []
 
             if trainee["achievements"]:
-                writer.writerow(["Achievements"])
-                writer.writerow(
-                    [
-                        "Title",
-                        "Description",
-                        "Achievement Type",
-                        "Date Earned",
-                        "Points Awarded",
-                    ]
-                )
+                yield ["Achievements"]
+                yield [
+                    "Title",
+                    "Description",
+                    "Achievement Type",
+                    "Date Earned",
+                    "Points Awarded",
+                ]
                 for ach_obj in trainee["achievements"]:
-                    writer.writerow(
-                        [
-                            ach_obj["title"],
-                            ach_obj["description"],
-                            ach_obj["achievement_type"],
-                            ach_obj["date_earned"].strftime("%Y-%m-%d"),
-                            ach_obj["points_awarded"],
-                        ]
-                    )
-                writer.writerow([])
+                    yield [
+                        ach_obj["title"],
+                        ach_obj["description"],
+                        ach_obj["achievement_type"],
+                        ach_obj["date_earned"].strftime("%Y-%m-%d"),
+                        ach_obj["points_awarded"],
+                    ]
+                yield []
 
             if trainee["belt_progressions"]:
-                writer.writerow(["Belt Progressions"])
-                writer.writerow(
-                    [
-                        "Old Belt Rank",
-                        "New Belt Rank",
-                        "Points Earned",
-                        "Promotion Type",
-                        "Promoted At",
-                    ]
-                )
+                yield ["Belt Progressions"]
+                yield [
+                    "Old Belt Rank",
+                    "New Belt Rank",
+                    "Points Earned",
+                    "Promotion Type",
+                    "Promoted At",
+                ]
                 for bp_obj in trainee["belt_progressions"]:
-                    writer.writerow(
-                        [
-                            bp_obj["old_belt_rank"],
-                            bp_obj["new_belt_rank"],
-                            bp_obj["points_earned"],
-                            bp_obj["promotion_type"],
-                            bp_obj["promoted_at"].strftime("%Y-%m-%d %H:%M"),
-                        ]
-                    )
-                writer.writerow([])
-            writer.writerow([])
-
-    def _build_tournament_participation_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for tournament participation report."""
-        writer = csv.writer(output)
+                    yield [
+                        bp_obj["old_belt_rank"],
+                        bp_obj["new_belt_rank"],
+                        bp_obj["points_earned"],
+                        bp_obj["promotion_type"],
+                        bp_obj["promoted_at"].strftime("%Y-%m-%d %H:%M"),
+                    ]
+                yield []
+            yield []
 
-        writer.writerow(
-            ["BlackCobra Karate Club - Tournament Participation Report"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _tournament_participation_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for tournament participation report."""
+        yield ["BlackCobra Karate Club - Tournament Participation Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Events", summary["total_events"]])
-        writer.writerow(["Total Participants", summary["total_participants"]])
-        writer.writerow(["Total Matches", summary["total_matches"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Events", summary["total_events"]]
+        yield ["Total Participants", summary["total_participants"]]
+        yield ["Total Matches", summary["total_matches"]]
+        yield []
 
         for event in data["events"]:
-            writer.writerow([f"Event: {event['name']}"])
-            writer.writerow(
-                ["Event Date", "Location", "Status", "Max Participants"]
-            )
-            writer.writerow(
-                [
-                    event["event_date"].strftime("%Y-%m-%d"),
-                    event["location"],
-                    event["status"],
-                    event["max_participants"],
-                ]
-            )
-            writer.writerow([])
+            yield [f"Event: {event['name']}"]
+            yield ["Event Date", "Location", "Status", "Max Participants"]
+            yield [
+                event["event_date"].strftime("%Y-%m-%d"),
+                event["location"],
+                event["status"],
+                event["max_participants"],
+            ]
+            yield []
 
-            writer.writerow(["Participants"])
-            writer.writerow(
-                [
-                    "Trainee Name",
-                    "Email",
-                    "Belt Rank",
-                    "Weight Class",
-                    "Registered At",
-                    "Matches Count",
-                ]
-            )
+            yield ["Participants"]
+            yield [
+                "Trainee Name",
+                "Email",
+                "Belt Rank",
+                "Weight Class",
+                "Registered At",
+                "Matches Count",
+            ]
 
             for participant in event["participants"]:
-                writer.writerow(
-                    [
-                        participant["name"],
-                        participant["email"],
-                        participant["belt_rank"],
-                        participant["weight_class"],
-                        participant["registered_at"].strftime("%Y-%m-%d %H:%M"),
-                        participant["matches_count"],
-                    ]
-                )
+                yield [
+                    participant["name"],
+                    participant["email"],
+                    participant["belt_rank"],
+                    participant["weight_class"],
+                    participant["registered_at"].strftime("%Y-%m-%d %H:%M"),
+                    participant["matches_count"],
+                ]
 
                 if participant["matches"]:
-                    writer.writerow([])
-                    writer.writerow(["  Matches for " + participant["name"]])
-                    writer.writerow(
-                        [
-                            "  Match ID",
-                            "  Match Type",
-                            "  Is Promotion Match",
-                            "  Scheduled Time",
-                            "  Status",
-                            "  Is Winner",
-                            "  Opponent",
-                        ]
-                    )
+                    yield []
+                    yield ["  Matches for " + participant["name"]]
+                    yield [
+                        "  Match ID",
+                        "  Match Type",
+                        "  Is Promotion Match",
+                        "  Scheduled Time",
+                        "  Status",
+                        "  Is Winner",
+                        "  Opponent",
+                    ]
 
                     for match in participant["matches"]:
-                        writer.writerow(
-                            [
-                                match["match_id"],
-                                match["match_type"],
-                                match["is_promotion_match"],
-                                match["scheduled_time"].strftime("%Y-%m-%d %H:%M"),
-                                match["status"],
-                                match["is_winner"],
-                                match["opponent"],
-                            ]
-                        )
-
-            writer.writerow([])
+                        yield [
+                            match["match_id"],
+                            match["match_type"],
+                            match["is_promotion_match"],
+                            match["scheduled_time"].strftime("%Y-%m-%d %H:%M"),
+                            match["status"],
+                            match["is_winner"],
+                            match["opponent"],
+                        ]
 
-    def _build_performance_evaluation_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for performance evaluation report."""
-        writer = csv.writer(output)
+            yield []
 
-        writer.writerow(
-            ["BlackCobra Karate Club - Performance Evaluation Report"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _performance_evaluation_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for performance evaluation report."""
+        yield ["BlackCobra Karate Club - Performance Evaluation Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Evaluations", summary["total_evaluations"]])
-        writer.writerow(["Completed Evaluations", summary["completed_evaluations"]])
-        writer.writerow(["Pending Evaluations", summary["pending_evaluations"]])
-        writer.writerow(
-            ["Average Overall Rating", f"{summary['average_overall_rating']:.2f}"]
-        )
-        writer.writerow(["Average Technique", f"{summary['average_technique']:.2f}"])
-        writer.writerow(["Average Speed", f"{summary['average_speed']:.2f}"])
-        writer.writerow(["Average Strength", f"{summary['average_strength']:.2f}"])
-        writer.writerow(["Average Discipline", f"{summary['average_discipline']:.2f}"])
-        writer.writerow([])
-
-        writer.writerow(["Evaluation Details"])
-        writer.writerow(
-            [
-                "Trainee Name",
-                "Email",
-                "Current Belt Rank",
-                "Evaluator",
-                "Technique",
-                "Speed",
-                "Strength",
-                "Flexibility",
-                "Discipline",
-                "Spirit",
-                "Overall Rating",
-                "Average Rating",
-                "Attendance Score",
-                "Sparring Score",
-                "Achievement Score",
-                "Performance Score",
-                "Total Belt Points",
-                "Comments",
-                "Strengths",
-                "Areas for Improvement",
-                "Recommendations",
-                "Status",
-                "Evaluated At",
-                "Next Evaluation Date",
-            ]
-        )
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Evaluations", summary["total_evaluations"]]
+        yield ["Completed Evaluations", summary["completed_evaluations"]]
+        yield ["Pending Evaluations", summary["pending_evaluations"]]
+        yield ["Average Overall Rating", f"{summary['average_overall_rating']:.2f}"]
+        yield ["Average Technique", f"{summary['average_technique']:.2f}"]
+        yield ["Average Speed", f"{summary['average_speed']:.2f}"]
+        yield ["Average Strength", f"{summary['average_strength']:.2f}"]
+        yield ["Average Discipline", f"{summary['average_discipline']:.2f}"]
+        yield []
+
+        yield ["Evaluation Details"]
+        yield [
+            "Trainee Name",
+            "Email",
+            "Current Belt Rank",
+            "Evaluator",
+            "Technique",
+            "Speed",
+            "Strength",
+            "Flexibility",
+            "Discipline",
+            "Spirit",
+            "Overall Rating",
+            "Average Rating",
+            "Attendance Score",
+            "Sparring Score",
+            "Achievement Score",
+            "Performance Score",
+            "Total Belt Points",
+            "Comments",
+            "Strengths",
+            "Areas for Improvement",
+            "Recommendations",
+            "Status",
+            "Evaluated At",
+            "Next Evaluation Date",
+        ]
 
         for eval_obj in data["evaluations"]:
             next_eval_date = (
@@ -3098,196 +2999,168 @@ class ReportService:
                 if eval_obj["next_evaluation_date"]
                 else "N/A"
             )
-            writer.writerow(
-                [
-                    eval_obj["trainee_name"],
-                    eval_obj["trainee_email"],
-                    eval_obj["current_belt_rank"],
-                    eval_obj["evaluator"],
-                    eval_obj["technique"],
-                    eval_obj["speed"],
-                    eval_obj["strength"],
-                    eval_obj["flexibility"],
-                    eval_obj["discipline"],
-                    eval_obj["spirit"],
-                    eval_obj["overall_rating"],
-                    f"{eval_obj['average_rating']:.2f}",
-                    eval_obj["attendance_score"],
-                    eval_obj["sparring_score"],
-                    eval_obj["achievement_score"],
-                    eval_obj["performance_score"],
-                    eval_obj["total_belt_points"],
-                    eval_obj["comments"],
-                    eval_obj["strengths"],
-                    eval_obj["areas_for_improvement"],
-                    eval_obj["recommendations"],
-                    eval_obj["status"],
-                    eval_obj["evaluated_at"].strftime("%Y-%m-%d %H:%M"),
-                    next_eval_date,
-                ]
-            )
-
-    def _build_competition_results_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for competition results report."""
-        writer = csv.writer(output)
+            yield [
+                eval_obj["trainee_name"],
+                eval_obj["trainee_email"],
+                eval_obj["current_belt_rank"],
+                eval_obj["evaluator"],
+                eval_obj["technique"],
+                eval_obj["speed"],
+                eval_obj["strength"],
+                eval_obj["flexibility"],
+                eval_obj["discipline"],
+                eval_obj["spirit"],
+                eval_obj["overall_rating"],
+                f"{eval_obj['average_rating']:.2f}",
+                eval_obj["attendance_score"],
+                eval_obj["sparring_score"],
+                eval_obj["achievement_score"],
+                eval_obj["performance_score"],
+                eval_obj["total_belt_points"],
+                eval_obj["comments"],
+                eval_obj["strengths"],
+                eval_obj["areas_for_improvement"],
+                eval_obj["recommendations"],
+                eval_obj["status"],
+                eval_obj["evaluated_at"].strftime("%Y-%m-%d %H:%M"),
+                next_eval_date,
+            ]
 
-        writer.writerow(
-            ["BlackCobra Karate Club - Competition Results Report"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _competition_results_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for competition results report."""
+        yield ["BlackCobra Karate Club - Competition Results Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Matches", summary["total_matches"]])
-        writer.writerow([])
-
-        writer.writerow(["Match Results"])
-        writer.writerow(
-            [
-                "Match ID",
-                "Event Name",
-                "Event Date",
-                "Match Type",
-                "Is Promotion Match",
-                "Scheduled Time",
-                "Competitor 1",
-                "Competitor 2",
-                "Winner",
-            ]
-        )
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Matches", summary["total_matches"]]
+        yield []
+
+        yield ["Match Results"]
+        yield [
+            "Match ID",
+            "Event Name",
+            "Event Date",
+            "Match Type",
+            "Is Promotion Match",
+            "Scheduled Time",
+            "Competitor 1",
+            "Competitor 2",
+            "Winner",
+        ]
 
         for match in data["matches"]:
-            writer.writerow(
-                [
-                    match["match_id"],
-                    match["event_name"],
-                    match["event_date"].strftime("%Y-%m-%d"),
-                    match["match_type"],
-                    match["is_promotion_match"],
-                    match["scheduled_time"].strftime("%Y-%m-%d %H:%M"),
-                    match["competitor1"],
-                    match["competitor2"],
-                    match["winner"],
-                ]
-            )
+            yield [
+                match["match_id"],
+                match["event_name"],
+                match["event_date"].strftime("%Y-%m-%d"),
+                match["match_type"],
+                match["is_promotion_match"],
+                match["scheduled_time"].strftime("%Y-%m-%d %H:%M"),
+                match["competitor1"],
+                match["competitor2"],
+                match["winner"],
+            ]
 
-        writer.writerow([])
-        writer.writerow(["Detailed Judge Results"])
+        yield []
+        yield ["Detailed Judge Results"]
 
         for match in data["matches"]:
             if match["results"]:
-                writer.writerow(
-                    [f"Match {match['match_id']} - {match['event_name']}"]
-                )
-                writer.writerow(
-                    [
-                        "Judge",
-                        "Winner",
-                        "Competitor 1 Score",
-                        "Competitor 2 Score",
-                        "C1 Sparring Score",
-                        "C1 Penan Score",
-                        "C1 Judo Score",
-                        "C1 Breaking Score",
-                        "C2 Sparring Score",
-                        "C2 Penan Score",
-                        "C2 Judo Score",
-                        "C2 Breaking Score",
-                        "Notes",
-                        "Submitted At",
-                    ]
-                )
+                yield [f"Match {match['match_id']} - {match['event_name']}"]
+                yield [
+                    "Judge",
+                    "Winner",
+                    "Competitor 1 Score",
+                    "Competitor 2 Score",
+                    "C1 Sparring Score",
+                    "C1 Penan Score",
+                    "C1 Judo Score",
+                    "C1 Breaking Score",
+                    "C2 Sparring Score",
+                    "C2 Penan Score",
+                    "C2 Judo Score",
+                    "C2 Breaking Score",
+                    "Notes",
+                    "Submitted At",
+                ]
 
                 for result in match["results"]:
-                    writer.writerow(
-                        [
-                            result["judge_name"],
-                            result["winner"],
-                            result["competitor1_score"],
-                            result["competitor2_score"],
-                            result["c1_sparring_score"],
-                            result["c1_penan_score"],
-                            result["c1_judo_score"],
-                            result["c1_breaking_score"],
-                            result["c2_sparring_score"],
-                            result["c2_penan_score"],
-                            result["c2_judo_score"],
-                            result["c2_breaking_score"],
-                            result["notes"],
-                            result["submitted_at"].strftime("%Y-%m-%d %H:%M"),
-                        ]
-                    )
-
-    def _build_trainee_milestones_csv(self, output: io.StringIO, data: dict) -> None:
-        """Build CSV content for trainee milestones report."""
-        writer = csv.writer(output)
+                    yield [
+                        result["judge_name"],
+                        result["winner"],
+                        result["competitor1_score"],
+                        result["competitor2_score"],
+                        result["c1_sparring_score"],
+                        result["c1_penan_score"],
+                        result["c1_judo_score"],
+                        result["c1_breaking_score"],
+                        result["c2_sparring_score"],
+                        result["c2_penan_score"],
+                        result["c2_judo_score"],
+                        result["c2_breaking_score"],
+                        result["notes"],
+                        result["submitted_at"].strftime("%Y-%m-%d %H:%M"),
+                    ]
 
-        writer.writerow(
-            ["BlackCobra Karate Club - Trainee Milestones Report"]
-        )
-        writer.writerow([f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"])
-        writer.writerow([])
+    def _trainee_milestones_csv_rows(self, data: dict) -> Iterator[list]:
+        """Yield CSV rows for trainee milestones report."""
+        yield ["BlackCobra Karate Club - Trainee Milestones Report"]
+        yield [f"Generated: {data['generated_date'].strftime('%B %d, %Y')}"]
+        yield []
 
         summary = data["summary"]
-        writer.writerow(["Summary"])
-        writer.writerow(["Metric", "Value"])
-        writer.writerow(["Total Trainees", summary["total_trainees"]])
-        writer.writerow(["Total Milestones", summary["total_milestones"]])
-        writer.writerow([])
+        yield ["Summary"]
+        yield ["Metric", "Value"]
+        yield ["Total Trainees", summary["total_trainees"]]
+        yield ["Total Milestones", summary["total_milestones"]]
+        yield []
 
         for trainee in data["trainees"]:
-            writer.writerow([f"Trainee: {trainee['name']}"])
-            writer.writerow(
-                [
-                    "Current Belt Rank",
-                    "Weight Class",
-                    "Status",
-                    "Joined Date",
-                    "Total Milestones",
-                ]
-            )
-            writer.writerow(
-                [
-                    trainee["current_belt_rank"],
-                    trainee["weight_class"],
-                    trainee["status"],
-                    trainee["joined_date"].strftime("%Y-%m-%d"),
-                    trainee["total_milestones"],
-                ]
-            )
-            writer.writerow([])
+            yield [f"Trainee: {trainee['name']}"]
+            yield [
+                "Current Belt Rank",
+                "Weight Class",
+                "Status",
+                "Joined Date",
+                "Total Milestones",
+            ]
+            yield [
+                trainee["current_belt_rank"],
+                trainee["weight_class"],
+                trainee["status"],
+                trainee["joined_date"].strftime("%Y-%m-%d"),
+                trainee["total_milestones"],
+            ]
+            yield []
 
             if trainee["milestones"]:
-                writer.writerow(["Milestones"])
-                writer.writerow(
-                    [
-                        "Date",
-                        "Type",
-                        "Title",
-                        "Description",
-                        "Achievement Type",
-                        "Points Awarded",
-                    ]
-                )
+                yield ["Milestones"]
+                yield [
+                    "Date",
+                    "Type",
+                    "Title",
+                    "Description",
+                    "Achievement Type",
+                    "Points Awarded",
+                ]
 
                 for milestone in trainee["milestones"]:
                     points_awarded = milestone.get("points_awarded", "N/A")
                     if milestone["type"] == "belt_promotion":
                         points_awarded = milestone.get("points_earned", "N/A")
 
-                    writer.writerow(
-                        [
-                            milestone["date"].strftime("%Y-%m-%d"),
-                            milestone["type"],
-                            milestone["title"],
-                            milestone["description"],
-                            milestone["achievement_type"],
-                            points_awarded,
-                        ]
-                    )
-            writer.writerow([])
+                    yield [
+                        milestone["date"].strftime("%Y-%m-%d"),
+                        milestone["type"],
+                        milestone["title"],
+                        milestone["description"],
+                        milestone["achievement_type"],
+                        points_awarded,
+                    ]
+            yield []
 
     def belt_promotion_history_report(
         self,
@@ -3403,13 +3276,55 @@ class ReportService:
             TraineePoints,
         )
 
-        trainees = Trainee.objects.select_related("profile__user").filter(
+        trainees = Trainee.objects.select_related("profile__user", "points").filter(
             archived=False
         )
 
         if trainee_id:
             trainees = trainees.filter(id=trainee_id)
 
+        # One query per related table, filtered and ordered in SQL
+        if include_evaluations:
+            eval_query = TraineeEvaluation.objects.filter(status="completed")
+            if start_date:
+                eval_query = eval_query.filter(evaluated_at__date__gte=start_date)
+            if end_date:
+                eval_query = eval_query.filter(evaluated_at__date__lte=end_date)
+            trainees = trainees.prefetch_related(
+                Prefetch(
+                    "evaluations",
+                    queryset=eval_query.order_by("-evaluated_at"),
+                    to_attr="report_evaluations",
+                )
+            )
+
+        if include_achievements:
+            ach_query = TraineeAchievement.objects.all()
+            if start_date:
+                ach_query = ach_query.filter(date_earned__gte=start_date)
+            if end_date:
+                ach_query = ach_query.filter(date_earned__lte=end_date)
+            trainees = trainees.prefetch_related(
+                Prefetch(
+                    "achievements",
+                    queryset=ach_query.order_by("-date_earned"),
+                    to_attr="report_achievements",
+                )
+            )
+
+        belt_prog_query = BeltRankProgress.objects.all()
+        if start_date:
+            belt_prog_query = belt_prog_query.filter(promoted_at__date__gte=start_date)
+        if end_date:
+            belt_prog_query = belt_prog_query.filter(promoted_at__date__lte=end_date)
+        trainees = trainees.prefetch_related(
+            Prefetch(
+                "belt_rank_progress",
+                queryset=belt_prog_query.order_by("-promoted_at"),
+                to_attr="report_belt_progressions",
+            )
+        )
+
         trainees_data = []
 
         for trainee in trainees:
@@ -3420,13 +3335,7 @@ class ReportService:
             belt_progressions = []
 
             if include_evaluations:
-                eval_query = trainee.evaluations.filter(status="completed")
-                if start_date:
-                    eval_query = eval_query.filter(evaluated_at__date__gte=start_date)
-                if end_date:
-                    eval_query = eval_query.filter(evaluated_at__date__lte=end_date)
-
-                for eval_obj in eval_query.order_by("-evaluated_at"):
+                for eval_obj in trainee.report_evaluations:
                     evaluations.append(
                         {
                             "id": eval_obj.id,
@@ -3451,13 +3360,7 @@ class ReportService:
                     )
 
             if include_achievements:
-                ach_query = trainee.achievements.all()
-                if start_date:
-                    ach_query = ach_query.filter(date_earned__gte=start_date)
-                if end_date:
-                    ach_query = ach_query.filter(date_earned__lte=end_date)
-
-                for ach_obj in ach_query.order_by("-date_earned"):
+                for ach_obj in trainee.report_achievements:
                     achievements.append(
                         {
                             "id": ach_obj.id,
@@ -3469,13 +3372,7 @@ class ReportService:
                         }
                     )
 
-            belt_prog_query = trainee.belt_rank_progress.all()
-            if start_date:
-                belt_prog_query = belt_prog_query.filter(promoted_at__date__gte=start_date)
-            if end_date:
-                belt_prog_query = belt_prog_query.filter(promoted_at__date__lte=end_date)
-
-            for bp_obj in belt_prog_query.order_by("-promoted_at"):
+            for bp_obj in trainee.report_belt_progressions:
                 belt_progressions.append(
                     {
                         "id": bp_obj.id,
@@ -3580,27 +3477,40 @@ class ReportService:
         if status_filter:
             events = events.filter(status=status_filter)
 
+        registrations = EventRegistration.objects.filter(
+            status="registered"
+        ).select_related("trainee__profile__user")
+        if trainee_id:
+            registrations = registrations.filter(trainee_id=trainee_id)
+
+        events = events.prefetch_related(
+            Prefetch("registrations", queryset=registrations, to_attr="report_registrations"),
+            Prefetch(
+                "matches",
+                queryset=Match.objects.select_related(
+                    "competitor1__profile__user", "competitor2__profile__user"
+                ).order_by("scheduled_time"),
+                to_attr="report_matches",
+            ),
+        )
+
         events_data = []
 
         for event in events:
-            registrations = event.registrations.filter(status="registered").select_related(
-                "trainee__profile__user"
-            )
-
-            if trainee_id:
-                registrations = registrations.filter(trainee_id=trainee_id)
+            # Group the event's matches by competitor, keeping schedule order
+            matches_by_trainee = {}
+            for match in event.report_matches:
+                matches_by_trainee.setdefault(match.competitor1_id, []).append(match)
+                if match.competitor2_id != match.competitor1_id:
+                    matches_by_trainee.setdefault(match.competitor2_id, []).append(match)
 
             participants_data = []
-            for reg in registrations:
+            for reg in event.report_registrations:
                 trainee = reg.trainee
                 user = trainee.profile.user
 
                 matches = []
-                matches_as_c1 = trainee.matches_as_competitor1.filter(event=event)
-                matches_as_c2 = trainee.matches_as_competitor2.filter(event=event)
-                all_matches = matches_as_c1.union(matches_as_c2).order_by("scheduled_time")
-
-                for match in all_matches:
+                for match in matches_by_trainee.get(trainee.id, []):
                     is_winner = match.winner_id == trainee.id
 
                     matches.append(
@@ -3968,6 +3878,58 @@ class ReportService:
         if trainee_id:
             trainees = trainees.filter(id=trainee_id)
 
+        # One query per milestone source, filtered and ordered in SQL
+        achievements = TraineeAchievement.objects.all()
+        if start_date:
+            achievements = achievements.filter(date_earned__gte=start_date)
+        if end_date:
+            achievements = achievements.filter(date_earned__lte=end_date)
+        if achievement_type:
+            achievements = achievements.filter(achievement_type=achievement_type)
+
+        belt_promotions = BeltRankProgress.objects.all()
+        if start_date:
+            belt_promotions = belt_promotions.filter(promoted_at__date__gte=start_date)
+        if end_date:
+            belt_promotions = belt_promotions.filter(promoted_at__date__lte=end_date)
+
+        event_regs = EventRegistration.objects.filter(status="registered").select_related(
+            "event"
+        )
+        if start_date:
+            event_regs = event_regs.filter(event__event_date__gte=start_date)
+        if end_date:
+            event_regs = event_regs.filter(event__event_date__lte=end_date)
+
+        won_matches = Match.objects.filter(status="completed").select_related("event")
+        if start_date:
+            won_matches = won_matches.filter(scheduled_time__date__gte=start_date)
+        if end_date:
+            won_matches = won_matches.filter(scheduled_time__date__lte=end_date)
+
+        trainees = trainees.prefetch_related(
+            Prefetch(
+                "achievements",
+                queryset=achievements.order_by("-date_earned"),
+                to_attr="report_achievements",
+            ),
+            Prefetch(
+                "belt_rank_progress",
+                queryset=belt_promotions.order_by("-promoted_at"),
+                to_attr="report_belt_promotions",
+            ),
+            Prefetch(
+                "event_registrations",
+                queryset=event_regs.order_by("-registered_at"),
+                to_attr="report_event_registrations",
+            ),
+            Prefetch(
+                "won_matches",
+                queryset=won_matches.order_by("-scheduled_time"),
+                to_attr="report_won_matches",
+            ),
+        )
+
         trainees_data = []
 
         for trainee in trainees:
@@ -3975,15 +3937,7 @@ class ReportService:
 
             milestones = []
 
-            achievements = trainee.achievements.all()
-            if start_date:
-                achievements = achievements.filter(date_earned__gte=start_date)
-            if end_date:
-                achievements = achievements.filter(date_earned__lte=end_date)
-            if achievement_type:
-                achievements = achievements.filter(achievement_type=achievement_type)
-
-            for ach_obj in achievements.order_by("-date_earned"):
+            for ach_obj in trainee.report_achievements:
                 milestones.append(
                     {
                         "type": "achievement",
@@ -3995,13 +3949,7 @@ class ReportService:
                     }
                 )
 
-            belt_promotions = trainee.belt_rank_progress.all()
-            if start_date:
-                belt_promotions = belt_promotions.filter(promoted_at__date__gte=start_date)
-            if end_date:
-                belt_promotions = belt_promotions.filter(promoted_at__date__lte=end_date)
-
-            for bp_obj in belt_promotions.order_by("-promoted_at"):
+            for bp_obj in trainee.report_belt_promotions:
                 milestones.append(
                     {
                         "type": "belt_promotion",
@@ -4014,15 +3962,7 @@ class ReportService:
                     }
                 )
 
-            event_regs = trainee.event_registrations.filter(status="registered").select_related(
-                "event"
-            )
-            if start_date:
-                event_regs = event_regs.filter(event__event_date__gte=start_date)
-            if end_date:
-                event_regs = event_regs.filter(event__event_date__lte=end_date)
-
-            for reg in event_regs.order_by("-registered_at"):
+            for reg in trainee.report_event_registrations:
                 milestones.append(
                     {
                         "type": "event_participation",
@@ -4033,15 +3973,7 @@ class ReportService:
                     }
                 )
 
-            won_matches = trainee.won_matches.filter(status="completed").select_related(
-                "event"
-            )
-            if start_date:
-                won_matches = won_matches.filter(scheduled_time__date__gte=start_date)
-            if end_date:
-                won_matches = won_matches.filter(scheduled_time__date__lte=end_date)
-
-            for match in won_matches.order_by("-scheduled_time"):
+            for match in trainee.report_won_matches:
                 milestones.append(
                     {
                         "type": "match_win",
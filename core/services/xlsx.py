@@ -0,0 +1,210 @@
+"""
+XLSX Export for the BlackCobra Karate Club System.
+
+Writes Excel workbooks row by row. The worksheet is encoded and deflated
+into the zip container as rows arrive and the compressed bytes are handed
+back in chunks, so memory use does not grow with the number of rows.
+Strings are stored inline instead of in a shared string table, which
+would have to be held until the end of the sheet.
+
+Only the standard library is used: the zip container is written with
+zipfile in streaming mode (no seeking back to patch headers).
+"""
+import math
+import re
+import zipfile
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Rows encoded before the compressed output is handed back
+CHUNK_ROWS = 500
+
+# Excel's day 0 in the 1900 date system (accounting for its 1900 leap year bug)
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Characters that are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# Cell style indexes in STYLES
+_DATE_STYLE = 1
+_DATETIME_STYLE = 2
+_TIME_STYLE = 3
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+# Cell formats: general, date, date and time, time (built-in number formats)
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="21" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    "</cellXfs>"
+    "</styleSheet>"
+)
+
+SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+
+SHEET_END = "</sheetData></worksheet>"
+
+
+class _ChunkSink:
+    """Write-only, unseekable file that collects what zipfile writes to it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _text(value) -> str:
+    """Escape a string for use in XML text or attributes."""
+    return escape(_ILLEGAL_XML_CHARS.sub("", str(value)), {'"': "&quot;"})
+
+
+def _serial(value) -> float:
+    """Convert a date, datetime or time to an Excel serial number."""
+    if isinstance(value, time):
+        return (value.hour * 3600 + value.minute * 60 + value.second) / 86400
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value)
+        delta = value - EXCEL_EPOCH
+    else:
+        delta = value - EXCEL_EPOCH.date()
+    return delta.days + delta.seconds / 86400
+
+
+def _cell(value) -> str:
+    """Encode one cell; empty values become empty cells."""
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)) and math.isfinite(value):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, datetime):
+        return f'<c s="{_DATETIME_STYLE}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, date):
+        return f'<c s="{_DATE_STYLE}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, time):
+        return f'<c s="{_TIME_STYLE}"><v>{_serial(value)}</v></c>'
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{_text(value)}</t></is></c>'
+
+
+def _row(number: int, values) -> str:
+    """Encode one worksheet row."""
+    return f'<row r="{number}">{"".join(_cell(value) for value in values)}</row>'
+
+
+def stream_xlsx(rows: Iterable[list], sheet_name: str = "Report") -> Iterator[bytes]:
+    """
+    Write rows to a single-sheet XLSX workbook lazily.
+
+    Strings, numbers, booleans, dates, datetimes and times are written as
+    the matching cell type; None and "" leave the cell empty.
+
+    Args:
+        rows: Iterable of row lists, consumed once
+        sheet_name: Worksheet name (at most 31 characters are kept)
+
+    Yields:
+        Chunks of the XLSX file, suitable as the content of a
+        StreamingHttpResponse
+    """
+    sheet_name = re.sub(r"[\[\]:*?/\\]", " ", sheet_name)[:31] or "Report"
+
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("xl/workbook.xml", WORKBOOK.format(sheet_name=_text(sheet_name)))
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", STYLES)
+        yield sink.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(SHEET_START.encode())
+            chunk = []
+            for number, row in enumerate(rows, start=1):
+                chunk.append(_row(number, row))
+                if len(chunk) >= CHUNK_ROWS:
+                    sheet.write("".join(chunk).encode())
+                    chunk = []
+                    data = sink.drain()
+                    if data:
+                        yield data
+            if chunk:
+                sheet.write("".join(chunk).encode())
+            sheet.write(SHEET_END.encode())
+    yield sink.drain()
@@ -1,64 +1,177 @@
 """
 Django signals for automatic notification creation.
+
+Notification fan-out and other follow-up work is queued as background jobs
+(see core.tasks), so requests return without waiting for it.
 """
-from django.db.models.signals import post_save
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from core.models import Event, EventRegistration, BeltRankProgress, Match, MatchResult
+from core.models import (
+    Event, EventRegistration, BeltRankProgress, BeltRankThreshold, Match, MatchResult,
+    Notification, BroadcastNotification, Payment, Trainee,
+)
+from core.services.belt_thresholds import BeltThresholds
+from core.services.job_queue import JobQueue
 from core.services.notification_service import NotificationService
+from core.services.report_cache import ReportCache
 
 
 @receiver(post_save, sender=Event)
 def notify_event_created(sender, instance, created, **kwargs):
     """
-    Signal handler: Create notifications for all trainees when an event is created.
+    Signal handler: Queue notifications for all trainees when an event is created.
     """
     if created and instance.status != 'draft':
         # Only notify if event is not in draft status
-        NotificationService.create_event_notification(instance, 'event_created')
+        JobQueue.enqueue('notifications.event', event_id=instance.pk, notification_type='event_created')
     elif not created:
         # Event was updated
-        NotificationService.create_event_notification(instance, 'event_updated')
+        JobQueue.enqueue('notifications.event', event_id=instance.pk, notification_type='event_updated')
+
+
+@receiver(pre_save, sender=EventRegistration)
+def claim_registration_status(sender, instance, **kwargs):
+    """
+    Signal handler: Move a saved registration into or out of the "registered"
+    status with a conditional UPDATE, so only the save that actually changes
+    the stored status changes the event's participant count.
+
+    The status loaded with an instance can be stale when the same
+    registration is saved from several instances; the row itself is not.
+    """
+    instance.participant_delta = 0
+    if instance.pk is None or getattr(instance, 'seat_reserved', False):
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    rows = EventRegistration.objects.filter(pk=instance.pk)
+    if instance.status == 'registered':
+        instance.participant_delta = rows.exclude(status='registered').update(status='registered')
+    else:
+        instance.participant_delta = -rows.filter(status='registered').update(status=instance.status)
 
 
 @receiver(post_save, sender=EventRegistration)
-def auto_close_event_on_registration(sender, instance, created, **kwargs):
+def count_saved_registration(sender, instance, created, **kwargs):
     """
-    Signal handler: Automatically close event registration if max participants reached.
+    Signal handler: Update the event's participant count when a registration
+    enters or leaves the "registered" status.
     """
+    if getattr(instance, 'seat_reserved', False):
+        # Counted when EventRegistrationService reserved its seat
+        return
     if created:
-        event = instance.event
-        # Check if event should be closed due to max participants
-        reason = event.close_registration()
-        if reason == 'max_participants_reached':
-            # Create notification about event closure
-            NotificationService.create_event_closed_notification(event, 'max_participants_reached')
+        _add_participants(instance.event_id, int(instance.status == 'registered'))
+    else:
+        _add_participants(instance.event_id, getattr(instance, 'participant_delta', 0))
+
+
+@receiver(pre_delete, sender=EventRegistration)
+def count_deleted_registration(sender, instance, **kwargs):
+    """
+    Signal handler: Update the event's participant count when a registered
+    registration is deleted.
+
+    The row is withdrawn with a conditional UPDATE first, inside the delete's
+    transaction, so deleting it from stale instances counts it once.
+    """
+    if EventRegistration.objects.filter(pk=instance.pk, status='registered').update(status='withdrawn'):
+        _add_participants(instance.event_id, -1)
+
+
+def _add_participants(event_id, delta):
+    """Change an event's stored participant count in place."""
+    if delta:
+        Event.objects.filter(pk=event_id).update(participant_count=F('participant_count') + delta)
+
+
+@receiver(post_save, sender=EventRegistration)
+def auto_close_event_on_registration(sender, instance, created, **kwargs):
+    """
+    Signal handler: Queue a check that closes event registration if max participants is reached.
+    Registrations made through EventRegistrationService close the event themselves.
+    """
+    if created and not getattr(instance, 'seat_reserved', False):
+        JobQueue.enqueue('events.close_if_full', event_id=instance.event_id)
 
 
 @receiver(post_save, sender=BeltRankProgress)
 def notify_belt_promotion(sender, instance, created, **kwargs):
     """
-    Signal handler: Create notifications when a trainee is promoted to a new belt.
+    Signal handler: Queue notifications when a trainee is promoted to a new belt.
     """
     if created:
-        # Notify the trainee
-        NotificationService.create_belt_promotion_notification(instance)
-        # Notify admins
-        NotificationService.notify_belt_promotion_to_admins(instance)
+        # Notifies the trainee and the admins
+        JobQueue.enqueue('notifications.belt_promotion', progress_id=instance.pk)
 
 
 @receiver(post_save, sender=Match)
 def notify_match_scheduled(sender, instance, created, **kwargs):
     """
-    Signal handler: Create notifications when a match is scheduled.
+    Signal handler: Queue notifications when a match is scheduled.
     """
     if created:
-        NotificationService.create_match_scheduled_notification(instance)
+        JobQueue.enqueue('notifications.match_scheduled', match_id=instance.pk)
 
 
 @receiver(post_save, sender=MatchResult)
 def notify_match_result(sender, instance, created, **kwargs):
     """
-    Signal handler: Create notifications when match results are posted.
+    Signal handler: Queue notifications when match results are posted.
     """
     if created:
-        NotificationService.create_match_result_notification(instance)
+        JobQueue.enqueue('notifications.match_result', match_result_id=instance.pk)
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_summary(sender, instance, **kwargs):
+    """
+    Signal handler: Drop the recipient's cached notification summary when a
+    notification is created, marked read or deleted.
+    """
+    NotificationService.invalidate_summaries([instance.recipient_id])
+
+
+@receiver(post_save, sender=BroadcastNotification)
+@receiver(post_delete, sender=BroadcastNotification)
+def invalidate_broadcast_summaries(sender, instance, **kwargs):
+    """
+    Signal handler: Invalidate every user's cached notification summary when
+    a broadcast is sent, edited or deleted.
+    """
+    NotificationService.invalidate_broadcast_summaries()
+
+
+@receiver(post_save, sender=BeltRankThreshold)
+@receiver(post_delete, sender=BeltRankThreshold)
+def invalidate_belt_thresholds(sender, instance, **kwargs):
+    """
+    Signal handler: Make every process reload the belt threshold table.
+    """
+    BeltThresholds.invalidate()
+
+
+@receiver(post_save, sender=Trainee)
+@receiver(post_delete, sender=Trainee)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def invalidate_report_cache(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal handler: Drop cached reports that read from the changed model.
+    """
+    if sender is User and update_fields == frozenset({'last_login'}):
+        # Logging in changes nothing a report shows
+        return
+    ReportCache.invalidate(sender)
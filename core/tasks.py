@@ -0,0 +1,77 @@
+"""
+Background tasks run by the job queue worker (python manage.py run_jobs).
+
+Tasks take ids rather than model instances, since job payloads are stored
+as JSON, and do nothing if the object was deleted before the job ran.
+"""
+from core.models import Event, BeltRankProgress, Match, MatchResult, ReportExport
+from core.services.job_queue import task
+from core.services.notification_service import NotificationService
+from core.services.report_exports import ReportExportService
+
+
+@task('notifications.event')
+def send_event_notification(event_id, notification_type):
+    """Announce a created or updated event to all trainees."""
+    event = Event.objects.filter(pk=event_id).first()
+    if event:
+        NotificationService.create_event_notification(event, notification_type)
+
+
+@task('events.close_if_full')
+def close_event_if_full(event_id):
+    """Close an event's registration once it reaches max participants."""
+    event = Event.objects.filter(pk=event_id).first()
+    if event and event.close_registration() == 'max_participants_reached':
+        NotificationService.create_event_closed_notification(event, 'max_participants_reached')
+
+
+@task('notifications.event_closed')
+def send_event_closed_notification(event_id, reason):
+    """Announce that an event's registration closed."""
+    event = Event.objects.filter(pk=event_id).first()
+    if event:
+        NotificationService.create_event_closed_notification(event, reason)
+
+
+@task('notifications.belt_promotion')
+def send_belt_promotion_notifications(progress_id):
+    """Notify a promoted trainee and the admins."""
+    progress = BeltRankProgress.objects.select_related('trainee__profile__user').filter(pk=progress_id).first()
+    if progress:
+        NotificationService.create_belt_promotion_notification(progress)
+        NotificationService.notify_belt_promotion_to_admins(progress)
+
+
+@task('notifications.match_scheduled')
+def send_match_scheduled_notifications(match_id):
+    """Notify both competitors that their match was scheduled."""
+    match = Match.objects.select_related(
+        'event', 'competitor1__profile__user', 'competitor2__profile__user'
+    ).filter(pk=match_id).first()
+    if match:
+        NotificationService.create_match_scheduled_notification(match)
+
+
+@task('notifications.match_result')
+def send_match_result_notifications(match_result_id):
+    """Notify both competitors of a posted match result."""
+    match_result = MatchResult.objects.select_related('match__event').filter(pk=match_result_id).first()
+    if match_result:
+        NotificationService.create_match_result_notification(match_result)
+
+
+def fail_report_export(export_id):
+    """Release the export of a render job that failed for good."""
+    ReportExportService.fail(export_id, 'The export job failed; request the export again')
+
+
+@task('exports.render', on_failure=fail_report_export, atomic=False)
+def render_report_export(export_id):
+    """
+    Render a requested PDF export and store the file. Runs outside the job's
+    transaction so pollers see the export running while it renders.
+    """
+    export = ReportExport.objects.filter(pk=export_id).first()
+    if export:
+        ReportExportService.render(export)
@@ -1,3 +1,1763 @@
-from django.test import TestCase
+import io
+import itertools
+import random
+import tempfile
+import zipfile
+from datetime import date, time, timedelta
+from decimal import Decimal
+from time import sleep
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import F, Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from reportlab import rl_config
+from reportlab.platypus import SimpleDocTemplate, TableStyle
+
+from core.datasets import DatasetGenerator
+from core.models import (
+    Attendance,
+    BeltRankProgress,
+    BeltRankThreshold,
+    BroadcastNotification,
+    Event,
+    EventRegistration,
+    Job,
+    Leaderboard,
+    Match,
+    Notification,
+    Payment,
+    PointsLedgerEntry,
+    ReportExport,
+    Trainee,
+    TraineeAchievement,
+    TraineeEvaluation,
+    TraineePoints,
+    TrainingSession,
+    UserProfile,
+)
+from core.services import xlsx
+from core.services.attendance_service import AttendanceService
+from core.services.belt_thresholds import BeltThresholds
+from core.services.event_registration import EventRegistrationService
+from core.services.job_queue import TASKS, JobQueue
+from core.services.leaderboard_service import LeaderboardService, PointsService
+from core.services.matchmaking import BELT_ORDER, MatchmakingService, are_belts_adjacent, get_belt_index
+from core.services.notification_service import NotificationService
+from core.services.pdf_layout import PdfLayout, pdf_layout
+from core.services.pdf_tables import PagedTable
+from core.services.report_cache import ReportCache
+from core.services.report_exports import RENDERERS, ReportExportService
+from core.services.reports import ReportService
+from core.services.weighted_matching import max_weight_matching
+
+
+class AttendanceDashboardQueryTest(TestCase):
+    """The attendance dashboard must not issue queries per session or per trainee."""
+
+    # Session, user and profile lookups, the dashboard's aggregates and the
+    # notification summary in the page header, built and stored in the
+    # database cache on this cold-cache request
+    DASHBOARD_QUERIES = 27
+    # Once warm, the summary costs no query: 13 read it from the shared cache
+    WARM_DASHBOARD_QUERIES = 12
+
+    def setUp(self):
+        self.clear_notification_summaries()
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+        self.today = timezone.now().date()
+        self.sessions = [
+            self.create_session(self.today + timedelta(days=offset))
+            for offset in (-3, -1, 0, 2)
+        ]
+        self.members = 0
+
+    def create_session(self, date):
+        return TrainingSession.objects.create(
+            title=f"Training {date}",
+            date=date,
+            start_time=time(18, 0),
+            end_time=time(19, 30),
+            status="completed" if date < self.today else "scheduled",
+        )
+
+    def add_members(self, count):
+        """Add trainees, each marked in every session before today."""
+        for _ in range(count):
+            self.members += 1
+            user = User.objects.create_user(f"trainee{self.members}", first_name=f"T{self.members}")
+            profile = UserProfile.objects.create(user=user, role="trainee")
+            trainee = Trainee.objects.create(
+                profile=profile,
+                weight=60,
+                emergency_contact="Contact",
+                emergency_phone="0000000000",
+            )
+            for index, session in enumerate(self.sessions):
+                if session.date < self.today:
+                    Attendance.objects.create(
+                        trainee=trainee,
+                        session=session,
+                        date=session.date,
+                        status="present" if (self.members + index) % 3 == 0 else "absent",
+                    )
+
+    def clear_notification_summaries(self):
+        caches[NotificationService.CACHE_ALIAS].clear()
+        NotificationService.forget_process_summaries()
+
+    def count_dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("attendance_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_independent_of_club_size(self):
+        self.add_members(3)
+        small_club = self.count_dashboard_queries()
+
+        self.add_members(30)
+        self.clear_notification_summaries()
+        large_club = self.count_dashboard_queries()
+
+        self.assertEqual(small_club, large_club)
+        self.assertEqual(large_club, self.DASHBOARD_QUERIES)
+
+        # Warm, the summary is read from this process's memory
+        self.assertEqual(self.count_dashboard_queries(), self.WARM_DASHBOARD_QUERIES)
+
+    def test_low_attendance_trainees_use_thirty_day_rates(self):
+        self.add_members(6)
+        response = self.client.get(reverse("attendance_dashboard"))
+
+        low_attendance = list(response.context["low_attendance_trainees"])
+        self.assertTrue(low_attendance)
+        for trainee in low_attendance:
+            self.assertLess(trainee.sessions_attended * 2, trainee.total_sessions)
+            self.assertEqual(
+                trainee.attendance_rate,
+                trainee.sessions_attended * 100 // trainee.total_sessions,
+            )
+
+        past_session = response.context["past_sessions"][0]
+        self.assertEqual(past_session.marked_count, 6)
+        self.assertEqual(
+            past_session.present_count,
+            Attendance.objects.filter(session=past_session, status="present").count(),
+        )
+
+
+def render_slowly(output):
+    """Export renderer that outlives any job time limit used in the tests."""
+    sleep(5)
+
+
+def render_progress(output):
+    """Export renderer that records what a status page would see while it runs."""
+    render_progress.seen = (
+        ReportExport.objects.get().status,
+        len(connection.atomic_blocks),
+    )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ReportExportTest(TestCase):
+    """PDF exports are rendered by the job queue, not inside the request."""
+
+    def setUp(self):
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+        self.export_url = reverse("admin_reports_export") + (
+            "?report_type=membership&format=pdf&start_date=2026-01-01&end_date=2026-01-31"
+        )
+
+    def run_jobs(self):
+        while jobs := JobQueue.claim("test"):
+            for job in jobs:
+                JobQueue.run(job)
+
+    def test_identical_requests_share_one_export(self):
+        first = self.client.get(self.export_url)
+        second = self.client.get(self.export_url)
+
+        export = ReportExport.objects.get()
+        status_url = reverse("admin_export_status", args=[export.id])
+        self.assertRedirects(first, status_url)
+        self.assertRedirects(second, status_url)
+        self.assertEqual(Job.objects.filter(task="exports.render").count(), 1)
+
+        # Once finished, the same request queues a fresh export
+        self.run_jobs()
+        self.client.get(self.export_url)
+        self.assertEqual(ReportExport.objects.count(), 2)
+
+    def test_export_is_downloadable_once_rendered(self):
+        self.client.get(self.export_url)
+        export = ReportExport.objects.get()
+        status_url = reverse("admin_export_status", args=[export.id])
+        download_url = reverse("admin_export_download", args=[export.id])
+
+        pending = self.client.get(status_url, HTTP_HX_REQUEST="true")
+        self.assertContains(pending, 'hx-trigger="every 1s"')
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+
+        self.run_jobs()
+
+        done = self.client.get(status_url, HTTP_HX_REQUEST="true")
+        self.assertNotContains(done, "hx-trigger")
+        self.assertContains(done, download_url)
+
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="membership_report.pdf"', response["Content-Disposition"])
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        response.close()
+
+    def test_render_errors_are_reported(self):
+        export = ReportExportService.request_export(
+            "match_result", {"match_id": 0}, "Match_0_Result.pdf"
+        )
+        self.run_jobs()
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, "failed")
+        self.assertIn("DoesNotExist", export.error)
+        self.assertEqual(Job.objects.get().status, "succeeded")
+
+    def test_storage_errors_fail_the_export(self):
+        with mock.patch(
+            "django.core.files.storage.FileSystemStorage.save",
+            side_effect=OSError("No space left on device"),
+        ):
+            self.client.get(self.export_url)
+            self.run_jobs()
+
+        export = ReportExport.objects.get()
+        self.assertEqual(export.status, "failed")
+        self.assertIn("No space left on device", export.error)
+
+        # The failed export is not shared with later requests
+        self.client.get(self.export_url)
+        self.assertEqual(ReportExport.objects.filter(status="pending").count(), 1)
+
+    def test_export_fails_with_its_job(self):
+        export = ReportExportService.request_export(
+            "report", {"report_type": "membership", "options": {}}, "membership_report.pdf"
+        )
+        # The worker stopped during its last attempt
+        JobQueue.claim("test")
+        ReportExport.objects.filter(pk=export.pk).update(status="running")
+        Job.objects.update(
+            attempts=F("max_attempts"),
+            started_at=timezone.now() - JobQueue.LOCK_TIMEOUT - timedelta(seconds=1),
+        )
+
+        self.assertEqual(JobQueue.claim("test"), [])
+        export.refresh_from_db()
+        self.assertEqual(Job.objects.get().status, "failed")
+        self.assertEqual(export.status, "failed")
+
+    @mock.patch.dict(RENDERERS, {"slow": "core.tests.render_slowly"})
+    @mock.patch.object(JobQueue, "TIME_LIMIT", timedelta(seconds=0.05))
+    def test_renders_are_stopped_before_their_job_can_be_reclaimed(self):
+        export = ReportExportService.request_export("slow", {}, "slow.pdf")
+        self.run_jobs()
+
+        export.refresh_from_db()
+        self.assertEqual(export.status, "failed")
+        self.assertIn("JobTimeout", export.error)
+        self.assertEqual(Job.objects.get().status, "succeeded")
+
+    @mock.patch.dict(RENDERERS, {"progress": "core.tests.render_progress"})
+    def test_renders_commit_their_running_status_before_rendering(self):
+        ReportExportService.request_export("progress", {}, "progress.pdf")
+        outer = len(connection.atomic_blocks)
+        self.run_jobs()
+
+        # Only the renderer's own transaction is open, so the claim has committed
+        self.assertEqual(render_progress.seen, ("running", outer + 1))
+        self.assertEqual(ReportExport.objects.get().status, "done")
+
+    def test_old_finished_exports_and_their_files_are_purged(self):
+        for _ in range(2):
+            self.client.get(self.export_url)
+            self.run_jobs()
+        old, recent = ReportExport.objects.order_by("pk")
+        ReportExportService.request_export("match_result", {"match_id": 0}, "Match_0_Result.pdf")
+        self.run_jobs()
+        pending = ReportExportService.request_export(
+            "report", {"report_type": "membership", "options": {}}, "membership_report.pdf"
+        )
+        week_ago = timezone.now() - ReportExportService.RETENTION - timedelta(hours=1)
+        ReportExport.objects.exclude(pk=recent.pk).update(finished_at=week_ago, created_at=week_ago)
+
+        out = io.StringIO()
+        call_command("purge_exports", stdout=out)
+
+        self.assertIn("Deleted 2 export(s)", out.getvalue())
+        self.assertEqual(
+            set(ReportExport.objects.values_list("pk", flat=True)), {recent.pk, pending.pk}
+        )
+        self.assertFalse(old.file.storage.exists(old.file.name))
+        self.assertTrue(recent.file.storage.exists(recent.file.name))
+
+    def test_report_bundle_is_one_zip_of_pdfs(self):
+        response = self.client.post(
+            reverse("admin_report_bundle"),
+            {
+                "reports": ["trainee_milestones", "belt_promotion_history", "unknown"],
+                "start_date": "2026-01-01",
+                "end_date": "2026-12-31",
+            },
+        )
+        export = ReportExport.objects.get()
+        self.assertRedirects(response, reverse("admin_export_status", args=[export.id]))
+        self.assertEqual(export.kind, "bundle")
+
+        self.run_jobs()
+
+        response = self.client.get(reverse("admin_export_download", args=[export.id]))
+        self.assertEqual(response["Content-Type"], "application/zip")
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as bundle:
+            self.assertEqual(
+                bundle.namelist(),
+                ["belt_promotion_history.pdf", "trainee_milestones.pdf"],
+            )
+            self.assertTrue(bundle.read("trainee_milestones.pdf").startswith(b"%PDF"))
+        response.close()
+
+
+class ProgressionReportQueryTest(TestCase):
+    """Per-trainee reports must not issue queries per trainee."""
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.event = Event.objects.create(
+            name="Club Open",
+            event_date=self.today,
+            location="Main Dojo",
+            registration_deadline=self.today,
+            max_participants=100,
+            status="open",
+        )
+        self.trainees = []
+
+    def add_members(self, count):
+        """Add trainees with evaluations, achievements, promotions, points and won matches."""
+        for _ in range(count):
+            number = len(self.trainees) + 1
+            user = User.objects.create_user(f"trainee{number}", first_name=f"T{number}")
+            profile = UserProfile.objects.create(user=user, role="trainee")
+            trainee = Trainee.objects.create(
+                profile=profile,
+                weight=60,
+                emergency_contact="Contact",
+                emergency_phone="0000000000",
+            )
+            TraineeEvaluation.objects.create(trainee=trainee, status="completed")
+            TraineeAchievement.objects.create(
+                trainee=trainee, title="Kata", achievement_type="other", date_earned=self.today
+            )
+            BeltRankProgress.objects.create(
+                trainee=trainee, old_belt_rank="white", new_belt_rank="yellow", points_earned=50
+            )
+            TraineePoints.objects.update_or_create(
+                trainee=trainee, defaults={"total_points": 50, "wins": 1}
+            )
+            EventRegistration.objects.create(event=self.event, trainee=trainee)
+            if self.trainees:
+                Match.objects.create(
+                    event=self.event,
+                    competitor1=trainee,
+                    competitor2=self.trainees[0],
+                    winner=trainee,
+                    scheduled_time=timezone.now(),
+                    status="completed",
+                )
+            self.trainees.append(trainee)
+
+    def count_report_queries(self):
+        """Queries issued by each per-trainee report."""
+        report_service = ReportService()
+        reports = (
+            report_service.trainee_skill_progression_report,
+            report_service.tournament_participation_report,
+            report_service.performance_evaluation_report,
+            report_service.trainee_milestones_report,
+        )
+        counts = []
+        for report in reports:
+            with CaptureQueriesContext(connection) as queries:
+                report()
+            counts.append(len(queries))
+        return counts
+
+    def test_query_count_is_independent_of_club_size(self):
+        self.add_members(3)
+        small_club = self.count_report_queries()
+
+        self.add_members(20)
+        large_club = self.count_report_queries()
+
+        self.assertEqual(small_club, large_club)
+
+    def test_reports_include_each_members_rows(self):
+        self.add_members(4)
+        report_service = ReportService()
+
+        skills = report_service.trainee_skill_progression_report()
+        self.assertEqual(skills["summary"]["total_evaluations"], 4)
+        self.assertEqual(skills["summary"]["total_achievements"], 4)
+        self.assertEqual(skills["summary"]["total_belt_promotions"], 4)
+
+        participation = report_service.tournament_participation_report()
+        matches = {
+            row["trainee_id"]: row["matches_count"]
+            for row in participation["events"][0]["participants"]
+        }
+        self.assertEqual(matches[self.trainees[0].id], 3)
+        self.assertEqual(matches[self.trainees[1].id], 1)
+
+        milestones = report_service.trainee_milestones_report(trainee_id=self.trainees[1].id)
+        self.assertEqual(
+            sorted(m["type"] for m in milestones["trainees"][0]["milestones"]),
+            ["achievement", "belt_promotion", "event_participation", "match_win"],
+        )
+
+
+def per_session_attendance(sessions):
+    """Session statistics and records built per session, as the report did before."""
+    report = []
+    for session in sessions:
+        records = session.attendance_records.select_related("trainee__profile__user")
+        counts = {status: records.filter(status=status).count() for status, _ in Attendance.STATUS_CHOICES}
+        report.append((
+            session.id,
+            counts["present"] + counts["late"],
+            counts["absent"],
+            counts["excused"],
+            counts["late"],
+            records.count(),
+            [
+                (
+                    f"{record.trainee.profile.user.first_name} {record.trainee.profile.user.last_name}".strip()
+                    or record.trainee.profile.user.username,
+                    record.trainee.get_belt_rank_display(),
+                    record.get_status_display(),
+                    record.check_in_time,
+                    record.notes,
+                )
+                for record in records.order_by("trainee__profile__user__last_name")
+            ],
+        ))
+    return report
+
+
+class SessionAttendanceReportTest(TestCase):
+    """The aggregated session attendance report matches the per-session report it replaced."""
+
+    def setUp(self):
+        rng = random.Random(3)
+        trainees = []
+        for number, (first_name, last_name) in enumerate(
+            [("Ana", "Cruz"), ("Ben", "Diaz"), ("", ""), ("Cara", "Abad"), ("Dan", "Bato")]
+        ):
+            user = User.objects.create_user(f"trainee{number}", first_name=first_name, last_name=last_name)
+            trainees.append(Trainee.objects.create(
+                profile=UserProfile.objects.create(user=user, role="trainee"),
+                weight=60,
+                belt_rank=rng.choice(Trainee.BELT_CHOICES)[0],
+                emergency_contact="Contact",
+                emergency_phone="0000000000",
+            ))
+        for day, hour in [(1, 18), (1, 9), (8, 18), (15, 18)]:
+            session = TrainingSession.objects.create(
+                title=f"Training {day} {hour}",
+                date=date(2026, 3, day),
+                start_time=time(hour, 0),
+                end_time=time(hour + 1, 30),
+                status="completed",
+            )
+            for trainee in rng.sample(trainees, rng.randint(0, len(trainees))):
+                status = rng.choice(Attendance.STATUS_CHOICES)[0]
+                Attendance.objects.create(
+                    trainee=trainee,
+                    session=session,
+                    date=session.date,
+                    status=status,
+                    check_in_time=time(hour, rng.randint(0, 30)) if status != "absent" else None,
+                    notes=rng.choice(["", "Injured wrist", "Left early"]),
+                )
+
+    def test_counts_and_records_match_the_per_session_report(self):
+        report = ReportService().session_attendance_report()
+        reference = per_session_attendance(
+            TrainingSession.objects.order_by("-date", "-start_time", "-id")
+        )
+
+        self.assertEqual(
+            [
+                (s["id"], s["present_count"], s["absent_count"], s["excused_count"], s["late_count"], s["total_marked"])
+                for s in report["sessions"]
+            ],
+            [row[:6] for row in reference],
+        )
+        self.assertEqual(
+            (report["total_present"], report["total_absent"], report["total_excused"], report["total_late"]),
+            tuple(sum(row[index] for row in reference) for index in range(1, 5)),
+        )
+        records = [
+            (r["session_id"], r["trainee_name"], r["belt_rank"], r["status"], r["check_in_time"], r["notes"])
+            for r in report["attendance_records"]
+        ]
+        self.assertEqual(
+            records, [(row[0], *record) for row in reference for record in row[6]]
+        )
+
+    def test_records_can_be_read_more_than_once(self):
+        report = ReportService().session_attendance_report()
+        first = list(report["attendance_records"])
+        self.assertTrue(first)
+        self.assertEqual(list(report["attendance_records"]), first)
+
+        # The CSV and the PDF are both built from the same report data
+        csv = "".join(ReportService().stream_csv(report, "session_attendance"))
+        self.assertEqual(
+            csv.count("Injured wrist") + csv.count("Left early"),
+            sum(1 for record in first if record["notes"]),
+        )
+        self.assertTrue(ReportService().export_pdf(report, "session_attendance").startswith(b"%PDF"))
+
+
+class ReportCacheTest(TestCase):
+    """Report previews and exports share one computation until the data changes."""
+
+    def setUp(self):
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+        user = User.objects.create_user("trainee", first_name="Kenji")
+        self.trainee = Trainee.objects.create(
+            profile=UserProfile.objects.create(user=user, role="trainee"),
+            weight=60,
+            emergency_contact="Contact",
+            emergency_phone="0000000000",
+        )
+        ReportCache.reset_stats()
+
+    def preview(self, report_type):
+        response = self.client.post(
+            reverse("admin_reports"),
+            {"report_type": report_type, "start_date": "2026-01-01", "end_date": "2026-01-31"},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def export_csv(self, report_type):
+        response = self.client.get(
+            reverse("admin_reports_export"),
+            {"report_type": report_type, "format": "csv", "start_date": "2026-01-01", "end_date": "2026-01-31"},
+        )
+        return b"".join(response.streaming_content).decode()
+
+    def test_preview_and_export_share_one_computation(self):
+        preview = self.preview("membership")
+        self.assertContains(preview, "start_date=2026-01-01&end_date=2026-01-31")
+        self.export_csv("membership")
+
+        self.assertEqual(ReportCache.stats()["misses"], 1)
+        self.assertEqual(ReportCache.stats()["hits"], 1)
+
+    def test_saving_a_dependency_invalidates_only_reports_reading_it(self):
+        self.preview("membership")
+        self.preview("financial")
+
+        Payment.objects.create(
+            trainee=self.trainee, amount=500, payment_type="membership", status="pending"
+        )
+        self.assertIn("Kenji", self.export_csv("financial"))
+        self.export_csv("membership")
+
+        stats = ReportCache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_logging_in_keeps_cached_reports(self):
+        self.preview("membership")
+        self.client.login(username="admin", password="pw")
+        self.preview("membership")
+
+        self.assertEqual(ReportCache.stats()["hits"], 1)
+
+
+class CsvStreamTest(TestCase):
+    """Streamed CSV downloads match the CSV the reports were exported as before streaming."""
+
+    # Membership CSV of the fixture below, as written by the export before
+    # it was streamed
+    MEMBERSHIP_CSV = (
+        b"Membership Report\r\nPeriod: 2026-01-01 to 2026-01-31\r\n\r\n"
+        b"Summary\r\nMetric,Count\r\nTotal Members,4\r\nActive Members,2\r\n"
+        b"Inactive Members,1\r\nSuspended Members,1\r\nNew Members (Period),0\r\n\r\n"
+        b"Members by Belt Rank - Detailed\r\n\r\n"
+        b"Green (1)\r\nName,Status,Weight Class\r\n"
+        b'"Dan Bato ""DB""",Suspended,Light Heavyweight\r\n\r\n'
+        b"White (2)\r\nName,Status,Weight Class\r\nAna Cruz,Active,Flyweight\r\n"
+        b'"Cara Abad, Jr.",Inactive,Welterweight\r\n\r\n'
+        b"Yellow (1)\r\nName,Status,Weight Class\r\nBen Diaz,Active,Welterweight\r\n\r\n"
+        b"Members by Weight Class\r\nWeight Class,Count\r\n"
+        b"Flyweight,1\r\nLight Heavyweight,1\r\nWelterweight,2\r\n"
+    )
+
+    def setUp(self):
+        for number, (first_name, last_name, belt_rank, status, weight) in enumerate([
+            ("Ana", "Cruz", "white", "active", 45),
+            ("Ben", "Diaz", "yellow", "active", 62),
+            ("Cara", "Abad, Jr.", "white", "inactive", 70),
+            ("Dan", 'Bato "DB"', "green", "suspended", 81),
+        ]):
+            user = User.objects.create_user(f"trainee{number}", first_name=first_name, last_name=last_name)
+            Trainee.objects.create(
+                profile=UserProfile.objects.create(user=user, role="trainee"),
+                weight=weight,
+                belt_rank=belt_rank,
+                status=status,
+                emergency_contact="Contact",
+                emergency_phone="0000000000",
+            )
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+
+    @mock.patch.object(ReportService, "CSV_CHUNK_ROWS", 4)
+    def test_streamed_download_matches_the_unstreamed_export_byte_for_byte(self):
+        response = self.client.get(reverse("admin_reports_export"), {
+            "report_type": "membership",
+            "format": "csv",
+            "start_date": "2026-01-01",
+            "end_date": "2026-01-31",
+        })
+
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), self.MEMBERSHIP_CSV)
+        self.assertEqual(
+            "".join(ReportService().csv_chunks([["a,b", 1], [], ['"c"']])),
+            '"a,b",1\r\n\r\n"""c"""\r\n',
+        )
+
+
+class XlsxExportTest(TestCase):
+    """Excel exports are real workbooks with typed cells."""
+
+    NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+    def setUp(self):
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+
+    def read_sheet(self, content):
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+        return [
+            [
+                (cell.get("t"), cell.get("s"), "".join(cell.itertext()))
+                for cell in row.iter(f"{self.NS}c")
+            ]
+            for row in sheet.iter(f"{self.NS}row")
+        ]
+
+    def test_cells_keep_their_types(self):
+        content = b"".join(
+            xlsx.stream_xlsx([["Name <&>\x07", 7, Decimal("2.50"), date(2026, 1, 1), None, True]])
+        )
+
+        self.assertEqual(
+            self.read_sheet(content),
+            [[
+                ("inlineStr", None, "Name <&>"),
+                (None, None, "7"),
+                (None, None, "2.50"),
+                (None, "1", "46023.0"),
+                (None, None, ""),
+                ("b", None, "1"),
+            ]],
+        )
+
+    def test_event_export_streams_a_workbook(self):
+        Event.objects.create(
+            name="Spring Open",
+            event_date=date(2026, 3, 1),
+            location="Main Dojo",
+            registration_deadline=date(2026, 2, 20),
+            max_participants=10,
+        )
+
+        response = self.client.post(
+            reverse("admin_event_export"),
+            {"format": "excel", "columns": ["name", "date"], "sort_by": "date_desc"},
+        )
+
+        self.assertEqual(response["Content-Type"], xlsx.CONTENT_TYPE)
+        self.assertIn(".xlsx", response["Content-Disposition"])
+        rows = self.read_sheet(b"".join(response.streaming_content))
+        self.assertEqual([text for _, _, text in rows[4]], ["Event Name", "Date"])
+        self.assertEqual(rows[5], [("inlineStr", None, "Spring Open"), (None, "1", "46082.0")])
+
+
+class PagedTableTest(TestCase):
+    """Long PDF listings are laid out a page at a time without losing rows."""
+
+    def test_every_row_is_laid_out_once_under_a_header(self):
+        header = ["Name", "Belt"]
+        rows = ([f"Trainee {number}", "White"] for number in range(500))
+        placed = []
+
+        class Document(SimpleDocTemplate):
+            def afterFlowable(self, flowable):
+                table = getattr(flowable, "_table", flowable)
+                if hasattr(table, "_cellvalues"):
+                    placed.append(table._cellvalues)
+
+        Document(io.BytesIO()).build(
+            [PagedTable(header, rows, col_widths=[200, 100], style=TableStyle([]))]
+        )
+
+        self.assertGreater(len(placed), 1)
+        self.assertTrue(all(page[0] == header for page in placed))
+        self.assertEqual(
+            [row[0] for page in placed for row in page[1:]],
+            [f"Trainee {number}" for number in range(500)],
+        )
+
+
+class PdfLayoutTest(TestCase):
+    """Branded exports embed binary streams without changing reportlab's global settings."""
+
+    def test_builds_embed_binary_streams_and_restore_the_setting(self):
+        output = io.BytesIO()
+        pdf_layout.build(
+            SimpleDocTemplate(output),
+            [pdf_layout.logo(PdfLayout.CLUB_LOGO, 72), pdf_layout.association_header()],
+        )
+
+        self.assertEqual(rl_config.useA85, 1)
+        self.assertIn(b"/DCTDecode", output.getvalue())
+        self.assertNotIn(b"/ASCII85Decode", output.getvalue())
+
+
+class DatasetGeneratorTest(TestCase):
+    """Synthetic datasets are consistent and reproducible from their seed."""
+
+    def snapshot(self):
+        return (
+            list(Trainee.objects.order_by("profile__user__username").values_list(
+                "profile__user__username", "belt_rank", "weight", "joined_date"
+            )),
+            list(Payment.objects.order_by("trainee__profile__user__username", "payment_date", "amount")
+                 .values_list("payment_type", "amount", "status", "payment_date")),
+        )
+
+    def test_same_seed_gives_the_same_consistent_dataset(self):
+        today = date(2026, 6, 15)
+        counts = DatasetGenerator(600, seed=7, today=today).generate()
+        self.assertEqual(counts["Trainee"], 600)
+        self.assertEqual(TraineePoints.objects.count(), 600)
+        self.assertGreater(counts["Match"], 0)
+        self.assertGreater(counts["Attendance"], 0)
+
+        # Points totals agree with the points ledger and the matches
+        ledger = PointsLedgerEntry.objects.aggregate(total=Sum("points"))["total"]
+        points = TraineePoints.objects.aggregate(total=Sum("total_points"), wins=Sum("wins"))
+        self.assertEqual(points["total"], ledger)
+        self.assertEqual(points["wins"], Match.objects.filter(status="completed").count())
+        # auto_now_add fields are backdated
+        self.assertTrue(Trainee.objects.filter(joined_date__lt=today).exists())
+        self.assertTrue(Payment.objects.filter(payment_date__date__lt=today).exists())
+
+        first = self.snapshot()
+        DatasetGenerator(1).clear()
+        self.assertFalse(Trainee.objects.exists())
+        DatasetGenerator(600, seed=7, today=today).generate()
+        self.assertEqual(self.snapshot(), first)
+
+
+class EventParticipantCountTest(TestCase):
+    """The stored participant count follows registrations without counting them."""
+
+    def setUp(self):
+        self.event = Event.objects.create(
+            name="Club Open",
+            event_date=date(2026, 3, 1),
+            location="Main Dojo",
+            registration_deadline=date(2026, 2, 20),
+            max_participants=10,
+            status="open",
+        )
+
+    def add_trainee(self, number):
+        user = User.objects.create_user(f"trainee{number}")
+        return Trainee.objects.create(
+            profile=UserProfile.objects.create(user=user, role="trainee"),
+            weight=60,
+            emergency_contact="Contact",
+            emergency_phone="0000000000",
+        )
+
+    def count(self):
+        self.event.refresh_from_db()
+        return self.event.participant_count
+
+    def test_registering_withdrawing_and_deleting_update_the_count(self):
+        first = EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(1))
+        EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(2))
+        self.assertEqual(self.count(), 2)
+
+        withdrawn = EventRegistration.objects.get(pk=first.pk)
+        withdrawn.status = "withdrawn"
+        withdrawn.save()
+        withdrawn.save()
+        self.assertEqual(self.count(), 1)
+
+        withdrawn.delete()
+        self.assertEqual(self.count(), 1)
+        EventRegistration.objects.get(event=self.event).trainee.delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_stale_instances_change_the_count_once(self):
+        registration = EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(1))
+        EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(2))
+        first, second = (EventRegistration.objects.get(pk=registration.pk) for _ in range(2))
+
+        for stale in (first, second):
+            stale.status = "withdrawn"
+            stale.save()
+        self.assertEqual(self.count(), 1)
+
+        for stale in (first, second):
+            stale.status = "registered"
+            stale.save()
+        self.assertEqual(self.count(), 2)
+
+        first.delete()
+        second.delete()
+        self.assertEqual(self.count(), 1)
+
+    def test_editing_a_stale_event_keeps_the_count(self):
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+        stale = Event.objects.get(pk=self.event.pk)
+        EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(1))
+
+        stale.name = "Club Open 2026"
+        stale.save(update_fields=["name"])
+        self.client.post(reverse("admin_event_status_update", args=[self.event.pk]), {"status": "closed"})
+
+        self.assertEqual(self.count(), 1)
+        self.assertEqual((self.event.name, self.event.status), ("Club Open 2026", "closed"))
+
+    def test_full_saves_write_every_field(self):
+        self.event.description = "Annual tournament"
+        self.event.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.description, "Annual tournament")
+
+    def test_reconcile_fixes_drifted_counts(self):
+        EventRegistration.objects.bulk_create([
+            EventRegistration(event=self.event, trainee=self.add_trainee(number))
+            for number in range(3)
+        ])
+        self.assertEqual(self.count(), 0)
+
+        self.assertEqual(Event.reconcile_participant_counts(), 1)
+        self.assertEqual(self.count(), 3)
+        self.assertEqual(Event.reconcile_participant_counts(), 0)
+
+    def test_event_list_costs_the_same_queries_for_any_number_of_events(self):
+        admin = User.objects.create_user("admin", password="pw")
+        UserProfile.objects.create(user=admin, role="admin")
+        self.client.force_login(admin)
+        EventRegistration.objects.create(event=self.event, trainee=self.add_trainee(1))
+
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("admin_events"), HTTP_HX_REQUEST="true")
+            self.assertContains(response, "1/10")
+            return len(queries)
+
+        one_event = list_queries()
+        for number in range(5):
+            Event.objects.create(
+                name=f"Cup {number}",
+                event_date=date(2026, 4, 1),
+                location="Main Dojo",
+                registration_deadline=date(2026, 3, 20),
+                max_participants=10,
+            )
+        self.assertEqual(list_queries(), one_event)
+
+
+class EventRegistrationServiceTest(TestCase):
+    """Seats are reserved atomically and the last one closes registration."""
+
+    def setUp(self):
+        self.event = Event.objects.create(
+            name="Club Open",
+            event_date=date.today() + timedelta(days=7),
+            location="Main Dojo",
+            registration_deadline=date.today(),
+            max_participants=2,
+            status="open",
+        )
+
+    add_trainee = EventParticipantCountTest.add_trainee
+    count = EventParticipantCountTest.count
+
+    def register(self, trainee):
+        return EventRegistrationService.register(self.event, trainee.id)
+
+    def test_last_seat_closes_and_later_requests_are_refused(self):
+        first, second, third = (self.add_trainee(number) for number in range(3))
+
+        self.assertEqual(self.register(first), (EventRegistrationService.REGISTERED, False))
+        self.assertEqual(self.register(first), (EventRegistrationService.ALREADY_REGISTERED, False))
+        self.assertEqual(self.count(), 1)
+
+        self.assertEqual(self.register(second), (EventRegistrationService.REGISTERED, True))
+        self.assertEqual(self.count(), 2)
+        self.assertEqual(self.event.status, "closed")
+        self.assertTrue(Job.objects.filter(task="notifications.event_closed").exists())
+        self.assertFalse(Job.objects.filter(task="events.close_if_full").exists())
+
+        self.assertEqual(self.register(third), (EventRegistrationService.FULL, False))
+        self.assertEqual(self.count(), 2)
+        self.assertEqual(
+            EventRegistration.objects.filter(event=self.event, status="registered").count(), 2
+        )
+
+    def test_withdrawn_trainee_can_register_again(self):
+        trainee = self.add_trainee(1)
+        self.register(trainee)
+        registration = EventRegistration.objects.get(event=self.event, trainee=trainee)
+        registration.status = "withdrawn"
+        registration.save()
+        self.assertEqual(self.count(), 0)
+
+        self.assertEqual(self.register(trainee), (EventRegistrationService.REGISTERED, False))
+        self.assertEqual(self.count(), 1)
+
+    def test_repeated_unregisters_give_the_seat_back_once(self):
+        first, second = self.add_trainee(1), self.add_trainee(2)
+        self.register(first)
+        self.register(second)
+
+        self.assertTrue(EventRegistrationService.unregister(self.event.id, first.id))
+        self.assertFalse(EventRegistrationService.unregister(self.event.id, first.id))
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(
+            EventRegistration.objects.get(event=self.event, trainee=first).status, "withdrawn"
+        )
+
+
+class AttendanceServiceTest(TestCase):
+    """Attendance marks are written in one upsert, and only when they change something."""
+
+    add_trainee = EventParticipantCountTest.add_trainee
+
+    def setUp(self):
+        self.session = TrainingSession.objects.create(
+            title="Training",
+            date=date(2026, 3, 2),
+            start_time=time(18, 0),
+            end_time=time(19, 30),
+        )
+        self.first, self.second = self.add_trainee(1), self.add_trainee(2)
+        AttendanceService.record_attendance(
+            {
+                self.first.id: {"status": "present", "notes": "Injured wrist", "check_in_time": time(18, 5)},
+                self.second.id: {"status": "absent"},
+            },
+            session=self.session,
+        )
+
+    def record(self, marks):
+        with CaptureQueriesContext(connection) as queries:
+            written = AttendanceService.record_attendance(marks, session=self.session)
+        writes = [q["sql"] for q in queries if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))]
+        return written, writes
+
+    def rows(self):
+        return {
+            row[0]: row[1:]
+            for row in Attendance.objects.filter(session=self.session).values_list(
+                "trainee_id", "pk", "status", "notes", "check_in_time", "date"
+            )
+        }
+
+    def test_unchanged_marks_issue_no_write(self):
+        self.assertEqual(
+            self.record({
+                self.first.id: {"status": "present", "notes": "Injured wrist"},
+                self.second.id: {"status": "absent"},
+            }),
+            (0, []),
+        )
+
+    def test_partial_marks_keep_the_other_fields(self):
+        before = self.rows()
+        self.assertEqual(self.record({self.first.id: {"status": "late"}})[0], 1)
+
+        pk, status, notes, check_in_time, attendance_date = self.rows()[self.first.id]
+        self.assertEqual((pk, status), (before[self.first.id][0], "late"))
+        self.assertEqual((notes, check_in_time), ("Injured wrist", time(18, 5)))
+        self.assertEqual(attendance_date, self.session.date)
+        self.assertEqual(self.rows()[self.second.id], before[self.second.id])
+
+    def test_re_marks_update_rows_in_place_with_one_upsert(self):
+        before = self.rows()
+        third = self.add_trainee(3)
+
+        written, writes = self.record({
+            self.first.id: {"status": "absent", "check_in_time": None},
+            self.second.id: {"status": "excused", "notes": "Exam week"},
+            third.id: {"status": "present"},
+        })
+
+        self.assertEqual(written, 3)
+        self.assertEqual(len(writes), 1)
+        self.assertIn("ON CONFLICT", writes[0])
+        after = self.rows()
+        self.assertEqual(len(after), 3)
+        self.assertEqual(after[self.first.id][:4], (before[self.first.id][0], "absent", "Injured wrist", None))
+        self.assertEqual(after[self.second.id][:3], (before[self.second.id][0], "excused", "Exam week"))
+        self.assertEqual(after[third.id][1:3], ("present", ""))
+
+
+class CloseExpiredEventsTest(TestCase):
+    """Due events are closed together and announced once each."""
+
+    def test_expired_and_full_events_are_closed_with_their_reason(self):
+        today = date(2026, 2, 10)
+        expired = Event.objects.create(
+            name="Expired", event_date=date(2026, 3, 1), location="Main Dojo",
+            registration_deadline=date(2026, 2, 9), max_participants=10, status="open",
+        )
+        full = Event.objects.create(
+            name="Full", event_date=date(2026, 3, 1), location="Main Dojo",
+            registration_deadline=date(2026, 2, 20), max_participants=10, status="open",
+        )
+        still_open = Event.objects.create(
+            name="Open", event_date=date(2026, 3, 1), location="Main Dojo",
+            registration_deadline=date(2026, 2, 10), max_participants=10, status="open",
+        )
+        Event.objects.filter(pk=full.pk).update(participant_count=10)
+
+        closed = Event.close_due_registrations(today)
+
+        self.assertEqual(closed, {
+            "registration_deadline_passed": [expired.pk],
+            "max_participants_reached": [full.pk],
+        })
+        self.assertEqual(
+            dict(Event.objects.values_list("name", "status")),
+            {"Expired": "closed", "Full": "closed", "Open": "open"},
+        )
+        self.assertEqual(Event.close_due_registrations(today), {
+            "registration_deadline_passed": [],
+            "max_participants_reached": [],
+        })
+        still_open.refresh_from_db()
+        self.assertEqual(still_open.status, "open")
+
+    def test_command_announces_each_closed_event(self):
+        Event.objects.create(
+            name="Expired", event_date=date.today(), location="Main Dojo",
+            registration_deadline=date.today() - timedelta(days=1), max_participants=10, status="open",
+        )
+        call_command("close_expired_events", stdout=io.StringIO())
+
+        self.assertEqual(Event.objects.get().status, "closed")
+        self.assertEqual(
+            list(BroadcastNotification.objects.values_list("title", flat=True)),
+            ["Event Registration Closed: Expired"],
+        )
+
+
+    def test_loop_survives_a_failed_pass(self):
+        Event.objects.create(
+            name="Expired", event_date=date.today(), location="Main Dojo",
+            registration_deadline=date.today() - timedelta(days=1), max_participants=10, status="open",
+        )
+        close_due = Event.close_due_registrations
+        errors = [OperationalError("database is locked")]
+
+        def locked_once(*args):
+            if errors:
+                raise errors.pop()
+            return close_due(*args)
+
+        stderr = io.StringIO()
+        with mock.patch.object(
+            Event, "close_due_registrations", side_effect=locked_once
+        ), mock.patch(
+            "core.management.commands.close_expired_events.time.sleep",
+            side_effect=[None, KeyboardInterrupt],
+        ):
+            call_command("close_expired_events", "--loop", stdout=io.StringIO(), stderr=stderr)
+
+        self.assertIn("database is locked", stderr.getvalue())
+        self.assertEqual(BroadcastNotification.objects.count(), 1)
+
+class TraineePointsAwardTest(TestCase):
+    """Points are added with F() updates, in one statement for many trainees."""
+
+    add_trainee = EventParticipantCountTest.add_trainee
+
+    def setUp(self):
+        BeltRankThreshold.objects.update_or_create(belt_rank="green", defaults={"points_required": 50})
+        # The change is rolled back, but the process cache would keep it
+        self.addCleanup(BeltThresholds.invalidate)
+        self.first, self.second = self.add_trainee(1), self.add_trainee(2)
+
+    def points(self, trainee):
+        return TraineePoints.objects.values_list("total_points", "wins", "losses").get(trainee=trainee)
+
+    def test_award_batch_updates_totals_ledger_and_belts(self):
+        stale = TraineePoints.objects.create(trainee=self.first, total_points=25)
+
+        with CaptureQueriesContext(connection) as queries:
+            promoted = TraineePoints.award([
+                (self.first.id, TraineePoints.WIN_POINTS, "win"),
+                (self.second.id, TraineePoints.LOSS_POINTS, "loss"),
+                (self.second.id, 5, "bonus"),
+            ])
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "core_traineepoints"')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(promoted, [self.first.id])
+        self.assertEqual(self.points(self.first), (55, 1, 0))
+        self.assertEqual(self.points(self.second), (15, 0, 1))
+        self.assertEqual(
+            sorted(PointsLedgerEntry.objects.values_list("trainee_id", "points", "reason")),
+            sorted([(self.first.id, 30, "win"), (self.second.id, 10, "loss"), (self.second.id, 5, "bonus")]),
+        )
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.belt_rank, "green")
+        self.assertEqual(BeltRankProgress.objects.get().new_belt_rank, "green")
+
+        # A stale in-memory record adds to the stored total instead of overwriting it
+        stale.add_win()
+        self.assertEqual(self.points(self.first), (85, 2, 0))
+        self.assertEqual(BeltRankProgress.objects.count(), 1)
+
+    def test_added_points_refresh_the_promoted_belt(self):
+        record = TraineePoints.objects.create(trainee=self.first, total_points=40)
+        record.add_points(10)
+        self.assertEqual(record.trainee.belt_rank, "green")
+
+    def test_belt_sync_enters_the_change_it_made_once(self):
+        Trainee.objects.filter(pk=self.first.pk).update(belt_rank="green")
+        self.first.refresh_from_db()
+        PointsService.sync_points_with_belt(self.first)
+        PointsService.sync_points_with_belt(self.first)
+        self.assertEqual(self.points(self.first)[0], 50)
+
+        # Awarded after the trainee was loaded, then reset to the threshold
+        TraineePoints.award([(self.first.id, 20, "bonus")])
+        PointsService.sync_points_with_belt(self.first)
+        self.assertEqual(self.points(self.first)[0], 70)
+        PointsService.sync_points_with_belt(self.first, force=True)
+        self.assertEqual(self.points(self.first)[0], 50)
+
+        self.assertEqual(
+            list(PointsLedgerEntry.objects.filter(reason="belt_sync").order_by("pk").values_list("points", flat=True)),
+            [50, -20],
+        )
+        self.assertEqual(
+            PointsLedgerEntry.objects.filter(trainee=self.first).aggregate(total=Sum("points"))["total"], 50
+        )
+
+    def test_completed_evaluations_apply_points_once(self):
+        evaluation = TraineeEvaluation.objects.create(
+            trainee=self.first, technique=5, speed=5, strength=5, flexibility=5,
+            discipline=5, spirit=5, overall_rating=5, attendance_score=80, sparring_score=90,
+            achievement_score=70, performance_score=60, status="completed",
+        )
+        total = self.points(self.first)[0]
+        self.assertEqual(total, 39)
+
+        evaluation.save()
+        TraineeEvaluation.apply_points([evaluation])
+        self.assertEqual(self.points(self.first)[0], total)
+        self.assertEqual(PointsLedgerEntry.objects.filter(reason="evaluation").count(), 1)
+
+
+class BeltThresholdsTest(TestCase):
+    """The threshold table is read once per process and reloaded when it changes."""
+
+    def setUp(self):
+        BeltThresholds.invalidate()
+        self.addCleanup(BeltThresholds.invalidate)
+
+    def test_reads_are_served_from_memory_until_a_threshold_changes(self):
+        BeltThresholds.points_by_belt()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [threshold.belt_rank for threshold in BeltThresholds.all()],
+                [belt for belt, _ in Trainee.BELT_CHOICES],
+            )
+            self.assertEqual(BeltThresholds.next_after("white"), BeltThresholds.get("green"))
+            self.assertIsNone(BeltThresholds.next_after("master_degree"))
+
+        green = BeltRankThreshold.objects.get(belt_rank="green")
+        green.points_required = 123
+        green.save()
+        self.assertEqual(BeltThresholds.next_after("white").points_required, 123)
+
+        green.delete()
+        self.assertIsNone(BeltThresholds.next_after("white"))
+
+    def test_changes_from_other_processes_are_picked_up(self):
+        BeltThresholds.points_by_belt()
+        BeltRankThreshold.objects.filter(belt_rank="green").update(points_required=321)
+        # Another process saved the change and moved the shared version
+        caches[BeltThresholds.CACHE_ALIAS].set(BeltThresholds.VERSION_KEY, 1, None)
+
+        self.assertNotEqual(BeltThresholds.points_by_belt()["green"], 321)
+        with mock.patch.object(BeltThresholds, "CHECK_INTERVAL", 0):
+            self.assertEqual(BeltThresholds.points_by_belt()["green"], 321)
+
+
+class NotificationSummaryTest(TestCase):
+    """Summaries cached for the page header see notifications made by the job workers."""
+
+    def setUp(self):
+        NotificationService.forget_process_summaries()
+        user = User.objects.create_user("trainee")
+        self.trainee = Trainee.objects.create(
+            profile=UserProfile.objects.create(user=user, role="trainee"),
+            weight=60,
+            emergency_contact="Contact",
+            emergency_phone="0000000000",
+        )
+
+    def test_notifications_created_by_a_job_update_the_summary(self):
+        user = self.trainee.profile.user
+        self.assertEqual(NotificationService.get_notification_summary(user)["unread_count"], 0)
+
+        BeltRankProgress.objects.create(
+            trainee=self.trainee, old_belt_rank="white", new_belt_rank="green", points_earned=100
+        )
+        # Queued for the worker, so nothing changed yet
+        self.assertEqual(NotificationService.get_notification_summary(user)["unread_count"], 0)
+
+        call_command("run_jobs", "--once", stdout=io.StringIO())
+        summary = NotificationService.get_notification_summary(user)
+        self.assertEqual(summary["unread_count"], 1)
+        self.assertEqual(summary["latest"][0]["notification_type"], "belt_promotion")
+
+    def test_warm_summaries_are_read_from_memory_until_checked(self):
+        user = self.trainee.profile.user
+        NotificationService.get_notification_summary(user)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_notification_summary(user)["unread_count"], 0)
+
+        # Another process created a notification and dropped the shared summary
+        Notification.objects.bulk_create([
+            Notification(notification_type="general", title="Welcome", message="Hi", recipient=user)
+        ])
+        caches[NotificationService.CACHE_ALIAS].delete(
+            NotificationService.SUMMARY_CACHE_KEY.format(user_id=user.pk)
+        )
+        self.assertEqual(NotificationService.get_notification_summary(user)["unread_count"], 0)
+        with mock.patch.object(NotificationService, "SUMMARY_CHECK_INTERVAL", 0):
+            self.assertEqual(NotificationService.get_notification_summary(user)["unread_count"], 1)
+
+    def test_summaries_are_kept_in_the_shared_database_cache(self):
+        NotificationService.get_notification_summary(self.trainee.profile.user)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM core_notification_cache")
+            # The summary and the broadcast version
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+
+class LeaderboardRankingTest(TestCase):
+    """Every points award re-ranks its trainees, matching a full rebuild."""
+
+    add_trainee = EventParticipantCountTest.add_trainee
+
+    def setUp(self):
+        self.trainees = [self.add_trainee(number) for number in range(5)]
+        TraineePoints.objects.bulk_create([
+            TraineePoints(trainee=trainee, total_points=100 * number)
+            for number, trainee in enumerate(self.trainees)
+        ])
+        LeaderboardService.update_all_leaderboards()
+
+    def board(self, timeframe="all_time"):
+        return list(
+            Leaderboard.objects.filter(timeframe=timeframe)
+            .order_by("rank")
+            .values_list("rank", "trainee_id", "points")
+        )
+
+    def test_awards_from_any_source_match_a_full_rebuild(self):
+        first = self.trainees[0]
+        newcomer = self.add_trainee(9)
+        TraineePoints.award([(first.id, 450, "achievement"), (newcomer.id, 250, "evaluation")])
+
+        board = self.board()
+        self.assertEqual(board[0], (1, first.id, 450))
+        self.assertIn(newcomer.id, [trainee_id for _, trainee_id, _ in board])
+        self.assertEqual(
+            [trainee_id for _, trainee_id, _ in self.board("monthly")], [first.id, newcomer.id]
+        )
+
+        Leaderboard.objects.all().delete()
+        LeaderboardService.update_all_leaderboards()
+        self.assertEqual(self.board(), board)
+
+    def test_reranking_writes_only_the_window_between_old_and_new_rank(self):
+        TraineePoints.objects.filter(trainee=self.trainees[1]).update(total_points=250)
+        Leaderboard.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            LeaderboardService.update_trainee_rankings([self.trainees[1]])
+        writes = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "core_leaderboard"')]
+
+        # The entry it passed is shifted with one ranged update, then it is moved
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(
+            [trainee_id for _, trainee_id, _ in self.board()],
+            [self.trainees[4].id, self.trainees[3].id, self.trainees[1].id,
+             self.trainees[2].id, self.trainees[0].id],
+        )
+        written = Leaderboard.objects.filter(
+            timeframe="all_time", updated_at__gte=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(
+            set(written.values_list("trainee_id", flat=True)), {self.trainees[1].id, self.trainees[2].id}
+        )
+
+    def test_new_trainees_get_points_records_and_entries_in_bulk(self):
+        newcomers = [self.add_trainee(number) for number in range(10, 13)]
+        Trainee.objects.filter(pk=newcomers[0].pk).update(belt_rank="green")
+        green = BeltThresholds.get("green").points_required
+
+        LeaderboardService.update_leaderboard("all_time")
+
+        self.assertEqual(
+            dict(TraineePoints.objects.filter(trainee__in=newcomers).values_list("trainee_id", "total_points")),
+            {newcomers[0].id: green, newcomers[1].id: 0, newcomers[2].id: 0},
+        )
+        self.assertEqual(
+            list(PointsLedgerEntry.objects.filter(reason="belt_sync").values_list("trainee_id", "points")),
+            [(newcomers[0].id, green)],
+        )
+        board = self.board()
+        self.assertEqual(board[0], (1, newcomers[0].id, green))
+        self.assertEqual([rank for rank, _, _ in board], list(range(1, 9)))
+
+    def test_random_awards_match_a_full_rebuild(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            TraineePoints.award([
+                (rng.choice(self.trainees).id, rng.randrange(-50, 200, 10), "adjustment")
+                for _ in range(rng.randint(1, 3))
+            ])
+        board = self.board()
+
+        Leaderboard.objects.filter(timeframe="all_time").delete()
+        LeaderboardService.update_leaderboard("all_time")
+        self.assertEqual(self.board(), board)
+
+    def test_current_period_boards_pick_up_ledger_changes(self):
+        self.client.force_login(User.objects.create_user("viewer"))
+        TraineePoints.award([(self.trainees[0].id, 40, "achievement")])
+        # Entered straight into the ledger, without an award
+        TraineePoints.objects.get(trainee=self.trainees[1]).record_ledger_entry(60, "bonus")
+
+        response = self.client.get(reverse("leaderboard_monthly"))
+        self.assertEqual(
+            [(entry.trainee_id, entry.points) for entry in response.context["leaderboards"]],
+            [(self.trainees[1].id, 60), (self.trainees[0].id, 40)],
+        )
+
+    def test_invalid_periods_fall_back_to_the_current_one(self):
+        self.client.force_login(User.objects.create_user("viewer"))
+        today = date.today()
+
+        response = self.client.get(reverse("leaderboard_monthly"), {"year": "abc", "month": "13"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.context["year"], response.context["month"]), (today.year, today.month))
+
+        response = self.client.get(reverse("leaderboard_yearly"), {"year": "20x6"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["year"], today.year)
+
+
+def brute_force_matchings(vertices, edges):
+    """Every matching of a small graph, as lists of indices into edges."""
+    def extend(free, chosen):
+        if not free:
+            yield chosen
+            return
+        v, rest = free[0], free[1:]
+        yield from extend(rest, chosen)  # v stays unmatched
+        for k, (i, j, _) in enumerate(edges):
+            w = j if i == v else i if j == v else None
+            if w in rest:
+                yield from extend([u for u in rest if u != w], chosen + [k])
+
+    yield from extend(list(range(vertices)), [])
+
+
+class WeightedMatchingTest(TestCase):
+    """The blossom matching agrees with brute force on small graphs."""
+
+    def random_graph(self, rng):
+        vertices = rng.randint(2, 8)
+        edges = [
+            (i, j, rng.randint(1, 20))
+            for i in range(vertices)
+            for j in range(i + 1, vertices)
+            if rng.random() < 0.5
+        ]
+        return vertices, edges
+
+    def matched_edges(self, edges, mate):
+        matched = [k for k, (i, j, _) in enumerate(edges) if mate[i] == j]
+        for k in matched:
+            i, j, _ = edges[k]
+            self.assertEqual(mate[j], i)
+        return matched
+
+    def test_matches_brute_force_on_random_graphs(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            vertices, edges = self.random_graph(rng)
+            if not edges:
+                continue
+            matchings = list(brute_force_matchings(vertices, edges))
+
+            def weight(matching):
+                return sum(edges[k][2] for k in matching)
+
+            matched = self.matched_edges(edges, max_weight_matching(edges))
+            self.assertEqual(weight(matched), max(map(weight, matchings)), edges)
+
+            matched = self.matched_edges(edges, max_weight_matching(edges, max_cardinality=True))
+            self.assertEqual(
+                (len(matched), weight(matched)),
+                max((len(matching), weight(matching)) for matching in matchings),
+                edges,
+            )
+
+    def test_cardinality_can_outweigh_a_heavier_edge(self):
+        # Path 0-1-2-3 with a heavy middle edge
+        edges = [(0, 1, 2), (1, 2, 10), (2, 3, 2)]
+        self.assertEqual(max_weight_matching(edges), [-1, 2, 1, -1])
+        self.assertEqual(max_weight_matching(edges, max_cardinality=True), [1, 0, 3, 2])
+        self.assertEqual(max_weight_matching([]), [])
+
+
+class OptimalPairingsTest(TestCase):
+    """Optimal matchmaking pairs the most trainees at the lowest total score."""
+
+    def trainee(self, trainee_id, weight, belt_rank="green"):
+        return Trainee(id=trainee_id, weight=Decimal(weight), belt_rank=belt_rank, profile=UserProfile())
+
+    def pairings(self, trainees, strategy="_optimal_pairings"):
+        service = MatchmakingService()
+        pairings = getattr(service, strategy)(
+            service.build_snapshot(trainees), service.build_snapshot([])
+        )
+        return pairings, {
+            (snapshot.trainees[i].id, snapshot.trainees[j].id)
+            for _, _, snapshot, i, j in pairings
+        }
+
+    def test_components_are_solved_separately_with_odd_counts(self):
+        trainees = [
+            # Three compatible trainees: one of them sits out
+            self.trainee(1, "60"), self.trainee(2, "61.5"), self.trainee(3, "64"),
+            # A chain whose cheapest pair (5, 6) would leave 4 and 7 unpaired
+            self.trainee(4, "70"), self.trainee(5, "74.5"), self.trainee(6, "75.5"), self.trainee(7, "80"),
+            # Nobody within reach
+            self.trainee(8, "100", "black"),
+        ]
+        _, optimal = self.pairings(trainees)
+        self.assertEqual(optimal, {(1, 2), (4, 5), (6, 7)})
+
+        _, greedy = self.pairings(trainees, "_greedy_pairings")
+        self.assertEqual(greedy, {(1, 2), (5, 6)})
+
+    def test_matches_brute_force_on_random_pools(self):
+        rng = random.Random(3)
+        belts = ["white", "green", "brown"]
+        for _ in range(50):
+            trainees = [
+                self.trainee(number, f"{rng.uniform(55, 75):.1f}", rng.choice(belts))
+                for number in range(rng.randint(1, 8))
+            ]
+            snapshot = MatchmakingService.build_snapshot(trainees)
+            edges = [(i, j, snapshot.scaled_score(i, j) * 10) for i, j in snapshot.valid_pairs()]
+            best = min(
+                ((-len(matching), sum(edges[k][2] for k in matching))
+                 for matching in brute_force_matchings(len(trainees), edges)),
+                default=(0, 0),
+            )
+
+            pairings, _ = self.pairings(trainees)
+            self.assertEqual((-len(pairings), sum(pairing[0] for pairing in pairings)), best)
+
+
+def random_trainee_pool(rng, size):
+    """
+    Unsaved trainees with clustered weights, mixed belts (one unknown) and
+    ages, some unknown, so that many pairs tie on score or sit at the limits.
+    """
+    today = date.today()
+    belts = BELT_ORDER + ["unranked"]
+    trainees = []
+    for number in range(1, size + 1):
+        age = rng.choice([None, rng.randint(8, 20)])
+        profile = UserProfile(date_of_birth=age and today.replace(year=today.year - age, day=1))
+        trainees.append(Trainee(
+            id=number,
+            weight=Decimal(rng.randint(500, 700)).scaleb(-1),
+            belt_rank=rng.choice(belts),
+            profile=profile,
+        ))
+    return trainees
+
+
+class GreedyPairingsTest(TestCase):
+    """Greedy matchmaking picks the same pairs as scoring every pair of trainees."""
+
+    def all_pairs_greedy(self, trainees):
+        """
+        Score every valid pair with the model-level checks, in exact Decimal
+        arithmetic so that ties keep trainee-list order, then pick greedily.
+        """
+        service = MatchmakingService()
+        scored = []
+        for i, t1 in enumerate(trainees):
+            for t2 in trainees[i + 1:]:
+                if service._is_valid_pairing(t1, t2):
+                    score = (
+                        abs(t1.weight - t2.weight) * 2
+                        + abs(get_belt_index(t1.belt_rank) - get_belt_index(t2.belt_rank)) * 3
+                        + abs((t1.age or 0) - (t2.age or 0))
+                    )
+                    scored.append((score, t1.id, t2.id))
+        scored.sort(key=lambda pair: pair[0])
+
+        used, pairs = set(), []
+        for _, id1, id2 in scored:
+            if id1 not in used and id2 not in used:
+                pairs.append((id1, id2))
+                used.update((id1, id2))
+        return pairs
+
+    def test_matches_all_pairs_greedy_on_seeded_pools(self):
+        rng = random.Random(5)
+        service = MatchmakingService()
+        for size in (0, 1, 2, 7, 40, 150):
+            trainees = random_trainee_pool(rng, size)
+            pairings = service._greedy_pairings(
+                service.build_snapshot(trainees), service.build_snapshot([])
+            )
+            self.assertEqual(
+                [(snapshot.trainees[i].id, snapshot.trainees[j].id) for _, _, snapshot, i, j in pairings],
+                self.all_pairs_greedy(trainees),
+            )
+
+
+class TraineeSnapshotCountTest(TestCase):
+    """Snapshot pair counts match checking every pair of trainees."""
+
+    def all_pairs_flags(self, trainees):
+        """(weight ok, belt ok, age ok) of every pair, checked on the trainees themselves."""
+        service = MatchmakingService()
+        flags = {}
+        for i, t1 in enumerate(trainees):
+            for j in range(i + 1, len(trainees)):
+                t2 = trainees[j]
+                flags[(i, j)] = (
+                    abs(t1.weight - t2.weight) <= service.MAX_WEIGHT_DIFF,
+                    are_belts_adjacent(t1.belt_rank, t2.belt_rank),
+                    t1.age is None or t2.age is None or abs(t1.age - t2.age) <= service.MAX_AGE_DIFF,
+                )
+        return flags
+
+    def test_counts_match_all_pairs_on_seeded_pools(self):
+        rng = random.Random(5)
+        for size in (0, 1, 2, 7, 40, 150):
+            trainees = random_trainee_pool(rng, size)
+            snapshot = MatchmakingService.build_snapshot(trainees)
+            flags = self.all_pairs_flags(trainees)
+
+            self.assertEqual(
+                set(snapshot.valid_pairs()),
+                {pair for pair, pair_flags in flags.items() if all(pair_flags)},
+            )
+            for selected in itertools.product([False, True], repeat=3):
+                expected = sum(
+                    all(ok for ok, checked in zip(pair_flags, selected) if checked)
+                    for pair_flags in flags.values()
+                )
+                self.assertEqual(snapshot.count_pairs(*selected), expected, selected)
+
+            counts = snapshot.constraint_counts()
+            self.assertEqual(counts["total"], len(flags))
+            self.assertEqual(
+                [counts[name] for name in ("weight", "belt", "age")],
+                [sum(pair_flags[k] for pair_flags in flags.values()) for k in range(3)],
+            )
+            self.assertEqual(counts["valid"], sum(all(pair_flags) for pair_flags in flags.values()))
+            self.assertEqual(counts["failures"], {
+                name: list(flags.values()).count(category)
+                for name, category in snapshot.FAILURE_CATEGORIES.items()
+            })
+
+
+class JobQueueTest(TestCase):
+    """Jobs are claimed once, retried with backoff and reclaimed from stopped workers."""
+
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.dict(TASKS, {"tests.record": self.record})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record(self, value, fail=False):
+        self.calls.append(value)
+        if fail:
+            raise RuntimeError("task failed")
+
+    def test_worker_pass_runs_due_jobs_once(self):
+        first = JobQueue.enqueue("tests.record", value=1)
+        JobQueue.enqueue("tests.record", value=2, delay=timedelta(hours=1))
+
+        call_command("run_jobs", "--once", stdout=io.StringIO())
+
+        self.assertEqual(self.calls, [1])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), ("succeeded", 1))
+        self.assertEqual(JobQueue.claim("worker"), [])
+        with self.assertRaises(ValueError):
+            JobQueue.enqueue("tests.unknown")
+
+    def test_failures_are_retried_with_backoff_then_fail(self):
+        job = JobQueue.enqueue("tests.record", value=1, fail=True, max_attempts=2)
+
+        [claimed] = JobQueue.claim("worker")
+        self.assertFalse(JobQueue.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "pending")
+        self.assertIn("RuntimeError: task failed", job.last_error)
+        self.assertGreaterEqual(job.run_at, timezone.now() + JobQueue.RETRY_BASE_DELAY - timedelta(seconds=5))
+        self.assertEqual(JobQueue.claim("worker"), [])  # Not due yet
+
+        Job.objects.update(run_at=timezone.now())
+        [claimed] = JobQueue.claim("worker")
+        self.assertFalse(JobQueue.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_stale_locks_are_reclaimed(self):
+        job = JobQueue.enqueue("tests.record", value=1, max_attempts=2)
+        JobQueue.claim("stopped-worker")
+        self.assertEqual(JobQueue.claim("worker"), [])
+
+        stale = timezone.now() - JobQueue.LOCK_TIMEOUT - timedelta(seconds=1)
+        Job.objects.update(started_at=stale)
+        [claimed] = JobQueue.claim("worker")
+        self.assertEqual((claimed.locked_by, claimed.attempts), ("worker", 2))
+
+        # The stopped worker can no longer record an outcome for the job
+        JobQueue._record_failure(Job(pk=job.pk, locked_by="stopped-worker", attempts=1), "late")
+        self.assertTrue(JobQueue.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+
+        # Out of attempts when reclaimed: failed instead of run again
+        Job.objects.update(status="running", started_at=stale)
+        self.assertEqual(JobQueue.claim("worker"), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.last_error, "Worker stopped while running the job")
+
+
+class BroadcastNotificationTest(TestCase):
+    """Broadcasts read, count and mark read like one notification per active trainee."""
+
+    add_trainee = EventParticipantCountTest.add_trainee
+
+    def setUp(self):
+        self.first, self.second, inactive = (self.add_trainee(number) for number in range(3))
+        Trainee.objects.filter(pk=inactive.pk).update(status="inactive")
+        self.inactive = inactive.profile.user
+        self.event = Event.objects.create(
+            name="Club Open", event_date=date(2026, 3, 1), location="Main Dojo",
+            registration_deadline=date(2026, 2, 20), max_participants=10, status="open",
+        )
+        self.broadcast = NotificationService.create_event_notification(self.event)
+
+    def unread(self, trainee):
+        user = trainee if isinstance(trainee, User) else trainee.profile.user
+        return NotificationService.get_notification_summary(user)["unread_count"]
+
+    def test_broadcasts_reach_active_trainees_who_had_joined(self):
+        latecomer = self.add_trainee(9)
+
+        self.assertEqual((self.unread(self.first), self.unread(self.second)), (1, 1))
+        self.assertEqual((self.unread(self.inactive), self.unread(latecomer)), (0, 0))
+
+        [item] = NotificationService.get_notification_items(self.first.profile.user)
+        self.assertEqual(
+            (item["title"], item["is_read"], item["is_broadcast"]), ("New Event: Club Open", False, True)
+        )
+
+        # A new broadcast refreshes every cached summary
+        NotificationService.create_event_notification(self.event, "event_updated")
+        self.assertEqual((self.unread(self.first), self.unread(latecomer)), (2, 1))
+
+    def test_read_markers_are_per_user(self):
+        self.assertEqual(self.unread(self.first), 1)
+        user = self.first.profile.user
+
+        self.assertTrue(NotificationService.mark_broadcast_as_read(user, self.broadcast.pk))
+        self.assertTrue(NotificationService.mark_broadcast_as_read(user, self.broadcast.pk))
+        self.assertFalse(NotificationService.mark_broadcast_as_read(self.inactive, self.broadcast.pk))
+
+        self.assertEqual((self.unread(self.first), self.unread(self.second)), (0, 1))
+        self.assertTrue(NotificationService.get_notification_items(user)[0]["is_read"])
+
+    def test_mark_all_as_read_covers_personal_and_broadcast_notifications(self):
+        user = self.second.profile.user
+        NotificationService.bulk_create([
+            Notification(notification_type="general", title="Welcome", message="Hi", recipient=user)
+        ])
+        self.assertEqual(self.unread(self.second), 2)
+
+        self.assertEqual(NotificationService.mark_all_as_read(user), 2)
+        self.assertEqual(NotificationService.mark_all_as_read(user), 0)
+        self.assertEqual(self.unread(self.second), 0)
+        self.assertEqual(self.unread(self.first), 1)
+        self.assertTrue(all(item["is_read"] for item in NotificationService.get_notification_items(user)))
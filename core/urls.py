@@ -273,6 +273,17 @@ urlpatterns = [
     path(
         "admin/reports/export/", admin_views.reports_export, name="admin_reports_export"
     ),
+    # Background PDF exports
+    path(
+        "admin/exports/<int:export_id>/",
+        admin_views.export_status,
+        name="admin_export_status",
+    ),
+    path(
+        "admin/exports/<int:export_id>/download/",
+        admin_views.export_download,
+        name="admin_export_download",
+    ),
     # Extended Reports URLs
     path(
         "admin/reports/belt-promotion/",
@@ -304,6 +315,11 @@ urlpatterns = [
         admin_views.trainee_milestones_report,
         name="admin_trainee_milestones_report",
     ),
+    path(
+        "admin/reports/bundle/",
+        admin_views.report_bundle,
+        name="admin_report_bundle",
+    ),
     # Belt Rank Promotion URLs
     path(
         "admin/belt-promotion/",
@@ -490,6 +506,11 @@ urlpatterns = [
         notification_views.mark_as_read,
         name="mark_notification_read",
     ),
+    path(
+        "notifications/broadcast/<int:broadcast_id>/mark-as-read/",
+        notification_views.mark_broadcast_as_read,
+        name="mark_broadcast_read",
+    ),
     path(
         "notifications/mark-all-as-read/",
         notification_views.mark_all_as_read,
@@ -5,9 +5,9 @@ Handles admin dashboard and management functionality.
 
 import json
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib.auth.models import User
 from django.contrib import messages
 from datetime import timedelta
@@ -1095,7 +1095,8 @@ def event_edit(request, event_id):
         event.registration_deadline = registration_deadline
         event.max_participants = max_participants
         event.status = status
-        event.save()
+        # participant_count is kept by registrations (see core.signals)
+        event.save(update_fields=Event.FORM_FIELDS)
 
         # Check if event should be auto-closed
         if status == "open":
@@ -1163,7 +1164,7 @@ def event_archive(request, event_id):
     if request.method == "POST":
         event_name = event.name
         event.archived = True
-        event.save()
+        event.save(update_fields=["archived"])
 
         if request.headers.get("HX-Request"):
             from django.middleware.csrf import get_token
@@ -1268,7 +1269,7 @@ def event_restore(request, event_id):
     if request.method == "POST":
         event_name = event.name
         event.archived = False
-        event.save()
+        event.save(update_fields=["archived"])
 
         if request.headers.get("HX-Request"):
             from django.middleware.csrf import get_token
@@ -1312,7 +1313,7 @@ def event_status_update(request, event_id):
         if new_status in valid_statuses:
             old_status = event.status
             event.status = new_status
-            event.save()
+            event.save(update_fields=["status"])
 
             # Return updated status badge for HTMX
             if request.headers.get("HX-Request"):
@@ -2050,6 +2051,7 @@ def auto_matchmaking(request):
     selected_event = None
     selected_match_type = "sparring"
     selected_is_promotion = False
+    selected_strategy = "greedy"
 
     if request.method == "POST":
         event_id = request.POST.get("event", "").strip()
@@ -2058,6 +2060,9 @@ def auto_matchmaking(request):
         use_global = request.POST.get("use_global_pool", "off") == "on"
         selected_match_type = request.POST.get("match_type", "sparring").strip()
         selected_is_promotion = request.POST.get("is_promotion_match") == "on"
+        selected_strategy = request.POST.get("strategy", "greedy").strip()
+        if selected_strategy not in MatchmakingService.STRATEGIES:
+            selected_strategy = "greedy"
 
         if event_id:
             selected_event = Event.objects.get(id=event_id)
@@ -2069,6 +2074,7 @@ def auto_matchmaking(request):
                 use_global_pool=use_global,
                 match_type=selected_match_type,
                 is_promotion_match=selected_is_promotion,
+                strategy=selected_strategy,
             )
 
             # Store proposed matches in session for confirmation
@@ -2092,6 +2098,7 @@ def auto_matchmaking(request):
                 "use_global_pool": use_global,
                 "match_type": selected_match_type,
                 "is_promotion_match": selected_is_promotion,
+                "strategy": selected_strategy,
             }
 
     context = {
@@ -2102,6 +2109,7 @@ def auto_matchmaking(request):
         "match_types": Match.MATCH_TYPE_CHOICES,
         "selected_match_type": selected_match_type,
         "selected_is_promotion": selected_is_promotion,
+        "selected_strategy": selected_strategy,
     }
 
     return render(request, "admin/matchmaking/auto.html", context)
@@ -2821,14 +2829,15 @@ def reports_view(request):
         event_id_int = int(event_id) if event_id else None
         min_rating_int = int(min_rating) if min_rating else None
 
-        # Generate report based on type
-        if report_type == "membership":
-            report_data = report_service.membership_report(start_date, end_date)
-        elif report_type == "financial":
-            report_data = report_service.financial_report(start_date, end_date)
+        # Generate report based on type; the summary reports are cached and
+        # shared with their exports
+        if report_type in ("membership", "financial"):
+            report_data = report_service.build_report(
+                report_type, start_date=start_date, end_date=end_date
+            )
         elif report_type == "event" and event_id:
             try:
-                report_data = report_service.event_report(int(event_id))
+                report_data = report_service.build_report("event", event_id=event_id_int)
             except Event.DoesNotExist:
                 report_data = None
         elif report_type == "belt_promotion_history":
@@ -2890,10 +2899,91 @@ def reports_view(request):
     return render(request, "admin/reports/list.html", context)
 
 
+def _queue_pdf_export(request, kind, params, filename):
+    """
+    Queue a background PDF export and send the browser to its status page.
+    """
+    from core.services.report_exports import ReportExportService
+
+    export = ReportExportService.request_export(kind, params, filename, request.user)
+    return redirect("admin_export_status", export_id=export.id)
+
+
+def _queue_report_export(request, report_type, options, filename):
+    """
+    Queue a background PDF export of a ReportService report.
+    """
+    from datetime import date
+
+    options = {
+        name: value.isoformat() if isinstance(value, date) else value
+        for name, value in options.items()
+    }
+    return _queue_pdf_export(
+        request, "report", {"report_type": report_type, "options": options}, filename
+    )
+
+
+def _stream_report_file(report_service, report_data, report_type, file_format, filename):
+    """
+    Stream a ReportService report as a CSV or Excel download.
+    """
+    from core.services import xlsx
+
+    if file_format == "xlsx":
+        response = StreamingHttpResponse(
+            report_service.stream_xlsx(report_data, report_type),
+            content_type=xlsx.CONTENT_TYPE,
+        )
+    else:
+        response = StreamingHttpResponse(
+            report_service.stream_csv(report_data, report_type),
+            content_type="text/csv",
+        )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+@admin_required
+def export_status(request, export_id):
+    """
+    Status page of a background PDF export.
+    HTMX requests get the status panel only; it polls itself until the
+    export has finished.
+    """
+    from core.models import ReportExport
+
+    export = get_object_or_404(ReportExport, id=export_id)
+    context = {"export": export}
+
+    if request.headers.get("HX-Request"):
+        return render(request, "admin/exports/status_partial.html", context)
+
+    return render(request, "admin/exports/status.html", context)
+
+
+@admin_required
+def export_download(request, export_id):
+    """
+    Download the file of a finished background PDF export.
+    """
+    from django.http import FileResponse, Http404
+    from core.models import ReportExport
+
+    export = get_object_or_404(ReportExport, id=export_id)
+    if export.status != "done" or not export.file:
+        raise Http404("Export is not ready")
+
+    # The content type follows the file name: a PDF, or a zip for bundles
+    return FileResponse(
+        export.file.open("rb"), as_attachment=True, filename=export.filename
+    )
+
+
 @admin_required
 def reports_export(request):
     """
-    Export report as PDF or CSV.
+    Export report as PDF, CSV or Excel.
     Requirements: 7.3
     """
     from core.services.reports import ReportService
@@ -2937,82 +3027,72 @@ def reports_export(request):
     event_id_int = int(event_id) if event_id else None
     min_rating_int = int(min_rating) if min_rating else None
 
-    # Generate report data
-    report_data = None
-    if report_type == "membership":
-        report_data = report_service.membership_report(start_date, end_date)
-    elif report_type == "financial":
-        report_data = report_service.financial_report(start_date, end_date)
+    # Report options
+    if report_type in ("membership", "financial"):
+        options = {"start_date": start_date, "end_date": end_date}
     elif report_type == "event" and event_id:
-        try:
-            report_data = report_service.event_report(int(event_id))
-        except Event.DoesNotExist:
+        if not Event.objects.filter(id=event_id_int).exists():
             return HttpResponse("Event not found", status=404)
+        options = {"event_id": event_id_int}
     elif report_type == "belt_promotion_history":
-        report_data = report_service.belt_promotion_history_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            belt_rank=belt_rank if belt_rank else None,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "belt_rank": belt_rank if belt_rank else None,
+        }
     elif report_type == "trainee_skill_progression":
-        report_data = report_service.trainee_skill_progression_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            include_evaluations=include_evaluations,
-            include_achievements=include_achievements,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "include_evaluations": include_evaluations,
+            "include_achievements": include_achievements,
+        }
     elif report_type == "tournament_participation":
-        report_data = report_service.tournament_participation_report(
-            trainee_id=trainee_id_int,
-            event_id=event_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            status_filter=status_filter if status_filter else None,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "event_id": event_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "status_filter": status_filter if status_filter else None,
+        }
     elif report_type == "performance_evaluation":
-        report_data = report_service.performance_evaluation_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            evaluation_status=evaluation_status if evaluation_status else None,
-            min_rating=min_rating_int,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "evaluation_status": evaluation_status if evaluation_status else None,
+            "min_rating": min_rating_int,
+        }
     elif report_type == "competition_results":
-        report_data = report_service.competition_results_report(
-            event_id=event_id_int,
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            match_type=match_type if match_type else None,
-        )
+        options = {
+            "event_id": event_id_int,
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "match_type": match_type if match_type else None,
+        }
     elif report_type == "trainee_milestones":
-        report_data = report_service.trainee_milestones_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            achievement_type=achievement_type if achievement_type else None,
-        )
-
-    if not report_data:
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "achievement_type": achievement_type if achievement_type else None,
+        }
+    else:
         return HttpResponse("Invalid report type", status=400)
 
     # Export based on format
     if export_format == "pdf":
-        pdf_content = report_service.export_pdf(report_data, report_type)
-        response = HttpResponse(pdf_content, content_type="application/pdf")
-        response["Content-Disposition"] = (
-            f'attachment; filename="{report_type}_report.pdf"'
+        return _queue_report_export(
+            request, report_type, options, f"{report_type}_report.pdf"
         )
-        return response
-    elif export_format == "csv":
-        csv_content = report_service.export_csv(report_data, report_type)
-        response = HttpResponse(csv_content, content_type="text/csv")
-        response["Content-Disposition"] = (
-            f'attachment; filename="{report_type}_report.csv"'
+    elif export_format in ("csv", "xlsx"):
+        report_data = report_service.build_report(report_type, **options)
+        return _stream_report_file(
+            report_service, report_data, report_type, export_format, f"{report_type}_report"
         )
-        return response
 
     return HttpResponse("Invalid export format", status=400)
 
@@ -3020,7 +3100,7 @@ def reports_export(request):
 @admin_required
 def trainee_export(request):
     """
-    Export trainee list as PDF or CSV with optional filters and organization format.
+    Export trainee list as PDF, CSV or Excel with optional filters and organization format.
     Supports filtering by specific trainee IDs or using regular filters.
     Supports selecting which sections to include in PDF export.
     Requirements: 3.1, 3.6
@@ -3029,7 +3109,7 @@ def trainee_export(request):
 
     report_service = ReportService()
 
-    file_format = request.GET.get("format", "pdf").strip()  # file format: pdf or csv
+    file_format = request.GET.get("format", "pdf").strip()  # file format: pdf, csv or xlsx
     export_org = request.GET.get(
         "export_by", "user"
     ).strip()  # organization: user or belt
@@ -3076,6 +3156,8 @@ def trainee_export(request):
         belt_filter=belt_filter,
         trainee_ids=trainee_ids,
         export_format=f"by_{export_org}",
+        # The by-belt PDF groups trainees in memory; everything else streams
+        stream=file_format != "pdf" or export_org == "user",
     )
 
     # Export based on file format
@@ -3088,13 +3170,10 @@ def trainee_export(request):
             f'attachment; filename="trainees_{export_org}.pdf"'
         )
         return response
-    elif file_format == "csv":
-        csv_content = report_service.export_csv(report_data, "trainee_list")
-        response = HttpResponse(csv_content, content_type="text/csv")
-        response["Content-Disposition"] = (
-            f'attachment; filename="trainees_{export_org}.csv"'
+    elif file_format in ("csv", "xlsx"):
+        return _stream_report_file(
+            report_service, report_data, "trainee_list", file_format, f"trainees_{export_org}"
         )
-        return response
 
     return HttpResponse("Invalid export format", status=400)
 
@@ -3812,7 +3891,7 @@ def event_export(request):
         "total_events": events.count(),
         "open_events": events.filter(status="open").count(),
         "completed_events": events.filter(status="completed").count(),
-        "total_participants": sum(e.participant_count for e in events),
+        "total_participants": events.aggregate(total=Sum("participant_count"))["total"] or 0,
         "date_from": "",
         "date_to": "",
     }
@@ -3831,46 +3910,34 @@ def event_export(request):
         include_statistics = request.POST.get("include_statistics") == "on"
         sort_by = request.POST.get("sort_by", "date_desc")
 
-        # Filter events
-        filtered_events = events.filter(status__in=statuses) if statuses else events
-
-        if date_from:
+        # The PDF is rendered in the background from the same filters
+        if format_type == "pdf":
             from datetime import datetime
 
-            filtered_events = filtered_events.filter(event_date__gte=date_from)
-
-        if date_to:
-            from datetime import datetime
+            params = {
+                "statuses": statuses,
+                "date_from": date_from,
+                "date_to": date_to,
+                "columns": columns,
+                "include_participants": include_participants,
+                "include_matches": include_matches,
+                "include_statistics": include_statistics,
+                "sort_by": sort_by,
+                "prepared_by": request.user.get_full_name() or request.user.username,
+            }
+            return _queue_pdf_export(
+                request,
+                "events",
+                params,
+                f'Events_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
+            )
 
-            filtered_events = filtered_events.filter(event_date__lte=date_to)
-
-        # Sort events
-        if sort_by == "date_asc":
-            filtered_events = filtered_events.order_by("event_date")
-        elif sort_by == "name":
-            filtered_events = filtered_events.order_by("name")
-        elif sort_by == "participants":
-            filtered_events = filtered_events.annotate(
-                participant_count=Count(
-                    "registrations", filter=Q(registrations__status="registered")
-                )
-            ).order_by("-participant_count")
-        elif sort_by == "status":
-            filtered_events = filtered_events.order_by("status")
-        else:  # date_desc
-            filtered_events = filtered_events.order_by("-event_date")
+        filtered_events = filter_export_events(
+            events, statuses, date_from, date_to, sort_by
+        )
 
         # Export based on format
-        if format_type == "pdf":
-            return export_events_pdf(
-                filtered_events,
-                columns,
-                include_participants,
-                include_matches,
-                include_statistics,
-                request,
-            )
-        elif format_type == "csv":
+        if format_type == "csv":
             return export_events_csv(
                 filtered_events,
                 columns,
@@ -3892,19 +3959,76 @@ def event_export(request):
     return render(request, "admin/events/export.html", context)
 
 
+def filter_export_events(events, statuses, date_from, date_to, sort_by):
+    """
+    Apply the event export page's filters and sort order to events.
+    """
+    filtered_events = events.filter(status__in=statuses) if statuses else events
+
+    if date_from:
+        filtered_events = filtered_events.filter(event_date__gte=date_from)
+
+    if date_to:
+        filtered_events = filtered_events.filter(event_date__lte=date_to)
+
+    # Sort events
+    if sort_by == "date_asc":
+        filtered_events = filtered_events.order_by("event_date")
+    elif sort_by == "name":
+        filtered_events = filtered_events.order_by("name")
+    elif sort_by == "participants":
+        filtered_events = filtered_events.order_by("-participant_count")
+    elif sort_by == "status":
+        filtered_events = filtered_events.order_by("status")
+    else:  # date_desc
+        filtered_events = filtered_events.order_by("-event_date")
+
+    return filtered_events
+
+
+def render_events_pdf(
+    output,
+    statuses,
+    date_from,
+    date_to,
+    columns,
+    include_participants,
+    include_matches,
+    include_statistics,
+    sort_by,
+    prepared_by="System",
+):
+    """
+    Render the event export page's PDF report to output.
+    """
+    events = filter_export_events(
+        Event.objects.filter(archived=False), statuses, date_from, date_to, sort_by
+    )
+    export_events_pdf(
+        output,
+        events,
+        columns,
+        include_participants,
+        include_matches,
+        include_statistics,
+        prepared_by,
+    )
+
+
 def export_events_pdf(
+    output,
     events,
     columns,
     include_participants,
     include_matches,
     include_statistics,
-    request=None,
+    prepared_by="System",
 ):
     """
     Generate comprehensive PDF report.
     """
     from reportlab.lib.pagesizes import A4, letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.styles import ParagraphStyle
     from reportlab.lib.units import inch
     from reportlab.platypus import (
         SimpleDocTemplate,
@@ -3913,23 +4037,21 @@ def export_events_pdf(
         Paragraph,
         Spacer,
         PageBreak,
-        Image,
     )
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     from datetime import datetime
+    from core.services.pdf_layout import pdf_layout
+    from core.services.pdf_tables import PagedTable
+    from core.services.reports import ReportService
     import os
-
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="Events_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-    )
+    from django.conf import settings
 
     doc = SimpleDocTemplate(
-        response, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch
+        output, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch
     )
     story = []
-    styles = getSampleStyleSheet()
+    styles = pdf_layout.styles
 
     # Title styles
     title_style = ParagraphStyle(
@@ -3972,52 +4094,43 @@ def export_events_pdf(
     header_data = []
 
     # Try to add logo if it exists
-    logo_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "media", "logo.png"
-    )
-    if os.path.exists(logo_path):
-        try:
-            logo = Image(logo_path, width=0.5 * inch, height=0.5 * inch)
-            header_table_data = [
-                [
-                    logo,
-                    Paragraph(
-                        "<b>BlackCobra Karate Club</b><br/>Event Management Report",
-                        ParagraphStyle(
-                            "HeaderText",
-                            parent=styles["Normal"],
-                            fontSize=14,
-                            textColor=colors.HexColor("#ff6b35"),
-                            fontName="Helvetica-Bold",
-                        ),
+    logo_path = os.path.join(settings.BASE_DIR, "media", "logo.png")
+    logo = pdf_layout.logo(logo_path, 0.5 * inch)
+    if logo:
+        header_table_data = [
+            [
+                logo,
+                Paragraph(
+                    "<b>BlackCobra Karate Club</b><br/>Event Management Report",
+                    ParagraphStyle(
+                        "HeaderText",
+                        parent=styles["Normal"],
+                        fontSize=14,
+                        textColor=colors.HexColor("#ff6b35"),
+                        fontName="Helvetica-Bold",
                     ),
-                ]
+                ),
             ]
-            header_table = Table(header_table_data, colWidths=[0.8 * inch, 5 * inch])
-            header_table.setStyle(
-                TableStyle(
-                    [
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ]
-                )
+        ]
+        header_table = Table(header_table_data, colWidths=[0.8 * inch, 5 * inch])
+        header_table.setStyle(
+            TableStyle(
+                [
+                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ]
             )
-            story.append(header_table)
-        except:
-            # If logo fails to load, just use text
-            story.append(Paragraph("<b>BlackCobra Karate Club</b>", title_style))
-            story.append(Paragraph("Event Management Report", styles["Heading3"]))
+        )
+        story.append(header_table)
     else:
-        # No logo file, use text header
+        # No usable logo file, use text header
         story.append(Paragraph("<b>BlackCobra Karate Club</b>", title_style))
         story.append(Paragraph("Event Management Report", styles["Heading3"]))
 
     story.append(Spacer(1, 0.1 * inch))
 
     # Metadata section - use table for proper layout
-    current_user = (
-        request.user.get_full_name() or request.user.username if request else "System"
-    )
+    current_user = prepared_by
 
     metadata_data = [
         ["Generated on:", datetime.now().strftime("%B %d, %Y at %H:%M:%S")],
@@ -4204,28 +4317,34 @@ def export_events_pdf(
     if include_participants:
         story.append(PageBreak())
         story.append(Paragraph("Event Participants", section_style))
+        belt_names = dict(Trainee.BELT_CHOICES)
 
         for event in events[:5]:  # Limit to first 5 events per page
             registrations = event.registrations.filter(status="registered")
             if registrations.exists():
                 story.append(Paragraph(f"<b>{event.name}</b>", styles["Normal"]))
 
-                participant_data = [["Participant Name", "Belt Rank", "Weight Class"]]
-                for reg in registrations:
-                    trainee = reg.trainee
-                    participant_data.append(
-                        [
-                            trainee.profile.user.get_full_name(),
-                            trainee.get_belt_rank_display(),
-                            trainee.weight_class,
-                        ]
-                    )
-
-                participant_table = Table(
-                    participant_data, colWidths=[2.5 * inch, 1.5 * inch, 1.8 * inch]
+                # Streamed from the database as the table is laid out
+                participants = registrations.values_list(
+                    "trainee__profile__user__first_name",
+                    "trainee__profile__user__last_name",
+                    "trainee__belt_rank",
+                    "trainee__weight_class",
+                ).iterator(chunk_size=ReportService.STREAM_CHUNK_SIZE)
+                participant_rows = (
+                    [
+                        f"{first_name} {last_name}".strip(),
+                        belt_names.get(belt_rank, belt_rank),
+                        weight_class,
+                    ]
+                    for first_name, last_name, belt_rank, weight_class in participants
                 )
-                participant_table.setStyle(
-                    TableStyle(
+
+                participant_table = PagedTable(
+                    ["Participant Name", "Belt Rank", "Weight Class"],
+                    participant_rows,
+                    col_widths=[2.5 * inch, 1.5 * inch, 1.8 * inch],
+                    style=TableStyle(
                         [
                             ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#ff6b35")),
                             ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
@@ -4233,7 +4352,7 @@ def export_events_pdf(
                             ("PADDING", (0, 0), (-1, -1), 4),
                             ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
                         ]
-                    )
+                    ),
                 )
 
                 story.append(participant_table)
@@ -4276,41 +4395,21 @@ def export_events_pdf(
     story.append(sig_table)
 
     # Build PDF
-    doc.build(story)
-    return response
+    pdf_layout.build(doc, story)
 
 
-def export_events_csv(
-    events,
-    columns,
-    include_participants,
-    include_matches,
-    include_statistics,
-    request=None,
-):
+def _events_export_rows(events, columns, prepared_by, generated_at):
     """
-    Generate CSV export.
+    Yield the rows of an events export, streamed from the events queryset.
+    Dates are yielded as date objects so Excel exports get date cells.
     """
-    import csv
-    from datetime import datetime
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = (
-        f'attachment; filename="Events_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-    )
-
-    writer = csv.writer(response)
+    from core.services.reports import ReportService
 
     # Add metadata header
-    current_user = (
-        request.user.get_full_name() or request.user.username if request else "System"
-    )
-    writer.writerow(["BlackCobra Karate Club - Event Report"])
-    writer.writerow(
-        [f"Generated on: {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}"]
-    )
-    writer.writerow([f"Prepared by: {current_user}"])
-    writer.writerow([])  # Empty row for spacing
+    yield ["BlackCobra Karate Club - Event Report"]
+    yield [f"Generated on: {generated_at.strftime('%B %d, %Y at %H:%M:%S')}"]
+    yield [f"Prepared by: {prepared_by}"]
+    yield []  # Empty row for spacing
 
     # Headers
     headers = []
@@ -4331,15 +4430,15 @@ def export_events_csv(
     if "description" in columns:
         headers.append("Description")
 
-    writer.writerow(headers)
+    yield headers
 
     # Data rows
-    for event in events:
+    for event in events.iterator(chunk_size=ReportService.STREAM_CHUNK_SIZE):
         row = []
         if "name" in columns:
             row.append(event.name)
         if "date" in columns:
-            row.append(event.event_date.strftime("%Y-%m-%d"))
+            row.append(event.event_date)
         if "location" in columns:
             row.append(event.location)
         if "status" in columns:
@@ -4349,12 +4448,41 @@ def export_events_csv(
         if "max_participants" in columns:
             row.append(event.max_participants)
         if "deadline" in columns:
-            row.append(event.registration_deadline.strftime("%Y-%m-%d"))
+            row.append(event.registration_deadline)
         if "description" in columns:
             row.append(event.description or "")
 
-        writer.writerow(row)
+        yield row
+
+
+def export_events_csv(
+    events,
+    columns,
+    include_participants,
+    include_matches,
+    include_statistics,
+    request=None,
+):
+    """
+    Generate CSV export, streamed row by row from the events queryset.
+    """
+    from datetime import datetime
+    from core.services.reports import ReportService
+
+    current_user = (
+        request.user.get_full_name() or request.user.username if request else "System"
+    )
+    generated_at = datetime.now()
 
+    response = StreamingHttpResponse(
+        ReportService().csv_chunks(
+            _events_export_rows(events, columns, current_user, generated_at)
+        ),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="Events_Report_{generated_at.strftime("%Y%m%d_%H%M%S")}.csv"'
+    )
     return response
 
 
@@ -4367,17 +4495,27 @@ def export_events_excel(
     request=None,
 ):
     """
-    Generate Excel export (using CSV for now, can be extended with openpyxl).
+    Generate Excel export, streamed row by row from the events queryset.
     """
-    # For now, return CSV. Can be upgraded with openpyxl for true Excel format
-    return export_events_csv(
-        events,
-        columns,
-        include_participants,
-        include_matches,
-        include_statistics,
-        request,
+    from datetime import datetime
+    from core.services import xlsx
+
+    current_user = (
+        request.user.get_full_name() or request.user.username if request else "System"
     )
+    generated_at = datetime.now()
+
+    response = StreamingHttpResponse(
+        xlsx.stream_xlsx(
+            _events_export_rows(events, columns, current_user, generated_at),
+            sheet_name="Events",
+        ),
+        content_type=xlsx.CONTENT_TYPE,
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="Events_Report_{generated_at.strftime("%Y%m%d_%H%M%S")}.xlsx"'
+    )
+    return response
 
 
 @admin_required
@@ -4472,11 +4610,31 @@ def match_monitor(request):
 @admin_required
 def match_monitor_export_pdf(request):
     """
-    Generate a comprehensive PDF report for the Match Monitor.
+    Queue a comprehensive PDF report for the Match Monitor.
     Supports filtering by event, match type, status, and search.
     """
+    from datetime import datetime
+
+    filters = {
+        name: request.GET.get(name, "").strip()
+        for name in ("event_filter", "match_type_filter", "status_filter", "search")
+    }
+    return _queue_pdf_export(
+        request,
+        "match_monitor",
+        filters,
+        f'Match_Monitor_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf',
+    )
+
+
+def render_match_monitor_pdf(
+    output, event_filter="", match_type_filter="", status_filter="", search=""
+):
+    """
+    Render the Match Monitor PDF report to output.
+    """
     from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.styles import ParagraphStyle
     from reportlab.lib.units import inch
     from reportlab.platypus import (
         SimpleDocTemplate,
@@ -4484,13 +4642,12 @@ def match_monitor_export_pdf(request):
         TableStyle,
         Paragraph,
         Spacer,
-        Image,
         PageBreak,
     )
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     from datetime import datetime
-    import os
+    from core.services.pdf_layout import pdf_layout
     from django.db.models import Q, Prefetch
     from core.models import Match, MatchResult
 
@@ -4510,19 +4667,15 @@ def match_monitor_export_pdf(request):
         ),
     ).order_by("-scheduled_time")
 
-    event_filter = request.GET.get("event_filter", "").strip()
     if event_filter:
         matches = matches.filter(event_id=event_filter)
 
-    match_type_filter = request.GET.get("match_type_filter", "").strip()
     if match_type_filter:
         matches = matches.filter(match_type=match_type_filter)
 
-    status_filter = request.GET.get("status_filter", "").strip()
     if status_filter:
         matches = matches.filter(status=status_filter)
 
-    search = request.GET.get("search", "").strip()
     if search:
         matches = matches.filter(
             Q(competitor1__profile__user__first_name__icontains=search)
@@ -4538,16 +4691,11 @@ def match_monitor_export_pdf(request):
     pending = matches.filter(status="scheduled").count()
     ongoing = matches.filter(status="ongoing").count()
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="Match_Monitor_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-    )
-
     doc = SimpleDocTemplate(
-        response, pagesize=landscape(A4), topMargin=0.5 * inch, bottomMargin=0.5 * inch
+        output, pagesize=landscape(A4), topMargin=0.5 * inch, bottomMargin=0.5 * inch
     )
     story = []
-    styles = getSampleStyleSheet()
+    styles = pdf_layout.styles
 
     # Define Styles
     title_style = ParagraphStyle(
@@ -4571,20 +4719,12 @@ def match_monitor_export_pdf(request):
     )
 
     # Header with Dual Logos
-    logo1_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "core", "static", "images", "black_cobra_logo.jpg")
-    logo2_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "core", "static", "images", "judo_logo.png")
-    
-    logo_size = 0.8 * inch
-    l1 = Image(logo1_path, width=logo_size, height=logo_size) if os.path.exists(logo1_path) else ""
-    l2 = Image(logo2_path, width=logo_size, height=logo_size) if os.path.exists(logo2_path) else ""
-    
-    header_table = Table([[l1, Paragraph("<b>BLACKCOBRA KARATE CLUB</b><br/><font size=12>MATCH MONITOR COMPREHENSIVE REPORT</font>", title_style), l2]], colWidths=[1.5 * inch, 7 * inch, 1.5 * inch])
-    header_table.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("ALIGN", (0, 0), (0, 0), "LEFT"),
-        ("ALIGN", (1, 0), (1, 0), "CENTER"),
-        ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-    ]))
+    header_table = pdf_layout.letterhead(
+        Paragraph("<b>BLACKCOBRA KARATE CLUB</b><br/><font size=12>MATCH MONITOR COMPREHENSIVE REPORT</font>", title_style),
+        col_widths=[1.5 * inch, 7 * inch, 1.5 * inch],
+        logo_size=0.8 * inch,
+        spread=True,
+    )
     story.append(header_table)
     story.append(Spacer(1, 0.2 * inch))
 
@@ -4677,17 +4817,31 @@ def match_monitor_export_pdf(request):
     ]))
     story.append(sig_table)
 
-    doc.build(story)
-    return response
+    pdf_layout.build(doc, story)
 
 
 @admin_required
 def match_export_pdf(request, match_id):
     """
-    Generate a detailed PDF report for a specific match with judge signatories.
+    Queue a detailed PDF report for a specific match with judge signatories.
+    """
+    from datetime import datetime
+
+    match = get_object_or_404(Match, id=match_id)
+    return _queue_pdf_export(
+        request,
+        "match_result",
+        {"match_id": match.id},
+        f'Match_{match.id}_Result_{datetime.now().strftime("%Y%m%d")}.pdf',
+    )
+
+
+def render_match_result_pdf(output, match_id):
+    """
+    Render the PDF report of a match to output.
     """
     from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.styles import ParagraphStyle
     from reportlab.lib.units import inch
     from reportlab.platypus import (
         SimpleDocTemplate,
@@ -4695,40 +4849,31 @@ def match_export_pdf(request, match_id):
         TableStyle,
         Paragraph,
         Spacer,
-        Image,
     )
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_CENTER, TA_LEFT
     from datetime import datetime
-    import os
+    from core.services.pdf_layout import pdf_layout
     from core.models import Match, MatchResult
 
-    match = get_object_or_404(
-        Match.objects.select_related(
-            "event",
-            "competitor1__profile__user",
-            "competitor2__profile__user",
-            "winner__profile__user",
-        ).prefetch_related(
-            "judge_assignments__judge__profile__user",
-            "results__judge__profile__user",
-        ),
-        id=match_id,
-    )
+    match = Match.objects.select_related(
+        "event",
+        "competitor1__profile__user",
+        "competitor2__profile__user",
+        "winner__profile__user",
+    ).prefetch_related(
+        "judge_assignments__judge__profile__user",
+        "results__judge__profile__user",
+    ).get(id=match_id)
 
     judge_results = match.results.all()
     judge_assignments = match.judge_assignments.all()
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="Match_{match.id}_Result_{datetime.now().strftime("%Y%m%d")}.pdf"'
-    )
-
     doc = SimpleDocTemplate(
-        response, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch
+        output, pagesize=A4, topMargin=0.5 * inch, bottomMargin=0.5 * inch
     )
     story = []
-    styles = getSampleStyleSheet()
+    styles = pdf_layout.styles
 
     # Define Styles
     title_style = ParagraphStyle(
@@ -4757,44 +4902,14 @@ def match_export_pdf(request, match_id):
     )
 
     # Header section with Logos
-    logo1_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-        "core", "static", "images", "black_cobra_logo.jpg"
-    )
-    logo2_path = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-        "core", "static", "images", "judo_logo.png"
+    club_name = Paragraph("<b>BLACKCOBRA KARATE CLUB</b>", title_style)
+    header_table = pdf_layout.letterhead(
+        club_name,
+        col_widths=[1.2 * inch, 4.0 * inch, 1.2 * inch],
+        logo_size=0.8 * inch,
+        spread=True,
     )
-    
-    header_table_data = []
-    logo_size = 0.8 * inch
-    
-    l1 = None
-    if os.path.exists(logo1_path):
-        try:
-            l1 = Image(logo1_path, width=logo_size, height=logo_size)
-        except:
-            pass
-
-    l2 = None
-    if os.path.exists(logo2_path):
-        try:
-            l2 = Image(logo2_path, width=logo_size, height=logo_size)
-        except:
-            pass
 
-    club_name = Paragraph("<b>BLACKCOBRA KARATE CLUB</b>", title_style)
-    
-    # Create a layout table for the header: [Logo1, Title, Logo2]
-    header_row = [l1 or "", club_name, l2 or ""]
-    header_table = Table([header_row], colWidths=[1.2 * inch, 4.0 * inch, 1.2 * inch])
-    header_table.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("ALIGN", (0, 0), (0, 0), "LEFT"),
-        ("ALIGN", (1, 0), (1, 0), "CENTER"),
-        ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-    ]))
-    
     story.append(header_table)
     story.append(Spacer(1, 0.1 * inch))
 
@@ -4918,8 +5033,7 @@ def match_export_pdf(request, match_id):
     ]))
     story.append(sig_grid)
 
-    doc.build(story)
-    return response
+    pdf_layout.build(doc, story)
 
 
 @admin_required
@@ -5065,17 +5179,14 @@ def match_close(request, match_id):
 
         # Award points to trainees
         try:
-            winner_points, _ = TraineePoints.objects.get_or_create(trainee=winner)
             loser = (
                 match.competitor1 if match.competitor2 == winner else match.competitor2
             )
-            loser_points, _ = TraineePoints.objects.get_or_create(trainee=loser)
-
-            winner_points.add_win()
-            loser_points.add_loss()
-
-            # Update leaderboards
-            _update_leaderboards_after_match()
+            # Both competitors in one atomic points update
+            TraineePoints.award([
+                (winner.id, TraineePoints.WIN_POINTS, "win"),
+                (loser.id, TraineePoints.LOSS_POINTS, "loss"),
+            ])  # Also re-ranks both competitors
         except Exception as e:
             print(f"Error awarding points: {e}")
 
@@ -5102,12 +5213,6 @@ def match_close(request, match_id):
     return render(request, "admin/matchmaking/close_confirm.html", context)
 
 
-def _update_leaderboards_after_match():
-    """Update leaderboard rankings after a match is completed."""
-    from core.services.leaderboard_service import LeaderboardService
-    LeaderboardService.update_all_leaderboards()
-
-
 
 
 @admin_required
@@ -5149,25 +5254,24 @@ def belt_promotion_report(request):
 
         trainee_id_int = int(trainee_id) if trainee_id else None
 
-        report_data = report_service.belt_promotion_history_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            belt_rank=belt_rank if belt_rank else None,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "belt_rank": belt_rank if belt_rank else None,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "belt_promotion_history")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="belt_promotion_history.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "belt_promotion_history")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="belt_promotion_history.csv"'
-            return response
+            return _queue_report_export(
+                request, "belt_promotion_history", options, "belt_promotion_history.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.belt_promotion_history_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "belt_promotion_history", export_format, "belt_promotion_history"
+            )
 
     context = {
         "trainees": trainees,
@@ -5219,26 +5323,25 @@ def skill_progression_report(request):
 
         trainee_id_int = int(trainee_id) if trainee_id else None
 
-        report_data = report_service.trainee_skill_progression_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            include_evaluations=include_evaluations,
-            include_achievements=include_achievements,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "include_evaluations": include_evaluations,
+            "include_achievements": include_achievements,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "trainee_skill_progression")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="skill_progression.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "trainee_skill_progression")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="skill_progression.csv"'
-            return response
+            return _queue_report_export(
+                request, "trainee_skill_progression", options, "skill_progression.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.trainee_skill_progression_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "trainee_skill_progression", export_format, "skill_progression"
+            )
 
     context = {
         "trainees": trainees,
@@ -5291,26 +5394,25 @@ def tournament_participation_report(request):
         trainee_id_int = int(trainee_id) if trainee_id else None
         event_id_int = int(event_id) if event_id else None
 
-        report_data = report_service.tournament_participation_report(
-            trainee_id=trainee_id_int,
-            event_id=event_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            status_filter=status_filter if status_filter else None,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "event_id": event_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "status_filter": status_filter if status_filter else None,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "tournament_participation")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="tournament_participation.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "tournament_participation")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="tournament_participation.csv"'
-            return response
+            return _queue_report_export(
+                request, "tournament_participation", options, "tournament_participation.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.tournament_participation_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "tournament_participation", export_format, "tournament_participation"
+            )
 
     context = {
         "trainees": trainees,
@@ -5364,26 +5466,25 @@ def performance_evaluation_report(request):
         trainee_id_int = int(trainee_id) if trainee_id else None
         min_rating_int = int(min_rating) if min_rating else None
 
-        report_data = report_service.performance_evaluation_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            evaluation_status=evaluation_status if evaluation_status else None,
-            min_rating=min_rating_int,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "evaluation_status": evaluation_status if evaluation_status else None,
+            "min_rating": min_rating_int,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "performance_evaluation")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="performance_evaluation.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "performance_evaluation")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="performance_evaluation.csv"'
-            return response
+            return _queue_report_export(
+                request, "performance_evaluation", options, "performance_evaluation.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.performance_evaluation_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "performance_evaluation", export_format, "performance_evaluation"
+            )
 
     context = {
         "trainees": trainees,
@@ -5438,26 +5539,25 @@ def competition_results_report(request):
         trainee_id_int = int(trainee_id) if trainee_id else None
         event_id_int = int(event_id) if event_id else None
 
-        report_data = report_service.competition_results_report(
-            event_id=event_id_int,
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            match_type=match_type if match_type else None,
-        )
+        options = {
+            "event_id": event_id_int,
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "match_type": match_type if match_type else None,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "competition_results")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="competition_results.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "competition_results")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="competition_results.csv"'
-            return response
+            return _queue_report_export(
+                request, "competition_results", options, "competition_results.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.competition_results_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "competition_results", export_format, "competition_results"
+            )
 
     context = {
         "trainees": trainees,
@@ -5509,25 +5609,24 @@ def trainee_milestones_report(request):
 
         trainee_id_int = int(trainee_id) if trainee_id else None
 
-        report_data = report_service.trainee_milestones_report(
-            trainee_id=trainee_id_int,
-            start_date=start_date,
-            end_date=end_date,
-            achievement_type=achievement_type if achievement_type else None,
-        )
+        options = {
+            "trainee_id": trainee_id_int,
+            "start_date": start_date,
+            "end_date": end_date,
+            "achievement_type": achievement_type if achievement_type else None,
+        }
 
         export_format = request.POST.get("export_format", "").strip()
 
         if export_format == "pdf":
-            pdf_content = report_service.export_pdf(report_data, "trainee_milestones")
-            response = HttpResponse(pdf_content, content_type="application/pdf")
-            response["Content-Disposition"] = 'attachment; filename="trainee_milestones.pdf"'
-            return response
-        elif export_format == "csv":
-            csv_content = report_service.export_csv(report_data, "trainee_milestones")
-            response = HttpResponse(csv_content, content_type="text/csv")
-            response["Content-Disposition"] = 'attachment; filename="trainee_milestones.csv"'
-            return response
+            return _queue_report_export(
+                request, "trainee_milestones", options, "trainee_milestones.pdf"
+            )
+        elif export_format in ("csv", "xlsx"):
+            report_data = report_service.trainee_milestones_report(**options)
+            return _stream_report_file(
+                report_service, report_data, "trainee_milestones", export_format, "trainee_milestones"
+            )
 
     context = {
         "trainees": trainees,
@@ -5537,3 +5636,61 @@ def trainee_milestones_report(request):
     }
 
     return render(request, "admin/reports/trainee_milestones.html", context)
+
+
+@admin_required
+def report_bundle(request):
+    """
+    Export several extended reports for one period as a single zip of PDFs.
+    The reports are rendered in parallel in the background.
+    """
+    from core.services.report_bundle import BUNDLE_REPORTS
+    from datetime import date, timedelta
+
+    default_end_date = date.today()
+    default_start_date = default_end_date - timedelta(days=365)
+
+    if request.method == "POST":
+        report_types = [
+            name for name in request.POST.getlist("reports") if name in BUNDLE_REPORTS
+        ]
+        start_date_str = request.POST.get("start_date", "").strip()
+        end_date_str = request.POST.get("end_date", "").strip()
+
+        try:
+            start_date = (
+                date.fromisoformat(start_date_str)
+                if start_date_str
+                else default_start_date
+            )
+            end_date = (
+                date.fromisoformat(end_date_str) if end_date_str else default_end_date
+            )
+        except ValueError:
+            start_date = default_start_date
+            end_date = default_end_date
+
+        if not report_types:
+            messages.error(request, "Select at least one report for the bundle.")
+        else:
+            params = {
+                "report_types": report_types,
+                "options": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                },
+            }
+            return _queue_pdf_export(
+                request,
+                "bundle",
+                params,
+                f"reports_{start_date:%Y%m%d}_{end_date:%Y%m%d}.zip",
+            )
+
+    context = {
+        "report_choices": BUNDLE_REPORTS.items(),
+        "default_start_date": default_start_date.isoformat(),
+        "default_end_date": default_end_date.isoformat(),
+    }
+
+    return render(request, "admin/reports/bundle.html", context)
@@ -2,10 +2,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, F
 from django.http import JsonResponse
 from django.core.paginator import Paginator
 from ..models import Trainee, Attendance, TrainingSession, Event
+from ..services.attendance_service import AttendanceService
 from datetime import datetime, date, timedelta
 
 
@@ -23,6 +24,29 @@ def admin_required(view_func):
     return wrapper
 
 
+def with_attendance_counts(sessions):
+    """
+    Annotate sessions with their attendance counts, computed in the same
+    grouped query instead of several counts per session.
+    """
+    return sessions.annotate(
+        present_count=Count(
+            "attendance_records",
+            filter=Q(attendance_records__status__in=["present", "late"]),
+        ),
+        present_only_count=Count(
+            "attendance_records", filter=Q(attendance_records__status="present")
+        ),
+        absent_count=Count(
+            "attendance_records", filter=Q(attendance_records__status="absent")
+        ),
+        excused_count=Count(
+            "attendance_records", filter=Q(attendance_records__status="excused")
+        ),
+        marked_count=Count("attendance_records"),
+    )
+
+
 @admin_required
 def attendance_dashboard(request):
     """
@@ -38,21 +62,13 @@ def attendance_dashboard(request):
         status="active", archived=False
     ).count()
 
-    # Today's Sessions
-    todays_sessions = TrainingSession.objects.filter(date=today).order_by("start_time")
-    todays_sessions_count = todays_sessions.count()
-
-    # Add attendance stats to today's sessions
-    for session in todays_sessions:
-        session.present_count = session.attendance_records.filter(
-            status__in=["present", "late"]
-        ).count()
-        session.absent_count = session.attendance_records.filter(
-            status="absent"
-        ).count()
-        session.excused_count = session.attendance_records.filter(
-            status="excused"
-        ).count()
+    # Today's Sessions, with attendance stats
+    todays_sessions = list(
+        with_attendance_counts(TrainingSession.objects.filter(date=today)).order_by(
+            "start_time"
+        )
+    )
+    todays_sessions_count = len(todays_sessions)
 
     # Sessions this week
     week_start = today - timedelta(days=today.weekday())
@@ -62,52 +78,39 @@ def attendance_dashboard(request):
     ).count()
 
     # Monthly attendance rate
-    monthly_attendance = Attendance.objects.filter(date__gte=thirty_days_ago)
-    if monthly_attendance.exists():
-        total_records = monthly_attendance.count()
-        present_records = monthly_attendance.filter(
-            status__in=["present", "late"]
-        ).count()
-        monthly_rate = (
-            int((present_records / total_records) * 100) if total_records > 0 else 0
-        )
-    else:
-        monthly_rate = 0
-
-    # Past Sessions (before today)
-    past_sessions = TrainingSession.objects.filter(date__lt=today).order_by(
-        "-date", "-start_time"
-    )[:10]
+    monthly_attendance = Attendance.objects.filter(
+        date__gte=thirty_days_ago
+    ).aggregate(
+        total=Count("id"),
+        present=Count("id", filter=Q(status__in=["present", "late"])),
+    )
+    total_records = monthly_attendance["total"]
+    monthly_rate = (
+        int((monthly_attendance["present"] / total_records) * 100)
+        if total_records > 0
+        else 0
+    )
 
-    # Add attendance stats to past sessions
+    # Past Sessions (before today), with attendance stats
+    past_sessions = list(
+        with_attendance_counts(TrainingSession.objects.filter(date__lt=today)).order_by(
+            "-date", "-start_time"
+        )[:10]
+    )
     for session in past_sessions:
-        session.present_count = session.attendance_records.filter(
-            status__in=["present", "late"]
-        ).count()
-        session.absent_count = session.attendance_records.filter(
-            status="absent"
-        ).count()
-        session.excused_count = session.attendance_records.filter(
-            status="excused"
-        ).count()
+        session.present_rate = (
+            int((session.present_only_count / session.marked_count) * 100)
+            if session.marked_count
+            else 0
+        )
 
-    # Upcoming Sessions (after today)
-    upcoming_sessions = TrainingSession.objects.filter(
-        date__gt=today, status__in=["scheduled", "ongoing"]
+    # Upcoming Sessions (after today), with attendance stats
+    upcoming_sessions = with_attendance_counts(
+        TrainingSession.objects.filter(
+            date__gt=today, status__in=["scheduled", "ongoing"]
+        )
     ).order_by("date", "start_time")[:10]
 
-    # Add attendance stats to upcoming sessions
-    for session in upcoming_sessions:
-        session.present_count = session.attendance_records.filter(
-            status__in=["present", "late"]
-        ).count()
-        session.absent_count = session.attendance_records.filter(
-            status="absent"
-        ).count()
-        session.excused_count = session.attendance_records.filter(
-            status="excused"
-        ).count()
-
     # Upcoming Events with attendance
     upcoming_events = Event.objects.filter(
         event_date__gte=today, status__in=["open", "closed", "ongoing"], archived=False
@@ -121,6 +124,7 @@ def attendance_dashboard(request):
             attendance_records__date__gte=thirty_days_ago,
             attendance_records__status__in=["present", "late"],
         )
+        .select_related("profile__user")
         .annotate(
             attendance_count=Count(
                 "attendance_records",
@@ -134,23 +138,30 @@ def attendance_dashboard(request):
     )
 
     # Low Attendance Trainees (warning)
-    # Trainees with less than 50% attendance in last 30 days
-    low_attendance_trainees = []
-    for trainee in Trainee.objects.filter(status="active", archived=False):
-        records = trainee.attendance_records.filter(date__gte=thirty_days_ago)
-        if records.exists():
-            total = records.count()
-            present = records.filter(status__in=["present", "late"]).count()
-            rate = (present / total) * 100
-            if rate < 50:
-                trainee.attendance_rate = int(rate)
-                trainee.sessions_attended = present
-                trainee.total_sessions = total
-                low_attendance_trainees.append(trainee)
-
-    low_attendance_trainees = sorted(
-        low_attendance_trainees, key=lambda x: x.attendance_rate
-    )[:5]
+    # Trainees with less than 50% attendance in last 30 days, with each
+    # trainee's rate computed in one grouped query
+    low_attendance_trainees = (
+        Trainee.objects.filter(status="active", archived=False)
+        .select_related("profile__user")
+        .annotate(
+            total_sessions=Count(
+                "attendance_records",
+                filter=Q(attendance_records__date__gte=thirty_days_ago),
+            ),
+            sessions_attended=Count(
+                "attendance_records",
+                filter=Q(
+                    attendance_records__date__gte=thirty_days_ago,
+                    attendance_records__status__in=["present", "late"],
+                ),
+            ),
+        )
+        .filter(total_sessions__gt=F("sessions_attended") * 2)
+        .annotate(attendance_rate=F("sessions_attended") * 100 / F("total_sessions"))
+        .order_by(
+            "attendance_rate", "profile__user__first_name", "profile__user__last_name"
+        )[:5]
+    )
 
     # Session type distribution (last 30 days)
     session_types = (
@@ -362,6 +373,36 @@ def session_delete(request, session_id):
     )
 
 
+def attendance_marks_from_post(post, trainee_ids):
+    """
+    Read the attendance form's status, notes and check-in time for each
+    trainee that was given a status.
+
+    Returns:
+        Dict of trainee id -> Attendance field values
+    """
+    marks = {}
+    for trainee_id in trainee_ids:
+        status = post.get(f"status_{trainee_id}")
+        if not status:
+            continue
+
+        check_in = None
+        check_in_time = post.get(f"check_in_{trainee_id}", "")
+        if check_in_time:
+            try:
+                check_in = datetime.strptime(check_in_time, "%H:%M").time()
+            except ValueError:
+                pass
+
+        marks[trainee_id] = {
+            "status": status,
+            "notes": post.get(f"notes_{trainee_id}", ""),
+            "check_in_time": check_in,
+        }
+    return marks
+
+
 @admin_required
 def session_attendance(request, session_id):
     """
@@ -370,34 +411,14 @@ def session_attendance(request, session_id):
     session = get_object_or_404(TrainingSession, id=session_id)
 
     if request.method == "POST":
-        trainees = Trainee.objects.filter(status="active", archived=False)
-        attendance_count = 0
-
-        for trainee in trainees:
-            status = request.POST.get(f"status_{trainee.id}")
-            notes = request.POST.get(f"notes_{trainee.id}", "")
-            check_in_time = request.POST.get(f"check_in_{trainee.id}", "")
-
-            if status:
-                check_in = None
-                if check_in_time:
-                    try:
-                        check_in = datetime.strptime(check_in_time, "%H:%M").time()
-                    except ValueError:
-                        pass
-
-                Attendance.objects.update_or_create(
-                    trainee=trainee,
-                    session=session,
-                    defaults={
-                        "date": session.date,
-                        "status": status,
-                        "notes": notes,
-                        "check_in_time": check_in,
-                    },
-                )
-                if status in ["present", "late"]:
-                    attendance_count += 1
+        trainee_ids = Trainee.objects.filter(status="active", archived=False).values_list(
+            "id", flat=True
+        )
+        marks = attendance_marks_from_post(request.POST, trainee_ids)
+        AttendanceService.record_attendance(marks, session=session)
+        attendance_count = sum(
+            1 for mark in marks.values() if mark["status"] in ["present", "late"]
+        )
 
         # Update session status if it was scheduled
         if session.status == "scheduled":
@@ -441,35 +462,14 @@ def event_attendance(request, event_id):
 
     if request.method == "POST":
         # Get registered trainees
-        registrations = event.registrations.filter(status="registered")
-        attendance_count = 0
-
-        for reg in registrations:
-            trainee = reg.trainee
-            status = request.POST.get(f"status_{trainee.id}")
-            notes = request.POST.get(f"notes_{trainee.id}", "")
-            check_in_time = request.POST.get(f"check_in_{trainee.id}", "")
-
-            if status:
-                check_in = None
-                if check_in_time:
-                    try:
-                        check_in = datetime.strptime(check_in_time, "%H:%M").time()
-                    except ValueError:
-                        pass
-
-                Attendance.objects.update_or_create(
-                    trainee=trainee,
-                    event=event,
-                    defaults={
-                        "date": event.event_date,
-                        "status": status,
-                        "notes": notes,
-                        "check_in_time": check_in,
-                    },
-                )
-                if status in ["present", "late"]:
-                    attendance_count += 1
+        trainee_ids = event.registrations.filter(status="registered").values_list(
+            "trainee_id", flat=True
+        )
+        marks = attendance_marks_from_post(request.POST, trainee_ids)
+        AttendanceService.record_attendance(marks, event=event)
+        attendance_count = sum(
+            1 for mark in marks.values() if mark["status"] in ["present", "late"]
+        )
 
         messages.success(
             request,
@@ -622,23 +622,18 @@ def bulk_mark_present(request, session_id):
     Mark all trainees as present for a session.
     """
     session = get_object_or_404(TrainingSession, id=session_id)
-    trainees = Trainee.objects.filter(status="active", archived=False)
+    trainee_ids = Trainee.objects.filter(status="active", archived=False).values_list(
+        "id", flat=True
+    )
 
-    for trainee in trainees:
-        Attendance.objects.update_or_create(
-            trainee=trainee,
-            session=session,
-            defaults={
-                "date": session.date,
-                "status": "present",
-            },
-        )
+    marks = {trainee_id: {"status": "present"} for trainee_id in trainee_ids}
+    AttendanceService.record_attendance(marks, session=session)
 
     if session.status == "scheduled":
         session.status = "completed"
         session.save()
 
-    messages.success(request, f"All {trainees.count()} trainees marked as present.")
+    messages.success(request, f"All {len(marks)} trainees marked as present.")
 
     if request.headers.get("HX-Request"):
         return redirect("session_attendance", session_id=session.id)
@@ -658,7 +653,7 @@ def session_attendance_export(request):
         date_to: End date filter in YYYY-MM-DD format (optional)
         sections: Comma-separated list of sections for PDF (header, summary, sessions, details, signature)
     """
-    from django.http import HttpResponse
+    from django.http import HttpResponse, StreamingHttpResponse
     from core.services.reports import ReportService
 
     # Get export format
@@ -707,9 +702,10 @@ def session_attendance_export(request):
 
     if export_format == "csv":
         # Generate CSV
-        csv_content = report_service.export_csv(report_data, "session_attendance")
-
-        response = HttpResponse(csv_content, content_type="text/csv")
+        response = StreamingHttpResponse(
+            report_service.stream_csv(report_data, "session_attendance"),
+            content_type="text/csv",
+        )
         response["Content-Disposition"] = (
             f'attachment; filename="session_attendance_report_{date.today().isoformat()}.csv"'
         )
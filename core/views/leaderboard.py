@@ -7,9 +7,10 @@ from core.models import (
     Leaderboard,
     TraineePoints,
     BeltRankProgress,
-    BeltRankThreshold,
     Trainee,
 )
+from core.services.belt_thresholds import BeltThresholds
+from core.services.leaderboard_service import LeaderboardService
 
 
 @login_required
@@ -28,16 +29,28 @@ def leaderboard_all_time(request):
     return render(request, 'leaderboard/leaderboard.html', context)
 
 
+def _query_int(request, name, default, minimum, maximum):
+    """Integer query parameter, or the default if it is missing, invalid or out of range."""
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        return default
+    return value if minimum <= value <= maximum else default
+
+
 @login_required
 @require_http_methods(["GET"])
 def leaderboard_yearly(request):
     """Display yearly leaderboard rankings."""
-    year = request.GET.get('year', datetime.now().year)
+    year = _query_int(request, 'year', datetime.now().year, 1, 9998)
     leaderboards = Leaderboard.objects.filter(
         timeframe='yearly',
         year=year
     ).select_related('trainee', 'trainee__profile__user').order_by('rank')
     
+    # Rank periods on first view and after points changes; ended periods stay frozen
+    LeaderboardService.refresh_period_leaderboard('yearly', year)
+    
     context = {
         'leaderboards': leaderboards,
         'timeframe': f'Year {year}',
@@ -51,8 +64,8 @@ def leaderboard_yearly(request):
 @require_http_methods(["GET"])
 def leaderboard_monthly(request):
     """Display monthly leaderboard rankings."""
-    year = request.GET.get('year', datetime.now().year)
-    month = request.GET.get('month', datetime.now().month)
+    year = _query_int(request, 'year', datetime.now().year, 1, 9998)
+    month = _query_int(request, 'month', datetime.now().month, 1, 12)
     
     leaderboards = Leaderboard.objects.filter(
         timeframe='monthly',
@@ -60,7 +73,10 @@ def leaderboard_monthly(request):
         month=month
     ).select_related('trainee', 'trainee__profile__user').order_by('rank')
     
-    month_name = datetime(year, int(month), 1).strftime('%B')
+    # Rank periods on first view and after points changes; ended periods stay frozen
+    LeaderboardService.refresh_period_leaderboard('monthly', year, month)
+    
+    month_name = datetime(year, month, 1).strftime('%B')
     context = {
         'leaderboards': leaderboards,
         'timeframe': f'{month_name} {year}',
@@ -110,14 +126,7 @@ def trainee_profile_points(request, trainee_id):
     progress = BeltRankProgress.objects.filter(trainee=trainee).order_by('-promoted_at')
     
     # Get next belt rank threshold
-    current_belt_index = [belt[0] for belt in Trainee.BELT_CHOICES].index(trainee.belt_rank)
-    next_threshold = None
-    if current_belt_index < len(Trainee.BELT_CHOICES) - 1:
-        next_belt = Trainee.BELT_CHOICES[current_belt_index + 1][0]
-        try:
-            next_threshold = BeltRankThreshold.objects.get(belt_rank=next_belt)
-        except BeltRankThreshold.DoesNotExist:
-            pass
+    next_threshold = BeltThresholds.next_after(trainee.belt_rank)
     
     # Calculate progress percentage
     progress_percentage = 0
@@ -138,7 +147,7 @@ def trainee_profile_points(request, trainee_id):
 @require_http_methods(["GET"])
 def belt_rank_progress(request):
     """Display belt rank progression settings and history."""
-    thresholds = BeltRankThreshold.objects.all().order_by('points_required')
+    thresholds = BeltThresholds.all()
     
     # Get recent promotions
     recent_promotions = BeltRankProgress.objects.select_related(
@@ -5,15 +5,14 @@ from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
-from core.models import Notification
 from core.services.notification_service import NotificationService
 
 
 @login_required
 def notification_list(request):
-    """Display all notifications for the current user."""
-    notifications = Notification.objects.filter(recipient=request.user).order_by('-created_at')
-    unread_count = notifications.filter(is_read=False).count()
+    """Display all notifications for the current user, including broadcasts."""
+    notifications = NotificationService.get_notification_items(request.user)
+    unread_count = sum(1 for notification in notifications if not notification['is_read'])
     
     context = {
         'notifications': notifications,
@@ -33,6 +32,17 @@ def mark_as_read(request, notification_id):
     })
 
 
+@login_required
+@require_http_methods(['POST'])
+def mark_broadcast_as_read(request, broadcast_id):
+    """Mark a broadcast notification as read for the current user via AJAX."""
+    success = NotificationService.mark_broadcast_as_read(request.user, broadcast_id)
+    return JsonResponse({
+        'success': success,
+        'message': 'Notification marked as read' if success else 'Notification not found'
+    })
+
+
 @login_required
 @require_http_methods(['POST'])
 def mark_all_as_read(request):
@@ -48,7 +58,7 @@ def mark_all_as_read(request):
 @login_required
 def get_unread_count(request):
     """Get unread notification count via AJAX."""
-    count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+    count = NotificationService.get_notification_summary(request.user)['unread_count']
     return JsonResponse({
         'unread_count': count
     })
@@ -58,16 +68,17 @@ def get_unread_count(request):
 def get_recent_notifications(request):
     """Get recent notifications via AJAX."""
     limit = int(request.GET.get('limit', 10))
-    notifications = Notification.objects.filter(recipient=request.user).order_by('-created_at')[:limit]
+    notifications = NotificationService.get_notification_items(request.user, limit=limit)
     
     notifications_data = [
         {
-            'id': notif.id,
-            'title': notif.title,
-            'message': notif.message,
-            'type': notif.notification_type,
-            'is_read': notif.is_read,
-            'created_at': notif.created_at.isoformat(),
+            'id': notif['id'],
+            'title': notif['title'],
+            'message': notif['message'],
+            'type': notif['notification_type'],
+            'is_read': notif['is_read'],
+            'is_broadcast': notif['is_broadcast'],
+            'created_at': notif['created_at'].isoformat(),
         }
         for notif in notifications
     ]
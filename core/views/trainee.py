@@ -24,6 +24,7 @@ from core.models import (
     TraineeEvaluation,
     TraineeAchievement,
 )
+from core.services.event_registration import EventRegistrationService
 from core.services.leaderboard_service import PointsService, LeaderboardService
 from core.forms import TraineeProfileForm, TraineeDetailForm
 
@@ -169,6 +170,14 @@ def events_view(request):
     return response
 
 
+# Messages for registrations refused by EventRegistrationService.register
+REGISTRATION_REFUSALS = {
+    EventRegistrationService.DEADLINE_PASSED: "Registration deadline has passed.",
+    EventRegistrationService.FULL: "Event has reached maximum participants.",
+    EventRegistrationService.NOT_OPEN: "Registration is not open for this event.",
+}
+
+
 @trainee_required
 def event_register(request, event_id):
     """
@@ -178,15 +187,11 @@ def event_register(request, event_id):
     trainee = get_object_or_404(Trainee, profile__user=request.user)
     event = get_object_or_404(Event, id=event_id)
 
-    # Check if registration is allowed
-    if not event.is_registration_open:
-        if date.today() > event.registration_deadline:
-            messages.error(request, "Registration deadline has passed.")
-        elif event.is_full:
-            messages.error(request, "Event has reached maximum participants.")
-        else:
-            messages.error(request, "Registration is not open for this event.")
+    # Reserve a seat and register in one transaction
+    outcome, _ = EventRegistrationService.register(event, trainee.id)
 
+    if outcome in REGISTRATION_REFUSALS:
+        messages.error(request, REGISTRATION_REFUSALS[outcome])
         if request.headers.get("HX-Request"):
             return HttpResponse(
                 '<span class="text-red-600 text-sm">Registration closed</span>',
@@ -194,12 +199,7 @@ def event_register(request, event_id):
             )
         return redirect("trainee_events")
 
-    # Check if already registered
-    existing = EventRegistration.objects.filter(
-        event=event, trainee=trainee, status="registered"
-    ).exists()
-
-    if existing:
+    if outcome == EventRegistrationService.ALREADY_REGISTERED:
         messages.info(request, "You are already registered for this event.")
         if request.headers.get("HX-Request"):
             return HttpResponse(
@@ -208,9 +208,6 @@ def event_register(request, event_id):
             )
         return redirect("trainee_events")
 
-    # Create registration
-    EventRegistration.objects.create(event=event, trainee=trainee, status="registered")
-
     messages.success(request, f"Successfully registered for {event.name}!")
 
     if request.headers.get("HX-Request"):
@@ -241,14 +238,7 @@ def event_unregister(request, event_id):
             )
         return redirect("trainee_events")
 
-    # Find and update registration
-    registration = EventRegistration.objects.filter(
-        event=event, trainee=trainee, status="registered"
-    ).first()
-
-    if registration:
-        registration.status = "withdrawn"
-        registration.save()
+    if EventRegistrationService.unregister(event.id, trainee.id):
         messages.success(request, f"Successfully unregistered from {event.name}.")
 
     if request.headers.get("HX-Request"):
@@ -5,14 +5,13 @@ Diagnostic script to identify why auto-matching is finding no valid pairings.
 import os
 import sys
 import django
-from decimal import Decimal
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'karate.settings')
 sys.path.insert(0, os.path.dirname(__file__))
 django.setup()
 
 from core.models import Trainee, Event, EventRegistration, Match
-from core.services.matchmaking import MatchmakingService, are_belts_adjacent
+from core.services.matchmaking import MatchmakingService
 
 def diagnose_event(event_id=None, event_name=None):
     """Diagnose why an event has no valid matches."""
@@ -38,7 +37,7 @@ def diagnose_event(event_id=None, event_name=None):
     registrations = EventRegistration.objects.filter(
         event=event,
         status='registered'
-    ).select_related('trainee__profile')
+    ).select_related('trainee__profile__user')
     
     trainees = [reg.trainee for reg in registrations]
     
@@ -64,69 +63,23 @@ def diagnose_event(event_id=None, event_name=None):
     
     service = MatchmakingService()
     
-    # Check all pairings
-    total_pairs = 0
-    weight_valid = 0
-    belt_valid = 0
-    age_valid = 0
-    all_valid = 0
-    
-    invalid_reasons = {
-        'weight': [],
-        'belt': [],
-        'age': [],
-        'weight_belt': [],
-        'weight_age': [],
-        'belt_age': [],
-        'all_three': []
-    }
-    
-    for i, t1 in enumerate(trainees):
-        for t2 in trainees[i+1:]:
-            total_pairs += 1
-            
-            # Check constraints
-            weight_diff = abs(t1.weight - t2.weight)
-            weight_ok = weight_diff <= Decimal('5.0')
-            
-            belt_ok = are_belts_adjacent(t1.belt_rank, t2.belt_rank)
-            
-            age1 = t1.age or 0
-            age2 = t2.age or 0
-            age_diff = abs(age1 - age2)
-            age_ok = age_diff <= 3 or (t1.age is None or t2.age is None)
-            
-            # Count valid constraints
-            if weight_ok:
-                weight_valid += 1
-            if belt_ok:
-                belt_valid += 1
-            if age_ok:
-                age_valid += 1
-            
-            # Check what failed
-            if weight_ok and belt_ok and age_ok:
-                all_valid += 1
-            else:
-                # Categorize failure
-                name1 = t1.profile.user.get_full_name() or t1.profile.user.username
-                name2 = t2.profile.user.get_full_name() or t2.profile.user.username
-                pair_str = f"{name1} vs {name2}"
-                
-                if not weight_ok and not belt_ok and not age_ok:
-                    invalid_reasons['all_three'].append(pair_str)
-                elif not weight_ok and not belt_ok:
-                    invalid_reasons['weight_belt'].append(pair_str)
-                elif not weight_ok and not age_ok:
-                    invalid_reasons['weight_age'].append(pair_str)
-                elif not belt_ok and not age_ok:
-                    invalid_reasons['belt_age'].append(pair_str)
-                elif not weight_ok:
-                    invalid_reasons['weight'].append((pair_str, f"Δ{weight_diff:.1f}kg"))
-                elif not belt_ok:
-                    invalid_reasons['belt'].append(pair_str)
-                elif not age_ok:
-                    invalid_reasons['age'].append((pair_str, f"Δ{age_diff}yr"))
+    # Count pairings per constraint from the array-backed snapshot, without
+    # checking every pair individually
+    snapshot = service.build_snapshot(trainees)
+    counts = snapshot.constraint_counts()
+    total_pairs = counts['total']
+    weight_valid = counts['weight']
+    belt_valid = counts['belt']
+    age_valid = counts['age']
+    all_valid = counts['valid']
+    failures = counts['failures']
+    samples = snapshot.sample_failures(limit=5, counts=counts)
+    
+    def pair_name(i, j):
+        names = []
+        for t in (snapshot.trainees[i], snapshot.trainees[j]):
+            names.append(t.profile.user.get_full_name() or t.profile.user.username)
+        return " vs ".join(names)
     
     print(f"\nTotal possible pairings: {total_pairs}")
     print(f"  Weight constraint (≤5kg):     {weight_valid:3}/{total_pairs} ({100*weight_valid/total_pairs:5.1f}%)")
@@ -139,47 +92,29 @@ def diagnose_event(event_id=None, event_name=None):
     print("WHY PAIRINGS ARE FAILING")
     print("=" * 100)
     
-    if invalid_reasons['all_three']:
-        print(f"\nFail ALL three constraints ({len(invalid_reasons['all_three'])} pairs):")
-        for pair in invalid_reasons['all_three'][:5]:
-            print(f"  • {pair}")
-        if len(invalid_reasons['all_three']) > 5:
-            print(f"  ... and {len(invalid_reasons['all_three']) - 5} more")
-    
-    if invalid_reasons['weight_belt']:
-        print(f"\nFail Weight AND Belt ({len(invalid_reasons['weight_belt'])} pairs):")
-        for pair in invalid_reasons['weight_belt'][:5]:
-            print(f"  • {pair}")
-        if len(invalid_reasons['weight_belt']) > 5:
-            print(f"  ... and {len(invalid_reasons['weight_belt']) - 5} more")
-    
-    if invalid_reasons['weight_age']:
-        print(f"\nFail Weight AND Age ({len(invalid_reasons['weight_age'])} pairs):")
-        for pair in invalid_reasons['weight_age'][:5]:
-            print(f"  • {pair}")
-        if len(invalid_reasons['weight_age']) > 5:
-            print(f"  ... and {len(invalid_reasons['weight_age']) - 5} more")
-    
-    if invalid_reasons['weight']:
-        print(f"\nFail Weight only ({len(invalid_reasons['weight'])} pairs):")
-        for pair, info in invalid_reasons['weight'][:5]:
-            print(f"  • {pair} ({info})")
-        if len(invalid_reasons['weight']) > 5:
-            print(f"  ... and {len(invalid_reasons['weight']) - 5} more")
-    
-    if invalid_reasons['belt']:
-        print(f"\nFail Belt only ({len(invalid_reasons['belt'])} pairs):")
-        for pair in invalid_reasons['belt'][:5]:
-            print(f"  • {pair}")
-        if len(invalid_reasons['belt']) > 5:
-            print(f"  ... and {len(invalid_reasons['belt']) - 5} more")
-    
-    if invalid_reasons['age']:
-        print(f"\nFail Age only ({len(invalid_reasons['age'])} pairs):")
-        for pair, info in invalid_reasons['age'][:5]:
-            print(f"  • {pair} ({info})")
-        if len(invalid_reasons['age']) > 5:
-            print(f"  ... and {len(invalid_reasons['age']) - 5} more")
+    failure_labels = [
+        ('all_three', "Fail ALL three constraints"),
+        ('weight_belt', "Fail Weight AND Belt"),
+        ('weight_age', "Fail Weight AND Age"),
+        ('belt_age', "Fail Belt AND Age"),
+        ('weight', "Fail Weight only"),
+        ('belt', "Fail Belt only"),
+        ('age', "Fail Age only"),
+    ]
+    for category, label in failure_labels:
+        count = failures[category]
+        if not count:
+            continue
+        print(f"\n{label} ({count} pairs):")
+        for i, j in samples[category]:
+            if category == 'weight':
+                print(f"  • {pair_name(i, j)} (Δ{snapshot.weight_diff(i, j):.1f}kg)")
+            elif category == 'age':
+                print(f"  • {pair_name(i, j)} (Δ{snapshot.age_diff(i, j)}yr)")
+            else:
+                print(f"  • {pair_name(i, j)}")
+        if count > len(samples[category]):
+            print(f"  ... and {count - len(samples[category])} more")
     
     # Summary stats
     print("\n" + "=" * 100)
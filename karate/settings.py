@@ -82,6 +82,36 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Report data is shared with the job queue workers that render exports, so
+# it is cached in the database rather than in each process's memory. The
+# table is created by migration core.0039. Notification summaries are
+# invalidated by the workers and commands that create notifications, so they
+# are kept in the database too, in their own table (migration core.0041) so
+# per-user summaries do not push out cached reports. Those migrations create
+# the tables by name: moving a cache to another LOCATION needs a migration or
+# a manual createcachetable.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "reports": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "core_report_cache",
+        "TIMEOUT": 24 * 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+    "notifications": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "core_notification_cache",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
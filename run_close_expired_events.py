@@ -8,6 +8,9 @@ Usage:
     
 Or schedule with cron:
     0 0 * * * cd /path/to/karate && python manage.py close_expired_events
+
+Or, without cron, keep it running and closing due events every minute:
+    python manage.py close_expired_events --loop --interval 60
 """
 
 import os